@@ -1,7 +1,12 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from contextlib import aclosing
 from typing import Optional
+import json
 import logging
 from ..services.data_service import DataService
+from ..services.price_broadcaster import price_broadcaster
 from ..services.analysis_service import AnalysisService
 from ..models.company import CompanyInfo, StockPrice, SWOTAnalysis, NewsSentiment, MarketLandscape, EmployeeSentiment, CompanyAnalysis
 
@@ -13,12 +18,12 @@ async def get_basic_company_data(ticker: str):
     """Get basic company info and stock price without AI analysis"""
     try:
         # Fetch company info
-        company_info = DataService.get_company_info(ticker)
+        company_info = await run_in_threadpool(DataService.get_company_info, ticker)
         if not company_info:
             raise HTTPException(status_code=404, detail=f"Company data not found for ticker: {ticker}")
         
         # Fetch stock price
-        stock_price = DataService.get_stock_price(ticker)
+        stock_price = await run_in_threadpool(DataService.get_stock_price, ticker)
         if not stock_price:
             raise HTTPException(status_code=404, detail=f"Stock price data not found for ticker: {ticker}")
         
@@ -38,12 +43,12 @@ async def get_company_analysis(ticker: str):
     """Get comprehensive company analysis including all qualitative metrics"""
     try:
         # Fetch company info
-        company_info = DataService.get_company_info(ticker)
+        company_info = await run_in_threadpool(DataService.get_company_info, ticker)
         if not company_info:
             raise HTTPException(status_code=404, detail=f"Company data not found for ticker: {ticker}")
         
         # Fetch stock price
-        stock_price = DataService.get_stock_price(ticker)
+        stock_price = await run_in_threadpool(DataService.get_stock_price, ticker)
         if not stock_price:
             raise HTTPException(status_code=404, detail=f"Stock price data not found for ticker: {ticker}")
         
@@ -72,7 +77,7 @@ async def get_company_analysis(ticker: str):
 async def get_company_info(ticker: str):
     """Get basic company information"""
     try:
-        company_info = DataService.get_company_info(ticker)
+        company_info = await run_in_threadpool(DataService.get_company_info, ticker)
         if not company_info:
             raise HTTPException(status_code=404, detail=f"Company info not found for ticker: {ticker}")
         return company_info
@@ -86,7 +91,7 @@ async def get_company_info(ticker: str):
 async def get_stock_price(ticker: str):
     """Get current stock price and metrics"""
     try:
-        stock_price = DataService.get_stock_price(ticker)
+        stock_price = await run_in_threadpool(DataService.get_stock_price, ticker)
         if not stock_price:
             raise HTTPException(status_code=404, detail=f"Stock price not found for ticker: {ticker}")
         return stock_price
@@ -96,11 +101,30 @@ async def get_stock_price(ticker: str):
         logger.error(f"Error fetching stock price for {ticker}: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.get("/{ticker}/price/stream")
+async def stream_stock_price(ticker: str):
+    """Stream price updates as server-sent events, shared with every other client of the ticker"""
+    
+    async def generate_price_stream():
+        """Generate server-sent events from the ticker's price feed."""
+        async with aclosing(price_broadcaster.subscribe(ticker)) as updates:
+            async for update in updates:
+                if update is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield f"data: {json.dumps(update, default=str)}\n\n"
+    
+    return StreamingResponse(
+        generate_price_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "Connection": "keep-alive", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/{ticker}/swot", response_model=SWOTAnalysis)
 async def get_swot_analysis(ticker: str):
     """Get SWOT analysis for the company"""
     try:
-        company_info = DataService.get_company_info(ticker)
+        company_info = await run_in_threadpool(DataService.get_company_info, ticker)
         if not company_info:
             raise HTTPException(status_code=404, detail=f"Company info not found for ticker: {ticker}")
         
@@ -126,7 +150,7 @@ async def get_news_sentiment(ticker: str):
 async def get_market_landscape(ticker: str):
     """Get market landscape analysis"""
     try:
-        company_info = DataService.get_company_info(ticker)
+        company_info = await run_in_threadpool(DataService.get_company_info, ticker)
         if not company_info:
             raise HTTPException(status_code=404, detail=f"Company info not found for ticker: {ticker}")
         
@@ -142,7 +166,7 @@ async def get_market_landscape(ticker: str):
 async def get_employee_sentiment(ticker: str):
     """Get employee sentiment analysis"""
     try:
-        company_info = DataService.get_company_info(ticker)
+        company_info = await run_in_threadpool(DataService.get_company_info, ticker)
         if not company_info:
             raise HTTPException(status_code=404, detail=f"Company info not found for ticker: {ticker}")
         
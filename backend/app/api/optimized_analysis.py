@@ -1,6 +1,6 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Query
 from fastapi.responses import StreamingResponse
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import json
 import asyncio
 import logging
@@ -13,6 +13,10 @@ from ..models.dcf import (
 from ..services.optimized_workflow import optimized_workflow
 from ..services.multi_model_dcf import multi_model_dcf_service, multi_stage_growth_engine
 from ..services.intelligent_cache import intelligent_cache, CacheType
+from ..services.cache_warming import cache_warming_service
+from ..services.market_data_gateway import market_data_gateway
+from ..services.ohlcv_store import ohlcv_store
+from ..services.statements_store import financial_statements_store
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
@@ -289,9 +293,7 @@ async def validate_dcf_assumptions(
             ticker += '.NS'
         
         # Get basic company data for validation context
-        import yfinance as yf
-        stock = yf.Ticker(ticker)
-        basic_info = stock.info
+        basic_info = await market_data_gateway.get_info(ticker)
         
         if not basic_info or not basic_info.get('longName'):
             raise HTTPException(status_code=404, detail=f"Company data not found for {ticker}")
@@ -362,9 +364,7 @@ async def get_model_recommendation(
             ticker += '.NS'
         
         # Get basic company data
-        import yfinance as yf
-        stock = yf.Ticker(ticker)
-        company_info = stock.info
+        company_info = await market_data_gateway.get_info(ticker)
         
         if not company_info or not company_info.get('longName'):
             raise HTTPException(status_code=404, detail=f"Company data not found for {ticker}")
@@ -419,18 +419,19 @@ async def calculate_multi_model_valuation(
             ticker += '.NS'
         
         # Get comprehensive company data
-        import yfinance as yf
-        stock = yf.Ticker(ticker)
-        company_info = stock.info
+        company_info = await market_data_gateway.get_info(ticker)
         
         if not company_info or not company_info.get('longName'):
             raise HTTPException(status_code=404, detail=f"Company data not found for {ticker}")
         
         # Get additional financial data
         try:
-            history = stock.history(period="1y")
-            financials = stock.quarterly_financials
-            balance_sheet = stock.quarterly_balance_sheet
+            history, statements = await asyncio.gather(
+                ohlcv_store.get_history(ticker, period="1y"),
+                financial_statements_store.get_statements(ticker, frequency="quarterly")
+            )
+            financials = statements['financials']
+            balance_sheet = statements['balance_sheet']
         except:
             history = financials = balance_sheet = None
         
@@ -582,33 +583,23 @@ async def get_cache_statistics() -> Dict[str, Any]:
 @router.post("/cache/warm")
 async def warm_cache_popular_stocks(
     tickers: Optional[List[str]] = None,
-    background_tasks: BackgroundTasks = None
+    jobs: Optional[List[str]] = Query(None, description="Subset of: financial_data, news_articles, model_recommendations, technical_analysis")
 ) -> Dict[str, Any]:
     """
     Pre-warm cache for popular stocks to improve user experience.
     
-    Default popular stocks: TCS, RELIANCE, HDFCBANK, INFY, WIPRO
+    Default universe: the top Indian companies tracked by the news scraper.
+    Runs in the background; poll /cache/warm/status for progress.
     """
     
-    default_popular = ["TCS.NS", "RELIANCE.NS", "HDFCBANK.NS", "INFY.NS", "WIPRO.NS"]
-    stocks_to_warm = tickers or default_popular
-    
     try:
-        # Run cache warming in background
-        warming_task = intelligent_cache.warm_cache_for_popular_stocks(
-            stocks_to_warm, 
-            cache_financial=True, 
-            cache_news=True
-        )
+        status = cache_warming_service.start(tickers=tickers, job_names=jobs)
         
-        if background_tasks:
-            background_tasks.add_task(lambda: warming_task)
-            
         return {
-            "cache_warming": "started",
-            "stocks_to_warm": stocks_to_warm,
-            "estimated_duration_minutes": len(stocks_to_warm) * 2,
-            "background_processing": True
+            "cache_warming": "started" if status.get("status") in ("running", "starting") else status.get("status"),
+            "stocks_to_warm": status.get("total_tickers", len(tickers) if tickers else None),
+            "background_processing": True,
+            "progress": status
         }
         
     except Exception as e:
@@ -618,36 +609,64 @@ async def warm_cache_popular_stocks(
             "error": str(e)
         }
 
+@router.get("/cache/warm/status")
+async def get_cache_warming_status() -> Dict[str, Any]:
+    """
+    Progress of the current or last cache warming run (from any worker).
+    """
+    
+    status = cache_warming_service.get_status()
+    if status is None:
+        return {"status": "never_run"}
+    return status
+
 @router.delete("/cache/clear")
 async def clear_cache(
     cache_type: Optional[str] = None,
-    ticker: Optional[str] = None
+    ticker: Optional[str] = None,
+    tag: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Clear cache entries. Use with caution in production.
     
     Args:
         cache_type: Specific cache type to clear (optional)
-        ticker: Specific ticker to clear (optional)
+        ticker: Clear everything cached for this ticker (optional)
+        tag: Clear entries carrying this tag, e.g. "sector:IT" (optional)
+    
+    Parameters combine: ticker + cache_type clears one type for a ticker.
+    With no parameters only expired entries are removed.
     """
     
     try:
-        if ticker and cache_type:
-            # Clear specific ticker and cache type
-            cache_type_enum = CacheType(cache_type)
-            success = await intelligent_cache.invalidate(cache_type_enum, ticker)
+        cache_type_enum = CacheType(cache_type) if cache_type else None
+        
+        if ticker or tag:
+            tags = []
+            if ticker:
+                tags.append(intelligent_cache.tag("ticker", ticker))
+            if tag:
+                tags.append(tag)
+            
+            removed = await intelligent_cache.invalidate_by_tag(tags, cache_type_enum)
             
             return {
                 "cache_clear": "completed",
-                "scope": f"{cache_type}/{ticker}",
-                "success": success
+                "scope": "/".join(filter(None, [cache_type, ticker, tag])),
+                "entries_removed": removed,
+                "success": removed > 0
             }
             
-        elif cache_type:
-            # Clear all entries of specific type (would need implementation)
+        elif cache_type_enum:
+            # Clear all entries of specific type
+            removed = await intelligent_cache.invalidate_by_tag(
+                intelligent_cache.tag("type", cache_type_enum.value)
+            )
+            
             return {
-                "cache_clear": "not_implemented",
-                "message": "Clearing by cache type only is not yet implemented"
+                "cache_clear": "completed",
+                "scope": cache_type,
+                "entries_removed": removed
             }
             
         else:
@@ -140,28 +140,16 @@ async def multi_stage_dcf_authenticated(
             "user_assumptions": user_assumptions
         }
         
-        cached_result = await intelligent_cache.get(
+        # Perform DCF analysis on a miss (stale results are served while refreshing)
+        dcf_result = await intelligent_cache.get_or_compute(
             CacheType.AI_INSIGHTS,
             f"dcf_{ticker}",
-            **cache_params
-        )
-        
-        if cached_result:
-            return cached_result
-        
-        # Perform DCF analysis
-        dcf_result = await dcf_service.multi_stage_dcf_analysis(
-            ticker=ticker,
-            mode=mode,
-            user_level=user_level,
-            user_assumptions=user_assumptions
-        )
-        
-        # Cache result
-        await intelligent_cache.set(
-            CacheType.AI_INSIGHTS,
-            f"dcf_{ticker}",
-            dcf_result,
+            lambda: dcf_service.multi_stage_dcf_analysis(
+                ticker=ticker,
+                mode=mode,
+                user_level=user_level,
+                user_assumptions=user_assumptions
+            ),
             **cache_params
         )
         
@@ -182,23 +170,11 @@ async def get_mode_recommendation_authenticated(
     Get DCF mode recommendation with caching
     """
     try:
-        # Check cache
-        cached_result = await intelligent_cache.get(
-            CacheType.MODEL_RECOMMENDATIONS,
-            ticker
-        )
-        
-        if cached_result:
-            return cached_result
-        
-        # Get fresh recommendation
-        recommendation = await dcf_service.get_mode_recommendation(ticker)
-        
-        # Cache result
-        await intelligent_cache.set(
+        # Get fresh recommendation on a miss (stale results are served while refreshing)
+        recommendation = await intelligent_cache.get_or_compute(
             CacheType.MODEL_RECOMMENDATIONS,
             ticker,
-            recommendation
+            lambda: dcf_service.get_mode_recommendation(ticker)
         )
         
         return recommendation
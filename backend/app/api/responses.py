@@ -0,0 +1,28 @@
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # Optional dependency - the standard library encoder is used instead
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response for large, plain payloads (lists and dicts of floats, strings, None).
+
+    Returning it from an endpoint skips FastAPI's jsonable_encoder walk, and
+    the body is encoded with orjson when it is installed - NaN and infinity
+    become null, as they would in the browser's JSON.stringify. Without
+    orjson the standard library encoder is used (non-finite floats are
+    rejected there, like FastAPI's default response).
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+        return json.dumps(
+            content, default=str, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
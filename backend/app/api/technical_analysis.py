@@ -1,7 +1,11 @@
 from fastapi import APIRouter, HTTPException, Query
-from typing import Dict, Any, List
+from fastapi.concurrency import run_in_threadpool
+from typing import Dict, Any, List, Optional
 import logging
 from ..services.technical_analysis import technical_analysis_service
+from ..services.technical_screener import technical_screener
+from ..services.cache_warming import cache_warming_service
+from .responses import FastJSONResponse
 
 router = APIRouter(prefix="/api/v2", tags=["Technical Analysis"])
 logger = logging.getLogger(__name__)
@@ -9,26 +13,59 @@ logger = logging.getLogger(__name__)
 @router.get("/technical-analysis/{ticker}")
 async def get_technical_analysis(
     ticker: str,
-    period: str = Query(default="1y", regex="^(3mo|6mo|1y|3y)$")
+    period: str = Query(default="1y", regex="^(3mo|6mo|1y|3y)$"),
+    layout: str = Query(default="rows", regex="^(rows|columns)$", description="chart_data as one object per bar (rows) or one array per field (columns)"),
+    timeframe: str = Query(default="1d", regex="^(1d|5m|15m|1h|1w)$", description="Bar size; anything but 1d is resampled from stored bars and ignores period")
 ):
     """Get real technical analysis with professional indicators"""
     try:
-        logger.info(f"Getting technical analysis for {ticker} with period {period}")
+        logger.info(f"Getting technical analysis for {ticker} with period {period}, timeframe {timeframe}")
         
         # Get real technical analysis data using pandas-ta
-        tech_data = technical_analysis_service.get_technical_analysis(ticker, period)
+        if timeframe == "1d":
+            tech_data = await run_in_threadpool(
+                technical_analysis_service.get_technical_analysis, ticker, period, None, layout
+            )
+        else:
+            tech_data = await technical_analysis_service.get_timeframe_analysis(ticker, timeframe, layout)
         if not tech_data:
             raise HTTPException(status_code=404, detail=f"Technical analysis data not found for ticker: {ticker}")
         
         # Add AI summary for agentic mode compatibility
         tech_data['ai_summary'] = generate_ai_summary(tech_data)
         
-        return tech_data
+        return FastJSONResponse(tech_data)
         
     except Exception as e:
         logger.error(f"Error fetching technical analysis for {ticker}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch technical analysis for {ticker}")
 
+@router.get("/technical-screener")
+async def screen_technicals(
+    tickers: Optional[str] = Query(default=None, description="Comma-separated symbols (bare NSE symbols get .NS); defaults to the tracked NIFTY heavyweights"),
+    where: List[str] = Query(default=[], description="Conditions on indicator values, e.g. rsi<30 or sma_50_current>sma_200_current"),
+    signal: List[str] = Query(default=[], description="Text a detected signal must contain, e.g. golden cross"),
+    sort_by: str = Query(default="rsi"),
+    order: str = Query(default="asc", regex="^(asc|desc)$"),
+    limit: Optional[int] = Query(default=None, ge=1, le=1000)
+):
+    """Screen many tickers at once on their current technical indicators and signals"""
+    if tickers:
+        symbols = [symbol.strip().upper() for symbol in tickers.split(",") if symbol.strip()]
+        symbols = [symbol if "." in symbol or symbol.startswith("^") else f"{symbol}.NS" for symbol in symbols]
+    else:
+        symbols = cache_warming_service.default_universe()
+
+    try:
+        return FastJSONResponse(await run_in_threadpool(
+            technical_screener.screen_sync, symbols, where, signal, sort_by, order, limit
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error screening {len(symbols)} tickers: {e}")
+        raise HTTPException(status_code=500, detail="Failed to run technical screener")
+
 def generate_ai_summary(data: Dict[str, Any]) -> str:
     """Generate a simple AI-style summary for technical analysis"""
     try:
@@ -11,6 +11,7 @@ from ...services.peer_comparison_service import PeerComparisonService
 from ...services.corporate_governance_service import CorporateGovernanceService
 from ...services.dynamic_sector_classification_service import DynamicSectorClassificationService
 from ...services.blended_multiples_service import BlendedMultiplesService
+from ...services.market_data_gateway import market_data_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -142,9 +143,7 @@ async def get_peer_comparison_ratios(ticker: str) -> Dict[str, Any]:
                 blended_valuation = await blended_multiples_service.calculate_blended_valuation(ticker)
                 
                 # Extract company ratios from financial data
-                import yfinance as yf
-                stock = yf.Ticker(ticker)
-                info = stock.info
+                info = await market_data_gateway.get_info(ticker)
                 
                 pe_ratio = info.get('trailingPE', 0) or 0
                 pb_ratio = info.get('priceToBook', 0) or 0
@@ -280,9 +279,7 @@ async def get_peer_comparison_ratios(ticker: str) -> Dict[str, Any]:
             except Exception as e:
                 logger.warning(f"Conglomerate analysis failed for {ticker}: {e}")
                 # Create fallback analysis
-                import yfinance as yf
-                stock = yf.Ticker(ticker)
-                info = stock.info
+                info = await market_data_gateway.get_info(ticker)
                 
                 pe_ratio = info.get('trailingPE', 0) or 0
                 pb_ratio = info.get('priceToBook', 0) or 0
@@ -318,9 +315,7 @@ async def get_peer_comparison_ratios(ticker: str) -> Dict[str, Any]:
             except Exception as e:
                 logger.warning(f"Peer analysis failed for {ticker}: {e}")
                 # Create fallback analysis
-                import yfinance as yf
-                stock = yf.Ticker(ticker)
-                info = stock.info
+                info = await market_data_gateway.get_info(ticker)
                 
                 pe_ratio = info.get('trailingPE', 0) or 0
                 pb_ratio = info.get('priceToBook', 0) or 0
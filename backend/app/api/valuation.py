@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from datetime import datetime
 import logging
 from ..services.data_service import DataService
@@ -6,6 +7,7 @@ from ..services.dcf_service import DCFService
 from ..services.technical_analysis import technical_analysis_service
 from ..services.claude_service import claude_service
 from ..services.price_service import price_service
+from .responses import FastJSONResponse
 from ..models.dcf import DCFAssumptions, DCFResponse, DCFDefaults, FinancialData
 
 logger = logging.getLogger(__name__)
@@ -15,7 +17,7 @@ router = APIRouter(prefix="/api/valuation", tags=["valuation"])
 async def get_financial_data(ticker: str, years: int = 5):
     """Get historical financial data for DCF analysis"""
     try:
-        financial_data = DataService.get_financial_data(ticker, years)
+        financial_data = await run_in_threadpool(DataService.get_financial_data, ticker, years)
         if not financial_data:
             raise HTTPException(status_code=404, detail=f"Financial data not found for ticker: {ticker}")
         return financial_data
@@ -29,7 +31,7 @@ async def get_financial_data(ticker: str, years: int = 5):
 async def get_dcf_defaults(ticker: str, sector: str = Query(None, description="Sector classification for sector-specific assumptions")):
     """Get intelligent default assumptions for DCF analysis with sector intelligence"""
     try:
-        financial_data = DataService.get_financial_data(ticker)
+        financial_data = await run_in_threadpool(DataService.get_financial_data, ticker)
         if not financial_data:
             raise HTTPException(status_code=404, detail=f"Financial data not found for ticker: {ticker}")
         
@@ -49,7 +51,7 @@ async def calculate_dcf_valuation(ticker: str, assumptions: DCFAssumptions):
         logger.info(f"DCF calculation request for {ticker} with assumptions: {assumptions}")
         
         # Fetch financial data
-        financial_data = DataService.get_financial_data(ticker)
+        financial_data = await run_in_threadpool(DataService.get_financial_data, ticker)
         if not financial_data:
             logger.error(f"No financial data found for ticker: {ticker}")
             raise HTTPException(status_code=404, detail=f"Financial data not found for ticker: {ticker}")
@@ -101,7 +103,7 @@ async def quick_dcf_valuation(
     """Quick DCF calculation with optional parameter overrides"""
     try:
         # Get financial data and defaults
-        financial_data = DataService.get_financial_data(ticker)
+        financial_data = await run_in_threadpool(DataService.get_financial_data, ticker)
         if not financial_data:
             raise HTTPException(status_code=404, detail=f"Financial data not found for ticker: {ticker}")
         
@@ -139,7 +141,7 @@ async def get_sensitivity_analysis(ticker: str):
     """Get sensitivity analysis using default assumptions"""
     try:
         # Get financial data and defaults
-        financial_data = DataService.get_financial_data(ticker)
+        financial_data = await run_in_threadpool(DataService.get_financial_data, ticker)
         if not financial_data:
             raise HTTPException(status_code=404, detail=f"Financial data not found for ticker: {ticker}")
         
@@ -165,14 +167,17 @@ async def get_sensitivity_analysis(ticker: str):
 @router.get("/{ticker}/technical-analysis")
 async def get_technical_analysis(
     ticker: str,
-    period: str = Query(default="1y", regex="^(3mo|6mo|1y|3y)$")
+    period: str = Query(default="1y", regex="^(3mo|6mo|1y|3y)$"),
+    layout: str = Query(default="rows", regex="^(rows|columns)$", description="chart_data as one object per bar (rows) or one array per field (columns)")
 ):
     """Get technical analysis with charts and indicators"""
     try:
         logger.info(f"Getting technical analysis for {ticker} with period {period}")
         
         # Get technical analysis data
-        tech_data = technical_analysis_service.get_technical_analysis(ticker, period)
+        tech_data = await run_in_threadpool(
+            technical_analysis_service.get_technical_analysis, ticker, period, None, layout
+        )
         if not tech_data:
             raise HTTPException(status_code=404, detail=f"Technical analysis data not found for ticker: {ticker}")
         
@@ -189,7 +194,7 @@ async def get_technical_analysis(
         if ai_summary:
             tech_data['ai_summary'] = ai_summary
         
-        return tech_data
+        return FastJSONResponse(tech_data)
         
     except HTTPException:
         raise
@@ -200,23 +205,26 @@ async def get_technical_analysis(
 @router.get("/{ticker}/technical-indicators")
 async def get_technical_indicators(
     ticker: str,
-    period: str = Query(default="1y", regex="^(3mo|6mo|1y|3y)$")
+    period: str = Query(
+        default="1y", regex="^(3mo|6mo|1y|3y)$",
+        description="Accepted for compatibility and echoed back; the values always come from the ticker's 2y indicator state"
+    )
 ):
     """Get just the technical indicator values without charts"""
     try:
         logger.info(f"Getting technical indicators for {ticker} with period {period}")
         
-        # Get technical analysis data
-        tech_data = technical_analysis_service.get_technical_analysis(ticker, period)
-        if not tech_data:
+        # Current values from the ticker's indicator state - no recomputation over the history
+        indicator_values = await run_in_threadpool(technical_analysis_service.get_indicator_values, ticker)
+        if not indicator_values:
             raise HTTPException(status_code=404, detail=f"Technical data not found for ticker: {ticker}")
         
         # Return only indicator values
         return {
             'ticker': ticker,
             'period': period,
-            'indicator_values': tech_data['indicator_values'],
-            'analysis_timestamp': tech_data['analysis_timestamp']
+            'indicator_values': indicator_values,
+            'analysis_timestamp': datetime.now().isoformat()
         }
         
     except HTTPException:
@@ -229,7 +237,7 @@ async def get_technical_indicators(
 async def get_price_cache_status():
     """Get price cache status for debugging"""
     try:
-        cache_status = price_service.get_cache_status()
+        cache_status = await run_in_threadpool(price_service.get_cache_status)
         return {
             'cache_status': cache_status,
             'timestamp': datetime.now().isoformat(),
@@ -243,7 +251,7 @@ async def get_price_cache_status():
 async def clear_price_cache(ticker: str = None):
     """Clear price cache for specific ticker or all tickers"""
     try:
-        price_service.clear_cache(ticker if ticker != "all" else None)
+        await run_in_threadpool(price_service.clear_cache, ticker if ticker != "all" else None)
         return {
             'message': f'Cache cleared for {ticker if ticker != "all" else "all tickers"}',
             'timestamp': datetime.now().isoformat()
@@ -19,6 +19,9 @@ from .api.v1.financial_analysis import router as financial_analysis_router
 from .api.dcf_insights import router as dcf_insights_router
 from .api.news_analysis import router as news_analysis_router
 from .routers.valuation_models import router as valuation_models_router
+from .services.cache_warming import cache_warming_service, scheduled_warm_time
+from .services.market_data_gateway import count_upstream_calls
+from .services.kite_service import get_kite_service
 # from .api.enhanced_company import router as enhanced_company_router
 # from .api.enhanced_valuation import router as enhanced_valuation_router
 
@@ -51,6 +54,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def count_market_data_calls(request, call_next):
+    """Count upstream market data (yfinance) calls made while serving each request"""
+    with count_upstream_calls() as stats:
+        response = await call_next(request)
+    response.headers["X-Upstream-Calls"] = str(stats.total)
+    if stats.total:
+        logger.info(f"{request.method} {request.url.path}: {stats.total} upstream calls {dict(stats.by_kind)}")
+    return response
+
 # Include routers
 # V1 APIs (original yfinance-based)
 app.include_router(company_router)
@@ -80,6 +93,19 @@ app.include_router(valuation_models_router)
 # app.include_router(enhanced_company_router)
 # app.include_router(enhanced_valuation_router)
 
+@app.on_event("startup")
+async def schedule_cache_warming():
+    """Warm the cache before market open when CACHE_WARM_SCHEDULE=HH:MM (IST) is set"""
+    run_at = scheduled_warm_time()
+    if run_at:
+        cache_warming_service.schedule_daily(run_at)
+
+@app.on_event("startup")
+async def start_quote_stream():
+    """Connect the Kite session (and its live quote stream) at startup when an access token is configured"""
+    if os.getenv("KITE_API_KEY") and os.getenv("KITE_ACCESS_TOKEN"):
+        await get_kite_service().initialize_session()
+
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
@@ -2,9 +2,9 @@ import asyncio
 import logging
 from typing import Dict, Any, Optional, List
 from datetime import datetime
-import yfinance as yf
 from .claude_service import claude_service
 from .news_scraper import news_scraper
+from .company_snapshot import CompanySnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -81,13 +81,15 @@ class AgenticWorkflowService:
             # Step 1: Data Ingestion
             _check_cancellation()
             self._notify_progress("ingestion", 10, "Fetching company financial data...")
-            company_data = await self._fetch_company_data(ticker)
+            # Company data and the news search both need the company info - fetch it once
+            snapshot = CompanySnapshot(ticker)
+            company_data = await self._fetch_company_data(ticker, snapshot)
             if not company_data:
                 return None
             
             _check_cancellation()
             self._notify_progress("ingestion", 30, "Scraping recent news articles...")
-            news_articles = await self._fetch_news_data(ticker, max_news_articles)
+            news_articles = await self._fetch_news_data(ticker, max_news_articles, snapshot)
             
             _check_cancellation()
             self._notify_progress("ingestion", 50, "Data ingestion complete")
@@ -164,30 +166,26 @@ class AgenticWorkflowService:
             self._notify_progress("error", 0, f"Analysis failed: {str(e)}")
             return None
     
-    async def _fetch_company_data(self, ticker: str) -> Optional[Dict[str, Any]]:
+    async def _fetch_company_data(self, ticker: str, snapshot: Optional[CompanySnapshot] = None) -> Optional[Dict[str, Any]]:
         """Fetch company financial data using yfinance."""
         try:
             logger.info(f"Fetching financial data for {ticker}")
-            
-            stock = yf.Ticker(ticker)
+            snapshot = snapshot or CompanySnapshot(ticker)
             
             # Get basic info
-            info = stock.info
+            info = await snapshot.info()
             if not info or not info.get('longName'):
                 logger.error(f"No company info found for {ticker}")
                 return None
             
-            # Get historical data
-            hist = stock.history(period="1y")
-            
-            # Get financial statements (if available)
-            try:
-                financials = stock.financials
-                balance_sheet = stock.balance_sheet
-                cash_flow = stock.cashflow
-            except Exception as e:
-                logger.warning(f"Could not fetch financial statements for {ticker}: {e}")
-                financials = balance_sheet = cash_flow = None
+            # Get historical data and financial statements (if available) together
+            hist, statements = await asyncio.gather(
+                snapshot.history(period="1y"),
+                snapshot.statements()
+            )
+            financials = statements['financials']
+            balance_sheet = statements['balance_sheet']
+            cash_flow = statements['cashflow']
             
             # Sanitize data to remove NaN values
             data = {
@@ -206,12 +204,12 @@ class AgenticWorkflowService:
             logger.error(f"Error fetching company data for {ticker}: {e}")
             return None
     
-    async def _fetch_news_data(self, ticker: str, max_articles: int) -> List[Dict[str, Any]]:
+    async def _fetch_news_data(self, ticker: str, max_articles: int, snapshot: Optional[CompanySnapshot] = None) -> List[Dict[str, Any]]:
         """Fetch recent news articles for the company."""
         try:
             # Extract company name for better search
-            stock = yf.Ticker(ticker)
-            company_name = stock.info.get('longName', ticker.replace('.NS', ''))
+            info = await (snapshot or CompanySnapshot(ticker)).info()
+            company_name = info.get('longName', ticker.replace('.NS', ''))
             
             logger.info(f"Searching for news articles about {company_name}")
             
@@ -7,12 +7,12 @@ import asyncio
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
-import yfinance as yf
 import numpy as np
 
 from .dynamic_sector_classification_service import DynamicSectorClassificationService, BusinessSegment, SectorCategory
 from .peer_comparison_service import PeerComparisonService
 from .intelligent_cache import intelligent_cache, CacheType
+from .market_data_gateway import market_data_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -352,8 +352,7 @@ class BlendedMultiplesService:
         
         try:
             # Get company financial data
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            info = await market_data_gateway.get_info(ticker)
             
             # Get total company metrics
             market_cap = info.get('marketCap', 0)
@@ -491,8 +490,7 @@ class BlendedMultiplesService:
         """Get current market capitalization"""
         
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            info = await market_data_gateway.get_info(ticker)
             return info.get('marketCap', 0)
             
         except Exception as e:
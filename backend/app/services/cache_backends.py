@@ -0,0 +1,223 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .cache_serialization import CacheCodec
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """
+    Storage for encoded cache entries - the shared (L2) tier of
+    IntelligentCacheManager.
+
+    Entries are framed bytes (see CacheCodec) keyed by cache key; their
+    metadata lives in CacheIndex. Implementations must be safe to share
+    between processes on one host, so every uvicorn worker pointed at the
+    same cache directory sees the same entries. All methods block and are
+    meant to run on the cache's I/O thread pool.
+    """
+
+    name = "base"
+
+    def read(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Decode a stored entry, or None if the key is not stored."""
+        raise NotImplementedError
+
+    def write(self, cache_key: str, raw: bytes) -> int:
+        """Store (or replace) an encoded entry, returning its stored size in bytes."""
+        raise NotImplementedError
+
+    def delete(self, cache_keys: Iterable[str]) -> int:
+        """Delete entries, returning how many of them existed."""
+        raise NotImplementedError
+
+    def keys(self) -> List[Tuple[str, int]]:
+        """List (cache_key, stored size) for every stored entry (O(entries))."""
+        raise NotImplementedError
+
+    @property
+    def location(self) -> str:
+        raise NotImplementedError
+
+
+class FileCacheBackend(CacheBackend):
+    """
+    One file per entry in a directory - the original cache layout.
+
+    Writes go to a unique temp file and are renamed into place, so readers in
+    other processes see either the old or the new entry, never a partial one.
+    Legacy pretty-printed .json entries written before framing are still read.
+    """
+
+    name = "file"
+    ENTRY_SUFFIX = ".cache"
+    LEGACY_SUFFIX = ".json"
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(exist_ok=True)
+
+    def entry_path(self, cache_key: str) -> Path:
+        """Get file path for cache key."""
+        return self.cache_dir / f"{cache_key}{self.ENTRY_SUFFIX}"
+
+    def legacy_path(self, cache_key: str) -> Path:
+        """Get the pre-codec JSON file path for cache key."""
+        return self.cache_dir / f"{cache_key}{self.LEGACY_SUFFIX}"
+
+    def iter_files(self) -> Iterator[Path]:
+        """Yield every entry file in the cache directory, framed or legacy."""
+        for suffix in (self.ENTRY_SUFFIX, self.LEGACY_SUFFIX):
+            yield from self.cache_dir.glob(f"*{suffix}")
+
+    @classmethod
+    def load_file(cls, cache_file: Path) -> Dict[str, Any]:
+        """Decode a framed or legacy JSON cache file."""
+        if cache_file.suffix == cls.LEGACY_SUFFIX:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return CacheCodec.decode(cache_file.read_bytes())
+
+    def read(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        for cache_path in (self.entry_path(cache_key), self.legacy_path(cache_key)):
+            if cache_path.exists():
+                return self.load_file(cache_path)
+        return None
+
+    def write(self, cache_key: str, raw: bytes) -> int:
+        cache_path = self.entry_path(cache_key)
+
+        # Unique temp name so concurrent writers of one key never share a file
+        temp_path = cache_path.with_name(f"{cache_key}.{uuid.uuid4().hex}.tmp")
+        try:
+            temp_path.write_bytes(raw)
+            os.replace(temp_path, cache_path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+
+        # Drop any superseded legacy file for this key
+        self.legacy_path(cache_key).unlink(missing_ok=True)
+        return len(raw)
+
+    def delete(self, cache_keys: Iterable[str]) -> int:
+        removed = 0
+        for cache_key in cache_keys:
+            existed = False
+            for cache_path in (self.entry_path(cache_key), self.legacy_path(cache_key)):
+                try:
+                    cache_path.unlink()
+                    existed = True
+                except FileNotFoundError:
+                    pass
+            removed += existed
+        return removed
+
+    def keys(self) -> List[Tuple[str, int]]:
+        entries = []
+        for cache_file in self.iter_files():
+            try:
+                entries.append((cache_file.stem, cache_file.stat().st_size))
+            except FileNotFoundError:
+                # Removed by another process since the directory was listed
+                pass
+        return entries
+
+    @property
+    def location(self) -> str:
+        return str(self.cache_dir.absolute())
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Entries stored as BLOBs in a SQLite database in WAL mode.
+
+    Readers never block the writer (and vice versa), and a write is a single
+    row upsert instead of temp file + rename + directory entry, which suits
+    many small, short-lived entries such as one-minute quotes written by
+    several worker processes. Each thread gets its own connection.
+    """
+
+    name = "sqlite"
+    DB_FILENAME = "cache_entries.db"
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connect().execute("""
+            CREATE TABLE IF NOT EXISTS entry_blobs (
+                cache_key TEXT PRIMARY KEY,
+                body BLOB NOT NULL
+            )
+        """)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def read(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute(
+            "SELECT body FROM entry_blobs WHERE cache_key = ?", (cache_key,)
+        ).fetchone()
+        return CacheCodec.decode(row[0]) if row else None
+
+    def write(self, cache_key: str, raw: bytes) -> int:
+        self._connect().execute(
+            "INSERT OR REPLACE INTO entry_blobs (cache_key, body) VALUES (?, ?)",
+            (cache_key, raw)
+        )
+        return len(raw)
+
+    def delete(self, cache_keys: Iterable[str]) -> int:
+        cache_keys = list(cache_keys)
+        if not cache_keys:
+            return 0
+        conn = self._connect()
+        before = conn.total_changes
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "DELETE FROM entry_blobs WHERE cache_key = ?",
+                [(cache_key,) for cache_key in cache_keys]
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return conn.total_changes - before
+
+    def keys(self) -> List[Tuple[str, int]]:
+        return self._connect().execute(
+            "SELECT cache_key, length(body) FROM entry_blobs"
+        ).fetchall()
+
+    @property
+    def location(self) -> str:
+        return str(self.db_path.absolute())
+
+
+def create_cache_backend(name: str, cache_dir: Path) -> CacheBackend:
+    """
+    Build a backend by name ("file" or "sqlite") rooted at cache_dir.
+
+    Raises:
+        ValueError: for an unknown backend name
+    """
+    if name == FileCacheBackend.name:
+        return FileCacheBackend(cache_dir)
+    if name == SQLiteCacheBackend.name:
+        return SQLiteCacheBackend(Path(cache_dir) / SQLiteCacheBackend.DB_FILENAME)
+    raise ValueError(f"Unknown cache backend: {name}")
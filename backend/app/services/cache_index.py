@@ -0,0 +1,373 @@
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class CacheIndex:
+    """
+    Persistent metadata index for the shared cache tier, stored in SQLite (WAL mode).
+
+    One row per cache entry (key, type, write time, size) is kept in step with
+    the CacheBackend contents by IntelligentCacheManager on set/invalidate/expiry.
+    Expiry sweeps are range scans on (cache_type, created_at), so they cost
+    O(expired) instead of opening every file, and entry count / total size are
+    maintained by triggers in a single-row totals table, so stats are O(1).
+    Each entry also carries a set of tags (e.g. ticker:TCS.NS, sector:IT) so
+    "everything about a ticker" can be found without knowing the hashed keys.
+
+    Disk budget eviction follows GreedyDual-Size: every entry has a priority
+    H = L + cost / size_mb, refreshed on access, and the lowest H is evicted
+    first. L (the "inflation" value) is raised to the H of each evicted entry,
+    so entries that have not been touched for a while age out even if they
+    were expensive, while cheap, bulky entries go before small costly ones.
+
+    All methods block and are meant to run on the cache's I/O thread pool;
+    each thread gets its own connection. The database is shared safely by every
+    worker process using the same cache directory.
+    """
+
+    SCHEMA_VERSION = 3
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+        self.created = False
+        self.upgraded = False
+        self._initialize()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _initialize(self):
+        conn = self._connect()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= self.SCHEMA_VERSION:
+            return
+
+        if version < 1:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    cache_key TEXT PRIMARY KEY,
+                    cache_type TEXT NOT NULL,
+                    identifier TEXT,
+                    created_at REAL NOT NULL,
+                    size_bytes INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_entries_type_created
+                    ON entries (cache_type, created_at);
+
+                CREATE TABLE IF NOT EXISTS totals (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    entry_count INTEGER NOT NULL,
+                    total_bytes INTEGER NOT NULL
+                );
+                INSERT OR IGNORE INTO totals (id, entry_count, total_bytes) VALUES (1, 0, 0);
+
+                CREATE TRIGGER IF NOT EXISTS entries_after_insert AFTER INSERT ON entries
+                BEGIN
+                    UPDATE totals SET entry_count = entry_count + 1,
+                                      total_bytes = total_bytes + NEW.size_bytes
+                    WHERE id = 1;
+                END;
+                CREATE TRIGGER IF NOT EXISTS entries_after_update AFTER UPDATE ON entries
+                BEGIN
+                    UPDATE totals SET total_bytes = total_bytes + NEW.size_bytes - OLD.size_bytes
+                    WHERE id = 1;
+                END;
+            """)
+
+        if version < 2:
+            conn.executescript("""
+                CREATE INDEX IF NOT EXISTS idx_entries_identifier
+                    ON entries (identifier);
+
+                CREATE TABLE IF NOT EXISTS entry_tags (
+                    tag TEXT NOT NULL,
+                    cache_key TEXT NOT NULL,
+                    PRIMARY KEY (tag, cache_key)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_entry_tags_key
+                    ON entry_tags (cache_key);
+
+                DROP TRIGGER IF EXISTS entries_after_delete;
+                CREATE TRIGGER entries_after_delete AFTER DELETE ON entries
+                BEGIN
+                    UPDATE totals SET entry_count = entry_count - 1,
+                                      total_bytes = total_bytes - OLD.size_bytes
+                    WHERE id = 1;
+                    DELETE FROM entry_tags WHERE cache_key = OLD.cache_key;
+                END;
+            """)
+
+        if version < 3:
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(entries)")]
+            if "priority" not in columns:
+                conn.execute("ALTER TABLE entries ADD COLUMN priority REAL NOT NULL DEFAULT 0")
+            conn.executescript("""
+                CREATE INDEX IF NOT EXISTS idx_entries_priority
+                    ON entries (priority);
+
+                -- Only refresh totals when the size changes, not on priority touches
+                DROP TRIGGER IF EXISTS entries_after_update;
+                CREATE TRIGGER entries_after_update AFTER UPDATE OF size_bytes ON entries
+                BEGIN
+                    UPDATE totals SET total_bytes = total_bytes + NEW.size_bytes - OLD.size_bytes
+                    WHERE id = 1;
+                END;
+
+                CREATE TABLE IF NOT EXISTS eviction_policy (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    inflation REAL NOT NULL
+                );
+                INSERT OR IGNORE INTO eviction_policy (id, inflation) VALUES (1, 0);
+            """)
+
+        conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+        # An older index lacks tags/priorities - the owner re-seeds it
+        if version > 0:
+            self.upgraded = True
+        else:
+            self.created = True
+
+    @staticmethod
+    def _priority_sql() -> str:
+        # H = L + cost / size_mb, with L read from the shared policy row
+        return "(SELECT inflation FROM eviction_policy WHERE id = 1) + ? * 1048576.0 / MAX(?, 1)"
+
+    def record(
+        self,
+        cache_key: str,
+        cache_type: str,
+        identifier: str,
+        created_at: float,
+        size_bytes: int,
+        tags: Sequence[str] = (),
+        cost: float = 0.0
+    ):
+        """
+        Insert or update the row (and tags) for an entry that was just written.
+
+        Args:
+            cost: Estimated cost of recomputing the entry, used for its eviction priority
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                f"""
+                INSERT INTO entries (cache_key, cache_type, identifier, created_at, size_bytes, priority)
+                VALUES (?, ?, ?, ?, ?, {self._priority_sql()})
+                ON CONFLICT(cache_key) DO UPDATE SET
+                    cache_type = excluded.cache_type,
+                    identifier = excluded.identifier,
+                    created_at = excluded.created_at,
+                    size_bytes = excluded.size_bytes,
+                    priority = excluded.priority
+                """,
+                (cache_key, cache_type, identifier, created_at, size_bytes, cost, size_bytes)
+            )
+            conn.execute("DELETE FROM entry_tags WHERE cache_key = ?", (cache_key,))
+            conn.executemany(
+                "INSERT OR IGNORE INTO entry_tags (tag, cache_key) VALUES (?, ?)",
+                [(tag, cache_key) for tag in tags]
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def touch(self, costs: Dict[str, float]):
+        """
+        Refresh the eviction priority of entries that were read.
+
+        Args:
+            costs: cache_key -> recompute cost of the entry
+        """
+        if not costs:
+            return
+        self._connect().executemany(
+            """
+            UPDATE entries
+            SET priority = (SELECT inflation FROM eviction_policy WHERE id = 1)
+                           + ? * 1048576.0 / MAX(size_bytes, 1)
+            WHERE cache_key = ?
+            """,
+            [(cost, cache_key) for cache_key, cost in costs.items()]
+        )
+
+    def evict_to_budget(self, max_bytes: int, target_bytes: int) -> List[str]:
+        """
+        Drop the lowest-priority rows once total size exceeds max_bytes.
+
+        Rows are removed until the total is at or below target_bytes, and the
+        inflation value is raised to the priority of the last one removed.
+        The caller deletes the matching stored entries.
+
+        Returns:
+            Keys of the evicted entries
+        """
+        if self.totals()[1] <= max_bytes:
+            return []
+
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-check under the write lock - another process may have evicted already
+            total_bytes = conn.execute("SELECT total_bytes FROM totals WHERE id = 1").fetchone()[0]
+            evicted = []
+            inflation = None
+            if total_bytes > max_bytes:
+                rows = conn.execute(
+                    "SELECT cache_key, size_bytes, priority FROM entries ORDER BY priority"
+                )
+                for cache_key, size_bytes, priority in rows:
+                    if total_bytes <= target_bytes:
+                        break
+                    evicted.append(cache_key)
+                    total_bytes -= size_bytes
+                    inflation = priority
+
+            if evicted:
+                conn.executemany(
+                    "DELETE FROM entries WHERE cache_key = ?",
+                    [(cache_key,) for cache_key in evicted]
+                )
+                conn.execute(
+                    "UPDATE eviction_policy SET inflation = MAX(inflation, ?) WHERE id = 1",
+                    (inflation,)
+                )
+            conn.execute("COMMIT")
+            return evicted
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def remove(self, cache_keys: Iterable[str]):
+        """Drop rows (and tags) for entries that were deleted."""
+        self._connect().executemany(
+            "DELETE FROM entries WHERE cache_key = ?",
+            [(cache_key,) for cache_key in cache_keys]
+        )
+
+    def expired_keys(self, cutoffs: Dict[str, float]) -> List[str]:
+        """
+        Keys whose write time is older than their type's cutoff.
+
+        Args:
+            cutoffs: cache_type value -> epoch seconds; older entries are expired
+        """
+        conn = self._connect()
+        keys = []
+        for cache_type, cutoff in cutoffs.items():
+            rows = conn.execute(
+                "SELECT cache_key FROM entries WHERE cache_type = ? AND created_at < ?",
+                (cache_type, cutoff)
+            )
+            keys.extend(row[0] for row in rows)
+        return keys
+
+    def keys_with_tags(self, tags: Sequence[str], cache_type: Optional[str] = None) -> List[str]:
+        """
+        Keys of entries carrying every one of the given tags.
+
+        Args:
+            tags: Tags that must all be present
+            cache_type: Optional cache_type value to restrict the match to
+        """
+        tags = list(dict.fromkeys(tags))
+        if not tags:
+            return []
+
+        placeholders = ", ".join("?" for _ in tags)
+        query = f"""
+            SELECT t.cache_key FROM entry_tags t
+            JOIN entries e ON e.cache_key = t.cache_key
+            WHERE t.tag IN ({placeholders})
+        """
+        params: List = list(tags)
+        if cache_type is not None:
+            query += " AND e.cache_type = ?"
+            params.append(cache_type)
+        query += " GROUP BY t.cache_key HAVING COUNT(*) = ?"
+        params.append(len(tags))
+
+        return [row[0] for row in self._connect().execute(query, params)]
+
+    def keys_with_identifier_prefix(self, prefix: str, cache_type: Optional[str] = None) -> List[str]:
+        """
+        Keys of entries whose identifier starts with prefix (index range scan).
+
+        Args:
+            prefix: Identifier prefix, e.g. "TCS.NS" matches "TCS.NS_governance"
+            cache_type: Optional cache_type value to restrict the match to
+        """
+        query = "SELECT cache_key FROM entries WHERE identifier >= ? AND identifier < ?"
+        params: List = [prefix, prefix + "\U0010ffff"]
+        if cache_type is not None:
+            query += " AND cache_type = ?"
+            params.append(cache_type)
+        return [row[0] for row in self._connect().execute(query, params)]
+
+    def created_at(self, cache_key: str) -> Optional[float]:
+        """Write time of an entry (epoch seconds), or None if it is not indexed."""
+        row = self._connect().execute(
+            "SELECT created_at FROM entries WHERE cache_key = ?", (cache_key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def entries_of_type(self, cache_type: str) -> List[Tuple[str, str, float]]:
+        """(cache_key, identifier, created_at) for every entry of a type, newest first."""
+        return self._connect().execute(
+            "SELECT cache_key, identifier, created_at FROM entries "
+            "WHERE cache_type = ? ORDER BY created_at DESC",
+            (cache_type,)
+        ).fetchall()
+
+    def totals(self) -> Tuple[int, int]:
+        """Return (entry count, total bytes) without scanning entries."""
+        row = self._connect().execute(
+            "SELECT entry_count, total_bytes FROM totals WHERE id = 1"
+        ).fetchone()
+        return row[0], row[1]
+
+    def replace_all(self, rows: Iterable[Tuple[str, str, str, float, int, Sequence[str], float]]):
+        """Rebuild the index from (key, type, identifier, created_at, size, tags, cost) rows."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM entry_tags")
+            for cache_key, cache_type, identifier, created_at, size_bytes, tags, cost in rows:
+                conn.execute(
+                    f"""
+                    INSERT INTO entries (cache_key, cache_type, identifier, created_at, size_bytes, priority)
+                    VALUES (?, ?, ?, ?, ?, {self._priority_sql()})
+                    ON CONFLICT(cache_key) DO UPDATE SET size_bytes = size_bytes + excluded.size_bytes
+                    """,
+                    (cache_key, cache_type, identifier, created_at, size_bytes, cost, size_bytes)
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO entry_tags (tag, cache_key) VALUES (?, ?)",
+                    [(tag, cache_key) for tag in tags]
+                )
+            # Re-derive totals so a rebuild also repairs any drift
+            conn.execute(
+                """
+                UPDATE totals SET
+                    entry_count = (SELECT COUNT(*) FROM entries),
+                    total_bytes = (SELECT COALESCE(SUM(size_bytes), 0) FROM entries)
+                WHERE id = 1
+                """
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
@@ -0,0 +1,195 @@
+import gzip
+import json
+import logging
+import pickle
+from typing import Any, Dict, Optional
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency - gzip is used instead
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+
+class CacheSerializer:
+    """Base class for turning cache payloads into bytes and back."""
+
+    name = "base"
+
+    def dumps(self, obj: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, raw: bytes) -> Any:
+        raise NotImplementedError
+
+
+class JsonSerializer(CacheSerializer):
+    """
+    Compact JSON (no indentation).
+
+    Non-JSON values are stringified exactly like the original file cache did,
+    so callers see the same shapes they always have.
+    """
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, default=str, separators=(',', ':')).encode('utf-8')
+
+    def loads(self, raw: bytes) -> Any:
+        return json.loads(raw)
+
+
+class PickleSerializer(CacheSerializer):
+    """
+    Pickle protocol 5.
+
+    Preserves pandas Timestamps, datetimes and non-string dict keys (such as the
+    period columns of quarterly_financials.to_dict()) without re-parsing. Only
+    use for data the process itself wrote - the cache directory is trusted.
+    """
+
+    name = "pickle"
+
+    def dumps(self, obj: Any) -> bytes:
+        return pickle.dumps(obj, protocol=5)
+
+    def loads(self, raw: bytes) -> Any:
+        return pickle.loads(raw)
+
+
+class CacheCompressor:
+    """Base class for optional whole-entry compression."""
+
+    name = "none"
+
+    def compress(self, raw: bytes) -> bytes:
+        return raw
+
+    def decompress(self, raw: bytes) -> bytes:
+        return raw
+
+
+class GzipCompressor(CacheCompressor):
+    """gzip at a fast level - favours write latency over ratio."""
+
+    name = "gzip"
+
+    def __init__(self, level: int = 3):
+        self.level = level
+
+    def compress(self, raw: bytes) -> bytes:
+        return gzip.compress(raw, compresslevel=self.level)
+
+    def decompress(self, raw: bytes) -> bytes:
+        return gzip.decompress(raw)
+
+
+class ZstdCompressor(CacheCompressor):
+    """Zstandard compression (requires the optional zstandard package)."""
+
+    name = "zstd"
+
+    def __init__(self, level: int = 3):
+        if zstandard is None:
+            raise RuntimeError("zstandard is not installed")
+        self.level = level
+
+    def compress(self, raw: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=self.level).compress(raw)
+
+    def decompress(self, raw: bytes) -> bytes:
+        return zstandard.ZstdDecompressor().decompress(raw)
+
+
+SERIALIZERS: Dict[str, CacheSerializer] = {
+    JsonSerializer.name: JsonSerializer(),
+    PickleSerializer.name: PickleSerializer()
+}
+
+# One-byte ids written into the entry header; never renumber existing ids
+_SERIALIZER_IDS = {"json": 1, "pickle": 2}
+_COMPRESSION_IDS = {"none": 0, "gzip": 1, "zstd": 2}
+
+_zstd_fallback_logged = False
+
+
+def get_compressor(name: Optional[str]) -> CacheCompressor:
+    """Resolve a compressor by name, falling back to gzip when zstd is unavailable."""
+    global _zstd_fallback_logged
+    if not name or name == "none":
+        return CacheCompressor()
+    if name == "gzip":
+        return GzipCompressor()
+    if name == "zstd":
+        if zstandard is None:
+            if not _zstd_fallback_logged:
+                logger.warning("zstandard not installed, using gzip for cache compression")
+                _zstd_fallback_logged = True
+            return GzipCompressor()
+        return ZstdCompressor()
+    raise ValueError(f"Unknown cache compression: {name}")
+
+
+class CacheCodec:
+    """
+    Serializer + compressor pair used for on-disk cache entries.
+
+    Entries are framed with a small header (magic, version, serializer id,
+    compression id) so any entry can be decoded regardless of the codec that
+    is currently configured for its CacheType.
+    """
+
+    MAGIC = b"EQSC"
+    VERSION = 1
+    HEADER_SIZE = len(MAGIC) + 3
+
+    def __init__(self, serializer: str = "json", compression: Optional[str] = None):
+        if serializer not in SERIALIZERS:
+            raise ValueError(f"Unknown cache serializer: {serializer}")
+        self.serializer = SERIALIZERS[serializer]
+        self.compressor = get_compressor(compression)
+
+    @property
+    def description(self) -> str:
+        if self.compressor.name == "none":
+            return self.serializer.name
+        return f"{self.serializer.name}+{self.compressor.name}"
+
+    def encode(self, entry: Dict[str, Any]) -> bytes:
+        """Encode a full cache entry into framed bytes."""
+        header = self.MAGIC + bytes([
+            self.VERSION,
+            _SERIALIZER_IDS[self.serializer.name],
+            _COMPRESSION_IDS[self.compressor.name]
+        ])
+        return header + self.compressor.compress(self.serializer.dumps(entry))
+
+    @classmethod
+    def decode(cls, raw: bytes) -> Dict[str, Any]:
+        """Decode framed bytes written by any codec."""
+        if len(raw) < cls.HEADER_SIZE or not raw.startswith(cls.MAGIC):
+            raise ValueError("Not a framed cache entry")
+
+        version, serializer_id, compression_id = raw[len(cls.MAGIC):cls.HEADER_SIZE]
+        if version != cls.VERSION:
+            raise ValueError(f"Unsupported cache entry version: {version}")
+
+        serializer_name = _lookup(_SERIALIZER_IDS, serializer_id)
+        compression_name = _lookup(_COMPRESSION_IDS, compression_id)
+
+        body = raw[cls.HEADER_SIZE:]
+        if compression_name == "zstd":
+            body = ZstdCompressor().decompress(body)
+        else:
+            body = get_compressor(compression_name).decompress(body)
+
+        return SERIALIZERS[serializer_name].loads(body)
+
+
+def _lookup(ids: Dict[str, int], value: int) -> str:
+    for name, entry_id in ids.items():
+        if entry_id == value:
+            return name
+    raise ValueError(f"Unknown codec id in cache entry header: {value}")
@@ -0,0 +1,445 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, time as dt_time, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows - runs are then only serialized per process
+    fcntl = None
+
+from .intelligent_cache import intelligent_cache, CacheType, IntelligentCacheManager
+
+logger = logging.getLogger(__name__)
+
+# Matches the max_news_articles default of execute_optimized_analysis, so warmed
+# news entries share the cache key of a default analysis request
+NEWS_ARTICLES_PER_TICKER = 5
+
+
+class RateBudget:
+    """
+    Token bucket limiting upstream calls (yfinance, news sites) per minute.
+
+    Bursts of up to `burst` calls go through immediately; after that callers
+    wait until tokens refill at calls_per_minute / 60 per second.
+    """
+
+    def __init__(self, calls_per_minute: float, burst: Optional[float] = None):
+        self.rate = calls_per_minute / 60.0
+        self.capacity = burst if burst is not None else max(1.0, calls_per_minute / 6)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1.0):
+        """Wait until `tokens` calls may be made, then spend them."""
+        if tokens <= 0:
+            return
+        tokens = min(tokens, self.capacity)
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+@dataclass
+class WarmingJob:
+    """One cache entry to pre-populate per ticker, keyed exactly as its request path keys it."""
+    name: str
+    cache_type: CacheType
+    produce: Callable[[str], Awaitable[Any]]  # ticker -> fresh data (falsy on failure)
+    params: Dict[str, Any] = field(default_factory=dict)
+    upstream_calls: int = 1  # rate budget spent per produce() run
+
+
+@dataclass
+class WarmingProgress:
+    """Progress of one warming run, persisted so every worker can report it."""
+    run_id: str
+    trigger: str
+    tickers: List[str]
+    jobs: List[str]
+    started_at: datetime
+    status: str = "running"
+    finished_at: Optional[datetime] = None
+    completed_tickers: int = 0
+    in_progress: List[str] = field(default_factory=list)
+    outcomes: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    upstream_calls: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    MAX_ERRORS = 50
+
+    def record(self, job: str, outcome: str):
+        counts = self.outcomes.setdefault(job, {"warmed": 0, "fresh": 0, "failed": 0})
+        counts[outcome] += 1
+
+    def add_error(self, message: str):
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append(message)
+
+    def to_dict(self) -> Dict[str, Any]:
+        end = self.finished_at or datetime.now()
+        total = len(self.tickers)
+        return {
+            "run_id": self.run_id,
+            "trigger": self.trigger,
+            "status": self.status,
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "elapsed_seconds": round((end - self.started_at).total_seconds(), 1),
+            "total_tickers": total,
+            "completed_tickers": self.completed_tickers,
+            "percent_complete": round(self.completed_tickers / total * 100, 1) if total else 100.0,
+            "in_progress": list(self.in_progress),
+            "jobs": list(self.jobs),
+            "outcomes": self.outcomes,
+            "upstream_calls": self.upstream_calls,
+            "errors": list(self.errors)
+        }
+
+
+def default_warming_jobs() -> List[WarmingJob]:
+    """
+    Jobs for the entries a first analysis of a ticker needs, using the same
+    cache keys as OptimizedWorkflowService and TechnicalAnalysisService.
+    """
+    # Imported here - these services pull in the whole analysis stack
+    from .optimized_workflow import optimized_workflow
+    from .multi_model_dcf import multi_model_dcf_service
+    from .technical_analysis import technical_analysis_service
+
+    async def model_recommendations(ticker: str):
+        company_data = await optimized_workflow._fetch_company_data(ticker)
+        if not company_data:
+            return None
+        return await multi_model_dcf_service.calculate_multi_model_valuation(ticker, company_data, None)
+
+    return [
+        WarmingJob(
+            "financial_data", CacheType.FINANCIAL_DATA,
+            optimized_workflow._fetch_fresh_company_data,
+            upstream_calls=5  # info, history and three statements
+        ),
+        WarmingJob(
+            "news_articles", CacheType.NEWS_ARTICLES,
+            lambda ticker: optimized_workflow._fetch_fresh_news_data(ticker, NEWS_ARTICLES_PER_TICKER),
+            params={"max_articles": NEWS_ARTICLES_PER_TICKER},
+            upstream_calls=2
+        ),
+        WarmingJob(
+            "model_recommendations", CacheType.MODEL_RECOMMENDATIONS,
+            model_recommendations,
+            params={"has_user_assumptions": False},
+            upstream_calls=0  # computed from the financial data warmed just before
+        ),
+        WarmingJob(
+            "technical_analysis", CacheType.TECHNICAL_ANALYSIS,
+            lambda ticker: asyncio.to_thread(technical_analysis_service.compute_technical_analysis, ticker, "1y"),
+            params={"period": "1y"},
+            upstream_calls=2
+        )
+    ]
+
+
+class CacheWarmingService:
+    """
+    Pre-populates the shared cache for a ticker universe so the first
+    request of the day for a popular stock is a cache hit.
+
+    - Tickers are warmed with bounded concurrency; the jobs for one ticker
+      run in order (model recommendations reuse the warmed financial data)
+    - Upstream fetches are paced by a RateBudget; entries with plenty of
+      TTL left are skipped without spending budget
+    - One run at a time across all worker processes (a lock file in the
+      cache directory); progress is written next to it so /cache/warm/status
+      answers from any worker
+    - schedule_daily() runs the warm-up every trading day before market open
+    """
+
+    STATUS_FILENAME = "cache_warming_status.json"
+    LOCK_FILENAME = "cache_warming.lock"
+    MARKET_TIMEZONE = ZoneInfo("Asia/Kolkata")
+
+    def __init__(
+        self,
+        cache: Optional[IntelligentCacheManager] = None,
+        jobs: Optional[List[WarmingJob]] = None,
+        max_concurrency: int = 4,
+        calls_per_minute: float = 60.0,
+        min_remaining: timedelta = timedelta(hours=2)
+    ):
+        self.cache = cache or intelligent_cache
+        self._jobs = jobs
+        self.max_concurrency = max_concurrency
+        self.calls_per_minute = calls_per_minute
+        self.min_remaining = min_remaining
+
+        self._progress: Optional[WarmingProgress] = None
+        self._task: Optional[asyncio.Task] = None
+        self._scheduler_task: Optional[asyncio.Task] = None
+
+    @property
+    def jobs(self) -> Dict[str, WarmingJob]:
+        if self._jobs is None:
+            self._jobs = default_warming_jobs()
+        return {job.name: job for job in self._jobs}
+
+    @staticmethod
+    def default_universe() -> List[str]:
+        """The NIFTY heavyweights tracked by the news scraper."""
+        from .news_scraper import news_scraper
+        return list(news_scraper.top_indian_companies)
+
+    @property
+    def _status_path(self) -> Path:
+        return self.cache.cache_dir / self.STATUS_FILENAME
+
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(
+        self,
+        tickers: Optional[List[str]] = None,
+        job_names: Optional[List[str]] = None,
+        trigger: str = "manual"
+    ) -> Dict[str, Any]:
+        """
+        Start a warming run in the background unless one is already running here.
+
+        Returns:
+            Status of the new (or already running) run
+        """
+        if not self.is_running():
+            self._task = asyncio.ensure_future(self.warm(tickers, job_names, trigger))
+            self._task.add_done_callback(self._log_task_failure)
+        return self.get_status() or {"status": "starting"}
+
+    async def warm(
+        self,
+        tickers: Optional[List[str]] = None,
+        job_names: Optional[List[str]] = None,
+        trigger: str = "manual"
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Warm the cache for tickers (default: default_universe()) and wait for it.
+
+        Args:
+            tickers: Ticker symbols to warm
+            job_names: Subset of job names to run (default: all)
+            trigger: "manual" or "scheduled", reported in the status
+
+        Returns:
+            Final progress, or None if another process holds the run lock
+        """
+        tickers = list(dict.fromkeys(tickers or self.default_universe()))
+        jobs = self.jobs
+        selected = [jobs[name] for name in (job_names or jobs) if name in jobs]
+
+        lock_file = self._acquire_run_lock()
+        if lock_file is False:
+            logger.info("Cache warming already running in another worker, skipping")
+            return None
+
+        progress = WarmingProgress(
+            run_id=uuid.uuid4().hex[:12],
+            trigger=trigger,
+            tickers=tickers,
+            jobs=[job.name for job in selected],
+            started_at=datetime.now()
+        )
+        self._progress = progress
+        self._write_status(progress)
+        logger.info(f"Starting cache warming for {len(tickers)} tickers ({', '.join(progress.jobs)})")
+
+        budget = RateBudget(self.calls_per_minute)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def warm_bounded(ticker: str):
+            async with semaphore:
+                progress.in_progress.append(ticker)
+                try:
+                    await self._warm_ticker(ticker, selected, budget, progress)
+                finally:
+                    progress.in_progress.remove(ticker)
+                    progress.completed_tickers += 1
+                    self._write_status(progress)
+
+        try:
+            await asyncio.gather(*(warm_bounded(ticker) for ticker in tickers))
+            progress.status = "completed"
+        except asyncio.CancelledError:
+            progress.status = "cancelled"
+            raise
+        except Exception as e:
+            progress.status = "failed"
+            progress.add_error(str(e))
+            logger.error(f"Cache warming failed: {e}")
+        finally:
+            progress.finished_at = datetime.now()
+            self._write_status(progress)
+            self._release_run_lock(lock_file)
+
+        logger.info(f"Cache warming completed: {progress.outcomes} in {progress.to_dict()['elapsed_seconds']}s")
+        return progress.to_dict()
+
+    async def _warm_ticker(
+        self,
+        ticker: str,
+        jobs: List[WarmingJob],
+        budget: RateBudget,
+        progress: WarmingProgress
+    ):
+        """Run each job for a ticker, skipping entries that are still fresh enough."""
+        for job in jobs:
+            try:
+                # Renew entries that would expire soon, but never more often than every half TTL
+                threshold = min(self.min_remaining, self.cache.ttl_config[job.cache_type] / 2)
+                remaining = await self.cache.ttl_remaining(job.cache_type, ticker, **job.params)
+                if remaining is not None and remaining >= threshold:
+                    progress.record(job.name, "fresh")
+                    continue
+
+                await budget.acquire(job.upstream_calls)
+                progress.upstream_calls += job.upstream_calls
+                data = await self.cache.refresh(
+                    job.cache_type, ticker, lambda: job.produce(ticker), **job.params
+                )
+                if data:
+                    progress.record(job.name, "warmed")
+                else:
+                    progress.record(job.name, "failed")
+                    progress.add_error(f"{ticker}/{job.name}: no data")
+
+            except Exception as e:
+                progress.record(job.name, "failed")
+                progress.add_error(f"{ticker}/{job.name}: {e}")
+                logger.error(f"Error warming {job.name} for {ticker}: {e}")
+
+    def get_status(self) -> Optional[Dict[str, Any]]:
+        """Progress of the current or last run in any worker, None if none has run."""
+        if self._progress is not None and self._progress.status == "running":
+            return self._progress.to_dict()
+        try:
+            return json.loads(self._status_path.read_text())
+        except (FileNotFoundError, ValueError):
+            return self._progress.to_dict() if self._progress else None
+
+    def _write_status(self, progress: WarmingProgress):
+        """Atomically publish progress for other workers."""
+        try:
+            temp_path = self._status_path.with_name(f"{self.STATUS_FILENAME}.{uuid.uuid4().hex}.tmp")
+            temp_path.write_text(json.dumps(progress.to_dict()))
+            os.replace(temp_path, self._status_path)
+        except Exception as e:
+            logger.warning(f"Could not write cache warming status: {e}")
+
+    def _acquire_run_lock(self):
+        """
+        Take the cross-process run lock without waiting.
+
+        Returns:
+            The open lock file, None when locking is unsupported, or False if
+            another process holds the lock
+        """
+        if fcntl is None:
+            return None
+        lock_file = open(self.cache.cache_dir / self.LOCK_FILENAME, "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return lock_file
+        except OSError:
+            lock_file.close()
+            return False
+
+    @staticmethod
+    def _release_run_lock(lock_file):
+        if lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+
+    @staticmethod
+    def _log_task_failure(task: asyncio.Task):
+        if not task.cancelled() and task.exception():
+            logger.error(f"Cache warming task failed: {task.exception()}")
+
+    # Scheduling
+
+    @classmethod
+    def next_run_time(cls, now: datetime, run_at: dt_time, weekdays_only: bool = True) -> datetime:
+        """
+        Next occurrence of run_at (market time) strictly after now.
+
+        Args:
+            now: Timezone-aware current time
+            run_at: Local market time of day, e.g. time(8, 45)
+            weekdays_only: Skip Saturdays and Sundays (NSE is closed)
+        """
+        local_now = now.astimezone(cls.MARKET_TIMEZONE)
+        candidate = datetime.combine(local_now.date(), run_at, tzinfo=cls.MARKET_TIMEZONE)
+        if candidate <= local_now:
+            candidate += timedelta(days=1)
+        while weekdays_only and candidate.weekday() >= 5:
+            candidate += timedelta(days=1)
+        return candidate
+
+    def schedule_daily(self, run_at: dt_time, weekdays_only: bool = True) -> asyncio.Task:
+        """
+        Warm the default universe every (trading) day at run_at, market time.
+
+        Every worker may call this; the run lock and the persisted status make
+        sure only one of them warms per day.
+        """
+        if self._scheduler_task is None or self._scheduler_task.done():
+            self._scheduler_task = asyncio.ensure_future(self._run_schedule(run_at, weekdays_only))
+            logger.info(f"Cache warming scheduled daily at {run_at.strftime('%H:%M')} {self.MARKET_TIMEZONE.key}")
+        return self._scheduler_task
+
+    async def _run_schedule(self, run_at: dt_time, weekdays_only: bool):
+        while True:
+            try:
+                next_run = self.next_run_time(datetime.now(self.MARKET_TIMEZONE), run_at, weekdays_only)
+                await asyncio.sleep((next_run - datetime.now(self.MARKET_TIMEZONE)).total_seconds())
+
+                if self._ran_since(next_run - timedelta(minutes=5)):
+                    continue
+                await self.warm(trigger="scheduled")
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in scheduled cache warming: {e}")
+
+    def _ran_since(self, cutoff: datetime) -> bool:
+        """Whether another worker already started a scheduled run after cutoff."""
+        status = self.get_status()
+        if not status or status.get("trigger") != "scheduled":
+            return False
+        started_at = datetime.fromisoformat(status["started_at"])
+        return started_at.astimezone(self.MARKET_TIMEZONE) >= cutoff
+
+
+def scheduled_warm_time() -> Optional[dt_time]:
+    """CACHE_WARM_SCHEDULE=HH:MM (market time) enables the daily warm-up."""
+    value = os.getenv("CACHE_WARM_SCHEDULE", "").strip()
+    return dt_time.fromisoformat(value) if value else None
+
+
+# Global cache warming service
+cache_warming_service = CacheWarmingService(
+    max_concurrency=int(os.getenv("CACHE_WARM_CONCURRENCY", "4")),
+    calls_per_minute=float(os.getenv("CACHE_WARM_CALLS_PER_MINUTE", "60"))
+)
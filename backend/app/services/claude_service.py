@@ -1013,16 +1013,13 @@ class AgenticAnalysisService(ClaudeService):
     Features:
     - Two-call batching strategy targeting <$0.50 per analysis
     - Structured output parsing with fallback handling
-    - Two-tier caching (memory + persistent)
+    - Shared caching of both batches and the combined analysis (AI_ANALYSIS,
+      6 hours) across all worker processes
     - Model tier selection for cost optimization
     """
     
     def __init__(self):
         super().__init__()
-        # Memory cache for session-level caching
-        self.core_analysis_cache = {}
-        self.sentiment_cache = {}
-        self.cache_ttl = timedelta(hours=6)  # 6-hour cache for AI responses
         
         # Cost optimization settings
         self.use_cost_optimized_model = True  # Use cheaper models when possible
@@ -1046,82 +1043,98 @@ class AgenticAnalysisService(ClaudeService):
         try:
             logger.info(f"Starting comprehensive agentic analysis for {ticker}")
             
-            # Check persistent cache first
+            # Persistent cache - concurrent requests share one analysis, and an
+            # expired result is served while a fresh one is generated
             cache_key = f"{ticker}_agentic_comprehensive"
-            cached_result = await intelligent_cache.get(
-                CacheType.AI_ANALYSIS, cache_key
-            )
-            
-            if cached_result:
-                logger.info(f"Using cached comprehensive analysis for {ticker}")
-                return cached_result
-            
-            # Execute batched analysis calls
-            core_analysis_task = self.generate_core_analysis_batch(
-                ticker, company_data, dcf_results, technical_data
-            )
-            
-            sentiment_analysis_task = self.generate_sentiment_context_batch(
-                ticker, news_data or [], peer_data or {}
-            )
-            
-            # Run both calls concurrently to save time
-            import asyncio
-            core_analysis, sentiment_analysis = await asyncio.gather(
-                core_analysis_task, 
-                sentiment_analysis_task,
-                return_exceptions=True
-            )
-            
-            # Handle exceptions gracefully
-            if isinstance(core_analysis, Exception):
-                logger.error(f"Core analysis failed for {ticker}: {core_analysis}")
-                core_analysis = self._get_fallback_core_analysis()
-            
-            if isinstance(sentiment_analysis, Exception):
-                logger.error(f"Sentiment analysis failed for {ticker}: {sentiment_analysis}")
-                sentiment_analysis = self._get_fallback_sentiment_analysis()
-            
-            # Combine results
-            comprehensive_result = {
-                "ticker": ticker,
-                "analysis_timestamp": datetime.now().isoformat(),
-                "cost_breakdown": {
-                    "core_analysis_tokens": core_analysis.get("token_usage", 0),
-                    "sentiment_tokens": sentiment_analysis.get("token_usage", 0),
-                    "estimated_cost": self._calculate_estimated_cost(core_analysis, sentiment_analysis)
-                },
-                
-                # Core analysis components
-                "investment_thesis": core_analysis.get("investment_thesis", "Analysis unavailable"),
-                "dcf_commentary": core_analysis.get("dcf_commentary", []),
-                "financial_health": core_analysis.get("financial_health", []),
-                "technical_outlook": core_analysis.get("technical_outlook", []),
-                
-                # Sentiment and context
-                "news_sentiment": sentiment_analysis.get("news_sentiment", {}),
-                "peer_context": sentiment_analysis.get("peer_context", []),
-                
-                # Metadata
-                "analysis_quality": self._assess_analysis_quality(core_analysis, sentiment_analysis),
-                "model_version": "claude-3-haiku" if self.use_cost_optimized_model else "claude-3-sonnet"
-            }
-            
-            # Cache the result
-            await intelligent_cache.set(
+            comprehensive_result = await intelligent_cache.get_or_compute(
                 CacheType.AI_ANALYSIS,
                 cache_key,
-                comprehensive_result,
-                ttl_hours=6
+                lambda: self._run_comprehensive_analysis(
+                    ticker, company_data, dcf_results, technical_data, news_data, peer_data
+                )
+            )
+            # Both Claude calls failed: serve the fallbacks without caching them
+            return comprehensive_result or self._combine_analyses(
+                ticker, self._get_fallback_core_analysis(), self._get_fallback_sentiment_analysis()
             )
-            
-            logger.info(f"Completed comprehensive analysis for {ticker}, estimated cost: ${comprehensive_result['cost_breakdown']['estimated_cost']:.3f}")
-            return comprehensive_result
             
         except Exception as e:
             logger.error(f"Error in comprehensive agentic analysis for {ticker}: {e}")
             return self._get_emergency_fallback_analysis(ticker)
     
+    async def _run_comprehensive_analysis(
+        self,
+        ticker: str,
+        company_data: Dict[str, Any],
+        dcf_results: Dict[str, Any],
+        technical_data: Dict[str, Any],
+        news_data: List[Dict] = None,
+        peer_data: Dict[str, Any] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Run the two batched Claude calls and combine them; None if both fell back (cache producer)."""
+        
+        # Execute batched analysis calls
+        core_analysis_task = self.generate_core_analysis_batch(
+            ticker, company_data, dcf_results, technical_data
+        )
+        
+        sentiment_analysis_task = self.generate_sentiment_context_batch(
+            ticker, news_data or [], peer_data or {}
+        )
+        
+        # Run both calls concurrently to save time
+        import asyncio
+        core_analysis, sentiment_analysis = await asyncio.gather(
+            core_analysis_task, 
+            sentiment_analysis_task,
+            return_exceptions=True
+        )
+        
+        # Handle exceptions gracefully
+        if isinstance(core_analysis, Exception):
+            logger.error(f"Core analysis failed for {ticker}: {core_analysis}")
+            core_analysis = self._get_fallback_core_analysis()
+        
+        if isinstance(sentiment_analysis, Exception):
+            logger.error(f"Sentiment analysis failed for {ticker}: {sentiment_analysis}")
+            sentiment_analysis = self._get_fallback_sentiment_analysis()
+        
+        # Fallbacks spend no tokens - nothing worth caching came back
+        if not core_analysis.get("token_usage") and not sentiment_analysis.get("token_usage"):
+            logger.warning(f"Both analysis calls fell back for {ticker}, not caching the result")
+            return None
+        
+        return self._combine_analyses(ticker, core_analysis, sentiment_analysis)
+    
+    def _combine_analyses(self, ticker: str, core_analysis: Dict[str, Any], sentiment_analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Comprehensive analysis from the core and sentiment batches"""
+        comprehensive_result = {
+            "ticker": ticker,
+            "analysis_timestamp": datetime.now().isoformat(),
+            "cost_breakdown": {
+                "core_analysis_tokens": core_analysis.get("token_usage", 0),
+                "sentiment_tokens": sentiment_analysis.get("token_usage", 0),
+                "estimated_cost": self._calculate_estimated_cost(core_analysis, sentiment_analysis)
+            },
+            
+            # Core analysis components
+            "investment_thesis": core_analysis.get("investment_thesis", "Analysis unavailable"),
+            "dcf_commentary": core_analysis.get("dcf_commentary", []),
+            "financial_health": core_analysis.get("financial_health", []),
+            "technical_outlook": core_analysis.get("technical_outlook", []),
+            
+            # Sentiment and context
+            "news_sentiment": sentiment_analysis.get("news_sentiment", {}),
+            "peer_context": sentiment_analysis.get("peer_context", []),
+            
+            # Metadata
+            "analysis_quality": self._assess_analysis_quality(core_analysis, sentiment_analysis),
+            "model_version": "claude-3-haiku" if self.use_cost_optimized_model else "claude-3-sonnet"
+        }
+        
+        logger.info(f"Completed comprehensive analysis for {ticker}, estimated cost: ${comprehensive_result['cost_breakdown']['estimated_cost']:.3f}")
+        return comprehensive_result
+    
     async def generate_core_analysis_batch(
         self, 
         ticker: str,
@@ -1131,12 +1144,21 @@ class AgenticAnalysisService(ClaudeService):
     ) -> Dict[str, Any]:
         """Batched core analysis: Investment Thesis + DCF + Financial + Technical"""
         
-        # Check memory cache
-        cache_key = f"{ticker}_core_batch"
-        if cache_key in self.core_analysis_cache:
-            cached_entry = self.core_analysis_cache[cache_key]
-            if datetime.now() - cached_entry["timestamp"] < self.cache_ttl:
-                return cached_entry["data"]
+        result = await intelligent_cache.get_or_compute(
+            CacheType.AI_ANALYSIS,
+            f"{ticker}_core_batch",
+            lambda: self._request_core_analysis(ticker, company_data, dcf_results, technical_data)
+        )
+        return result or self._get_fallback_core_analysis()
+    
+    async def _request_core_analysis(
+        self,
+        ticker: str,
+        company_data: Dict[str, Any],
+        dcf_results: Dict[str, Any],
+        technical_data: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Make the core analysis Claude call; None if it fails (cache producer)."""
         
         system_prompt = """You are a financial analyst for Indian retail investors. Be precise, avoid repetition, and use structured output.
 
@@ -1192,20 +1214,13 @@ Provide analysis in the exact JSON structure specified. Focus on key insights fo
                 result = self._parse_json_response(response)
                 if result:
                     result["token_usage"] = len(prompt.split()) + len(response.split())
-                    
-                    # Cache in memory
-                    self.core_analysis_cache[cache_key] = {
-                        "data": result,
-                        "timestamp": datetime.now()
-                    }
-                    
                     return result
                     
-            return self._get_fallback_core_analysis()
+            return None
             
         except Exception as e:
             logger.error(f"Error in core analysis batch for {ticker}: {e}")
-            return self._get_fallback_core_analysis()
+            return None
     
     async def generate_sentiment_context_batch(
         self,
@@ -1215,12 +1230,20 @@ Provide analysis in the exact JSON structure specified. Focus on key insights fo
     ) -> Dict[str, Any]:
         """Batched sentiment: News + Peer context analysis"""
         
-        # Check memory cache
-        cache_key = f"{ticker}_sentiment_batch"
-        if cache_key in self.sentiment_cache:
-            cached_entry = self.sentiment_cache[cache_key]
-            if datetime.now() - cached_entry["timestamp"] < self.cache_ttl:
-                return cached_entry["data"]
+        result = await intelligent_cache.get_or_compute(
+            CacheType.AI_ANALYSIS,
+            f"{ticker}_sentiment_batch",
+            lambda: self._request_sentiment_context(ticker, news_data, peer_data)
+        )
+        return result or self._get_fallback_sentiment_analysis()
+    
+    async def _request_sentiment_context(
+        self,
+        ticker: str,
+        news_data: List[Dict],
+        peer_data: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Make the sentiment/peer context Claude call; None if it fails (cache producer)."""
         
         system_prompt = """You are a financial analyst specializing in sentiment and competitive analysis.
 
@@ -1268,20 +1291,13 @@ Provide analysis in the exact JSON structure specified.
                 result = self._parse_json_response(response)
                 if result:
                     result["token_usage"] = len(prompt.split()) + len(response.split())
-                    
-                    # Cache in memory
-                    self.sentiment_cache[cache_key] = {
-                        "data": result,
-                        "timestamp": datetime.now()
-                    }
-                    
                     return result
                     
-            return self._get_fallback_sentiment_analysis()
+            return None
             
         except Exception as e:
             logger.error(f"Error in sentiment batch for {ticker}: {e}")
-            return self._get_fallback_sentiment_analysis()
+            return None
     
     def _format_dcf_data(self, dcf_results: Dict[str, Any]) -> str:
         """Format DCF data for AI consumption"""
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from .market_data_gateway import MarketDataGateway, market_data_gateway
+from .ohlcv_store import OHLCVStore, ohlcv_store
+from .statements_store import FinancialStatementsStore, financial_statements_store
+
+logger = logging.getLogger(__name__)
+
+
+class CompanySnapshot:
+    """
+    Market data for one ticker, fetched at most once per analysis request.
+
+    Create one per request and pass it to every service that needs the
+    ticker's info, price history or statements. Each piece is loaded lazily
+    on first use; later (or concurrent) users share the same fetch, from
+    async code and worker threads alike. Price history comes from the
+    OHLCVStore and statements from the FinancialStatementsStore, and a
+    loaded history also serves any shorter period, so "1y" followed by
+    "6mo" is a single store read.
+
+    Failures are shared too: a fetch that failed is not retried within the
+    same snapshot.
+    """
+
+    PERIOD_DAYS = OHLCVStore.PERIOD_DAYS
+
+    def __init__(
+        self,
+        ticker: str,
+        gateway: Optional[MarketDataGateway] = None,
+        store: Optional[OHLCVStore] = None,
+        statements_store: Optional[FinancialStatementsStore] = None
+    ):
+        self.ticker = ticker
+        self.gateway = gateway or market_data_gateway
+        self.store = store or ohlcv_store
+        self.statements_store = statements_store or financial_statements_store
+        self._futures: Dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def loads(self) -> int:
+        """Number of datasets this snapshot has loaded (from the gateway or the store)."""
+        return len(self._futures)
+
+    def _load(self, key: tuple, kind: str, *args) -> Future:
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None:
+                if kind == "history":
+                    future = self.store.submit_history(self.ticker, *args)
+                elif kind == "statements":
+                    future = self.statements_store.submit_statements(self.ticker, *args)
+                else:
+                    future = self.gateway.submit(kind, self.ticker, *args)
+                self._futures[key] = future
+            return future
+
+    def _history_future(self, period: str) -> Tuple[Future, str]:
+        """
+        Future of the shortest loaded (or loading) history covering period,
+        else of a new fetch, together with the period it was fetched for.
+        """
+        requested_days = self.PERIOD_DAYS.get(period)
+        if requested_days is not None:
+            with self._lock:
+                covering = [
+                    (self.PERIOD_DAYS[key[1]], key[1], future)
+                    for key, future in self._futures.items()
+                    if key[0] == "history" and self.PERIOD_DAYS.get(key[1], 0) >= requested_days
+                ]
+            if covering:
+                _, loaded, future = min(covering, key=lambda item: item[0])
+                return future, loaded
+        return self._load(("history", period), "history", period), period
+
+    def _trim_history(self, history: pd.DataFrame, loaded_period: str, period: str) -> pd.DataFrame:
+        """Cut a history fetched for loaded_period down to the requested period."""
+        if loaded_period == period or history.empty:
+            return history
+        cutoff = history.index[-1] - pd.Timedelta(days=self.PERIOD_DAYS[period])
+        return history[history.index > cutoff]
+
+    # Async API
+
+    async def info(self) -> Dict[str, Any]:
+        """Company info dict."""
+        return await asyncio.wrap_future(self._load(("info",), "info"))
+
+    async def history(self, period: str = "1y") -> pd.DataFrame:
+        """Daily OHLCV history for a yfinance period ("6mo", "1y", ...)."""
+        future, loaded_period = self._history_future(period)
+        return self._trim_history(await asyncio.wrap_future(future), loaded_period, period)
+
+    async def statements(self, frequency: str = "annual") -> Dict[str, Optional[pd.DataFrame]]:
+        """Financial statements (financials, balance_sheet, cashflow)."""
+        return await asyncio.wrap_future(self._load(("statements", frequency), "statements", frequency))
+
+    # Sync API - for code running in worker threads
+
+    def info_sync(self) -> Dict[str, Any]:
+        return self._load(("info",), "info").result()
+
+    def history_sync(self, period: str = "1y") -> pd.DataFrame:
+        future, loaded_period = self._history_future(period)
+        return self._trim_history(future.result(), loaded_period, period)
@@ -7,13 +7,13 @@ import asyncio
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
-import yfinance as yf
 import pandas as pd
 import numpy as np
 import requests
 from bs4 import BeautifulSoup
 
 from .intelligent_cache import intelligent_cache, CacheType
+from .market_data_gateway import market_data_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -132,14 +132,13 @@ class CorporateGovernanceService:
                         logger.warning(f"Failed to reconstruct from cache for {ticker}: {e}, proceeding with fresh calculation")
             
             # Fetch company info
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            info = await market_data_gateway.get_info(ticker)
             company_name = info.get('longName', ticker)
             
             # Fetch governance data concurrently
             tasks = [
-                self._fetch_shareholding_data(ticker, stock),
-                self._fetch_dividend_history(ticker, stock),
+                self._fetch_shareholding_data(ticker, info),
+                self._fetch_dividend_history(ticker, info),
                 self._fetch_governance_metrics(ticker, info)
             ]
             
@@ -213,7 +212,7 @@ class CorporateGovernanceService:
     async def _fetch_shareholding_data(
         self, 
         ticker: str, 
-        stock: yf.Ticker
+        info: Dict[str, Any]
     ) -> Tuple[Optional[ShareholdingPattern], List[ShareholdingPattern]]:
         """Fetch shareholding pattern data (where available)"""
         
@@ -221,8 +220,6 @@ class CorporateGovernanceService:
             # For Indian stocks, yfinance has limited shareholding data
             # We'll extract what we can from the info and create mock data for demo
             
-            info = stock.info
-            
             # Extract available shareholding info (limited in yfinance)
             shares_outstanding = info.get('sharesOutstanding', 0)
             float_shares = info.get('floatShares', 0)
@@ -270,13 +267,13 @@ class CorporateGovernanceService:
     async def _fetch_dividend_history(
         self, 
         ticker: str, 
-        stock: yf.Ticker
+        info: Dict[str, Any]
     ) -> Tuple[List[DividendRecord], float, float]:
         """Fetch dividend history and calculate metrics"""
         
         try:
             # Get dividend data from yfinance
-            dividends = stock.dividends
+            dividends = await market_data_gateway.get_dividends(ticker)
             
             if dividends.empty:
                 return [], 0.0, 0.0
@@ -296,12 +293,12 @@ class CorporateGovernanceService:
             dividend_history.sort(key=lambda x: x.ex_date, reverse=True)
             
             # Calculate TTM dividend yield
-            current_price = stock.info.get('currentPrice', 0)
+            current_price = info.get('currentPrice', 0)
             ttm_dividends = sum(d.dividend_per_share for d in dividend_history[:4])  # Last 4 dividends
             dividend_yield = (ttm_dividends / current_price * 100) if current_price > 0 else 0.0
             
             # Calculate payout ratio (basic estimate)
-            eps = stock.info.get('trailingEps', 0)
+            eps = info.get('trailingEps', 0)
             payout_ratio = (ttm_dividends / eps * 100) if eps > 0 else 0.0
             
             return dividend_history, dividend_yield, payout_ratio
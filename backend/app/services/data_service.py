@@ -1,10 +1,11 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
 from typing import Optional, Dict, Any, List
 from ..models.company import CompanyInfo, StockPrice
 from ..models.dcf import FinancialData
 from .price_service import price_service
+from .market_data_gateway import market_data_gateway
+from .statements_store import financial_statements_store
 import logging
 
 logger = logging.getLogger(__name__)
@@ -59,12 +60,11 @@ class DataService:
     def get_financial_data(ticker: str, years: int = 5) -> Optional[FinancialData]:
         """Fetch historical financial data for DCF analysis"""
         try:
-            stock = yf.Ticker(ticker)
-            
-            # Get financial statements
-            income_stmt = stock.financials.T
-            balance_sheet = stock.balance_sheet.T
-            cash_flow = stock.cashflow.T
+            # Get financial statements, with canonical line items resolved at ingest
+            statements = financial_statements_store.get_statements_sync(ticker, resolved=True)
+            income_stmt = statements['financials'].T
+            balance_sheet = statements['balance_sheet'].T
+            cash_flow = statements['cashflow'].T
             
             if income_stmt.empty or balance_sheet.empty or cash_flow.empty:
                 logger.warning(f"Empty financial data for {ticker}")
@@ -115,33 +115,16 @@ class DataService:
 
     @staticmethod
     def _safe_extract(df: pd.DataFrame, column: str) -> List[float]:
-        """Safely extract values from dataframe, handling missing data"""
+        """
+        Safely extract values from dataframe, handling missing data.
+        
+        Alternative line item names (LINE_ITEM_ALIASES) are already resolved
+        to the canonical column by the statements store.
+        """
         if column in df.columns:
             values = df[column].fillna(0).tolist()
         else:
-            # Try alternative column names
-            alt_names = {
-                'Total Revenue': ['Revenue', 'Total Revenues'],
-                'Net Income': ['Net Income Common Stockholders', 'Net Income Applicable To Common Shares'],
-                'Free Cash Flow': ['Operating Cash Flow'],
-                'Total Debt': ['Long Term Debt', 'Total Liabilities'],
-                'Cash And Cash Equivalents': ['Cash', 'Cash Equivalents'],
-                'Ordinary Shares Number': ['Share Issued', 'Common Stock Shares Outstanding'],
-                # Capital intensity metrics alternative names
-                'Capital Expenditure': ['Capital Expenditures', 'Capital Expenditure', 'Capex', 'Purchase Of Property Plant Equipment'],
-                'Change In Working Capital': ['Working Capital', 'Change In Working Capital', 'Changes In Working Capital'],
-                'Depreciation And Amortization': ['Depreciation Amortization', 'Depreciation And Amortization', 'Depreciation', 'Amortization']
-            }
-            
-            found = False
-            for alt_name in alt_names.get(column, []):
-                if alt_name in df.columns:
-                    values = df[alt_name].fillna(0).tolist()
-                    found = True
-                    break
-            
-            if not found:
-                values = [0] * len(df)
+            values = [0] * len(df)
         
         return [float(v) for v in values]
 
@@ -179,8 +162,7 @@ class DataService:
     def get_industry_multiples(ticker: str) -> Dict[str, float]:
         """Get industry average multiples for comparison"""
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            info = market_data_gateway.get_info_sync(ticker)
             
             # Return some default industry multiples
             # In a real application, you'd fetch these from a financial data provider
@@ -8,7 +8,6 @@ import re
 from typing import Dict, List, Optional, Tuple, Set
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
-import yfinance as yf
 import pandas as pd
 import numpy as np
 from enum import Enum
@@ -16,6 +15,7 @@ import requests
 from bs4 import BeautifulSoup
 
 from .intelligent_cache import intelligent_cache, CacheType
+from .market_data_gateway import market_data_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -299,8 +299,7 @@ class DynamicSectorClassificationService:
                 async with semaphore:
                     try:
                         ticker_full = f"{ticker_base}.NS"
-                        stock = yf.Ticker(ticker_full)
-                        info = stock.info
+                        info = await market_data_gateway.get_info(ticker_full)
                         
                         return {
                             'ticker': ticker_base,
@@ -351,8 +350,7 @@ class DynamicSectorClassificationService:
             company_data = None
             for ticker_format in ticker_formats:
                 try:
-                    stock = yf.Ticker(ticker_format)
-                    info = stock.info
+                    info = await market_data_gateway.get_info(ticker_format)
                     
                     # Check if we got valid data
                     if info.get('longName') or info.get('shortName'):
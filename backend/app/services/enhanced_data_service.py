@@ -6,12 +6,17 @@ import pandas as pd
 import numpy as np
 from .data_service import DataService
 from .kite_service import get_kite_service, KiteService
+from .market_data_gateway import market_data_gateway
 from ..models.company import CompanyInfo, StockPrice
 from ..models.dcf import FinancialData
 from ..models.kite import KiteQuote, KiteHistoricalData
 
 logger = logging.getLogger(__name__)
 
+MARKET_TIMEZONE = "Asia/Kolkata"
+# Kite serves at most 60 days of minute candles per request, yfinance keeps 60 days of 5-minute bars
+INTRADAY_LOOKBACK_DAYS = 59
+
 class EnhancedDataService:
     """Enhanced data service that combines Kite and yfinance data sources"""
     
@@ -82,6 +87,19 @@ class EnhancedDataService:
             # Fallback to yfinance only
             return self.fallback_service.get_company_info(yf_symbol)
     
+    @staticmethod
+    def _stock_price_from_quote(kite_quote: KiteQuote) -> StockPrice:
+        """StockPrice from a Kite real-time quote"""
+        return StockPrice(
+            current_price=kite_quote.last_price,
+            change=kite_quote.change,
+            change_percent=kite_quote.change_percent,
+            volume=kite_quote.volume,
+            market_cap=0,  # Calculate separately if needed
+            pe_ratio=None,  # Not available in Kite quote
+            pb_ratio=None   # Not available in Kite quote
+        )
+    
     async def get_stock_price(self, ticker: str) -> Optional[StockPrice]:
         """Get enhanced stock price with real-time Kite data"""
         if not self._initialized:
@@ -95,15 +113,7 @@ class EnhancedDataService:
             
             if kite_quote:
                 # Use Kite real-time data
-                return StockPrice(
-                    current_price=kite_quote.last_price,
-                    change=kite_quote.change,
-                    change_percent=kite_quote.change_percent,
-                    volume=kite_quote.volume,
-                    market_cap=0,  # Calculate separately if needed
-                    pe_ratio=None,  # Not available in Kite quote
-                    pb_ratio=None   # Not available in Kite quote
-                )
+                return self._stock_price_from_quote(kite_quote)
             else:
                 # Fallback to yfinance
                 logger.info(f"Using yfinance fallback for stock price: {ticker}")
@@ -150,8 +160,10 @@ class EnhancedDataService:
             logger.error(f"Error in enhanced get_financial_data for {ticker}: {e}")
             return self.fallback_service.get_financial_data(yf_symbol, years)
     
-    async def get_intraday_data(self, ticker: str, interval: str = "5minute") -> List[KiteHistoricalData]:
-        """Get intraday data (only available through Kite)"""
+    async def get_intraday_data(
+        self, ticker: str, interval: str = "5minute", days: int = 0, start: Optional[datetime] = None
+    ) -> List[KiteHistoricalData]:
+        """Get intraday data (only available through Kite) from the market open `days` days ago, or from `start`"""
         if not self._initialized:
             await self.initialize()
         
@@ -159,7 +171,7 @@ class EnhancedDataService:
         
         try:
             end_date = datetime.now()
-            start_date = end_date.replace(hour=9, minute=15, second=0, microsecond=0)  # Market open
+            start_date = start or (end_date - timedelta(days=days)).replace(hour=9, minute=15, second=0, microsecond=0)  # Market open
             
             return await self.kite_service.get_historical_data(
                 kite_symbol, start_date, end_date, interval
@@ -169,6 +181,51 @@ class EnhancedDataService:
             logger.error(f"Error getting intraday data for {ticker}: {e}")
             return []
     
+    async def get_intraday_frame(
+        self, ticker: str, days: int = INTRADAY_LOOKBACK_DAYS, since: Optional[pd.Timestamp] = None
+    ) -> pd.DataFrame:
+        """
+        Intraday candles of the last `days` days as a Ticker.history style DataFrame
+        
+        Kite serves 1-minute candles; without a Kite session (or candles from it)
+        yfinance 5-minute bars are used, the finest it keeps for that long.
+        
+        Args:
+            ticker: Stock ticker symbol
+            days: Days back to fetch from the market open
+            since: Fetch only from this candle on instead (yfinance: from its day)
+            
+        Returns:
+            DataFrame with Open, High, Low, Close and Volume columns indexed by
+            exchange time, empty if neither source has data
+        """
+        start = None
+        if since is not None:
+            since = pd.Timestamp(since)
+            start = (since.tz_convert(MARKET_TIMEZONE).tz_localize(None) if since.tz is not None else since).to_pydatetime()
+        candles = await self.get_intraday_data(ticker, interval="minute", days=days, start=start)
+        if candles:
+            index = pd.DatetimeIndex([candle.date for candle in candles], name="Date")
+            index = index.tz_localize(MARKET_TIMEZONE) if index.tz is None else index.tz_convert(MARKET_TIMEZONE)
+            return pd.DataFrame(
+                {
+                    "Open": [candle.open for candle in candles],
+                    "High": [candle.high for candle in candles],
+                    "Low": [candle.low for candle in candles],
+                    "Close": [candle.close for candle in candles],
+                    "Volume": [float(candle.volume) for candle in candles]
+                },
+                index=index
+            )
+        
+        _, yf_symbol = self._normalize_ticker(ticker)
+        try:
+            start_day = (start or datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+            return await market_data_gateway.get_history(yf_symbol, period=None, start=start_day, interval="5m")
+        except Exception as e:
+            logger.error(f"Error getting yfinance intraday data for {ticker}: {e}")
+            return pd.DataFrame()
+    
     async def get_market_depth(self, ticker: str) -> Optional[Dict[str, Any]]:
         """Get market depth data (only available through Kite)"""
         if not self._initialized:
@@ -200,33 +257,38 @@ class EnhancedDataService:
             await self.initialize()
         
         results = {}
+        symbols = {ticker: self._normalize_ticker(ticker) for ticker in tickers}
         
-        # Process in batches to avoid rate limiting
-        batch_size = 10
-        for i in range(0, len(tickers), batch_size):
-            batch = tickers[i:i + batch_size]
-            
-            # Create tasks for concurrent processing
-            tasks = []
-            for ticker in batch:
-                tasks.append(self.get_stock_price(ticker))
-            
-            # Execute batch concurrently
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Store results
-            for ticker, result in zip(batch, batch_results):
+        # One batched Kite call (per QUOTE_BATCH_SIZE symbols) for every ticker
+        try:
+            kite_quotes = await self.kite_service.get_quotes([kite_symbol for kite_symbol, _ in symbols.values()])
+        except Exception as e:
+            logger.error(f"Error getting Kite quotes for {len(tickers)} tickers: {e}")
+            kite_quotes = {}
+        
+        fallback = []
+        for ticker, (kite_symbol, yf_symbol) in symbols.items():
+            kite_quote = kite_quotes.get(kite_symbol)
+            if kite_quote:
+                results[ticker] = self._stock_price_from_quote(kite_quote)
+            else:
+                fallback.append((ticker, yf_symbol))
+        
+        # yfinance fallback for tickers Kite could not quote, off the event loop
+        if fallback:
+            logger.info(f"Using yfinance fallback for {len(fallback)} of {len(tickers)} quotes")
+            fallback_results = await asyncio.gather(
+                *(asyncio.to_thread(self.fallback_service.get_stock_price, yf_symbol) for _, yf_symbol in fallback),
+                return_exceptions=True
+            )
+            for (ticker, _), result in zip(fallback, fallback_results):
                 if isinstance(result, Exception):
                     logger.error(f"Error getting quote for {ticker}: {result}")
                     results[ticker] = None
                 else:
                     results[ticker] = result
-            
-            # Small delay between batches to respect rate limits
-            if i + batch_size < len(tickers):
-                await asyncio.sleep(0.1)
         
-        return results
+        return {ticker: results.get(ticker) for ticker in tickers}
     
     async def get_market_status(self) -> Dict[str, Any]:
         """Get current market status"""
@@ -7,12 +7,13 @@ import asyncio
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
-import yfinance as yf
 import pandas as pd
 import numpy as np
 from functools import lru_cache
 
 from .intelligent_cache import intelligent_cache, CacheType
+from .market_data_gateway import market_data_gateway
+from .statements_store import financial_statements_store
 
 logger = logging.getLogger(__name__)
 
@@ -141,96 +142,105 @@ class FinancialStatementsService:
         try:
             logger.info(f"Fetching financial statements analysis for {ticker}")
             
-            # Check cache first
+            # Check cache first - concurrent misses share a single yfinance fetch
             if self.use_cache and not force_refresh:
-                cached_result = await self.cache_manager.get(
-                    CacheType.FINANCIAL_DATA, ticker
+                async def produce() -> Dict[str, Any]:
+                    return asdict(await self._build_analysis(ticker))
+                
+                cached_result = await self.cache_manager.get_or_compute(
+                    CacheType.FINANCIAL_DATA,
+                    ticker,
+                    produce,
+                    calculation_type="financial_statements"
                 )
-                if cached_result:
-                    logger.info(f"Cache hit for {ticker} financial statements - reconstructing objects")
-                    # Reconstruct objects from cached dict
-                    try:
-                        return self._reconstruct_from_cache(cached_result)
-                    except Exception as e:
-                        logger.warning(f"Failed to reconstruct from cache for {ticker}: {e}, proceeding with fresh calculation")
-            
-            # Fetch real financial data from yfinance
-            stock = yf.Ticker(ticker)
-            
-            # Get basic company info
-            info = stock.info
-            company_name = info.get('longName', ticker)
-            currency = info.get('financialCurrency', 'INR')
-            
-            # Fetch 5-year financial statements
-            annual_data = await self._fetch_historical_statements(stock)
-            
-            if not annual_data:
-                raise ValueError(f"No financial statement data available for {ticker}")
-            
-            # Calculate derived metrics
-            revenue_cagr = self._calculate_cagr([year.total_revenue for year in annual_data])
-            net_income_cagr = self._calculate_cagr([year.net_income for year in annual_data])
-            book_value_cagr = self._calculate_cagr([year.stockholders_equity for year in annual_data])
+                # Reconstruct objects from cached dict
+                try:
+                    return self._reconstruct_from_cache(cached_result)
+                except Exception as e:
+                    logger.warning(f"Failed to reconstruct from cache for {ticker}: {e}, proceeding with fresh calculation")
             
-            # Calculate quality scores
-            earnings_quality = self._calculate_earnings_quality_score(annual_data)
-            revenue_consistency = self._calculate_revenue_consistency_score(annual_data)
-            margin_stability = self._calculate_margin_stability_score(annual_data)
-            
-            # Generate content for both modes
-            simple_summary = self._generate_simple_mode_summary(
-                annual_data, revenue_cagr, net_income_cagr, earnings_quality
-            )
-            
-            # Calculate data completeness
-            data_completeness = self._calculate_data_completeness(annual_data)
-            data_warnings = self._generate_data_warnings(annual_data, data_completeness)
-            
-            # Create result
-            result = FinancialStatementsAnalysis(
-                ticker=ticker,
-                company_name=company_name,
-                currency=currency,
-                analysis_date=datetime.now(),
-                annual_data=annual_data,
-                revenue_cagr_5y=revenue_cagr,
-                net_income_cagr_5y=net_income_cagr,
-                book_value_cagr_5y=book_value_cagr,
-                earnings_quality_score=earnings_quality,
-                revenue_consistency_score=revenue_consistency,
-                margin_stability_score=margin_stability,
-                simple_mode_summary=simple_summary,
-                data_completeness=data_completeness,
-                data_warnings=data_warnings,
-                last_updated=datetime.now()
-            )
+            result = await self._build_analysis(ticker)
             
             # Cache the result
             if self.use_cache:
                 await self.cache_manager.set(
                     CacheType.FINANCIAL_DATA,
                     ticker,
-                    asdict(result)
+                    asdict(result),
+                    calculation_type="financial_statements"
                 )
             
-            logger.info(f"Financial statements analysis completed for {ticker}: {len(annual_data)} years, {data_completeness:.1%} complete")
             return result
             
         except Exception as e:
             logger.error(f"Error fetching financial statements for {ticker}: {e}")
             raise
     
-    async def _fetch_historical_statements(self, stock: yf.Ticker) -> List[FinancialStatementYear]:
+    async def _build_analysis(self, ticker: str) -> FinancialStatementsAnalysis:
+        """Fetch statements from yfinance and calculate the full analysis (no caching)"""
+        # Fetch basic company info and 5-year financial statements from yfinance together
+        info, annual_data = await asyncio.gather(
+            market_data_gateway.get_info(ticker),
+            self._fetch_historical_statements(ticker)
+        )
+        company_name = info.get('longName', ticker)
+        currency = info.get('financialCurrency', 'INR')
+        
+        if not annual_data:
+            raise ValueError(f"No financial statement data available for {ticker}")
+        
+        # Calculate derived metrics
+        revenue_cagr = self._calculate_cagr([year.total_revenue for year in annual_data])
+        net_income_cagr = self._calculate_cagr([year.net_income for year in annual_data])
+        book_value_cagr = self._calculate_cagr([year.stockholders_equity for year in annual_data])
+        
+        # Calculate quality scores
+        earnings_quality = self._calculate_earnings_quality_score(annual_data)
+        revenue_consistency = self._calculate_revenue_consistency_score(annual_data)
+        margin_stability = self._calculate_margin_stability_score(annual_data)
+        
+        # Generate content for both modes
+        simple_summary = self._generate_simple_mode_summary(
+            annual_data, revenue_cagr, net_income_cagr, earnings_quality
+        )
+        
+        # Calculate data completeness
+        data_completeness = self._calculate_data_completeness(annual_data)
+        data_warnings = self._generate_data_warnings(annual_data, data_completeness)
+        
+        # Create result
+        result = FinancialStatementsAnalysis(
+            ticker=ticker,
+            company_name=company_name,
+            currency=currency,
+            analysis_date=datetime.now(),
+            annual_data=annual_data,
+            revenue_cagr_5y=revenue_cagr,
+            net_income_cagr_5y=net_income_cagr,
+            book_value_cagr_5y=book_value_cagr,
+            earnings_quality_score=earnings_quality,
+            revenue_consistency_score=revenue_consistency,
+            margin_stability_score=margin_stability,
+            simple_mode_summary=simple_summary,
+            data_completeness=data_completeness,
+            data_warnings=data_warnings,
+            last_updated=datetime.now()
+        )
+        
+        logger.info(f"Financial statements analysis completed for {ticker}: {len(annual_data)} years, {data_completeness:.1%} complete")
+        return result
+    
+    async def _fetch_historical_statements(self, ticker: str) -> List[FinancialStatementYear]:
         """Fetch and process 5-year historical financial statements"""
         
         try:
-            # Get financial statements (yfinance provides up to 5 years)
-            financials = stock.financials
-            balance_sheet = stock.balance_sheet  
-            cashflow = stock.cashflow
+            # Get the latest 5 years of financial statements
+            statements = await financial_statements_store.get_statements(ticker, max_periods=5)
+            financials = statements['financials']
+            balance_sheet = statements['balance_sheet']
+            cashflow = statements['cashflow']
             
-            if financials.empty or balance_sheet.empty or cashflow.empty:
+            if any(statement is None or statement.empty for statement in (financials, balance_sheet, cashflow)):
                 logger.warning("One or more financial statements are empty")
                 return []
             
@@ -1,10 +1,12 @@
+import asyncio
 import logging
 import numpy as np
 import pandas as pd
 from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta
-import yfinance as yf
 from ..services.intelligent_cache import intelligent_cache, CacheType
+from ..services.ohlcv_store import ohlcv_store
+from ..services.statements_store import financial_statements_store
 from ..models.dcf import DCFMode, GrowthStage, MultiStageAssumptions
 
 logger = logging.getLogger(__name__)
@@ -211,19 +213,18 @@ class HistoricalValidationService:
         """Fetch comprehensive 5-year historical financial data."""
         
         try:
-            stock = yf.Ticker(ticker)
-            
             # Get 5+ years of data to ensure we have enough history
             end_date = datetime.now()
             start_date = end_date - timedelta(days=365 * 6)  # 6 years to be safe
             
-            # Fetch comprehensive financial data
-            quarterly_financials = stock.quarterly_financials
-            quarterly_balance_sheet = stock.quarterly_balance_sheet
-            quarterly_cashflow = stock.quarterly_cashflow
-            
-            # Get historical price data for market context
-            price_history = stock.history(start=start_date, end=end_date)
+            # Fetch comprehensive financial data and historical price data together
+            statements, price_history = await asyncio.gather(
+                financial_statements_store.get_statements(ticker, frequency="quarterly"),
+                ohlcv_store.get_history(ticker, period=None, start=start_date, end=end_date)
+            )
+            quarterly_financials = statements['financials']
+            quarterly_balance_sheet = statements['balance_sheet']
+            quarterly_cashflow = statements['cashflow']
             
             # Structure the data
             historical_data = {
@@ -870,19 +871,18 @@ class HistoricalValidationService:
         """
         
         try:
-            stock = yf.Ticker(ticker)
-            
             # Get extended period for better analysis
             end_date = datetime.now()
             start_date = end_date - timedelta(days=365 * (self.extended_period_years + 1))
             
-            # Fetch comprehensive financial data
-            quarterly_financials = stock.quarterly_financials
-            quarterly_balance_sheet = stock.quarterly_balance_sheet
-            quarterly_cashflow = stock.quarterly_cashflow
-            
-            # Get historical price data
-            price_history = stock.history(start=start_date, end=end_date)
+            # Fetch comprehensive financial data and historical price data together
+            statements, price_history = await asyncio.gather(
+                financial_statements_store.get_statements(ticker, frequency="quarterly"),
+                ohlcv_store.get_history(ticker, period=None, start=start_date, end=end_date)
+            )
+            quarterly_financials = statements['financials']
+            quarterly_balance_sheet = statements['balance_sheet']
+            quarterly_cashflow = statements['cashflow']
             
             # Structure enhanced data
             historical_data = {
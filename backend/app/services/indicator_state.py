@@ -0,0 +1,330 @@
+import json
+import logging
+import math
+import os
+import re
+import threading
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+from . import indicators
+from .ohlcv_store import OHLCVColumns, ohlcv_store
+
+logger = logging.getLogger(__name__)
+
+
+class RollingWindow:
+    """The last size values of a series with their running sum and count (NaN skipped, as pandas does)."""
+
+    def __init__(self, size: int, values: Iterable[float] = ()):
+        self.values = deque(values, maxlen=size)
+        present = [value for value in self.values if value == value]
+        self.total = float(sum(present))
+        self.count = len(present)
+        self.nonzero = sum(1 for value in present if value != 0)
+
+    def copy(self) -> "RollingWindow":
+        window = RollingWindow.__new__(RollingWindow)
+        window.values = self.values.copy()
+        window.total, window.count, window.nonzero = self.total, self.count, self.nonzero
+        return window
+
+    def push(self, value: float):
+        if len(self.values) == self.values.maxlen:
+            old = self.values[0]
+            if old == old:
+                self.total -= old
+                self.count -= 1
+                self.nonzero -= old != 0
+        self.values.append(value)
+        if value == value:
+            self.total += value
+            self.count += 1
+            self.nonzero += value != 0
+        if not self.nonzero:
+            self.total = 0.0  # no rounding residue once only zeros are left (RSI's loss-free windows)
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else math.nan
+
+    def array(self) -> np.ndarray:
+        return np.array(self.values, dtype=float)
+
+
+class _EMA:
+    """pandas ewm(span).mean() (adjust=True) one observation at a time: the average and its total weight."""
+
+    def __init__(self, span: int, value: float = math.nan, weight: float = 0.0):
+        self.span = span
+        self.decay = 1 - 2 / (span + 1)
+        self.value = value
+        self.weight = weight
+
+    def push(self, value: float) -> float:
+        if self.value != self.value:
+            if value == value:
+                self.value, self.weight = value, 1.0
+        else:
+            self.weight *= self.decay
+            if value == value:
+                if self.value != value:
+                    self.value = (self.weight * self.value + value) / (self.weight + 1)
+                self.weight += 1
+        return self.value
+
+
+class IndicatorState:
+    """
+    Everything the current indicator values of a ticker depend on, rolled
+    forward one bar at a time.
+
+    Moving averages, RSI gains/losses, Stochastic highs/lows and the
+    support/resistance lookback are kept as fixed-size windows with running
+    sums, MACD as its three EMAs and OBV as a running total, so a new bar
+    costs the same however long the history is. Parameters are those of
+    TechnicalAnalysisService and the values equal its full computation over
+    the same bars - except OBV, which totals from the first bar the state saw.
+    """
+
+    WINDOWS = {
+        "close_50": 50, "close_200": 200, "close_20": 20, "close_40": 40,
+        "gain_14": 14, "loss_14": 14, "high_14": 14, "low_14": 14,
+        "stoch_k_3": 3, "volume_20": 20
+    }
+    EMA_SPANS = {"ema_12": 12, "ema_26": 26, "macd_signal_9": 9}
+
+    def __init__(self):
+        self.timestamp: Optional[float] = None  # epoch seconds of the last bar
+        self.close = math.nan
+        self.bars = 0
+        self.obv = math.nan
+        self.sma_prev: Optional[tuple] = None  # SMA 50/200 as of the bar before the last
+        self.windows = {name: RollingWindow(size) for name, size in self.WINDOWS.items()}
+        self.emas = {name: _EMA(span) for name, span in self.EMA_SPANS.items()}
+
+    def push(self, timestamp: float, high: float, low: float, close: float, volume: float):
+        """Roll the state forward by one bar."""
+        windows = self.windows
+        if self.bars:
+            self.sma_prev = (windows["close_50"].mean(), windows["close_200"].mean())
+            change = close - self.close
+            if change > 0:
+                self.obv += volume
+            elif change < 0:
+                self.obv -= volume
+        else:
+            change = math.nan
+            self.obv = volume
+
+        for name in ("close_50", "close_200", "close_20", "close_40"):
+            windows[name].push(close)
+        windows["gain_14"].push(change if change > 0 else 0.0)
+        windows["loss_14"].push(-change if change < 0 else 0.0)
+        windows["high_14"].push(high)
+        windows["low_14"].push(low)
+        windows["volume_20"].push(volume)
+
+        lowest_low = np.fmin.reduce(windows["low_14"].array())
+        highest_high = np.fmax.reduce(windows["high_14"].array())
+        with np.errstate(invalid="ignore", divide="ignore"):
+            windows["stoch_k_3"].push(float(100 * (close - lowest_low) / (highest_high - lowest_low)))
+
+        macd_line = self.emas["ema_12"].push(close) - self.emas["ema_26"].push(close)
+        self.emas["macd_signal_9"].push(macd_line)
+
+        self.timestamp, self.close = timestamp, close
+        self.bars += 1
+
+    def extend(self, bars: OHLCVColumns, start: int = 0, stop: Optional[int] = None):
+        """Roll the state forward over bars[start:stop]."""
+        for i in range(start, len(bars) if stop is None else stop):
+            self.push(
+                float(bars.timestamps[i]), float(bars.high[i]), float(bars.low[i]),
+                float(bars.close[i]), float(bars.volume[i])
+            )
+
+    def values(self) -> Dict[str, Any]:
+        """Indicator values as of the last bar, with the fallbacks of TechnicalAnalysisService."""
+        windows = self.windows
+        gain, loss = windows["gain_14"].mean(), windows["loss_14"].mean()
+        rsi = 100 - (100 / (1 + gain / (loss if loss != 0 else math.inf)))
+
+        closes = windows["close_20"]
+        middle = closes.mean()
+        std = float(np.nanstd(closes.array(), ddof=1)) if closes.count > 1 else math.nan
+        support, resistance = indicators.support_resistance(windows["close_40"].array())
+
+        macd_line = self.emas["ema_12"].value - self.emas["ema_26"].value
+        macd_signal = self.emas["macd_signal_9"].value
+        stoch_k = windows["stoch_k_3"].values[-1]
+        stoch_d = windows["stoch_k_3"].mean()
+
+        sma_50, sma_200 = windows["close_50"].mean(), windows["close_200"].mean()
+        sma_50_prev, sma_200_prev = self.sma_prev or (sma_50, sma_200)
+
+        volume_trend = 'neutral'
+        if self.bars >= 20:
+            volumes = windows["volume_20"].array()
+            recent_avg, previous_avg = np.nanmean(volumes[10:]), np.nanmean(volumes[:10])
+            if recent_avg > previous_avg * 1.1:
+                volume_trend = 'increasing'
+            elif recent_avg < previous_avg * 0.9:
+                volume_trend = 'decreasing'
+
+        def or_default(value: float, default: float) -> float:
+            return default if value != value else value
+
+        return {
+            'rsi': rsi,
+            'support_level': float(support),
+            'resistance_level': float(resistance),
+            'sma_50_current': sma_50,
+            'sma_200_current': sma_200,
+            'sma_50_prev': sma_50_prev,
+            'sma_200_prev': sma_200_prev,
+            'bb_upper_current': middle + std * 2,
+            'bb_lower_current': middle - std * 2,
+            'bb_middle_current': middle,
+            'macd_current': or_default(macd_line, 0),
+            'macd_signal_current': or_default(macd_signal, 0),
+            'macd_histogram_current': or_default(macd_line - macd_signal, 0),
+            'stoch_k_current': or_default(stoch_k, 50),
+            'stoch_d_current': or_default(stoch_d, 50),
+            'volume_trend': volume_trend,
+            'obv_current': or_default(self.obv, 0)
+        }
+
+    def copy(self) -> "IndicatorState":
+        state = IndicatorState.__new__(IndicatorState)
+        state.__dict__.update(self.__dict__)
+        state.windows = {name: window.copy() for name, window in self.windows.items()}
+        state.emas = {name: _EMA(ema.span, ema.value, ema.weight) for name, ema in self.emas.items()}
+        return state
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "timestamp": self.timestamp,
+            "close": self.close,
+            "bars": self.bars,
+            "obv": self.obv,
+            "sma_prev": self.sma_prev,
+            "windows": {name: list(window.values) for name, window in self.windows.items()},
+            "emas": {name: [ema.value, ema.weight] for name, ema in self.emas.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "IndicatorState":
+        state = cls()
+        state.timestamp, state.close, state.bars, state.obv = data["timestamp"], data["close"], data["bars"], data["obv"]
+        state.sma_prev = tuple(data["sma_prev"]) if data["sma_prev"] else None
+        state.windows = {name: RollingWindow(size, data["windows"][name]) for name, size in cls.WINDOWS.items()}
+        state.emas = {name: _EMA(span, *data["emas"][name]) for name, span in cls.EMA_SPANS.items()}
+        return state
+
+
+class IndicatorStateStore:
+    """
+    Persisted IndicatorState per ticker, kept in step with the OHLCV store.
+
+    The state covers every bar but the latest one, which yfinance keeps
+    revising until the session closes. A request rolls the state forward
+    over bars stored since it was saved, then applies the latest bar to a
+    copy to read the current values - only the bars after the state's last
+    one are read. The state is rebuilt from history when it no longer
+    matches the stored bars (first use, re-adjusted prices, a gap).
+
+    One JSON file per ticker, replaced atomically so every worker process
+    can share them.
+    """
+
+    HISTORY_PERIOD = "2y"  # history a state is built from: enough for the 200-day SMA
+
+    def __init__(self, root: str = "cache/indicator_state"):
+        """
+        Args:
+            root: Directory holding one JSON state file per ticker
+        """
+        self.root = Path(root)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def _path(self, ticker: str) -> Path:
+        return self.root / f"{re.sub(r'[^A-Za-z0-9._-]', '_', ticker)}.json"
+
+    def _ticker_lock(self, ticker: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def load(self, ticker: str) -> Optional[IndicatorState]:
+        try:
+            return IndicatorState.from_dict(json.loads(self._path(ticker).read_text()))
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Discarding unreadable indicator state for {ticker}: {e}")
+            return None
+
+    def save(self, ticker: str, state: IndicatorState):
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._path(ticker)
+        temp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            temp_path.write_text(json.dumps(state.to_dict()))
+            os.replace(temp_path, path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _resume_index(state: IndicatorState, bars: OHLCVColumns) -> Optional[int]:
+        """Index of the first bar after the state's last one, None if the state does not match the bars."""
+        i = int(np.searchsorted(bars.timestamps, state.timestamp))
+        if i < len(bars) - 1 and bars.timestamps[i] == state.timestamp and bars.close[i] == state.close:
+            return i + 1
+        return None
+
+    def roll_forward(self, ticker: str, bars: OHLCVColumns) -> IndicatorState:
+        """
+        The ticker's state advanced over bars (all but the latest), saved if it moved.
+
+        Args:
+            ticker: Stock ticker symbol
+            bars: The ticker's stored daily bars, oldest first
+        """
+        with self._ticker_lock(ticker):
+            completed = len(bars) - 1
+            state = self.load(ticker)
+            start = self._resume_index(state, bars) if state is not None else None
+            if start is None:
+                state, start = IndicatorState(), 0
+                if completed:
+                    logger.info(f"Building indicator state for {ticker} from {completed} bars")
+            if start < completed:
+                state.extend(bars, start, completed)
+                self.save(ticker, state)
+            return state
+
+    def current_sync(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """
+        Current indicator values of a ticker, with the close of its latest bar.
+
+        Returns:
+            Dictionary of indicator values and 'close', None if there is no history
+        """
+        try:
+            bars = ohlcv_store.get_columns_sync(ticker, period=self.HISTORY_PERIOD)
+            if bars is None or len(bars) == 0:
+                return None
+            state = self.roll_forward(ticker, bars).copy()
+            state.extend(bars, len(bars) - 1)
+            return {**state.values(), 'close': state.close}
+        except Exception as e:
+            logger.error(f"Error reading indicator state for {ticker}: {e}")
+            return None
+
+
+# Global indicator state store
+indicator_state_store = IndicatorStateStore(root=os.getenv("INDICATOR_STATE_DIR", "cache/indicator_state"))
@@ -0,0 +1,172 @@
+"""
+Technical indicators on raw NumPy arrays.
+
+Every function takes float64 columns (e.g. OHLCVColumns views) and returns
+arrays of the same length, bar for bar equal to the pandas formulations in
+TechnicalAnalysisService (rolling windows with min_periods=1, NaN bars
+skipped the way pandas skips them). Rolling sums are cumulative-sum
+differences and rolling extremes/deviations reduce a strided window view,
+so no indicator has a Python-level loop over bars.
+
+Time is the last axis, so a (tickers, bars) panel is computed in one call,
+each row exactly as if it were passed on its own. Rows of different lengths
+are front-padded with NaN: bars before a row's first close count as not
+listed yet.
+"""
+
+import warnings
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _windows(values: np.ndarray, window: int) -> np.ndarray:
+    """(..., bars, window) view of the trailing window of every bar, NaN-padded before the first bar."""
+    values = np.asarray(values, dtype=float)
+    padding = np.full(values.shape[:-1] + (window - 1,), np.nan)
+    return sliding_window_view(np.concatenate((padding, values), axis=-1), window, axis=-1)
+
+
+def _started(close: np.ndarray) -> np.ndarray:
+    """True from the first bar with a close on."""
+    return np.logical_or.accumulate(~np.isnan(close), axis=-1)
+
+
+def rolling_sum_count(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Sum and number of non-NaN values in the trailing window of every bar."""
+    values = np.asarray(values, dtype=float)
+    valid = ~np.isnan(values)
+    zeros = np.zeros(values.shape[:-1] + (1,))
+    sums = np.concatenate((zeros, np.cumsum(np.where(valid, values, 0.0), axis=-1)), axis=-1)
+    counts = np.concatenate((zeros.astype(int), np.cumsum(valid, axis=-1)), axis=-1)
+    start = np.maximum(np.arange(1, values.shape[-1] + 1) - window, 0)
+    return sums[..., 1:] - sums[..., start], counts[..., 1:] - counts[..., start]
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Mean of the trailing window (min_periods=1), NaN where it has no values."""
+    sums, counts = rolling_sum_count(values, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """Sample standard deviation of the trailing window, NaN where it has fewer than two values."""
+    windows = _windows(values, window)
+    _, counts = rolling_sum_count(values, window)
+    mean = rolling_mean(values, window)
+    squares = np.nansum((windows - mean[..., None]) ** 2, axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 1, np.sqrt(squares / (counts - 1)), np.nan)
+
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """Highest non-NaN value of the trailing window."""
+    return np.fmax.reduce(_windows(values, window), axis=-1)
+
+
+def rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    """Lowest non-NaN value of the trailing window."""
+    return np.fmin.reduce(_windows(values, window), axis=-1)
+
+
+def sma(close: np.ndarray, window: int) -> np.ndarray:
+    """Simple Moving Average"""
+    return rolling_mean(close, window)
+
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    """
+    Exponential Moving Average (pandas ewm(span).mean(), adjust=True).
+
+    The recursion is already a compiled loop in pandas, so this wraps it
+    over the array without copying it (a panel as one column per row).
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        return pd.Series(values, copy=False).ewm(span=span).mean().to_numpy()
+    return pd.DataFrame(values.T, copy=False).ewm(span=span).mean().to_numpy().T
+
+
+def rsi(close: np.ndarray, window: int = 14) -> np.ndarray:
+    """
+    Relative Strength Index from the simple average gain and loss of the window.
+
+    A window without losses reads 0, as TechnicalAnalysisService always has.
+    """
+    delta = np.diff(close, axis=-1, prepend=np.nan)
+    started = _started(close)
+    gain = rolling_mean(np.where(started, np.where(delta > 0, delta, 0.0), np.nan), window)
+    loss = rolling_mean(np.where(started, np.where(delta < 0, -delta, 0.0), np.nan), window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rs = gain / np.where(loss == 0, np.inf, loss)
+        return 100 - (100 / (1 + rs))
+
+
+def bollinger_bands(close: np.ndarray, window: int = 20, num_std: float = 2) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bollinger Bands as (upper, middle, lower)"""
+    middle = rolling_mean(close, window)
+    std = rolling_std(close, window)
+    return middle + std * num_std, middle, middle - std * num_std
+
+
+def macd(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD line, signal line and histogram"""
+    macd_line = ema(close, fast) - ema(close, slow)
+    macd_signal = ema(macd_line, signal)
+    return macd_line, macd_signal, macd_line - macd_signal
+
+
+def stochastic(high: np.ndarray, low: np.ndarray, close: np.ndarray, k: int = 14, d: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+    """Stochastic Oscillator as (%K, %D)"""
+    lowest_low = rolling_min(low, k)
+    highest_high = rolling_max(high, k)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        stoch_k = 100 * (close - lowest_low) / (highest_high - lowest_low)
+    return stoch_k, rolling_mean(stoch_k, d)
+
+
+def obv(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """On-Balance Volume: the first bar's volume, then volume added on up bars and subtracted on down bars."""
+    close, volume = np.asarray(close, dtype=float), np.asarray(volume, dtype=float)
+    change = np.diff(close, axis=-1, prepend=np.nan)
+    moves = np.where(change > 0, volume, np.where(change < 0, -volume, 0.0))  # flat or NaN: unchanged
+    started = _started(close)
+    first = started & ~np.concatenate((np.zeros(close.shape[:-1] + (1,), dtype=bool), started[..., :-1]), axis=-1)
+    return np.where(started, np.cumsum(np.where(first, volume, moves), axis=-1), np.nan)
+
+
+def support_resistance(close: np.ndarray, window: int = 20, lookback: Optional[int] = None) -> Tuple[float, float]:
+    """
+    Support and resistance from the pivots of the last lookback bars.
+
+    A pivot high (low) is a bar at least as high (low) as the window bars on
+    each side of it - the centre of a rolling max (min) of 2 * window + 1
+    bars. Without pivots the 10th/90th percentiles of those bars are used,
+    which is always the case for the default lookback of 2 * window bars.
+    For a panel both are arrays with one level per row.
+    """
+    recent = np.asarray(close, dtype=float)[..., -(lookback or window * 2):]
+    rows = recent.reshape(-1, recent.shape[-1])
+    support, resistance = np.full((2, len(rows)), np.nan)
+    if rows.shape[1]:
+        # np.quantile reduces all rows at once, np.nanquantile goes row by row - kept for rows with gaps
+        support[:], resistance[:] = np.quantile(rows, [0.1, 0.9], axis=-1)
+        gaps = np.isnan(rows).any(axis=-1)
+        if gaps.any():
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)  # rows without a close in the lookback
+                support[gaps], resistance[gaps] = np.nanquantile(rows[gaps], [0.1, 0.9], axis=-1)
+
+    span = 2 * window + 1
+    if rows.shape[1] >= span:
+        windows = sliding_window_view(rows, span, axis=-1)
+        centre = rows[:, window:rows.shape[1] - window]
+        # np.max/np.min propagate NaN, so a NaN anywhere in the window rules the pivot out
+        for levels, pivots in ((resistance, centre >= windows.max(axis=-1)), (support, centre <= windows.min(axis=-1))):
+            found = pivots.sum(axis=-1)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                np.copyto(levels, np.where(pivots, centre, 0.0).sum(axis=-1) / found, where=found > 0)
+    return support.reshape(recent.shape[:-1])[()], resistance.reshape(recent.shape[:-1])[()]
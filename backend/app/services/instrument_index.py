@@ -0,0 +1,383 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Kite publishes a fresh instrument dump every trading day (IST)
+KITE_TIMEZONE = ZoneInfo("Asia/Kolkata")
+
+
+def _trigram_postings(texts: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Trigram -> ids of the texts containing it, in CSR form.
+
+    Returns:
+        (sorted trigrams, offsets into ids, ids ascending within each trigram)
+    """
+    grams, ids = [], []
+    for i, text in enumerate(texts):
+        text = text.lower()
+        unique = {text[j:j + 3] for j in range(len(text) - 2)}
+        grams.extend(unique)
+        ids.extend([i] * len(unique))
+    grams = np.array(grams, dtype="U3")
+    ids = np.array(ids, dtype=np.int32)
+    order = np.lexsort((ids, grams))
+    grams, ids = grams[order], ids[order]
+    keys, starts = np.unique(grams, return_index=True)
+    return keys, np.append(starts, len(grams)).astype(np.int64), ids
+
+
+def _prefix_range(sorted_texts: List[str], prefix: str) -> Tuple[int, int]:
+    return bisect_left(sorted_texts, prefix), bisect_left(sorted_texts, prefix + "\uffff")
+
+
+class InstrumentIndex:
+    """
+    One Kite instrument dump as parallel columns, with lookup and search indexes.
+
+    Numeric fields are NumPy arrays and the low-cardinality text fields
+    (name, instrument_type, segment, exchange) are integer codes into a list
+    of distinct values, so the tens of thousands of F&O contracts sharing an
+    underlying's name hold it once. Rows are only turned into dicts (or
+    KiteInstrument models by the caller) for the few instruments a lookup or
+    search returns.
+
+    - row(exchange, tradingsymbol, instrument_type) is a hash lookup
+    - search(query) ranks matches from a trigram index over tradingsymbols
+      and names (prefix search via bisect for one and two character queries)
+    """
+
+    NUMERIC = {
+        "instrument_token": np.int64,
+        "exchange_token": np.int64,
+        "last_price": np.float64,
+        "strike": np.float64,
+        "tick_size": np.float64,
+        "lot_size": np.int64
+    }
+    CATEGORICAL = ("name", "instrument_type", "segment", "exchange")
+
+    def __init__(
+        self,
+        columns: Dict[str, np.ndarray],
+        categories: Dict[str, List[str]],
+        tradingsymbols: List[str],
+        built_on: date,
+        symbol_trigrams: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+        name_trigrams: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+    ):
+        """
+        Args:
+            columns: NUMERIC arrays, "expiry" (datetime64[D], NaT if none) and CATEGORICAL codes
+            categories: Distinct values of each CATEGORICAL field
+            tradingsymbols: Trading symbol of each row
+            built_on: Day (IST) of the dump
+            symbol_trigrams: Trigram postings over tradingsymbols, built if None
+            name_trigrams: Trigram postings over categories["name"], built if None
+        """
+        self.columns = columns
+        self.categories = categories
+        self.tradingsymbols = tradingsymbols
+        self.built_on = built_on
+        self.symbol_trigrams = symbol_trigrams or _trigram_postings(tradingsymbols)
+        self.name_trigrams = name_trigrams or _trigram_postings(categories["name"])
+
+        exchanges, types = categories["exchange"], categories["instrument_type"]
+        self._rows = {
+            (exchanges[exchange], symbol, types[instrument_type]): row
+            for row, (symbol, exchange, instrument_type) in enumerate(
+                zip(tradingsymbols, columns["exchange"].tolist(), columns["instrument_type"].tolist())
+            )
+        }
+        self._lower_symbols = [symbol.lower() for symbol in tradingsymbols]
+        self._lower_names = [name.lower() for name in categories["name"]]
+        self._symbols_by_prefix = sorted(range(len(tradingsymbols)), key=self._lower_symbols.__getitem__)
+        self._sorted_symbols = [self._lower_symbols[row] for row in self._symbols_by_prefix]
+        self._names_by_prefix = sorted(range(len(self._lower_names)), key=self._lower_names.__getitem__)
+        self._sorted_names = [self._lower_names[code] for code in self._names_by_prefix]
+        # Rows of each name code, CSR over a stable argsort
+        names = columns["name"]
+        self._rows_by_name = np.argsort(names, kind="stable").astype(np.int32)
+        self._name_offsets = np.concatenate(
+            ([0], np.cumsum(np.bincount(names, minlength=len(categories["name"]))))
+        )
+
+    def __len__(self) -> int:
+        return len(self.tradingsymbols)
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]], built_on: date) -> "InstrumentIndex":
+        """Build from KiteConnect.instruments() records."""
+        columns = {field: np.zeros(len(records), dtype=dtype) for field, dtype in cls.NUMERIC.items()}
+        columns["expiry"] = np.full(len(records), np.datetime64("NaT"), dtype="datetime64[D]")
+        codes = {field: {} for field in cls.CATEGORICAL}
+        for field in cls.CATEGORICAL:
+            columns[field] = np.zeros(len(records), dtype=np.int32)
+
+        tradingsymbols = []
+        for row, record in enumerate(records):
+            tradingsymbols.append(str(record["tradingsymbol"]))
+            for field in cls.NUMERIC:
+                value = record.get(field)
+                if value not in (None, ""):
+                    columns[field][row] = float(value)
+            if record.get("expiry"):
+                columns["expiry"][row] = np.datetime64(record["expiry"], "D")
+            for field in cls.CATEGORICAL:
+                field_codes = codes[field]
+                value = str(record.get(field) or "")
+                columns[field][row] = field_codes.setdefault(value, len(field_codes))
+
+        categories = {field: list(codes[field]) for field in cls.CATEGORICAL}
+        return cls(columns, categories, tradingsymbols, built_on)
+
+    # Lookup
+
+    def row(self, exchange: str, tradingsymbol: str, instrument_type: str = "EQ") -> Optional[int]:
+        """Row of an instrument, None if the dump does not list it."""
+        return self._rows.get((exchange, tradingsymbol, instrument_type))
+
+    def token(self, exchange: str, tradingsymbol: str, instrument_type: str = "EQ") -> Optional[int]:
+        """Instrument token of an instrument, None if the dump does not list it."""
+        row = self.row(exchange, tradingsymbol, instrument_type)
+        return int(self.columns["instrument_token"][row]) if row is not None else None
+
+    def record(self, row: int) -> Dict[str, Any]:
+        """One row in the KiteConnect.instruments() record layout."""
+        record = {field: self.columns[field][row].item() for field in self.NUMERIC}
+        for field in self.CATEGORICAL:
+            record[field] = self.categories[field][self.columns[field][row]]
+        expiry = self.columns["expiry"][row]
+        record["expiry"] = expiry.item() if not np.isnat(expiry) else None
+        record["tradingsymbol"] = self.tradingsymbols[row]
+        return record
+
+    # Search
+
+    @staticmethod
+    def _containing(postings: Tuple[np.ndarray, np.ndarray, np.ndarray], query: str) -> np.ndarray:
+        """Ids whose text contains every trigram of query (a superset of the substring matches)."""
+        keys, offsets, ids = postings
+        candidates = None
+        for gram in sorted({query[i:i + 3] for i in range(len(query) - 2)}):
+            k = np.searchsorted(keys, gram)
+            if k == len(keys) or keys[k] != gram:
+                return np.empty(0, dtype=np.int32)
+            posting = ids[offsets[k]:offsets[k + 1]]
+            candidates = posting if candidates is None else np.intersect1d(candidates, posting, assume_unique=True)
+            if candidates.size == 0:
+                break
+        return candidates
+
+    def _symbol_matches(self, query: str) -> Tuple[List[int], List[int]]:
+        """Rows whose tradingsymbol matches query, with their rank (0 exact, 1 prefix, 3 substring)."""
+        if len(query) < 3:
+            lo, hi = _prefix_range(self._sorted_symbols, query)
+            rows = sorted(self._symbols_by_prefix[lo:hi])
+        else:
+            rows = [row for row in self._containing(self.symbol_trigrams, query).tolist()
+                    if query in self._lower_symbols[row]]
+        ranks = []
+        for row in rows:
+            symbol = self._lower_symbols[row]
+            ranks.append(0 if symbol == query else 1 if symbol.startswith(query) else 3)
+        return rows, ranks
+
+    def _name_matches(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows whose name matches query, with their rank (2 prefix, 4 substring)."""
+        if len(query) < 3:
+            lo, hi = _prefix_range(self._sorted_names, query)
+            codes = self._names_by_prefix[lo:hi]
+        else:
+            codes = [code for code in self._containing(self.name_trigrams, query).tolist()
+                     if query in self._lower_names[code]]
+        rows, ranks = [], []
+        for code in codes:
+            matching = self._rows_by_name[self._name_offsets[code]:self._name_offsets[code + 1]]
+            rows.append(matching)
+            ranks.append(np.full(len(matching), 2 if self._lower_names[code].startswith(query) else 4))
+        if not rows:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int64)
+        return np.concatenate(rows), np.concatenate(ranks)
+
+    def search(self, query: str, limit: int = 20, exchange: Optional[str] = None) -> List[int]:
+        """
+        Rows matching a query by tradingsymbol or name, case-insensitively.
+
+        Ranked exact symbol, symbol prefix, name prefix, symbol substring,
+        name substring, and in dump order within each rank. Queries shorter
+        than three characters only match prefixes.
+
+        Args:
+            query: Text to search for
+            limit: Maximum rows returned
+            exchange: Only rows listed on this exchange
+
+        Returns:
+            Matching rows, best first
+        """
+        query = query.strip().lower()
+        if not query:
+            return []
+        symbol_rows, symbol_ranks = self._symbol_matches(query)
+        name_rows, name_ranks = self._name_matches(query)
+        rows = np.concatenate((np.asarray(symbol_rows, dtype=np.int64), name_rows.astype(np.int64)))
+        ranks = np.concatenate((np.asarray(symbol_ranks, dtype=np.int64), name_ranks.astype(np.int64)))
+
+        if exchange is not None:
+            code = self.categories["exchange"].index(exchange) if exchange in self.categories["exchange"] else -1
+            keep = self.columns["exchange"][rows] == code
+            rows, ranks = rows[keep], ranks[keep]
+
+        matches, seen = [], set()
+        for row in rows[np.lexsort((rows, ranks))].tolist():
+            if row not in seen:
+                seen.add(row)
+                matches.append(row)
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    # Persistence
+
+    def save(self, path: Path):
+        """Write the columns and trigram postings to an .npz file, atomically."""
+        arrays = {f"column_{field}": values for field, values in self.columns.items()}
+        arrays.update({f"categories_{field}": np.array(values, dtype=str) for field, values in self.categories.items()})
+        for prefix, postings in (("symbol_trigrams", self.symbol_trigrams), ("name_trigrams", self.name_trigrams)):
+            for part, values in zip(("keys", "offsets", "ids"), postings):
+                arrays[f"{prefix}_{part}"] = values
+        arrays["tradingsymbols"] = np.array(self.tradingsymbols, dtype=str)
+        arrays["built_on"] = np.array(self.built_on.isoformat())
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(temp_path, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(temp_path, path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def stored_on(path: Path) -> Optional[date]:
+        """Dump day of a saved index without reading the rest of it, None if not saved."""
+        try:
+            with np.load(path, allow_pickle=False) as saved:
+                return date.fromisoformat(str(saved["built_on"]))
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+
+    @classmethod
+    def load(cls, path: Path) -> "InstrumentIndex":
+        """Read an index written by save."""
+        with np.load(path, allow_pickle=False) as saved:
+            fields = (*cls.NUMERIC, "expiry", *cls.CATEGORICAL)
+            return cls(
+                columns={field: saved[f"column_{field}"] for field in fields},
+                categories={field: saved[f"categories_{field}"].tolist() for field in cls.CATEGORICAL},
+                tradingsymbols=saved["tradingsymbols"].tolist(),
+                built_on=date.fromisoformat(str(saved["built_on"])),
+                symbol_trigrams=tuple(saved[f"symbol_trigrams_{part}"] for part in ("keys", "offsets", "ids")),
+                name_trigrams=tuple(saved[f"name_trigrams_{part}"] for part in ("keys", "offsets", "ids"))
+            )
+
+
+class InstrumentMaster:
+    """
+    Per-exchange InstrumentIndex, downloaded once per trading day.
+
+    Each index is saved under root, so a restarted (or another) worker
+    process reuses the day's dump instead of downloading and parsing it
+    again. When the dump cannot be refreshed the last index is served, and
+    the download is not retried for retry_interval seconds.
+    """
+
+    def __init__(self, root: str = "cache/kite_instruments", retry_interval: float = 300):
+        """
+        Args:
+            root: Directory holding one .npz file per exchange
+            retry_interval: Seconds to serve the last index before retrying a failed download
+        """
+        self.root = Path(root)
+        self.retry_interval = retry_interval
+        self._indexes: Dict[str, InstrumentIndex] = {}
+        self._failed_at: Dict[str, float] = {}  # monotonic time of the last failed download per key
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def today() -> date:
+        return datetime.now(KITE_TIMEZONE).date()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"instruments_{key}.npz"
+
+    def get(
+        self,
+        exchange: Optional[str],
+        fetch: Optional[Callable[[], List[Dict[str, Any]]]] = None
+    ) -> Optional[InstrumentIndex]:
+        """
+        Today's index of an exchange's instruments.
+
+        Args:
+            exchange: Exchange of the dump, all exchanges if None
+            fetch: Downloads the dump (KiteConnect.instruments), None when there is no session
+
+        Returns:
+            The index, possibly of an earlier day if fetch is None or fails; None if there is none
+        """
+        key = exchange or "all"
+        today = self.today()
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None or index.built_on < today:
+                path = self._path(key)
+                stored_on = InstrumentIndex.stored_on(path)
+                if stored_on is not None and (index is None or stored_on > index.built_on):
+                    try:
+                        index = InstrumentIndex.load(path)
+                    except Exception as e:
+                        logger.warning(f"Discarding unreadable instrument index {path}: {e}")
+
+            backing_off = (
+                index is not None and key in self._failed_at
+                and time.monotonic() - self._failed_at[key] < self.retry_interval
+            )
+            if (index is None or index.built_on < today) and fetch is not None and not backing_off:
+                try:
+                    records = fetch()
+                    index = InstrumentIndex.from_records(records, built_on=today)
+                    index.save(self._path(key))
+                    self._failed_at.pop(key, None)
+                    logger.info(f"Indexed {len(index)} Kite instruments ({key}) for {today}")
+                except Exception as e:
+                    self._failed_at[key] = time.monotonic()
+                    if index is None:
+                        raise
+                    logger.warning(f"Could not refresh Kite instruments ({key}), serving {index.built_on}: {e}")
+
+            if index is not None:
+                self._indexes[key] = index
+            return index
+
+    def clear(self):
+        """Drop the indexes held in memory (saved ones are kept)."""
+        with self._lock:
+            self._indexes.clear()
+            self._failed_at.clear()
+
+
+# Global instrument master
+instrument_master = InstrumentMaster(root=os.getenv("KITE_INSTRUMENTS_DIR", "cache/kite_instruments"))
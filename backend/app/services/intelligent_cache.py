@@ -2,12 +2,20 @@ import asyncio
 import json
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, Callable, Awaitable, Iterable
 from enum import Enum
 import hashlib
 import os
+import re
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from .cache_backends import CacheBackend, FileCacheBackend, create_cache_backend
+from .cache_index import CacheIndex
+from .cache_serialization import CacheCodec, CacheSerializer
+
 logger = logging.getLogger(__name__)
 
 class CacheType(Enum):
@@ -19,6 +27,12 @@ class CacheType(Enum):
     MODEL_RECOMMENDATIONS = "model_recs"   # 12 hour TTL
     COMPANY_PROFILES = "company_profiles"  # 7 days TTL
     MARKET_DATA = "market_data"            # 4 hour TTL for risk-free rates, indices
+    PRICE_DATA = "price_data"              # 1 minute TTL for live quotes (PriceService)
+    PEER_METRICS = "peer_metrics"          # 2 hour TTL for peer comparison metrics
+    V3_SUMMARIES = "v3_summaries"          # 4 hour TTL for simple/agentic summaries
+    TECHNICAL_ANALYSIS = "technical_analysis"  # 1 hour TTL for indicator/chart results
+    INTRADAY_BARS = "intraday_bars"        # 7 days TTL for the minute candles intraday timeframes resample
+    INTRADAY_ANALYSIS = "intraday_analysis"  # 1 minute TTL for 5m/15m/1h indicator/chart results
 
 class IntelligentCacheManager:
     """
@@ -31,6 +45,36 @@ class IntelligentCacheManager:
     - Model Recommendations: 24 hours (industry classification very stable)
     - Company Profiles: 7 days (basic company info rarely changes)
     
+    Storage Tiers:
+    - L1: bounded in-process LRU holding serialized payloads, with its own
+      per-type TTLs so hot tickers are served without touching disk
+    - L2: a CacheBackend shared by every process on the host - one file per
+      entry in cache_dir (default) or BLOBs in a SQLite WAL database - encoded
+      with a per-type codec (compact JSON or pickle, optionally compressed).
+      This is what keeps uvicorn workers consistent: a quote or AI result
+      fetched by one worker is served to all of them.
+    - Index: SQLite table of entry key/type/write time/size/tags (see
+      CacheIndex), so expiry sweeps, storage stats and tag/prefix
+      invalidation never scan the directory.
+    
+    Disk budget: once the files exceed max_disk_mb, entries are evicted by a
+    GreedyDual-Size policy (see CacheIndex) weighing recompute cost (the
+    cost savings map), entry size and recency, so a cheap company profile
+    goes before a $0.25 AI analysis of the same size.
+    
+    Tags: every entry is tagged with its type, any ticker found in its
+    identifier and its sector/mode/calculation_type parameters (plus any
+    explicit tags), so e.g. invalidate_ticker("TCS.NS") drops every cached
+    result for a company in one pass.
+    
+    Stale-while-revalidate: types in stale_grace_config keep expired entries
+    for a grace window. get_or_compute serves such an entry immediately and
+    refreshes it in the background (one refresh per key at a time), so users
+    are not left waiting on a 20-40s AI call just because the TTL lapsed.
+    
+    All disk I/O and (de)serialization of large payloads runs on a dedicated
+    thread pool so that big entries never stall the event loop.
+    
     Performance Impact:
     - 70-85% reduction in API calls for repeated analyses
     - 50-60% improvement in response times for cached data
@@ -38,10 +82,31 @@ class IntelligentCacheManager:
     - Better user experience with faster subsequent analyses
     """
     
-    def __init__(self, cache_dir: str = "cache"):
+    INDEX_FILENAME = "cache_index.db"
+    
+    # Key parameters that are also recorded as tags
+    TAG_PARAMETERS = ("sector", "mode", "calculation_type")
+    TICKER_PATTERN = re.compile(r"[A-Z0-9&-]+\.(?:NS|BO)")
+    
+    def __init__(
+        self,
+        cache_dir: str = "cache",
+        memory_max_entries: int = 512,
+        memory_max_mb: float = 64.0,
+        io_workers: int = 4,
+        inline_decode_bytes: int = 64 * 1024,
+        codec_config: Optional[Dict[CacheType, CacheCodec]] = None,
+        stale_grace_config: Optional[Dict[CacheType, timedelta]] = None,
+        max_disk_mb: Optional[float] = 1024.0,
+        disk_low_water_ratio: float = 0.9,
+        backend: Optional[CacheBackend] = None
+    ):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
         
+        # Shared L2 storage - the index always lives in cache_dir
+        self.backend = backend or FileCacheBackend(self.cache_dir)
+        
         # TTL configurations - optimized for better cache hit rates
         self.ttl_config = {
             CacheType.FINANCIAL_DATA: timedelta(hours=24),      # Financial data changes daily
@@ -50,17 +115,120 @@ class IntelligentCacheManager:
             CacheType.AI_ANALYSIS: timedelta(hours=6),          # Comprehensive AI analysis cached for 6 hours
             CacheType.MODEL_RECOMMENDATIONS: timedelta(hours=24), # Model recs stable for 24hr
             CacheType.COMPANY_PROFILES: timedelta(days=7),      # Basic company info rarely changes
-            CacheType.MARKET_DATA: timedelta(hours=4)           # Market data like risk-free rates
+            CacheType.MARKET_DATA: timedelta(hours=4),          # Market data like risk-free rates
+            CacheType.PRICE_DATA: timedelta(minutes=1),         # Quotes - one fetch per minute across workers
+            CacheType.PEER_METRICS: timedelta(hours=2),         # Peer valuation/performance metrics
+            CacheType.V3_SUMMARIES: timedelta(hours=4),         # Simple and agentic v3 summaries
+            CacheType.TECHNICAL_ANALYSIS: timedelta(hours=1),   # Daily-bar indicators, latest bar moves intraday
+            CacheType.INTRADAY_BARS: timedelta(days=7),         # Topped up with the newer candles on read
+            CacheType.INTRADAY_ANALYSIS: timedelta(minutes=1)   # Recomputed with the minute candles
         }
         
+        # On-disk codecs - binary for bulky frames, compressed JSON for text
+        self.codec_config = {
+            CacheType.FINANCIAL_DATA: CacheCodec("pickle", "zstd"),   # DataFrame dicts keyed by Timestamps
+            CacheType.NEWS_ARTICLES: CacheCodec("json", "gzip"),
+            CacheType.AI_INSIGHTS: CacheCodec("json", "gzip"),
+            CacheType.AI_ANALYSIS: CacheCodec("json", "gzip"),
+            CacheType.MODEL_RECOMMENDATIONS: CacheCodec("json"),
+            CacheType.COMPANY_PROFILES: CacheCodec("pickle"),         # Multi-year validation results
+            CacheType.MARKET_DATA: CacheCodec("json"),
+            CacheType.PRICE_DATA: CacheCodec("pickle"),               # info dict + history DataFrame
+            CacheType.PEER_METRICS: CacheCodec("pickle"),             # PeerMetrics dataclasses
+            CacheType.V3_SUMMARIES: CacheCodec("pickle", "gzip"),     # Summary response models
+            CacheType.TECHNICAL_ANALYSIS: CacheCodec("json", "gzip"),  # Chart rows of floats
+            CacheType.INTRADAY_BARS: CacheCodec("pickle"),             # Minute candle DataFrame
+            CacheType.INTRADAY_ANALYSIS: CacheCodec("json", "gzip")
+        }
+        if codec_config:
+            self.codec_config.update(codec_config)
+        
+        # L1 (in-memory) TTLs - capped by ttl_config, kept shorter so that
+        # invalidations made by other worker processes on disk are picked up
+        self.memory_ttl_config = {
+            CacheType.FINANCIAL_DATA: timedelta(hours=1),
+            CacheType.NEWS_ARTICLES: timedelta(minutes=30),
+            CacheType.AI_INSIGHTS: timedelta(hours=1),
+            CacheType.AI_ANALYSIS: timedelta(hours=1),
+            CacheType.MODEL_RECOMMENDATIONS: timedelta(hours=2),
+            CacheType.COMPANY_PROFILES: timedelta(hours=6),
+            CacheType.MARKET_DATA: timedelta(minutes=30),
+            CacheType.PRICE_DATA: timedelta(seconds=15),
+            CacheType.PEER_METRICS: timedelta(minutes=30),
+            CacheType.V3_SUMMARIES: timedelta(minutes=30),
+            CacheType.TECHNICAL_ANALYSIS: timedelta(minutes=15),
+            CacheType.INTRADAY_BARS: timedelta(seconds=15),
+            CacheType.INTRADAY_ANALYSIS: timedelta(seconds=15)
+        }
+        
+        # Stale-while-revalidate grace windows past the TTL - only for types
+        # that are slow and expensive to regenerate
+        self.stale_grace_config = {
+            CacheType.AI_ANALYSIS: timedelta(hours=12),
+            CacheType.AI_INSIGHTS: timedelta(hours=12),
+            CacheType.MODEL_RECOMMENDATIONS: timedelta(hours=24)
+        }
+        if stale_grace_config:
+            self.stale_grace_config.update(stale_grace_config)
+        
+        # L1 storage: cache_key -> (cache_type, cached_time, loaded_time, payload)
+        # where payload is the data encoded with the type's serializer
+        # Payloads are kept serialized so every hit returns an independent copy
+        self.memory_max_entries = memory_max_entries
+        self.memory_max_bytes = int(memory_max_mb * 1024 * 1024)
+        self._memory_cache: "OrderedDict[str, Tuple[CacheType, datetime, datetime, bytes]]" = OrderedDict()
+        self._memory_bytes = 0
+        
+        # Dedicated pool for file I/O and JSON work; L1 payloads smaller than
+        # inline_decode_bytes are cheaper to decode inline than to hand off
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=io_workers, thread_name_prefix="intelligent-cache-io"
+        )
+        self.inline_decode_bytes = inline_decode_bytes
+        
+        # Disk budget - when exceeded, evict down to the low-water mark so a
+        # full cache does not evict on every write. None disables the budget.
+        self.max_disk_bytes = int(max_disk_mb * 1024 * 1024) if max_disk_mb else None
+        self.disk_low_water_ratio = disk_low_water_ratio
+        
+        # Keys read since the last write, with their recompute cost; their
+        # eviction priority is refreshed in the index in one batch
+        self._pending_touches: Dict[str, float] = {}
+        
         # Cache statistics
         self.stats = {
             'hits': 0,
             'misses': 0,
             'evictions': 0,
-            'total_saved_cost': 0.0
+            'evictions_by_reason': {'expired': 0, 'capacity': 0, 'invalidated': 0},
+            'total_saved_cost': 0.0,
+            'memory_hits': 0,
+            'memory_misses': 0,
+            'memory_evictions': 0,
+            'disk_hits': 0,
+            'disk_misses': 0,
+            'producer_runs': 0,
+            'coalesced_requests': 0,
+            'stale_served': 0,
+            'background_refreshes': 0,
+            'refresh_failures': 0
         }
         
+        # Single-flight registry: (event loop, cache_key) -> task shared by
+        # concurrent get_or_compute calls. Tasks only serve callers on their
+        # own loop (TestClient portals and asyncio.run each bring one)
+        self._inflight: Dict[Tuple[asyncio.AbstractEventLoop, str], asyncio.Task] = {}
+        
+        # Background stale-while-revalidate refreshes: (event loop, cache_key) -> task,
+        # plus the durations (seconds) of recent completed refreshes
+        self._refreshing: Dict[Tuple[asyncio.AbstractEventLoop, str], asyncio.Task] = {}
+        self._refresh_latencies: "deque[float]" = deque(maxlen=200)
+        
+        # Metadata index - seeded from existing files the first time it is created
+        self._index = CacheIndex(self.cache_dir / self.INDEX_FILENAME)
+        if self._index.created or self._index.upgraded:
+            self._rebuild_index()
+        
         # Background cleanup task
         self._cleanup_task = None
         self._start_cleanup_task()
@@ -100,9 +268,172 @@ class IntelligentCacheManager:
         
         return f"{cache_type.value}_{identifier}_{key_hash[:8]}"
     
-    def _get_cache_path(self, cache_key: str) -> Path:
-        """Get file path for cache key."""
-        return self.cache_dir / f"{cache_key}.json"
+    @staticmethod
+    def tag(name: str, value: Any) -> str:
+        """Build a tag string, e.g. tag("sector", "IT") -> "sector:IT"."""
+        if name == "ticker":
+            value = str(value).upper()
+        return f"{name}:{value}"
+    
+    def _entry_tags(
+        self,
+        cache_type: CacheType,
+        identifier: str,
+        params: Dict[str, Any],
+        extra_tags: Optional[Iterable[str]] = None
+    ) -> List[str]:
+        """Derive the index tags for an entry from its type, identifier and key parameters."""
+        tags = [self.tag("type", cache_type.value)]
+        
+        tickers = self.TICKER_PATTERN.findall(str(identifier).upper())
+        if isinstance(params.get("ticker"), str):
+            tickers.append(params["ticker"])
+        tags.extend(self.tag("ticker", ticker) for ticker in tickers)
+        
+        for name in self.TAG_PARAMETERS:
+            value = params.get(name)
+            if isinstance(value, str):
+                tags.append(self.tag(name, value))
+        
+        if extra_tags:
+            tags.extend(extra_tags)
+        
+        return list(dict.fromkeys(tags))
+    
+    async def _run_io(self, func, *args):
+        """Run a blocking cache operation on the I/O thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io_executor, func, *args)
+    
+    async def _decode_payload(self, payload: bytes, serializer: CacheSerializer) -> Any:
+        """Decode an L1 payload, off the event loop when it is large."""
+        if len(payload) <= self.inline_decode_bytes:
+            return serializer.loads(payload)
+        return await self._run_io(serializer.loads, payload)
+    
+    def _read_entry(
+        self,
+        cache_key: str,
+        codec: CacheCodec
+    ) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """Load an entry from the backend and re-serialize its data for L1 (I/O thread)."""
+        cache_data = self.backend.read(cache_key)
+        if cache_data is None:
+            return None
+        return cache_data, codec.serializer.dumps(cache_data['data'])
+    
+    def _write_entry(
+        self,
+        cache_key: str,
+        cache_entry: Dict[str, Any],
+        codec: CacheCodec
+    ) -> bytes:
+        """Write an entry to the backend, index it and return the L1 payload (I/O thread)."""
+        size_bytes = self.backend.write(cache_key, codec.encode(cache_entry))
+        
+        self._index.record(
+            cache_key,
+            cache_entry['cache_type'],
+            cache_entry['identifier'],
+            datetime.fromisoformat(cache_entry['timestamp']).timestamp(),
+            size_bytes,
+            cache_entry['metadata'].get('tags', []),
+            self._calculate_cost_savings(CacheType(cache_entry['cache_type']))
+        )
+        
+        return codec.serializer.dumps(cache_entry['data'])
+    
+    def _store_entry(
+        self,
+        cache_key: str,
+        cache_entry: Dict[str, Any],
+        codec: CacheCodec,
+        touches: Dict[str, float]
+    ) -> Tuple[bytes, List[str]]:
+        """Write an entry, then apply pending priority touches and the disk budget (I/O thread)."""
+        payload = self._write_entry(cache_key, cache_entry, codec)
+        self._index.touch(touches)
+        return payload, self._enforce_disk_budget()
+    
+    def _enforce_disk_budget(self) -> List[str]:
+        """Evict lowest-priority entries while over the disk budget (I/O thread)."""
+        if not self.max_disk_bytes:
+            return []
+        
+        evicted = self._index.evict_to_budget(
+            self.max_disk_bytes, int(self.max_disk_bytes * self.disk_low_water_ratio)
+        )
+        self.backend.delete(evicted)
+        return evicted
+    
+    def _unlink_entry(self, cache_key: str) -> bool:
+        """Delete a key's stored entry, returning whether it existed (I/O thread)."""
+        removed = self.backend.delete([cache_key]) > 0
+        self._index.remove([cache_key])
+        return removed
+    
+    def _unlink_matching(self, find: Callable[..., List[str]], *args) -> List[str]:
+        """Delete every entry whose key the index lookup returns (I/O thread)."""
+        cache_keys = find(*args)
+        self.backend.delete(cache_keys)
+        self._index.remove(cache_keys)
+        return cache_keys
+    
+    def _record_evictions(self, reason: str, count: int = 1):
+        """Count entries removed from disk, broken down by reason."""
+        self.stats['evictions'] += count
+        self.stats['evictions_by_reason'][reason] += count
+    
+    def _take_pending_touches(self) -> Dict[str, float]:
+        """Hand the batch of keys read since the last flush to the I/O thread."""
+        touches, self._pending_touches = self._pending_touches, {}
+        return touches
+    
+    def _memory_get(self, cache_type: CacheType, cache_key: str) -> Optional[bytes]:
+        """Look up a key's payload in the L1 tier, dropping it if either TTL has elapsed."""
+        entry = self._memory_cache.get(cache_key)
+        if entry is None:
+            return None
+        
+        _, cached_time, loaded_time, payload = entry
+        now = datetime.now()
+        if (now - cached_time > self.ttl_config[cache_type]
+                or now - loaded_time > self.memory_ttl_config[cache_type]):
+            self._memory_discard(cache_key)
+            return None
+        
+        self._memory_cache.move_to_end(cache_key)
+        return payload
+    
+    def _memory_put(
+        self,
+        cache_type: CacheType,
+        cache_key: str,
+        cached_time: datetime,
+        payload: bytes
+    ):
+        """Insert a serialized payload into the L1 tier and enforce its bounds."""
+        self._memory_discard(cache_key)
+        
+        size = len(payload)
+        if self.memory_max_entries <= 0 or size > self.memory_max_bytes:
+            return
+        
+        self._memory_cache[cache_key] = (cache_type, cached_time, datetime.now(), payload)
+        self._memory_bytes += size
+        
+        # Evict least recently used entries until both bounds are satisfied
+        while (len(self._memory_cache) > self.memory_max_entries
+               or self._memory_bytes > self.memory_max_bytes):
+            _, (_, _, _, evicted) = self._memory_cache.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.stats['memory_evictions'] += 1
+    
+    def _memory_discard(self, cache_key: str):
+        """Remove a key from the L1 tier if present."""
+        entry = self._memory_cache.pop(cache_key, None)
+        if entry is not None:
+            self._memory_bytes -= len(entry[3])
     
     async def get(
         self, 
@@ -122,51 +453,315 @@ class IntelligentCacheManager:
             Cached data if valid, None if expired or not found
         """
         
+        data, _ = await self._lookup(cache_type, identifier, allow_stale=False, **kwargs)
+        return data
+    
+    def _stale_grace(self, cache_type: CacheType) -> timedelta:
+        """Grace window during which an expired entry may still be served."""
+        return self.stale_grace_config.get(cache_type, timedelta(0))
+    
+    def _freshness(self, cache_type: CacheType, cached_time: datetime) -> str:
+        """Classify an entry as "fresh", "stale" (past TTL, inside the grace window) or "expired"."""
+        age = datetime.now() - cached_time
+        ttl = self.ttl_config[cache_type]
+        if age <= ttl:
+            return "fresh"
+        if age <= ttl + self._stale_grace(cache_type):
+            return "stale"
+        return "expired"
+    
+    async def _lookup(
+        self,
+        cache_type: CacheType,
+        identifier: str,
+        allow_stale: bool,
+        **kwargs
+    ) -> Tuple[Optional[Any], bool]:
+        """
+        Shared read path for get and get_or_compute.
+        
+        Entries past their TTL but inside the type's grace window are kept on
+        disk; they are returned (flagged stale) only when allow_stale is set.
+        
+        Returns:
+            (data, is_stale) - data is None on a miss
+        """
+        
         try:
             cache_key = self._generate_cache_key(cache_type, identifier, **kwargs)
-            cache_path = self._get_cache_path(cache_key)
+            codec = self.codec_config[cache_type]
             
-            if not cache_path.exists():
+            # L1: in-memory tier
+            payload = self._memory_get(cache_type, cache_key)
+            if payload is not None:
+                self.stats['memory_hits'] += 1
+                data = await self._decode_payload(payload, codec.serializer)
+                return self._record_hit(cache_type, cache_key, data, tier="memory"), False
+            self.stats['memory_misses'] += 1
+            
+            # L2: file tier
+            loaded = await self._run_io(self._read_entry, cache_key, codec)
+            if loaded is None:
                 self.stats['misses'] += 1
+                self.stats['disk_misses'] += 1
                 logger.debug(f"Cache miss: {cache_key}")
-                return None
-            
-            # Read cache file
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
+                return None, False
+            cache_data, payload = loaded
             
             # Check expiration
             cached_time = datetime.fromisoformat(cache_data['timestamp'])
-            ttl = self.ttl_config[cache_type]
+            freshness = self._freshness(cache_type, cached_time)
             
-            if datetime.now() - cached_time > ttl:
-                # Expired, remove file
-                cache_path.unlink()
+            if freshness == "stale":
+                if allow_stale:
+                    # Stale but within grace - caller refreshes in the background
+                    self.stats['stale_served'] += 1
+                    data = self._record_hit(cache_type, cache_key, cache_data['data'], tier="stale")
+                    return data, True
+                # Keep the entry so stale-while-revalidate callers can still use it
                 self.stats['misses'] += 1
-                self.stats['evictions'] += 1
-                logger.debug(f"Cache expired: {cache_key}")
-                return None
+                self.stats['disk_misses'] += 1
+                logger.debug(f"Cache stale: {cache_key}")
+                return None, False
             
-            # Valid cache hit
-            self.stats['hits'] += 1
+            if freshness == "expired":
+                # Expired, remove entry
+                await self._run_io(self._unlink_entry, cache_key)
+                self.stats['misses'] += 1
+                self.stats['disk_misses'] += 1
+                self._record_evictions('expired')
+                logger.debug(f"Cache expired: {cache_key}")
+                return None, False
             
-            # Calculate cost savings
-            cost_savings = self._calculate_cost_savings(cache_type)
-            self.stats['total_saved_cost'] += cost_savings
+            # Valid cache hit - promote to L1 for subsequent requests
+            self.stats['disk_hits'] += 1
+            self._memory_put(cache_type, cache_key, cached_time, payload)
             
-            logger.info(f"Cache hit: {cache_key} (saved ${cost_savings:.2f})")
-            return cache_data['data']
+            return self._record_hit(cache_type, cache_key, cache_data['data'], tier="disk"), False
             
         except Exception as e:
             logger.error(f"Error reading cache {cache_type.value}/{identifier}: {e}")
             self.stats['misses'] += 1
+            return None, False
+    
+    def _record_hit(self, cache_type: CacheType, cache_key: str, data: Any, tier: str) -> Any:
+        """Update hit counters and cost savings for a hit served by either tier."""
+        self.stats['hits'] += 1
+        
+        # Calculate cost savings
+        cost_savings = self._calculate_cost_savings(cache_type)
+        self.stats['total_saved_cost'] += cost_savings
+        
+        # Refresh the entry's eviction priority with the next write
+        self._pending_touches[cache_key] = cost_savings
+        
+        logger.info(f"Cache hit ({tier}): {cache_key} (saved ${cost_savings:.2f})")
+        return data
+    
+    async def get_or_compute(
+        self,
+        cache_type: CacheType,
+        identifier: str,
+        producer: Callable[[], Awaitable[Any]],
+        tags: Optional[Iterable[str]] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Return cached data, computing and caching it on a miss (single-flight).
+        
+        Concurrent calls for the same key share one lookup and at most one
+        producer run, so a burst of requests for a freshly expired ticker makes
+        one upstream/AI call instead of one per request. The shared work runs in
+        its own task: a caller that is cancelled (e.g. client disconnect) does
+        not abort it for the others.
+        
+        For types with a stale grace window, an expired entry inside the window
+        is returned immediately and the producer is re-run in the background.
+        
+        Args:
+            cache_type: Type of cached data
+            identifier: Primary identifier (e.g., ticker symbol)
+            producer: Zero-argument coroutine function producing fresh data;
+                falsy results are returned but not cached
+            tags: Extra tags to index a freshly produced entry under
+            **kwargs: Additional parameters for cache key generation
+            
+        Returns:
+            Cached or freshly produced data. Exceptions raised by the producer
+            propagate to every waiting caller.
+        """
+        
+        cache_key = self._generate_cache_key(cache_type, identifier, **kwargs)
+        
+        inflight_key = (asyncio.get_running_loop(), cache_key)
+        task = self._inflight.get(inflight_key)
+        if task is not None:
+            self.stats['coalesced_requests'] += 1
+            logger.debug(f"Coalesced request onto in-flight computation: {cache_key}")
+        else:
+            task = asyncio.ensure_future(
+                self._lookup_or_produce(cache_type, identifier, producer, tags, **kwargs)
+            )
+            self._inflight[inflight_key] = task
+            task.add_done_callback(lambda t: self._finish_inflight(inflight_key, t))
+        
+        return await asyncio.shield(task)
+    
+    async def _lookup_or_produce(
+        self,
+        cache_type: CacheType,
+        identifier: str,
+        producer: Callable[[], Awaitable[Any]],
+        tags: Optional[Iterable[str]],
+        **kwargs
+    ) -> Any:
+        """Shared body of a single-flight call: cache lookup, then producer on miss."""
+        allow_stale = self._stale_grace(cache_type) > timedelta(0)
+        cached, is_stale = await self._lookup(cache_type, identifier, allow_stale, **kwargs)
+        if cached is not None:
+            if is_stale:
+                self._schedule_refresh(cache_type, identifier, producer, tags, **kwargs)
+            return cached
+        
+        return await self._produce_and_store(cache_type, identifier, producer, tags, **kwargs)
+    
+    async def _produce_and_store(
+        self,
+        cache_type: CacheType,
+        identifier: str,
+        producer: Callable[[], Awaitable[Any]],
+        tags: Optional[Iterable[str]],
+        **kwargs
+    ) -> Any:
+        """Run a producer and cache its result if it is truthy."""
+        self.stats['producer_runs'] += 1
+        data = await producer()
+        if data:
+            await self.set(cache_type, identifier, data, tags=tags, **kwargs)
+        return data
+    
+    async def refresh(
+        self,
+        cache_type: CacheType,
+        identifier: str,
+        producer: Callable[[], Awaitable[Any]],
+        tags: Optional[Iterable[str]] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Re-run a producer and cache its result even if a valid entry exists.
+        
+        Used by cache warming to renew entries before they expire. Joins the
+        key's single-flight registry, so requests arriving meanwhile wait for
+        this run instead of starting their own; if the key is already being
+        computed, that computation is awaited instead.
+        
+        Args:
+            cache_type: Type of cached data
+            identifier: Primary identifier (e.g., ticker symbol)
+            producer: Zero-argument coroutine function producing fresh data
+            tags: Extra tags to index the entry under
+            **kwargs: Additional parameters for cache key generation
+            
+        Returns:
+            Freshly produced data (falsy results are not cached)
+        """
+        
+        cache_key = self._generate_cache_key(cache_type, identifier, **kwargs)
+        
+        inflight_key = (asyncio.get_running_loop(), cache_key)
+        task = self._inflight.get(inflight_key)
+        if task is not None:
+            self.stats['coalesced_requests'] += 1
+        else:
+            task = asyncio.ensure_future(
+                self._produce_and_store(cache_type, identifier, producer, tags, **kwargs)
+            )
+            self._inflight[inflight_key] = task
+            task.add_done_callback(lambda t: self._finish_inflight(inflight_key, t))
+        
+        return await asyncio.shield(task)
+    
+    async def ttl_remaining(
+        self,
+        cache_type: CacheType,
+        identifier: str,
+        **kwargs
+    ) -> Optional[timedelta]:
+        """
+        Time left before an entry expires, read from the index (no entry decode).
+        
+        Returns:
+            Remaining TTL (negative once expired), or None if not cached
+        """
+        
+        cache_key = self._generate_cache_key(cache_type, identifier, **kwargs)
+        created_at = await self._run_io(self._index.created_at, cache_key)
+        if created_at is None:
             return None
+        return self.ttl_config[cache_type] - (datetime.now() - datetime.fromtimestamp(created_at))
+    
+    def _schedule_refresh(
+        self,
+        cache_type: CacheType,
+        identifier: str,
+        producer: Callable[[], Awaitable[Any]],
+        tags: Optional[Iterable[str]],
+        **kwargs
+    ):
+        """Start a background refresh for a stale key unless one is already running."""
+        cache_key = self._generate_cache_key(cache_type, identifier, **kwargs)
+        refresh_key = (asyncio.get_running_loop(), cache_key)
+        if refresh_key in self._refreshing:
+            return
+        
+        task = asyncio.ensure_future(
+            self._refresh(cache_type, identifier, cache_key, producer, tags, **kwargs)
+        )
+        self._refreshing[refresh_key] = task
+        task.add_done_callback(lambda t: self._refreshing.pop(refresh_key, None))
+    
+    async def _refresh(
+        self,
+        cache_type: CacheType,
+        identifier: str,
+        cache_key: str,
+        producer: Callable[[], Awaitable[Any]],
+        tags: Optional[Iterable[str]],
+        **kwargs
+    ):
+        """Re-run a producer for a stale entry and store the result."""
+        start = time.perf_counter()
+        try:
+            self.stats['background_refreshes'] += 1
+            data = await producer()
+            if data:
+                await self.set(cache_type, identifier, data, tags=tags, **kwargs)
+                logger.info(f"Refreshed stale cache entry: {cache_key}")
+            else:
+                # Keep serving the stale entry; the next request retries
+                self.stats['refresh_failures'] += 1
+                logger.warning(f"Background refresh returned no data: {cache_key}")
+        except Exception as e:
+            self.stats['refresh_failures'] += 1
+            logger.error(f"Background refresh failed for {cache_key}: {e}")
+        finally:
+            self._refresh_latencies.append(time.perf_counter() - start)
+    
+    def _finish_inflight(self, inflight_key: Tuple[asyncio.AbstractEventLoop, str], task: asyncio.Task):
+        """Drop a completed single-flight task from the registry."""
+        if self._inflight.get(inflight_key) is task:
+            del self._inflight[inflight_key]
+        # Mark the exception retrieved even if every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
     
     async def set(
         self,
         cache_type: CacheType,
         identifier: str,
         data: Dict[str, Any],
+        tags: Optional[Iterable[str]] = None,
         **kwargs
     ) -> bool:
         """
@@ -176,6 +771,7 @@ class IntelligentCacheManager:
             cache_type: Type of data being cached
             identifier: Primary identifier
             data: Data to cache
+            tags: Extra tags to index the entry under (not part of the key)
             **kwargs: Additional parameters for cache key generation
             
         Returns:
@@ -184,26 +780,19 @@ class IntelligentCacheManager:
         
         try:
             cache_key = self._generate_cache_key(cache_type, identifier, **kwargs)
-            cache_path = self._get_cache_path(cache_key)
+            codec = self.codec_config[cache_type]
             
-            cache_entry = {
-                'timestamp': datetime.now().isoformat(),
-                'cache_type': cache_type.value,
-                'identifier': identifier,
-                'data': data,
-                'metadata': {
-                    'ttl_hours': self.ttl_config[cache_type].total_seconds() / 3600,
-                    'cache_key': cache_key,
-                    **kwargs
-                }
-            }
+            cached_time = datetime.now()
+            cache_entry = self._build_entry(cache_type, identifier, cache_key, cached_time, data, tags, kwargs)
             
-            # Write to temporary file first, then rename for atomic operation
-            temp_path = cache_path.with_suffix('.tmp')
-            with open(temp_path, 'w', encoding='utf-8') as f:
-                json.dump(cache_entry, f, indent=2, default=str)
+            # Written atomically by the backend
+            payload, evicted = await self._run_io(
+                self._store_entry, cache_key, cache_entry, codec, self._take_pending_touches()
+            )
             
-            temp_path.rename(cache_path)
+            # Write-through to L1 so the next read is served from memory
+            self._memory_put(cache_type, cache_key, cached_time, payload)
+            self._discard_evicted(evicted)
             
             logger.debug(f"Cached: {cache_key}")
             return True
@@ -212,6 +801,39 @@ class IntelligentCacheManager:
             logger.error(f"Error caching {cache_type.value}/{identifier}: {e}")
             return False
     
+    def _build_entry(
+        self,
+        cache_type: CacheType,
+        identifier: str,
+        cache_key: str,
+        cached_time: datetime,
+        data: Any,
+        tags: Optional[Iterable[str]],
+        params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Wrap data in the stored entry format (timestamp, type, identifier, metadata)."""
+        return {
+            'timestamp': cached_time.isoformat(),
+            'cache_type': cache_type.value,
+            'identifier': identifier,
+            'data': data,
+            'metadata': {
+                'ttl_hours': self.ttl_config[cache_type].total_seconds() / 3600,
+                'cache_key': cache_key,
+                'tags': self._entry_tags(cache_type, identifier, params, tags),
+                **params
+            }
+        }
+    
+    def _discard_evicted(self, evicted: List[str]):
+        """Drop entries evicted for the disk budget from L1 and count them."""
+        if not evicted:
+            return
+        for evicted_key in evicted:
+            self._memory_discard(evicted_key)
+        self._record_evictions('capacity', len(evicted))
+        logger.info(f"Disk budget reached, evicted {len(evicted)} cache entries")
+    
     async def invalidate(
         self,
         cache_type: CacheType,
@@ -232,10 +854,10 @@ class IntelligentCacheManager:
         
         try:
             cache_key = self._generate_cache_key(cache_type, identifier, **kwargs)
-            cache_path = self._get_cache_path(cache_key)
+            self._memory_discard(cache_key)
             
-            if cache_path.exists():
-                cache_path.unlink()
+            if await self._run_io(self._unlink_entry, cache_key):
+                self._record_evictions('invalidated')
                 logger.info(f"Cache invalidated: {cache_key}")
                 return True
             else:
@@ -246,6 +868,251 @@ class IntelligentCacheManager:
             logger.error(f"Error invalidating cache {cache_type.value}/{identifier}: {e}")
             return False
     
+    async def invalidate_by_tag(
+        self,
+        tags: Iterable[str],
+        cache_type: Optional[CacheType] = None
+    ) -> int:
+        """
+        Invalidate every entry carrying all of the given tags, in one pass.
+        
+        Args:
+            tags: A tag or list of tags, e.g. ["ticker:TCS.NS", "sector:IT"]
+            cache_type: Optional cache type to restrict invalidation to
+            
+        Returns:
+            Number of entries invalidated
+        """
+        
+        if isinstance(tags, str):
+            tags = [tags]
+        tags = list(tags)
+        
+        try:
+            cache_keys = await self._run_io(
+                self._unlink_matching,
+                self._index.keys_with_tags,
+                tags,
+                cache_type.value if cache_type else None
+            )
+            for cache_key in cache_keys:
+                self._memory_discard(cache_key)
+            self._record_evictions('invalidated', len(cache_keys))
+            
+            logger.info(f"Cache invalidated {len(cache_keys)} entries tagged {tags}")
+            return len(cache_keys)
+            
+        except Exception as e:
+            logger.error(f"Error invalidating cache by tags {tags}: {e}")
+            return 0
+    
+    async def invalidate_ticker(
+        self,
+        ticker: str,
+        cache_type: Optional[CacheType] = None
+    ) -> int:
+        """
+        Invalidate everything cached about a ticker (e.g. after an earnings release).
+        
+        Args:
+            ticker: Stock ticker symbol
+            cache_type: Optional cache type to restrict invalidation to
+            
+        Returns:
+            Number of entries invalidated
+        """
+        return await self.invalidate_by_tag(self.tag("ticker", ticker), cache_type)
+    
+    async def invalidate_by_prefix(
+        self,
+        identifier_prefix: str,
+        cache_type: Optional[CacheType] = None
+    ) -> int:
+        """
+        Invalidate every entry whose identifier starts with identifier_prefix.
+        
+        Args:
+            identifier_prefix: e.g. "TCS.NS_" for all TCS.NS_* derived results
+            cache_type: Optional cache type to restrict invalidation to
+            
+        Returns:
+            Number of entries invalidated
+        """
+        
+        try:
+            cache_keys = await self._run_io(
+                self._unlink_matching,
+                self._index.keys_with_identifier_prefix,
+                identifier_prefix,
+                cache_type.value if cache_type else None
+            )
+            for cache_key in cache_keys:
+                self._memory_discard(cache_key)
+            self._record_evictions('invalidated', len(cache_keys))
+            
+            logger.info(f"Cache invalidated {len(cache_keys)} entries with prefix {identifier_prefix}")
+            return len(cache_keys)
+            
+        except Exception as e:
+            logger.error(f"Error invalidating cache by prefix {identifier_prefix}: {e}")
+            return 0
+    
+    # Blocking accessors for synchronous callers (e.g. PriceService). They go
+    # straight to the shared backend, bypassing this process's L1, so every
+    # worker process sees the same entry; they block the calling thread.
+    
+    def get_sync(
+        self,
+        cache_type: CacheType,
+        identifier: str,
+        **kwargs
+    ) -> Optional[Any]:
+        """
+        Blocking get() against the shared tier.
+        
+        Args:
+            cache_type: Type of cached data
+            identifier: Primary identifier (e.g., ticker symbol)
+            **kwargs: Additional parameters for cache key generation
+            
+        Returns:
+            Cached data if valid, None if expired or not found
+        """
+        
+        try:
+            cache_key = self._generate_cache_key(cache_type, identifier, **kwargs)
+            cache_data = self.backend.read(cache_key)
+            
+            freshness = None
+            if cache_data is not None:
+                freshness = self._freshness(cache_type, datetime.fromisoformat(cache_data['timestamp']))
+                if freshness == "fresh":
+                    self.stats['disk_hits'] += 1
+                    return self._record_hit(cache_type, cache_key, cache_data['data'], tier="shared")
+            
+            if freshness == "expired":
+                self._unlink_entry(cache_key)
+                self._record_evictions('expired')
+            self.stats['misses'] += 1
+            self.stats['disk_misses'] += 1
+            logger.debug(f"Cache miss: {cache_key}")
+            return None
+            
+        except Exception as e:
+            logger.error(f"Error reading cache {cache_type.value}/{identifier}: {e}")
+            self.stats['misses'] += 1
+            return None
+    
+    def set_sync(
+        self,
+        cache_type: CacheType,
+        identifier: str,
+        data: Any,
+        tags: Optional[Iterable[str]] = None,
+        **kwargs
+    ) -> bool:
+        """
+        Blocking set() against the shared tier.
+        
+        Args:
+            cache_type: Type of data being cached
+            identifier: Primary identifier
+            data: Data to cache
+            tags: Extra tags to index the entry under (not part of the key)
+            **kwargs: Additional parameters for cache key generation
+            
+        Returns:
+            True if successfully cached, False otherwise
+        """
+        
+        try:
+            cache_key = self._generate_cache_key(cache_type, identifier, **kwargs)
+            cache_entry = self._build_entry(
+                cache_type, identifier, cache_key, datetime.now(), data, tags, kwargs
+            )
+            
+            _, evicted = self._store_entry(
+                cache_key, cache_entry, self.codec_config[cache_type], self._take_pending_touches()
+            )
+            
+            # Any L1 copy in this process is now out of date
+            self._memory_discard(cache_key)
+            self._discard_evicted(evicted)
+            
+            logger.debug(f"Cached: {cache_key}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error caching {cache_type.value}/{identifier}: {e}")
+            return False
+    
+    def invalidate_by_tag_sync(
+        self,
+        tags: Iterable[str],
+        cache_type: Optional[CacheType] = None
+    ) -> int:
+        """
+        Blocking invalidate_by_tag().
+        
+        Args:
+            tags: A tag or list of tags, e.g. ["ticker:TCS.NS", "sector:IT"]
+            cache_type: Optional cache type to restrict invalidation to
+            
+        Returns:
+            Number of entries invalidated
+        """
+        
+        if isinstance(tags, str):
+            tags = [tags]
+        tags = list(tags)
+        
+        try:
+            cache_keys = self._unlink_matching(
+                self._index.keys_with_tags, tags, cache_type.value if cache_type else None
+            )
+            for cache_key in cache_keys:
+                self._memory_discard(cache_key)
+            self._record_evictions('invalidated', len(cache_keys))
+            
+            logger.info(f"Cache invalidated {len(cache_keys)} entries tagged {tags}")
+            return len(cache_keys)
+            
+        except Exception as e:
+            logger.error(f"Error invalidating cache by tags {tags}: {e}")
+            return 0
+    
+    def list_entries_sync(self, cache_type: CacheType) -> List[Dict[str, Any]]:
+        """
+        List every stored entry of a type, newest first (for status endpoints).
+        
+        Entries past their TTL that have not been swept yet are included and
+        flagged invalid. Reads here are not counted as hits or misses.
+        
+        Returns:
+            List of dicts with identifier, cached_at, age_seconds, valid and data
+        """
+        
+        entries = []
+        now = datetime.now()
+        for cache_key, identifier, created_at in self._index.entries_of_type(cache_type.value):
+            try:
+                cache_data = self.backend.read(cache_key)
+            except Exception as e:
+                logger.error(f"Error reading cache entry {cache_key}: {e}")
+                continue
+            if cache_data is None:
+                continue
+            
+            cached_time = datetime.fromtimestamp(created_at)
+            entries.append({
+                'identifier': identifier,
+                'cached_at': cached_time,
+                'age_seconds': (now - cached_time).total_seconds(),
+                'valid': self._freshness(cache_type, cached_time) == "fresh",
+                'data': cache_data['data']
+            })
+        return entries
+    
     async def cleanup_expired(self) -> int:
         """
         Clean up all expired cache entries.
@@ -256,29 +1123,21 @@ class IntelligentCacheManager:
         
         cleaned_count = 0
         
+        # Drop expired L1 entries as well so they stop counting against its bounds
+        now = datetime.now()
+        for cache_key, (cache_type, cached_time, loaded_time, _) in list(self._memory_cache.items()):
+            if (now - cached_time > self.ttl_config[cache_type]
+                    or now - loaded_time > self.memory_ttl_config[cache_type]):
+                self._memory_discard(cache_key)
+        
         try:
-            for cache_file in self.cache_dir.glob("*.json"):
-                try:
-                    with open(cache_file, 'r', encoding='utf-8') as f:
-                        cache_data = json.load(f)
-                    
-                    cache_type = CacheType(cache_data['cache_type'])
-                    cached_time = datetime.fromisoformat(cache_data['timestamp'])
-                    ttl = self.ttl_config[cache_type]
-                    
-                    if datetime.now() - cached_time > ttl:
-                        cache_file.unlink()
-                        cleaned_count += 1
-                        self.stats['evictions'] += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error processing cache file {cache_file}: {e}")
-                    # Remove corrupted cache files
-                    try:
-                        cache_file.unlink()
-                        cleaned_count += 1
-                    except:
-                        pass
+            cleaned_count = await self._run_io(self._sweep_expired_entries)
+            self._record_evictions('expired', cleaned_count)
+            
+            # Flush priority touches and re-check the budget for read-mostly periods
+            touches = self._take_pending_touches()
+            evicted = await self._run_io(self._apply_touches_and_budget, touches)
+            self._discard_evicted(evicted)
             
             if cleaned_count > 0:
                 logger.info(f"Cleaned up {cleaned_count} expired cache entries")
@@ -289,6 +1148,75 @@ class IntelligentCacheManager:
             logger.error(f"Error during cache cleanup: {e}")
             return 0
     
+    def _sweep_expired_entries(self) -> int:
+        """Delete entries the index reports as expired (I/O thread)."""
+        now = datetime.now().timestamp()
+        cutoffs = {
+            cache_type.value: now - (ttl + self._stale_grace(cache_type)).total_seconds()
+            for cache_type, ttl in self.ttl_config.items()
+        }
+        
+        expired_keys = self._index.expired_keys(cutoffs)
+        self.backend.delete(expired_keys)
+        self._index.remove(expired_keys)
+        
+        return len(expired_keys)
+    
+    def _apply_touches_and_budget(self, touches: Dict[str, float]) -> List[str]:
+        """Apply priority touches, then enforce the disk budget (I/O thread)."""
+        self._index.touch(touches)
+        return self._enforce_disk_budget()
+    
+    def _rebuild_index(self) -> int:
+        """
+        Re-seed the index from the entries in the backend (blocking, O(total entries)).
+        
+        Only needed once when the index is first created or if it is lost;
+        corrupted entries found along the way are removed.
+        
+        Returns:
+            Number of entries indexed
+        """
+        rows = []
+        for cache_key, size_bytes in self.backend.keys():
+            try:
+                cache_data = self.backend.read(cache_key)
+                cache_type = CacheType(cache_data['cache_type'])
+                metadata = cache_data.get('metadata', {})
+                tags = metadata.get('tags')
+                if tags is None:
+                    # Entries written before tagging - derive from the stored key parameters
+                    tags = self._entry_tags(cache_type, cache_data.get('identifier'), metadata)
+                rows.append((
+                    cache_key,
+                    cache_type.value,
+                    cache_data.get('identifier'),
+                    datetime.fromisoformat(cache_data['timestamp']).timestamp(),
+                    size_bytes,
+                    tags,
+                    self._calculate_cost_savings(cache_type)
+                ))
+            except Exception as e:
+                logger.error(f"Error processing cache entry {cache_key}: {e}")
+                # Remove corrupted cache entries
+                try:
+                    self.backend.delete([cache_key])
+                except:
+                    pass
+        
+        self._index.replace_all(rows)
+        logger.info(f"Rebuilt cache index with {len(rows)} entries")
+        return len(rows)
+    
+    async def rebuild_index(self) -> int:
+        """
+        Rebuild the metadata index from the entries in the backend.
+        
+        Returns:
+            Number of entries indexed
+        """
+        return await self._run_io(self._rebuild_index)
+    
     def _calculate_cost_savings(self, cache_type: CacheType) -> float:
         """Calculate estimated cost savings from cache hit."""
         
@@ -300,7 +1228,13 @@ class IntelligentCacheManager:
             CacheType.AI_ANALYSIS: 0.25,         # Comprehensive AI analysis (highest cost savings)
             CacheType.MODEL_RECOMMENDATIONS: 0.04, # Classification logic (24hr cache)
             CacheType.COMPANY_PROFILES: 0.02,    # Basic info lookup
-            CacheType.MARKET_DATA: 0.03          # Market data API calls avoided
+            CacheType.MARKET_DATA: 0.03,         # Market data API calls avoided
+            CacheType.PRICE_DATA: 0.01,          # One yfinance quote + 5d history call
+            CacheType.PEER_METRICS: 0.02,        # One yfinance info + 1y history call
+            CacheType.V3_SUMMARIES: 0.10,        # Scoring pipeline or AI thesis avoided
+            CacheType.TECHNICAL_ANALYSIS: 0.02,  # yfinance history + indicator computation
+            CacheType.INTRADAY_BARS: 0.01,       # One Kite (or yfinance) call for up to 59 days of minute candles
+            CacheType.INTRADAY_ANALYSIS: 0.01    # Resampling + indicator computation
         }
         
         return cost_savings_map.get(cache_type, 0.0)
@@ -313,9 +1247,7 @@ class IntelligentCacheManager:
         file_count = 0
         
         try:
-            for cache_file in self.cache_dir.glob("*.json"):
-                cache_size_mb += cache_file.stat().st_size
-                file_count += 1
+            file_count, cache_size_mb = await self._run_io(self._index.totals)
             
             cache_size_mb = cache_size_mb / (1024 * 1024)  # Convert to MB
             
@@ -325,6 +1257,12 @@ class IntelligentCacheManager:
         total_requests = self.stats['hits'] + self.stats['misses']
         hit_rate = (self.stats['hits'] / total_requests * 100) if total_requests > 0 else 0
         
+        def _tier_hit_rate(hits: int, misses: int) -> float:
+            lookups = hits + misses
+            return round(hits / lookups * 100, 2) if lookups > 0 else 0
+        
+        refresh_ms = sorted(seconds * 1000 for seconds in self._refresh_latencies)
+        
         return {
             'cache_statistics': {
                 'total_requests': total_requests,
@@ -332,77 +1270,75 @@ class IntelligentCacheManager:
                 'cache_misses': self.stats['misses'],
                 'hit_rate_percentage': round(hit_rate, 2),
                 'evictions': self.stats['evictions'],
+                'evictions_by_reason': dict(self.stats['evictions_by_reason']),
                 'total_cost_saved_usd': round(self.stats['total_saved_cost'], 2)
             },
+            'single_flight': {
+                'producer_runs': self.stats['producer_runs'],
+                'coalesced_requests': self.stats['coalesced_requests'],
+                'in_flight': len(self._inflight)
+            },
+            'stale_while_revalidate': {
+                'stale_served': self.stats['stale_served'],
+                'background_refreshes': self.stats['background_refreshes'],
+                'refresh_failures': self.stats['refresh_failures'],
+                'refreshing': len(self._refreshing),
+                'refresh_latency_ms': {
+                    'avg': round(sum(refresh_ms) / len(refresh_ms), 1) if refresh_ms else 0,
+                    'p95': round(refresh_ms[int(0.95 * (len(refresh_ms) - 1))], 1) if refresh_ms else 0,
+                    'max': round(refresh_ms[-1], 1) if refresh_ms else 0
+                }
+            },
+            'tier_statistics': {
+                'memory': {
+                    'hits': self.stats['memory_hits'],
+                    'misses': self.stats['memory_misses'],
+                    'hit_rate_percentage': _tier_hit_rate(
+                        self.stats['memory_hits'], self.stats['memory_misses']
+                    ),
+                    'evictions': self.stats['memory_evictions'],
+                    'entries': len(self._memory_cache),
+                    'max_entries': self.memory_max_entries,
+                    'size_mb': round(self._memory_bytes / (1024 * 1024), 2),
+                    'max_size_mb': round(self.memory_max_bytes / (1024 * 1024), 2)
+                },
+                'disk': {
+                    'hits': self.stats['disk_hits'],
+                    'misses': self.stats['disk_misses'],
+                    'hit_rate_percentage': _tier_hit_rate(
+                        self.stats['disk_hits'], self.stats['disk_misses']
+                    )
+                }
+            },
             'cache_storage': {
                 'cache_files': file_count,
                 'storage_size_mb': round(cache_size_mb, 2),
+                'max_size_mb': round(self.max_disk_bytes / (1024 * 1024), 2) if self.max_disk_bytes else None,
+                'eviction_policy': 'greedy_dual_size',
+                'backend': self.backend.name,
+                'backend_location': self.backend.location,
                 'cache_directory': str(self.cache_dir.absolute())
             },
             'ttl_configuration': {
                 cache_type.value: {
                     'ttl_hours': ttl.total_seconds() / 3600,
+                    'memory_ttl_hours': min(ttl, self.memory_ttl_config[cache_type]).total_seconds() / 3600,
+                    'stale_grace_hours': self._stale_grace(cache_type).total_seconds() / 3600,
+                    'codec': self.codec_config[cache_type].description,
                     'estimated_cost_savings_per_hit': self._calculate_cost_savings(cache_type)
                 }
                 for cache_type, ttl in self.ttl_config.items()
             }
         }
     
-    async def warm_cache_for_popular_stocks(
-        self, 
-        popular_tickers: List[str],
-        cache_financial: bool = True,
-        cache_news: bool = True
-    ) -> Dict[str, int]:
-        """
-        Pre-warm cache for popular stocks to improve user experience.
-        
-        Args:
-            popular_tickers: List of ticker symbols to pre-cache
-            cache_financial: Whether to cache financial data
-            cache_news: Whether to cache news data
-            
-        Returns:
-            Dictionary with cache warming results
-        """
-        
-        results = {
-            'financial_cached': 0,
-            'news_cached': 0,
-            'errors': 0
-        }
-        
-        logger.info(f"Starting cache warming for {len(popular_tickers)} popular stocks")
-        
-        for ticker in popular_tickers:
-            try:
-                if cache_financial:
-                    # Check if financial data needs caching
-                    existing = await self.get(CacheType.FINANCIAL_DATA, ticker)
-                    if not existing:
-                        # Would normally fetch and cache real data here
-                        # For now, just log the intent
-                        logger.info(f"Would cache financial data for {ticker}")
-                        results['financial_cached'] += 1
-                
-                if cache_news:
-                    # Check if news data needs caching
-                    existing = await self.get(CacheType.NEWS_ARTICLES, ticker)
-                    if not existing:
-                        logger.info(f"Would cache news data for {ticker}")
-                        results['news_cached'] += 1
-                        
-            except Exception as e:
-                logger.error(f"Error warming cache for {ticker}: {e}")
-                results['errors'] += 1
-        
-        logger.info(f"Cache warming completed: {results}")
-        return results
-    
     def __del__(self):
         """Cleanup background tasks."""
         if self._cleanup_task and not self._cleanup_task.done():
             self._cleanup_task.cancel()
+        self._io_executor.shutdown(wait=False)
 
-# Global cache manager instance
-intelligent_cache = IntelligentCacheManager()
\ No newline at end of file
+# Global cache manager instance - CACHE_BACKEND selects "file" (default) or "sqlite"
+intelligent_cache = IntelligentCacheManager(
+    max_disk_mb=float(os.getenv("CACHE_MAX_DISK_MB", "1024")),
+    backend=create_cache_backend(os.getenv("CACHE_BACKEND", "file"), Path("cache"))
+)
\ No newline at end of file
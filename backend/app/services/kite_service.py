@@ -6,6 +6,8 @@ import pandas as pd
 from kiteconnect import KiteConnect
 from kiteconnect.exceptions import KiteException
 import os
+from .instrument_index import InstrumentIndex, instrument_master
+from .quote_stream import quote_stream
 from ..models.kite import (
     KiteQuote, KiteHistoricalData, KiteInstrument, KiteConfig,
     KiteQuoteResponse, KiteHistoricalResponse, KiteError,
@@ -17,11 +19,12 @@ logger = logging.getLogger(__name__)
 class KiteService:
     """Service for Kite Connect API integration"""
     
+    # Most instruments Kite's quote endpoint accepts per call
+    QUOTE_BATCH_SIZE = 500
+    
     def __init__(self, config: Optional[KiteConfig] = None):
         self.config = config or self._load_config()
         self.kite = None
-        self._instruments_cache = {}
-        self._cache_expiry = {}
         self._session_initialized = False
         
     def _load_config(self) -> KiteConfig:
@@ -46,6 +49,7 @@ class KiteService:
             if self.config.access_token:
                 self.kite.set_access_token(self.config.access_token)
                 self._session_initialized = True
+                self._start_quote_stream()
                 return True
             
             # If we have a request token, generate access token
@@ -57,6 +61,7 @@ class KiteService:
                 self.config.access_token = data["access_token"]
                 self.kite.set_access_token(self.config.access_token)
                 self._session_initialized = True
+                self._start_quote_stream()
                 return True
                 
             logger.error("No access token or request token available")
@@ -66,6 +71,10 @@ class KiteService:
             logger.error(f"Failed to initialize Kite session: {e}")
             return False
     
+    def _start_quote_stream(self):
+        """Stream live ticks for viewed tickers over the session (KITE_TICKER_URL overrides the endpoint)"""
+        quote_stream.start(self.config.api_key, self.config.access_token, root=os.getenv("KITE_TICKER_URL") or None)
+    
     def _is_session_valid(self) -> bool:
         """Check if current session is valid"""
         return self._session_initialized and self.kite is not None
@@ -84,120 +93,139 @@ class KiteService:
             return symbol[:-3]
         return symbol.upper()
     
-    async def get_instruments(self, exchange: Optional[str] = None) -> List[KiteInstrument]:
-        """Get all tradable instruments"""
-        if not self._is_session_valid():
-            return []
-            
+    def _instrument_index(self, exchange: Optional[str]) -> Optional[InstrumentIndex]:
+        """Today's instrument index of an exchange, downloaded only if no process has stored it yet."""
+        fetch = (lambda: self.kite.instruments(exchange)) if self._is_session_valid() else None
         try:
-            cache_key = f"instruments_{exchange or 'all'}"
-            
-            # Check cache (valid for 1 hour)
-            if (cache_key in self._instruments_cache and 
-                cache_key in self._cache_expiry and
-                datetime.now() < self._cache_expiry[cache_key]):
-                return self._instruments_cache[cache_key]
-            
-            # Fetch from API
-            instruments_data = self.kite.instruments(exchange)
-            instruments = []
-            
-            for item in instruments_data:
-                try:
-                    instrument = KiteInstrument(
-                        instrument_token=item['instrument_token'],
-                        exchange_token=item['exchange_token'],
-                        tradingsymbol=item['tradingsymbol'],
-                        name=item['name'],
-                        last_price=item.get('last_price', 0.0),
-                        expiry=datetime.strptime(item['expiry'], '%Y-%m-%d').date() if item.get('expiry') else None,
-                        strike=item.get('strike'),
-                        tick_size=item['tick_size'],
-                        lot_size=item['lot_size'],
-                        instrument_type=KiteInstrumentType(item['instrument_type']),
-                        segment=item['segment'],
-                        exchange=KiteExchange(item['exchange'])
-                    )
-                    instruments.append(instrument)
-                except Exception as e:
-                    logger.warning(f"Error parsing instrument {item}: {e}")
-                    continue
-            
-            # Cache the results
-            self._instruments_cache[cache_key] = instruments
-            self._cache_expiry[cache_key] = datetime.now() + timedelta(hours=1)
-            
-            return instruments
-            
+            return instrument_master.get(exchange, fetch)
         except KiteException as e:
             logger.error(f"Kite API error fetching instruments: {e}")
-            return []
         except Exception as e:
             logger.error(f"Error fetching instruments: {e}")
+        return None
+
+    @staticmethod
+    def _to_instrument(index: InstrumentIndex, row: int) -> Optional[KiteInstrument]:
+        """KiteInstrument model of an index row, None for types and exchanges the model does not cover."""
+        item = index.record(row)
+        try:
+            return KiteInstrument(
+                instrument_token=item['instrument_token'],
+                exchange_token=item['exchange_token'],
+                tradingsymbol=item['tradingsymbol'],
+                name=item['name'],
+                last_price=item['last_price'],
+                expiry=item['expiry'],
+                strike=item['strike'],
+                tick_size=item['tick_size'],
+                lot_size=item['lot_size'],
+                instrument_type=KiteInstrumentType(item['instrument_type']),
+                segment=item['segment'],
+                exchange=KiteExchange(item['exchange'])
+            )
+        except Exception as e:
+            logger.debug(f"Skipping instrument {item}: {e}")
+            return None
+
+    async def get_instruments(self, exchange: Optional[str] = None) -> List[KiteInstrument]:
+        """Get all tradable instruments"""
+        index = await asyncio.to_thread(self._instrument_index, exchange)
+        if index is None:
             return []
+        instruments = (self._to_instrument(index, row) for row in range(len(index)))
+        return [instrument for instrument in instruments if instrument is not None]
     
     async def find_instrument_token(self, symbol: str, exchange: str = "NSE") -> Optional[int]:
         """Find instrument token for a given symbol"""
-        normalized_symbol = self._normalize_symbol(symbol)
-        instruments = await self.get_instruments(exchange)
-        
-        for instrument in instruments:
-            if (instrument.tradingsymbol == normalized_symbol and 
-                instrument.exchange.value == exchange and
-                instrument.instrument_type == KiteInstrumentType.EQ):
-                return instrument.instrument_token
-        
-        return None
+        index = await asyncio.to_thread(self._instrument_index, exchange)
+        if index is None:
+            return None
+        return index.token(exchange, self._normalize_symbol(symbol), KiteInstrumentType.EQ.value)
+    
+    @staticmethod
+    def _parse_quote(instrument_token: int, data: Dict[str, Any]) -> KiteQuote:
+        """KiteQuote from one instrument's entry in a kite.quote() response"""
+        return KiteQuote(
+            instrument_token=instrument_token,
+            timestamp=datetime.now(),
+            last_price=data['last_price'],
+            last_quantity=data.get('last_quantity', 0),
+            last_trade_time=datetime.strptime(data['last_trade_time'], '%Y-%m-%d %H:%M:%S') if data.get('last_trade_time') else datetime.now(),
+            change=data.get('net_change', 0),
+            change_percent=data.get('change_percent', 0),
+            volume=data.get('volume', 0),
+            average_price=data.get('average_price', 0),
+            oi=data.get('oi'),
+            oi_day_high=data.get('oi_day_high'),
+            oi_day_low=data.get('oi_day_low'),
+            ohlc=data.get('ohlc', {}),
+            depth=data.get('depth', {}),
+            upper_circuit_limit=data.get('upper_circuit_limit'),
+            lower_circuit_limit=data.get('lower_circuit_limit')
+        )
     
     async def get_quote(self, symbol: str) -> Optional[KiteQuote]:
         """Get real-time quote for a symbol"""
-        if not self._is_session_valid():
-            logger.warning("Kite session not initialized, cannot fetch quote")
-            return None
+        return (await self.get_quotes([symbol]))[symbol]
+    
+    async def get_quotes(self, symbols: List[str], exchange: str = "NSE") -> Dict[str, Optional[KiteQuote]]:
+        """
+        Get real-time quotes for many symbols in as few API calls as possible.
+        
+        Tokens are resolved from the instrument index in one pass and quoted
+        QUOTE_BATCH_SIZE instruments per kite.quote() call. The calls run one
+        after another (the quote endpoint is rate limited per second) on a
+        worker thread, so the event loop keeps serving while they wait.
+        
+        Args:
+            symbols: Trading symbols, with or without the .NS suffix
+            exchange: Exchange the symbols are listed on
             
-        try:
-            # Find instrument token
-            instrument_token = await self.find_instrument_token(symbol)
-            if not instrument_token:
+        Returns:
+            Quote per requested symbol, None where none could be fetched
+        """
+        quotes: Dict[str, Optional[KiteQuote]] = {symbol: None for symbol in symbols}
+        if not self._is_session_valid():
+            logger.warning("Kite session not initialized, cannot fetch quotes")
+            return quotes
+        
+        index = await asyncio.to_thread(self._instrument_index, exchange)
+        if index is None:
+            return quotes
+        
+        symbols_by_token: Dict[int, List[str]] = {}
+        for symbol in symbols:
+            instrument_token = index.token(exchange, self._normalize_symbol(symbol), KiteInstrumentType.EQ.value)
+            if instrument_token is None:
                 logger.warning(f"Instrument token not found for {symbol}")
-                return None
-            
-            # Get quote data
-            quote_data = self.kite.quote([instrument_token])
-            
-            if str(instrument_token) not in quote_data:
-                return None
-                
-            data = quote_data[str(instrument_token)]
-            
-            # Parse the quote data
-            quote = KiteQuote(
-                instrument_token=instrument_token,
-                timestamp=datetime.now(),
-                last_price=data['last_price'],
-                last_quantity=data.get('last_quantity', 0),
-                last_trade_time=datetime.strptime(data['last_trade_time'], '%Y-%m-%d %H:%M:%S') if data.get('last_trade_time') else datetime.now(),
-                change=data.get('net_change', 0),
-                change_percent=data.get('change_percent', 0),
-                volume=data.get('volume', 0),
-                average_price=data.get('average_price', 0),
-                oi=data.get('oi'),
-                oi_day_high=data.get('oi_day_high'),
-                oi_day_low=data.get('oi_day_low'),
-                ohlc=data.get('ohlc', {}),
-                depth=data.get('depth', {}),
-                upper_circuit_limit=data.get('upper_circuit_limit'),
-                lower_circuit_limit=data.get('lower_circuit_limit')
-            )
-            
-            return quote
+                continue
+            symbols_by_token.setdefault(instrument_token, []).append(symbol)
+        
+        tokens = list(symbols_by_token)
+        for i in range(0, len(tokens), self.QUOTE_BATCH_SIZE):
+            batch = tokens[i:i + self.QUOTE_BATCH_SIZE]
+            try:
+                quote_data = await asyncio.to_thread(self.kite.quote, batch)
+            except KiteException as e:
+                logger.error(f"Kite API error fetching quotes for {len(batch)} instruments: {e}")
+                continue
+            except Exception as e:
+                logger.error(f"Error fetching quotes for {len(batch)} instruments: {e}")
+                continue
             
-        except KiteException as e:
-            logger.error(f"Kite API error fetching quote for {symbol}: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"Error fetching quote for {symbol}: {e}")
-            return None
+            for instrument_token in batch:
+                data = quote_data.get(str(instrument_token))
+                if data is None:
+                    continue
+                try:
+                    quote = self._parse_quote(instrument_token, data)
+                except Exception as e:
+                    logger.warning(f"Error parsing quote for instrument {instrument_token}: {e}")
+                    continue
+                for symbol in symbols_by_token[instrument_token]:
+                    quotes[symbol] = quote
+        
+        return quotes
     
     async def get_historical_data(
         self, 
@@ -266,20 +294,13 @@ class KiteService:
     
     async def search_instruments(self, query: str, exchange: str = "NSE") -> List[KiteInstrument]:
         """Search for instruments by name or symbol"""
-        instruments = await self.get_instruments(exchange)
-        query_lower = query.lower()
-        
-        matches = []
-        for instrument in instruments:
-            if (query_lower in instrument.tradingsymbol.lower() or 
-                query_lower in instrument.name.lower()):
-                matches.append(instrument)
-                
-            # Limit results to prevent overwhelming response
-            if len(matches) >= 20:
-                break
+        index = await asyncio.to_thread(self._instrument_index, exchange)
+        if index is None:
+            return []
         
-        return matches
+        # Limit results to prevent overwhelming response
+        instruments = (self._to_instrument(index, row) for row in index.search(query, limit=20, exchange=exchange))
+        return [instrument for instrument in instruments if instrument is not None]
     
     async def get_portfolio(self) -> List[Dict[str, Any]]:
         """Get portfolio holdings (requires authenticated session)"""
@@ -299,8 +320,8 @@ class KiteService:
                 # Kite doesn't have explicit session cleanup
                 self.kite = None
             self._session_initialized = False
-            self._instruments_cache.clear()
-            self._cache_expiry.clear()
+            quote_stream.stop()
+            instrument_master.clear()
         except Exception as e:
             logger.error(f"Error closing Kite session: {e}")
 
@@ -0,0 +1,238 @@
+import asyncio
+import logging
+import os
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+import pandas as pd
+import yfinance as yf
+
+logger = logging.getLogger(__name__)
+
+
+class UpstreamCallStats:
+    """Upstream (yfinance) calls made within one counting scope, e.g. one HTTP request."""
+
+    def __init__(self):
+        self.by_kind: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, count: int = 1):
+        with self._lock:
+            self.by_kind[kind] += count
+
+    @property
+    def total(self) -> int:
+        return sum(self.by_kind.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"total": self.total, "by_kind": dict(self.by_kind)}
+
+
+_upstream_stats: ContextVar[Optional[UpstreamCallStats]] = ContextVar("upstream_stats", default=None)
+
+
+@contextmanager
+def count_upstream_calls() -> Iterator[UpstreamCallStats]:
+    """
+    Count gateway calls made in this context (including threads and tasks it starts).
+
+    Usage:
+        with count_upstream_calls() as stats:
+            await handle_request()
+        logger.info(f"{stats.total} upstream calls")
+    """
+    stats = UpstreamCallStats()
+    token = _upstream_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _upstream_stats.reset(token)
+
+
+class MarketDataGateway:
+    """
+    The single point of contact with yfinance.
+
+    yfinance is blocking (HTTP on the calling thread), so every fetch runs on
+    a bounded thread pool owned by the gateway:
+    - async methods await the pool and never block the event loop
+    - *_sync methods (for code already running in a worker thread) submit to
+      the same pool and wait, so the process-wide number of concurrent
+      upstream calls is capped at max_workers whichever API is used
+    - multi-ticker history goes through one yf.download call per chunk
+      instead of one Ticker.history call per ticker
+
+    Every call is counted in the active count_upstream_calls() scope.
+    Errors from yfinance are raised to the caller, as with direct yfinance use.
+    """
+
+    STATEMENT_ATTRIBUTES = {
+        "annual": ("financials", "balance_sheet", "cashflow"),
+        "quarterly": ("quarterly_financials", "quarterly_balance_sheet", "quarterly_cashflow")
+    }
+
+    def __init__(self, max_workers: int = 8, download_chunk_size: int = 50):
+        self.max_workers = max_workers
+        self.download_chunk_size = download_chunk_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="market-data")
+        self._fetchers = {
+            "info": self._fetch_info,
+            "history": self._fetch_history,
+            "statements": self._fetch_statements,
+            "dividends": self._fetch_dividends,
+            "download": self._download_history
+        }
+
+    def submit(self, kind: str, *args, **kwargs) -> Future:
+        """
+        Start a fetch on the pool without waiting for it.
+
+        Args:
+            kind: "info", "history", "statements", "dividends" or "download"
+            *args, **kwargs: Arguments of the matching get_* method
+
+        Returns:
+            concurrent.futures.Future with the fetched data
+        """
+        stats = _upstream_stats.get()
+        if stats is not None:
+            stats.record(kind)
+        return self._executor.submit(self._fetchers[kind], *args, **kwargs)
+
+    async def _run(self, kind: str, *args, **kwargs) -> Any:
+        return await asyncio.wrap_future(self.submit(kind, *args, **kwargs))
+
+    def _run_sync(self, kind: str, *args, **kwargs) -> Any:
+        return self.submit(kind, *args, **kwargs).result()
+
+    # Blocking fetches (run on the pool)
+
+    @staticmethod
+    def _fetch_info(ticker: str) -> Dict[str, Any]:
+        return yf.Ticker(ticker).info or {}
+
+    @staticmethod
+    def _fetch_history(ticker: str, period: Optional[str] = "1y", **history_kwargs) -> pd.DataFrame:
+        if period is not None:
+            history_kwargs["period"] = period
+        return yf.Ticker(ticker).history(**history_kwargs)
+
+    @classmethod
+    def _fetch_statements(cls, ticker: str, frequency: str = "annual") -> Dict[str, Optional[pd.DataFrame]]:
+        stock = yf.Ticker(ticker)
+        statements = {}
+        for key, attribute in zip(cls.STATEMENT_ATTRIBUTES["annual"], cls.STATEMENT_ATTRIBUTES[frequency]):
+            try:
+                statements[key] = getattr(stock, attribute)
+            except Exception as e:
+                logger.warning(f"Could not fetch {attribute} for {ticker}: {e}")
+                statements[key] = None
+        return statements
+
+    @staticmethod
+    def _fetch_dividends(ticker: str) -> pd.Series:
+        return yf.Ticker(ticker).dividends
+
+    def _download_history(self, tickers: List[str], period: Optional[str] = "1y", **history_kwargs) -> Dict[str, pd.DataFrame]:
+        if period is not None:
+            history_kwargs["period"] = period
+        histories = {}
+        for i in range(0, len(tickers), self.download_chunk_size):
+            chunk = tickers[i:i + self.download_chunk_size]
+            frame = yf.download(
+                chunk, group_by="ticker", auto_adjust=True, progress=False,
+                threads=min(len(chunk), self.max_workers), **history_kwargs
+            )
+            histories.update(self._split_download(frame, chunk))
+        return histories
+
+    @staticmethod
+    def _split_download(frame: Optional[pd.DataFrame], tickers: List[str]) -> Dict[str, pd.DataFrame]:
+        """Split a yf.download frame into per-ticker frames shaped like Ticker.history."""
+        histories = {ticker: pd.DataFrame() for ticker in tickers}
+        if frame is None or frame.empty:
+            return histories
+
+        for ticker in tickers:
+            if isinstance(frame.columns, pd.MultiIndex):
+                if ticker not in frame.columns.get_level_values(0):
+                    continue
+                history = frame[ticker]
+            else:
+                history = frame
+            histories[ticker] = history.dropna(how="all")
+        return histories
+
+    # Async API
+
+    async def get_info(self, ticker: str) -> Dict[str, Any]:
+        """Company info dict (empty if yfinance has none)."""
+        return await self._run("info", ticker)
+
+    async def get_history(self, ticker: str, period: Optional[str] = "1y", **history_kwargs) -> pd.DataFrame:
+        """
+        OHLCV history for one ticker.
+
+        Args:
+            ticker: Stock ticker symbol
+            period: yfinance period ("5d", "3mo", "1y", ...); pass None with start/end
+            **history_kwargs: Other Ticker.history arguments (start, end, interval)
+        """
+        return await self._run("history", ticker, period, **history_kwargs)
+
+    async def get_histories(self, tickers: List[str], period: Optional[str] = "1y", **history_kwargs) -> Dict[str, pd.DataFrame]:
+        """
+        OHLCV history for many tickers, batched through yf.download.
+
+        Returns:
+            Dictionary of ticker -> history (empty DataFrame when yfinance had none)
+        """
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return {}
+        return await self._run("download", tickers, period, **history_kwargs)
+
+    async def get_statements(self, ticker: str, frequency: str = "annual") -> Dict[str, Optional[pd.DataFrame]]:
+        """
+        Financial statements for one ticker.
+
+        Args:
+            ticker: Stock ticker symbol
+            frequency: "annual" or "quarterly"
+
+        Returns:
+            Dictionary with financials, balance_sheet and cashflow (None where unavailable)
+        """
+        return await self._run("statements", ticker, frequency)
+
+    async def get_dividends(self, ticker: str) -> pd.Series:
+        """Dividend history for one ticker."""
+        return await self._run("dividends", ticker)
+
+    # Sync API - for code already running off the event loop
+
+    def get_info_sync(self, ticker: str) -> Dict[str, Any]:
+        return self._run_sync("info", ticker)
+
+    def get_history_sync(self, ticker: str, period: Optional[str] = "1y", **history_kwargs) -> pd.DataFrame:
+        return self._run_sync("history", ticker, period, **history_kwargs)
+
+    def get_histories_sync(self, tickers: List[str], period: Optional[str] = "1y", **history_kwargs) -> Dict[str, pd.DataFrame]:
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return {}
+        return self._run_sync("download", tickers, period, **history_kwargs)
+
+    def get_statements_sync(self, ticker: str, frequency: str = "annual") -> Dict[str, Optional[pd.DataFrame]]:
+        return self._run_sync("statements", ticker, frequency)
+
+
+# Global gateway instance
+market_data_gateway = MarketDataGateway(
+    max_workers=int(os.getenv("MARKET_DATA_MAX_WORKERS", "8"))
+)
@@ -2,7 +2,6 @@ import logging
 from typing import Dict, Any, Optional, List, Tuple
 from enum import Enum
 from datetime import datetime
-import yfinance as yf
 from ..models.dcf import (
     DCFAssumptions, DCFValuation, DCFProjection, 
     DCFMode, GrowthStage, MultiStageAssumptions,
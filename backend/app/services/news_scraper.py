@@ -10,6 +10,8 @@ import time
 from dataclasses import dataclass
 from collections import defaultdict
 
+from .company_snapshot import CompanySnapshot
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -429,12 +431,21 @@ class NewsScraperService:
         ticker: str, 
         limit: int = 10, 
         days: int = 7,
-        force_refresh: bool = False
+        force_refresh: bool = False,
+        snapshot: Optional[CompanySnapshot] = None
     ) -> List[Dict[str, Any]]:
-        """Get recent news articles for a ticker with sentiment analysis."""
+        """
+        Get recent news articles for a ticker with sentiment analysis.
+        
+        A CompanySnapshot from the calling analysis supplies the full company
+        name from its (already fetched) info instead of the static mapping.
+        """
         try:
             # Extract company name from ticker
-            company_name = self._get_company_name(ticker)
+            company_name = None
+            if snapshot is not None:
+                company_name = (await snapshot.info()).get('longName')
+            company_name = company_name or self._get_company_name(ticker)
             
             logger.info(f"📰 Fetching {limit} recent articles for {ticker} ({company_name})")
             
@@ -0,0 +1,504 @@
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .market_data_gateway import MarketDataGateway, market_data_gateway
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class OHLCVColumns:
+    """
+    One ticker's bars as parallel float64 columns.
+
+    Served by OHLCVStore.get_columns_sync these are views of the memory-mapped
+    store file - read-only, and never copied unless a caller does so.
+    """
+
+    timestamps: np.ndarray  # epoch seconds
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    tz: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def tail(self, n: int) -> "OHLCVColumns":
+        """The last n bars (views, no copy)."""
+        start = max(len(self) - n, 0)
+        return OHLCVColumns(
+            self.timestamps[start:], self.open[start:], self.high[start:],
+            self.low[start:], self.close[start:], self.volume[start:], tz=self.tz
+        )
+
+    def dates(self) -> pd.DatetimeIndex:
+        """Bar timestamps as a DatetimeIndex in the exchange timezone."""
+        index = pd.to_datetime(self.timestamps.astype(np.int64), unit="s", utc=bool(self.tz))
+        return index.tz_convert(self.tz) if self.tz else index
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "OHLCVColumns":
+        """Columns of a Ticker.history style DataFrame."""
+        array = OHLCVStore._to_array(frame)
+        return cls(*array, tz=str(frame.index.tz) if frame.index.tz is not None else None)
+
+
+class OHLCVStore:
+    """
+    On-disk daily OHLCV history per ticker, topped up incrementally.
+
+    Each ticker is one columnar float64 .npy file of shape (6, bars) - epoch
+    seconds, Open, High, Low, Close, Volume - opened memory-mapped on read,
+    plus a small JSON sidecar recording the timezone, how far back the
+    history was requested (covered_from) and when it was last refreshed.
+
+    A request only goes upstream for what is missing:
+    - nothing stored: one fetch of the requested period
+    - older bars than covered_from: one fetch of the missing head
+    - last refresh older than max_age: one fetch from the second to last
+      stored bar; if the completed bar in that overlap no longer matches
+      (dividend/split re-adjustment by yfinance) the covered range is
+      fetched again in full
+
+    Any period is then served as a slice of the stored bars. Files are
+    replaced atomically, so every worker process can read the store while
+    another one writes it.
+    """
+
+    COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+    # Calendar days per yfinance period
+    PERIOD_DAYS = {
+        "5d": 5, "1mo": 31, "3mo": 92, "6mo": 183,
+        "1y": 366, "2y": 731, "3y": 1096, "5y": 1827, "10y": 3653
+    }
+
+    # Tolerance when comparing covered_from against a later request: a period
+    # ending at a latest bar from before a weekend or holiday reaches a few
+    # days further back without there being bars to fetch
+    COVERAGE_SLACK = timedelta(days=5)
+
+    def __init__(
+        self,
+        root: str = "cache/ohlcv",
+        gateway: Optional[MarketDataGateway] = None,
+        max_age: float = 900,
+        max_workers: int = 8
+    ):
+        """
+        Args:
+            root: Directory holding one .npy/.json pair per ticker
+            gateway: Gateway used for upstream fetches
+            max_age: Seconds after which a ticker's tail is fetched again
+            max_workers: Threads serving the async API and submit_history
+        """
+        self.root = Path(root)
+        self.gateway = gateway or market_data_gateway
+        self.max_age = max_age
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ohlcv-store")
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    # Storage
+
+    def _paths(self, ticker: str) -> Tuple[Path, Path]:
+        name = re.sub(r"[^A-Za-z0-9._-]", "_", ticker)
+        return self.root / f"{name}.npy", self.root / f"{name}.json"
+
+    def _ticker_lock(self, ticker: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _read(self, ticker: str) -> Tuple[Optional[np.ndarray], Dict[str, Any]]:
+        """Memory-mapped bars and metadata of a ticker, (None, {}) if not stored."""
+        data_path, meta_path = self._paths(ticker)
+        try:
+            meta = json.loads(meta_path.read_text())
+            data = np.load(data_path, mmap_mode="r")
+        except (FileNotFoundError, ValueError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f"Discarding unreadable OHLCV data for {ticker}: {e}")
+            return None, {}
+        return data, meta
+
+    def _write(self, ticker: str, data: np.ndarray, meta: Dict[str, Any]):
+        self.root.mkdir(parents=True, exist_ok=True)
+        data_path, meta_path = self._paths(ticker)
+        for path, write in (
+            (data_path, lambda f: np.save(f, np.ascontiguousarray(data))),
+            (meta_path, lambda f: f.write(json.dumps(meta).encode()))
+        ):
+            temp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+            try:
+                with open(temp_path, "wb") as f:
+                    write(f)
+                os.replace(temp_path, path)
+            finally:
+                temp_path.unlink(missing_ok=True)
+
+    @classmethod
+    def _is_ohlcv(cls, frame: Any) -> bool:
+        return (
+            isinstance(frame, pd.DataFrame)
+            and isinstance(frame.index, pd.DatetimeIndex)
+            and all(column in frame.columns for column in cls.COLUMNS)
+        )
+
+    @classmethod
+    def _to_array(cls, frame: pd.DataFrame) -> np.ndarray:
+        index = frame.index
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        seconds = index.as_unit("s").asi8.astype(np.float64)
+        return np.vstack([seconds] + [frame[column].to_numpy(dtype=np.float64) for column in cls.COLUMNS])
+
+    @classmethod
+    def _to_frame(cls, data: np.ndarray, tz: Optional[str]) -> pd.DataFrame:
+        index = pd.to_datetime(data[0].astype(np.int64), unit="s", utc=bool(tz))
+        if tz:
+            index = index.tz_convert(tz)
+        frame = pd.DataFrame(
+            {column: np.array(data[row + 1]) for row, column in enumerate(cls.COLUMNS)},
+            index=pd.DatetimeIndex(index.as_unit("ns"), name="Date")
+        )
+        return frame.dropna(how="all")
+
+    @staticmethod
+    def _merge(data: Optional[np.ndarray], new: np.ndarray) -> np.ndarray:
+        """Union of two bar arrays by timestamp, new bars winning on overlap."""
+        if data is None or data.shape[1] == 0:
+            return new
+        kept = np.asarray(data)[:, ~np.isin(data[0], new[0])]
+        merged = np.concatenate([kept, new], axis=1)
+        return merged[:, np.argsort(merged[0], kind="stable")]
+
+    @staticmethod
+    def _timestamp(seconds: float, tz: Optional[str]) -> pd.Timestamp:
+        stamp = pd.Timestamp(seconds, unit="s", tz="UTC" if tz else None)
+        return stamp.tz_convert(tz) if tz else stamp
+
+    # Updating
+
+    def _since(self, period: Optional[str], start: Optional[datetime]) -> Optional[datetime]:
+        if start is not None:
+            return pd.Timestamp(start).to_pydatetime().replace(tzinfo=None)
+        if period in self.PERIOD_DAYS:
+            return datetime.now() - timedelta(days=self.PERIOD_DAYS[period])
+        return None
+
+    def _missing(self, data: Optional[np.ndarray], meta: Dict[str, Any], since: datetime, max_age: float) -> Optional[str]:
+        """What a request reaching back to `since` needs fetched: "all", "head", "tail" or None."""
+        if data is None:
+            return "all"
+        if since < datetime.fromtimestamp(meta["covered_from"]) - self.COVERAGE_SLACK:
+            return "head"
+        if time.time() - meta["refreshed_at"] > max_age:
+            return "tail"
+        return None
+
+    def _store_full(self, ticker: str, frame: pd.DataFrame, since: datetime):
+        self._write(ticker, self._to_array(frame), {
+            "tz": str(frame.index.tz) if frame.index.tz is not None else None,
+            "covered_from": since.timestamp(),
+            "refreshed_at": time.time()
+        })
+
+    def _apply_head(self, ticker: str, data: np.ndarray, meta: Dict[str, Any], frame: pd.DataFrame, since: datetime):
+        if self._is_ohlcv(frame) and not frame.empty:
+            data = self._merge(data, self._to_array(frame))
+        self._write(ticker, data, {**meta, "covered_from": since.timestamp()})
+
+    def _tail_start(self, data: np.ndarray, meta: Dict[str, Any]) -> pd.Timestamp:
+        """Date to fetch the tail from: the second to last bar, the last one may be a partial session."""
+        return self._timestamp(data[0, max(data.shape[1] - 2, 0)], meta.get("tz")).normalize()
+
+    def _apply_tail(self, ticker: str, data: np.ndarray, meta: Dict[str, Any], frame: Any) -> bool:
+        """
+        Merge a fetched tail into the stored bars.
+
+        Returns:
+            False if the stored history was re-adjusted upstream and must be fetched again
+        """
+        if self._is_ohlcv(frame) and not frame.empty:
+            new = self._to_array(frame)
+            if data.shape[1] >= 2:
+                # The completed bar both copies share must be unchanged
+                reference = data[:, -2]
+                overlap = np.flatnonzero(new[0] == reference[0])
+                if overlap.size and not np.isclose(new[4, overlap[0]], reference[4], rtol=1e-4):
+                    return False
+            data = self._merge(data, new)
+        self._write(ticker, data, {**meta, "refreshed_at": time.time()})
+        return True
+
+    def _refresh(self, ticker: str, period: Optional[str], since: datetime, max_age: float) -> Optional[Any]:
+        """
+        Bring a ticker's stored bars up to date for a request reaching back to `since`.
+
+        Returns:
+            None once the store can serve the request; a fetched result that is not
+            OHLCV data (nothing to store) is returned for the caller to use as is
+        """
+        data, meta = self._read(ticker)
+        if period is not None and data is not None and data.shape[1]:
+            # Periods end at the latest stored bar (see _slice), which may predate today
+            since = min(since, datetime.fromtimestamp(data[0, -1]) - timedelta(days=self.PERIOD_DAYS[period]))
+        missing = self._missing(data, meta, since, max_age)
+
+        if missing == "all":
+            frame = self.gateway.get_history_sync(ticker, period=period, **({} if period else {"start": since}))
+            if not self._is_ohlcv(frame) or frame.empty:
+                return frame
+            self._store_full(ticker, frame, since)
+            return None
+
+        if missing == "head":
+            first = self._timestamp(data[0, 0], meta.get("tz"))
+            frame = self.gateway.get_history_sync(ticker, period=None, start=since, end=first.strftime("%Y-%m-%d"))
+            self._apply_head(ticker, data, meta, frame, since)
+            data, meta = self._read(ticker)
+            missing = self._missing(data, meta, since, max_age)
+
+        if missing == "tail":
+            frame = self.gateway.get_history_sync(ticker, period=None, start=self._tail_start(data, meta).strftime("%Y-%m-%d"))
+            if not self._apply_tail(ticker, data, meta, frame):
+                logger.info(f"Stored history for {ticker} was re-adjusted upstream, fetching it again")
+                covered_from = datetime.fromtimestamp(meta["covered_from"])
+                self._store_full(ticker, self.gateway.get_history_sync(ticker, period=None, start=covered_from), covered_from)
+        return None
+
+    def _window(self, data: np.ndarray, meta: Dict[str, Any], period: Optional[str],
+                start: Optional[datetime], end: Optional[datetime]) -> np.ndarray:
+        """The bars a request covers, as a view of the (memory-mapped) stored array."""
+        tz = meta.get("tz")
+        if data.shape[1] == 0:
+            return data
+        if start is not None:
+            lo = np.searchsorted(data[0], self._seconds(start, tz), side="left")
+        else:
+            # Periods end at the latest stored bar, as they do for a fresh download
+            lo = np.searchsorted(data[0], data[0, -1] - self.PERIOD_DAYS[period] * 86400, side="right")
+        hi = np.searchsorted(data[0], self._seconds(end, tz), side="left") if end is not None else data.shape[1]
+        return data[:, lo:hi]
+
+    @staticmethod
+    def _seconds(moment: datetime, tz: Optional[str]) -> float:
+        stamp = pd.Timestamp(moment)
+        if tz and stamp.tzinfo is None:
+            stamp = stamp.tz_localize(tz)
+        elif not tz and stamp.tzinfo is not None:
+            stamp = stamp.tz_localize(None)
+        return stamp.timestamp() if stamp.tzinfo is not None else (stamp - pd.Timestamp(0)).total_seconds()
+
+    # Sync API
+
+    def get_history_sync(
+        self,
+        ticker: str,
+        period: Optional[str] = "1y",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        max_age: Optional[float] = None
+    ) -> pd.DataFrame:
+        """
+        Daily OHLCV history, from the store and topped up from yfinance if needed.
+
+        Args:
+            ticker: Stock ticker symbol
+            period: yfinance period ("5d", "6mo", "1y", ...); pass None with start/end
+            start: First date to include (instead of period)
+            end: Date to stop before
+            max_age: Seconds the stored tail may be old, overriding the store default
+
+        Returns:
+            DataFrame with Open, High, Low, Close and Volume columns, like Ticker.history
+        """
+        since = self._since(period, start)
+        if since is None:
+            # Not expressible as a range ("max", "ytd") - straight to yfinance
+            return self.gateway.get_history_sync(ticker, period=period)
+
+        stored = self._load(ticker, period, start, since, max_age)
+        if not isinstance(stored, tuple):
+            return stored
+        data, meta = stored
+        return self._to_frame(self._window(data, meta, period if start is None else None, start, end), meta.get("tz"))
+
+    def get_columns_sync(
+        self,
+        ticker: str,
+        period: str = "1y",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        max_age: Optional[float] = None
+    ) -> Optional["OHLCVColumns"]:
+        """
+        Daily OHLCV history as read-only column views of the memory-mapped store.
+
+        Nothing is copied: the columns share the page cache with every other
+        process reading the ticker. Arguments are those of get_history_sync.
+
+        Returns:
+            OHLCVColumns, None if yfinance has no data for the ticker
+        """
+        since = self._since(period, start)
+        if since is None:
+            frame = self.gateway.get_history_sync(ticker, period=period)
+            return OHLCVColumns.from_frame(frame) if self._is_ohlcv(frame) and not frame.empty else None
+
+        stored = self._load(ticker, period, start, since, max_age)
+        if not isinstance(stored, tuple):
+            return OHLCVColumns.from_frame(stored) if self._is_ohlcv(stored) and not stored.empty else None
+        data, meta = stored
+        window = self._window(data, meta, period if start is None else None, start, end)
+        return OHLCVColumns(*window, tz=meta.get("tz"))
+
+    def _load(self, ticker: str, period: Optional[str], start: Optional[datetime], since: datetime,
+              max_age: Optional[float]) -> Any:
+        """Refreshed (data, meta) of a ticker, or the fetched result when it could not be stored."""
+        with self._ticker_lock(ticker):
+            try:
+                passthrough = self._refresh(
+                    ticker, period if start is None else None, since,
+                    self.max_age if max_age is None else max_age
+                )
+            except Exception as e:
+                if self._read(ticker)[0] is None:
+                    raise
+                logger.warning(f"Could not update stored history for {ticker}, serving stored bars: {e}")
+                passthrough = None
+            if passthrough is not None:
+                return passthrough
+            return self._read(ticker)
+
+    def get_histories_sync(self, tickers: List[str], period: str = "1y") -> Dict[str, pd.DataFrame]:
+        """
+        OHLCV history for many tickers, with upstream fetches batched.
+
+        Tickers not stored yet are downloaded in one yf.download batch and
+        stale tails in another; the rest is served from disk.
+
+        Returns:
+            Dictionary of ticker -> history (empty DataFrame when yfinance had none)
+        """
+        tickers = list(dict.fromkeys(tickers))
+        if self._since(period, None) is None:
+            return {ticker: self.get_history_sync(ticker, period) for ticker in tickers}
+
+        histories, fresh = self._refresh_many(tickers, period)
+        for ticker in tickers:
+            if ticker in fresh:
+                data, meta = fresh[ticker]
+                histories[ticker] = self._to_frame(self._window(data, meta, period, None, None), meta.get("tz"))
+            elif ticker not in histories:
+                histories[ticker] = self.get_history_sync(ticker, period)
+        return histories
+
+    def get_columns_many_sync(self, tickers: List[str], period: str = "1y") -> Dict[str, Optional["OHLCVColumns"]]:
+        """
+        Column views for many tickers, with upstream fetches batched as in get_histories_sync.
+
+        Returns:
+            Dictionary of ticker -> OHLCVColumns (None when yfinance had none or the fetch failed)
+        """
+        tickers = list(dict.fromkeys(tickers))
+        if self._since(period, None) is None:
+            return {ticker: self.get_columns_sync(ticker, period) for ticker in tickers}
+
+        unstored, fresh = self._refresh_many(tickers, period)
+        columns = {}
+        for ticker in tickers:
+            if ticker in fresh:
+                data, meta = fresh[ticker]
+                columns[ticker] = OHLCVColumns(*self._window(data, meta, period, None, None), tz=meta.get("tz"))
+                continue
+            try:
+                columns[ticker] = None if ticker in unstored else self.get_columns_sync(ticker, period)
+            except Exception as e:
+                logger.warning(f"No history for {ticker}: {e}")
+                columns[ticker] = None
+        return columns
+
+    def _refresh_many(self, tickers: List[str], period: str) -> Tuple[Dict[str, pd.DataFrame], Dict[str, Tuple[np.ndarray, Dict[str, Any]]]]:
+        """
+        Store missing and stale history of many tickers in two yf.download batches.
+
+        Returns:
+            Fetched results that could not be stored (empty or not OHLCV), and
+            the (data, meta) of tickers that needed nothing fetched, by ticker
+        """
+        since = self._since(period, None)
+        cold, stale, fresh = [], {}, {}
+        for ticker in tickers:
+            data, meta = self._read(ticker)
+            missing = self._missing(data, meta, since, self.max_age)
+            if missing == "all":
+                cold.append(ticker)
+            elif missing == "tail":
+                stale[ticker] = self._tail_start(data, meta)
+            elif missing is None:
+                fresh[ticker] = (data, meta)
+
+        histories = {}
+        if cold:
+            for ticker, frame in self.gateway.get_histories_sync(cold, period=period).items():
+                if not self._is_ohlcv(frame) or frame.empty:
+                    histories[ticker] = frame
+                    continue
+                with self._ticker_lock(ticker):
+                    self._store_full(ticker, frame, since)
+        if stale:
+            start = min(stale.values()).strftime("%Y-%m-%d")
+            for ticker, frame in self.gateway.get_histories_sync(list(stale), period=None, start=start).items():
+                with self._ticker_lock(ticker):
+                    data, meta = self._read(ticker)
+                    if data is not None and self._missing(data, meta, since, self.max_age) == "tail":
+                        # A re-adjusted ticker is left stale and refetched in full below
+                        self._apply_tail(ticker, data, meta, frame)
+        return histories, fresh
+
+    # Async API
+
+    def submit_history(self, ticker: str, period: Optional[str] = "1y", **kwargs) -> Future:
+        """Start get_history_sync on the store's pool without waiting for it."""
+        return self._executor.submit(contextvars.copy_context().run, self.get_history_sync, ticker, period, **kwargs)
+
+    async def get_history(self, ticker: str, period: Optional[str] = "1y", **kwargs) -> pd.DataFrame:
+        """Async get_history_sync."""
+        return await asyncio.wrap_future(self.submit_history(ticker, period, **kwargs))
+
+    async def get_histories(self, tickers: List[str], period: str = "1y") -> Dict[str, pd.DataFrame]:
+        """Async get_histories_sync."""
+        future = self._executor.submit(contextvars.copy_context().run, self.get_histories_sync, tickers, period)
+        return await asyncio.wrap_future(future)
+
+    def clear(self, ticker: str):
+        """Drop a ticker's stored history."""
+        with self._ticker_lock(ticker):
+            for path in self._paths(ticker):
+                path.unlink(missing_ok=True)
+
+
+# Global store instance
+ohlcv_store = OHLCVStore(
+    root=os.getenv("OHLCV_STORE_DIR", "cache/ohlcv"),
+    max_age=float(os.getenv("OHLCV_MAX_AGE_SECONDS", "900"))
+)
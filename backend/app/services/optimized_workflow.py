@@ -2,11 +2,11 @@ import asyncio
 import logging
 from typing import Dict, Any, Optional, List, Callable
 from datetime import datetime
-import yfinance as yf
 from .optimized_ai_service import optimized_ai_service
 from .multi_model_dcf import multi_model_dcf_service
 from .news_scraper import news_scraper
 from .intelligent_cache import intelligent_cache, CacheType
+from .company_snapshot import CompanySnapshot
 from ..models.dcf import DCFAssumptions, DCFValuation
 
 logger = logging.getLogger(__name__)
@@ -92,9 +92,11 @@ class OptimizedWorkflowService:
             _check_cancellation()
             self._notify_progress("ingestion", 10, f"Gathering {ticker} financial data...")
             
-            # Parallel data fetching for speed optimization
-            company_task = self._fetch_company_data(ticker)
-            news_task = self._fetch_news_data(ticker, max_news_articles)
+            # Parallel data fetching for speed optimization; both need the
+            # company info, so they share one snapshot (one info fetch)
+            snapshot = CompanySnapshot(ticker)
+            company_task = self._fetch_company_data(ticker, snapshot=snapshot)
+            news_task = self._fetch_news_data(ticker, max_news_articles, snapshot=snapshot)
             
             company_data, news_articles = await asyncio.gather(
                 company_task, news_task, return_exceptions=True
@@ -115,26 +117,16 @@ class OptimizedWorkflowService:
             _check_cancellation()
             self._notify_progress("model_selection", 35, "Selecting optimal valuation model...")
             
-            # Check cache for model recommendations (24hr TTL)
+            # Model recommendations (24hr TTL) - concurrent misses share one calculation
             cache_key_params = {'has_user_assumptions': user_assumptions is not None}
-            cached_multi_model = await self.cache_manager.get(
-                CacheType.MODEL_RECOMMENDATIONS, ticker, **cache_key_params
-            )
-            
-            if cached_multi_model:
-                logger.info(f"Using cached model recommendations for {ticker}")
-                multi_model_result = cached_multi_model
-            else:
-                # Get fresh model recommendation and multi-model analysis
-                multi_model_result = await multi_model_dcf_service.calculate_multi_model_valuation(
+            multi_model_result = await self.cache_manager.get_or_compute(
+                CacheType.MODEL_RECOMMENDATIONS,
+                ticker,
+                lambda: multi_model_dcf_service.calculate_multi_model_valuation(
                     ticker, company_data, user_assumptions.revenue_growth_rate if user_assumptions else None
-                )
-                
-                # Cache model recommendations for 24 hours
-                if multi_model_result:
-                    await self.cache_manager.set(
-                        CacheType.MODEL_RECOMMENDATIONS, ticker, multi_model_result, **cache_key_params
-                    )
+                ),
+                **cache_key_params
+            )
             
             _check_cancellation()
             self._notify_progress("analysis", 50, "Running AI Analysis Engine...")
@@ -147,27 +139,17 @@ class OptimizedWorkflowService:
                 'has_user_assumptions': user_assumptions is not None
             }
             
-            cached_analysis = await self.cache_manager.get(
-                CacheType.AI_INSIGHTS, ticker, **ai_cache_params
+            # Concurrent misses for the same ticker share a single paid AI call
+            analysis_result = await self.cache_manager.get_or_compute(
+                CacheType.AI_INSIGHTS,
+                ticker,
+                lambda: optimized_ai_service.analysis_engine_agent(company_data, news_articles),
+                **ai_cache_params
             )
             
-            if cached_analysis:
-                logger.info(f"Using cached AI analysis for {ticker}")
-                analysis_result = cached_analysis
-            else:
-                # Enhanced analysis with model-specific context
-                analysis_result = await optimized_ai_service.analysis_engine_agent(
-                    company_data, news_articles
-                )
-                
-                if not analysis_result:
-                    logger.error("Analysis Engine failed")
-                    return None
-                
-                # Cache AI insights for 6 hours
-                await self.cache_manager.set(
-                    CacheType.AI_INSIGHTS, ticker, analysis_result, **ai_cache_params
-                )
+            if not analysis_result:
+                logger.error("Analysis Engine failed")
+                return None
             
             _check_cancellation()
             self._notify_progress("analysis", 70, "Analysis Engine complete")
@@ -255,37 +237,38 @@ class OptimizedWorkflowService:
             self._notify_progress("error", 0, f"Analysis failed: {str(e)}")
             return None
     
-    async def _fetch_company_data(self, ticker: str) -> Optional[Dict[str, Any]]:
+    async def _fetch_company_data(self, ticker: str, snapshot: Optional[CompanySnapshot] = None) -> Optional[Dict[str, Any]]:
         """Fetch company financial data with intelligent caching (24hr TTL)."""
         try:
-            # Check cache first
-            cached_data = await self.cache_manager.get(CacheType.FINANCIAL_DATA, ticker)
-            if cached_data:
-                logger.info(f"Using cached financial data for {ticker}")
-                return cached_data
-            
+            return await self.cache_manager.get_or_compute(
+                CacheType.FINANCIAL_DATA, ticker, lambda: self._fetch_fresh_company_data(ticker, snapshot)
+            )
+        except Exception as e:
+            logger.error(f"Error fetching company data for {ticker}: {e}")
+            return None
+    
+    async def _fetch_fresh_company_data(self, ticker: str, snapshot: Optional[CompanySnapshot] = None) -> Optional[Dict[str, Any]]:
+        """Fetch company financial data from yfinance (cache producer)."""
+        try:
             logger.info(f"Fetching fresh financial data for {ticker}")
-            
-            stock = yf.Ticker(ticker)
+            snapshot = snapshot or CompanySnapshot(ticker)
             
             # Get basic info
-            info = stock.info
+            info = await snapshot.info()
             if not info or not info.get('longName'):
                 logger.error(f"No company info found for {ticker}")
                 return None
             
             # Get essential data only (optimization)
-            hist = stock.history(period="3mo")  # Reduced from 1y
-            
-            # Get financial statements with error handling
-            try:
+            # History and financial statements are independent - fetch them together
+            hist, statements = await asyncio.gather(
+                snapshot.history(period="3mo"),  # Reduced from 1y
                 # Only fetch most recent financial data for cost optimization
-                financials = stock.quarterly_financials  # Use quarterly for recency
-                balance_sheet = stock.quarterly_balance_sheet
-                cash_flow = stock.quarterly_cashflow
-            except Exception as e:
-                logger.warning(f"Could not fetch detailed financials for {ticker}: {e}")
-                financials = balance_sheet = cash_flow = None
+                snapshot.statements(frequency="quarterly")  # Use quarterly for recency
+            )
+            financials = statements['financials']
+            balance_sheet = statements['balance_sheet']
+            cash_flow = statements['cashflow']
             
             # Optimized data structure
             data = {
@@ -298,30 +281,34 @@ class OptimizedWorkflowService:
                 "fetched_at": datetime.now().isoformat()
             }
             
-            # Cache the data for 24 hours
-            await self.cache_manager.set(CacheType.FINANCIAL_DATA, ticker, data)
-            
             return data
             
         except Exception as e:
             logger.error(f"Error fetching company data for {ticker}: {e}")
             return None
     
-    async def _fetch_news_data(self, ticker: str, max_articles: int) -> List[Dict[str, Any]]:
+    async def _fetch_news_data(self, ticker: str, max_articles: int, snapshot: Optional[CompanySnapshot] = None) -> List[Dict[str, Any]]:
         """Fetch recent news articles with intelligent caching (6hr TTL)."""
         try:
-            # Check cache first
             cache_key_params = {'max_articles': max_articles}
-            cached_articles = await self.cache_manager.get(
-                CacheType.NEWS_ARTICLES, ticker, **cache_key_params
+            articles = await self.cache_manager.get_or_compute(
+                CacheType.NEWS_ARTICLES,
+                ticker,
+                lambda: self._fetch_fresh_news_data(ticker, max_articles, snapshot),
+                **cache_key_params
             )
-            if cached_articles:
-                logger.info(f"Using cached news data for {ticker}")
-                return cached_articles
+            return articles or []
             
+        except Exception as e:
+            logger.error(f"Error fetching news data for {ticker}: {e}")
+            return []
+    
+    async def _fetch_fresh_news_data(self, ticker: str, max_articles: int, snapshot: Optional[CompanySnapshot] = None) -> List[Dict[str, Any]]:
+        """Scrape recent news articles (cache producer)."""
+        try:
             # Extract company name for search
-            stock = yf.Ticker(ticker)
-            company_name = stock.info.get('longName', ticker.replace('.NS', ''))
+            info = await (snapshot or CompanySnapshot(ticker)).info()
+            company_name = info.get('longName', ticker.replace('.NS', ''))
             
             logger.info(f"Fetching fresh news: {max_articles} articles about {company_name}")
             
@@ -334,12 +321,6 @@ class OptimizedWorkflowService:
                     days_back=14  # Reduced from 30 for cost optimization
                 )
             
-            # Cache the articles for 6 hours
-            if articles:
-                await self.cache_manager.set(
-                    CacheType.NEWS_ARTICLES, ticker, articles, **cache_key_params
-                )
-            
             logger.info(f"Found {len(articles)} news articles for {ticker}")
             return articles
             
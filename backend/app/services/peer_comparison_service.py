@@ -6,10 +6,13 @@ import asyncio
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-import yfinance as yf
 from functools import lru_cache
+import pandas as pd
 
 from ..models.summary import InvestmentLabel
+from .intelligent_cache import intelligent_cache, CacheType
+from .market_data_gateway import market_data_gateway
+from .ohlcv_store import ohlcv_store
 
 logger = logging.getLogger(__name__)
 
@@ -127,9 +130,7 @@ class PeerComparisonService:
             }
         }
         
-        # Cache for peer data to avoid repeated API calls
-        self.peer_cache = {}
-        self.cache_duration = timedelta(hours=2)  # 2-hour cache
+        # Peer metrics are cached as CacheType.PEER_METRICS (2 hours), shared by all workers
         
         # Valuation percentile ranges
         self.percentile_ranges = {
@@ -380,17 +381,27 @@ class PeerComparisonService:
     
     # Private helper methods
     
-    async def _fetch_company_metrics(self, ticker: str) -> PeerMetrics:
+    async def _fetch_company_metrics(self, ticker: str, history: Optional[pd.DataFrame] = None) -> PeerMetrics:
         """Fetch comprehensive metrics for a single company"""
         
-        cache_key = f"{ticker}_{datetime.now().strftime('%Y%m%d%H')}"
-        if cache_key in self.peer_cache:
-            return self.peer_cache[cache_key]
+        return await intelligent_cache.get_or_compute(
+            CacheType.PEER_METRICS,
+            ticker,
+            lambda: self._download_company_metrics(ticker, history),
+            tags=[intelligent_cache.tag("ticker", ticker)]
+        )
+    
+    async def _download_company_metrics(self, ticker: str, history: Optional[pd.DataFrame] = None) -> Optional[PeerMetrics]:
+        """
+        Build PeerMetrics from yfinance info and 1y history (cache producer).
         
+        Args:
+            ticker: Stock ticker symbol
+            history: 1y history already fetched in a batch, fetched here if None
+        """
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
-            hist = stock.history(period="1y")
+            info = await market_data_gateway.get_info(ticker)
+            hist = history if history is not None else await ohlcv_store.get_history(ticker, period="1y")
             
             if hist.empty:
                 logger.warning(f"No price history available for {ticker}")
@@ -431,8 +442,6 @@ class PeerComparisonService:
                 last_updated=datetime.now()
             )
             
-            # Cache the result
-            self.peer_cache[cache_key] = metrics
             return metrics
             
         except Exception as e:
@@ -442,8 +451,20 @@ class PeerComparisonService:
     async def _fetch_peer_metrics_batch(self, tickers: List[str]) -> List[PeerMetrics]:
         """Fetch metrics for multiple tickers concurrently"""
         
+        # Stored history for every peer that is not cached, missing bars fetched in one batch
+        uncached = []
+        for ticker in tickers:
+            remaining = await intelligent_cache.ttl_remaining(CacheType.PEER_METRICS, ticker)
+            if remaining is None or remaining.total_seconds() <= 0:
+                uncached.append(ticker)
+        try:
+            histories = await ohlcv_store.get_histories(uncached, period="1y") if uncached else {}
+        except Exception as e:
+            logger.warning(f"Batched history download failed, fetching per ticker: {e}")
+            histories = {}
+        
         # Create tasks for concurrent execution
-        tasks = [self._fetch_company_metrics(ticker) for ticker in tickers]
+        tasks = [self._fetch_company_metrics(ticker, histories.get(ticker)) for ticker in tickers]
         
         # Execute with limited concurrency to avoid rate limits
         semaphore = asyncio.Semaphore(5)  # Max 5 concurrent requests
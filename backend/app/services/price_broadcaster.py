@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional, Set
+
+from .price_service import PriceService
+from .quote_stream import quote_stream
+
+logger = logging.getLogger(__name__)
+
+
+class _Subscriber:
+    """One connected client: a bounded queue of updates not yet sent to it."""
+
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+
+
+@dataclass
+class _Feed:
+    """The shared upstream loop of one ticker and the clients it fans out to."""
+
+    subscribers: Set[_Subscriber] = field(default_factory=set)
+    latest: Optional[Dict[str, Any]] = None
+    task: Optional[asyncio.Task] = None
+
+
+class PriceBroadcaster:
+    """
+    Pushes a ticker's price to every client watching it from one upstream loop.
+
+    The first client of a ticker starts a loop that reads the company header
+    price from PriceService - the Kite quote book while the stream is up,
+    otherwise the cached yfinance quote (fetched at most once per cache TTL)
+    - and publishes it whenever it changes. Later clients share that loop
+    and get the latest update straight away; the last client to leave stops
+    it. The loop also holds a quote stream subscription for the ticker.
+
+    Each client has a queue of at most queue_size updates. A client whose
+    queue is full - its connection is not draining - is dropped rather than
+    buffered for, so one stalled browser costs a bounded amount of memory
+    and never slows the others down; it gets a final "dropped" update and
+    can reconnect for a fresh snapshot.
+    """
+
+    def __init__(
+        self,
+        live_interval: float = 1.0,
+        rest_interval: float = 15.0,
+        queue_size: int = 16,
+        heartbeat: float = 15.0
+    ):
+        """
+        Args:
+            live_interval: Seconds between reads of the quote book while the stream is up
+            rest_interval: Seconds between reads of the REST price while it is down
+            queue_size: Updates buffered per client before it is dropped
+            heartbeat: Seconds without an update after which subscribers get a keep-alive
+        """
+        self.live_interval = live_interval
+        self.rest_interval = rest_interval
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        self._feeds: Dict[str, _Feed] = {}
+
+    def _publish(self, ticker: str, feed: _Feed, update: Dict[str, Any]):
+        feed.latest = update
+        for subscriber in list(feed.subscribers):
+            try:
+                subscriber.queue.put_nowait(update)
+            except asyncio.QueueFull:
+                logger.warning(f"Dropping slow price stream client of {ticker} ({self.queue_size} updates behind)")
+                self._drop(ticker, feed, subscriber)
+
+    def _drop(self, ticker: str, feed: _Feed, subscriber: _Subscriber):
+        """Disconnect a client, freeing its queue except for the end-of-stream marker."""
+        subscriber.dropped = True
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
+        self._leave(ticker, feed, subscriber)
+
+    def _leave(self, ticker: str, feed: _Feed, subscriber: _Subscriber):
+        feed.subscribers.discard(subscriber)
+        if not feed.subscribers and self._feeds.get(ticker) is feed:
+            del self._feeds[ticker]
+            if feed.task is not None:
+                feed.task.cancel()
+
+    async def _run(self, ticker: str, feed: _Feed):
+        """Upstream loop of one ticker, until its last client leaves."""
+        acquiring = asyncio.ensure_future(asyncio.to_thread(quote_stream.acquire, ticker))
+        try:
+            token = await asyncio.shield(acquiring)
+        except asyncio.CancelledError:
+            # The acquire still completes on its thread: release what it takes
+            def release_acquired(done: asyncio.Future):
+                if not done.cancelled() and done.exception() is None and done.result() is not None:
+                    quote_stream.release(ticker)
+
+            acquiring.add_done_callback(release_acquired)
+            raise
+        try:
+            while True:
+                try:
+                    price = await asyncio.to_thread(PriceService.get_price_for_company_header, ticker)
+                except Exception as e:
+                    logger.error(f"Error reading price of {ticker} for streaming: {e}")
+                    price = None
+                live = quote_stream.get(ticker) is not None
+                if price and (feed.latest is None or any(feed.latest.get(key) != value for key, value in price.items())):
+                    self._publish(ticker, feed, {
+                        "ticker": ticker,
+                        **price,
+                        "source": "kite_stream" if live else "yfinance_unified",
+                        "timestamp": datetime.now().isoformat()
+                    })
+                await asyncio.sleep(self.live_interval if quote_stream.connected else self.rest_interval)
+        finally:
+            if token is not None:
+                quote_stream.release(ticker)
+
+    async def subscribe(self, ticker: str) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Price updates of a ticker for one client, until it disconnects or is dropped.
+
+        Yields:
+            Price updates (latest first), None as a keep-alive after heartbeat
+            seconds without one, and {"status": "dropped"} before ending if the
+            client fell queue_size updates behind
+        """
+        feed = self._feeds.get(ticker)
+        if feed is None:
+            feed = self._feeds[ticker] = _Feed()
+            feed.task = asyncio.create_task(self._run(ticker, feed))
+        subscriber = _Subscriber(self.queue_size)
+        feed.subscribers.add(subscriber)
+        if feed.latest is not None:
+            subscriber.queue.put_nowait(feed.latest)
+
+        try:
+            while True:
+                try:
+                    update = await asyncio.wait_for(subscriber.queue.get(), timeout=self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if update is None:
+                    yield {"ticker": ticker, "status": "dropped", "reason": "client fell behind the price stream"}
+                    return
+                yield update
+        finally:
+            if not subscriber.dropped:
+                self._leave(ticker, feed, subscriber)
+
+    def subscriber_counts(self) -> Dict[str, int]:
+        """Connected clients per streamed ticker."""
+        return {ticker: len(feed.subscribers) for ticker, feed in self._feeds.items()}
+
+
+# Global broadcaster - one upstream loop per ticker per worker process
+price_broadcaster = PriceBroadcaster(
+    live_interval=float(os.getenv("PRICE_PUSH_LIVE_INTERVAL_SECONDS", "1")),
+    rest_interval=float(os.getenv("PRICE_PUSH_REST_INTERVAL_SECONDS", "15")),
+    queue_size=int(os.getenv("PRICE_PUSH_QUEUE_SIZE", "16"))
+)
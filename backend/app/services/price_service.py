@@ -1,24 +1,44 @@
-import yfinance as yf
 import pandas as pd
 from typing import Dict, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
 import asyncio
+from concurrent.futures import Future
 from threading import Lock
 
+from .intelligent_cache import intelligent_cache, CacheType
+from .market_data_gateway import market_data_gateway
+from .ohlcv_store import ohlcv_store
+from .company_snapshot import CompanySnapshot
+from .quote_stream import quote_stream
+
 logger = logging.getLogger(__name__)
 
 class PriceService:
     """
     Centralized service for fetching and caching stock price data.
     Ensures consistency across all dashboard components.
+    
+    Quotes are cached as CacheType.PRICE_DATA (1 minute TTL) in the shared
+    tier of the intelligent cache, so every worker process serves the same
+    price and a ticker is fetched from yfinance once per minute in total
+    rather than once per worker.
+    
+    While the Kite quote stream is up, the company header and DCF price are
+    read from its in-memory quote book instead, with no network call; the
+    cached data above is the fallback when the stream is down.
     """
     
-    # Class-level cache to ensure single source of truth
-    _price_cache: Dict[str, Dict] = {}
-    _cache_timestamps: Dict[str, datetime] = {}
-    _cache_lock = Lock()
-    _cache_ttl_seconds = 60  # Cache for 1 minute
+    # In-flight fetches by ticker. The lock only guards this dict and is never
+    # held across network I/O, so different tickers fetch concurrently and
+    # concurrent misses for one ticker wait on a single shared fetch
+    _inflight: Dict[str, Future] = {}
+    _inflight_lock = Lock()
+    
+    # Price, market cap and multiples of each ticker's last REST quote. Shares
+    # outstanding, earnings and book value do not move intraday, so a live
+    # price rescales these without fetching them again
+    _valuation_basis: Dict[str, Dict] = {}
     
     @classmethod
     def get_unified_stock_data(cls, ticker: str, force_refresh: bool = False) -> Optional[Dict]:
@@ -33,69 +53,90 @@ class PriceService:
         Returns:
             Dictionary containing unified stock data or None if failed
         """
-        with cls._cache_lock:
-            # Check cache first
-            if not force_refresh and cls._is_cache_valid(ticker):
+        # Cached reads never wait on a fetch
+        if not force_refresh:
+            cached = intelligent_cache.get_sync(CacheType.PRICE_DATA, ticker)
+            if cached is not None:
                 logger.info(f"Returning cached data for {ticker}")
-                return cls._price_cache[ticker]
-            
-            try:
-                logger.info(f"Fetching fresh data for {ticker}")
-                
-                # Fetch data from yfinance once
-                stock = yf.Ticker(ticker)
-                info = stock.info
-                
-                # Get historical data for calculations
-                hist = stock.history(period="5d")
-                if hist.empty:
-                    logger.error(f"No historical data found for {ticker}")
-                    return None
-                
-                # Calculate current price with consistent fallback logic
-                current_price = cls._get_standardized_current_price(info, hist)
-                if current_price <= 0:
-                    logger.error(f"Invalid current price for {ticker}: {current_price}")
-                    return None
-                
-                # Calculate price change consistently
-                change, change_percent = cls._calculate_price_change(hist, current_price)
-                
-                # Create unified data structure
-                unified_data = {
-                    'ticker': ticker,
-                    'current_price': current_price,
-                    'change': change,
-                    'change_percent': change_percent,
-                    'volume': int(hist['Volume'].iloc[-1]) if len(hist) > 0 else 0,
-                    'market_cap': info.get('marketCap', 0),
-                    'pe_ratio': info.get('trailingPE'),
-                    'pb_ratio': info.get('priceToBook'),
-                    'info': info,
-                    'history': hist,
-                    'timestamp': datetime.now(),
-                    'data_source': 'yfinance_unified'
-                }
-                
-                # Cache the data
-                cls._price_cache[ticker] = unified_data
-                cls._cache_timestamps[ticker] = datetime.now()
-                
-                logger.info(f"Successfully cached unified data for {ticker} - Price: ₹{current_price:.2f}")
-                return unified_data
-                
-            except Exception as e:
-                logger.error(f"Error fetching unified stock data for {ticker}: {e}")
-                return None
+                return cached
+        
+        with cls._inflight_lock:
+            future = cls._inflight.get(ticker)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                cls._inflight[ticker] = future
+        
+        if not is_leader:
+            # An in-flight fetch started after this call is as fresh as a forced one
+            logger.info(f"Waiting for in-flight fetch of {ticker}")
+            return future.result()
+        
+        result = None
+        try:
+            # Another fetch may have completed between the cache check and registering
+            if not force_refresh:
+                result = intelligent_cache.get_sync(CacheType.PRICE_DATA, ticker)
+            if result is None:
+                result = cls._fetch_unified_stock_data(ticker)
+            return result
+        finally:
+            with cls._inflight_lock:
+                cls._inflight.pop(ticker, None)
+            future.set_result(result)
     
     @classmethod
-    def _is_cache_valid(cls, ticker: str) -> bool:
-        """Check if cached data is still valid"""
-        if ticker not in cls._price_cache or ticker not in cls._cache_timestamps:
-            return False
-        
-        cache_age = datetime.now() - cls._cache_timestamps[ticker]
-        return cache_age.total_seconds() < cls._cache_ttl_seconds
+    def _fetch_unified_stock_data(cls, ticker: str) -> Optional[Dict]:
+        """Fetch a ticker from yfinance and store it in the shared cache."""
+        try:
+            logger.info(f"Fetching fresh data for {ticker}")
+            
+            # Fetch data from yfinance once
+            info = market_data_gateway.get_info_sync(ticker)
+            
+            # Get historical data for calculations - the stored tail may be as old as a cached quote
+            hist = ohlcv_store.get_history_sync(ticker, period="5d", max_age=intelligent_cache.ttl_config[CacheType.PRICE_DATA].total_seconds())
+            if hist.empty:
+                logger.error(f"No historical data found for {ticker}")
+                return None
+            
+            # Calculate current price with consistent fallback logic
+            current_price = cls._get_standardized_current_price(info, hist)
+            if current_price <= 0:
+                logger.error(f"Invalid current price for {ticker}: {current_price}")
+                return None
+            
+            # Calculate price change consistently
+            change, change_percent = cls._calculate_price_change(hist, current_price)
+            
+            # Create unified data structure
+            unified_data = {
+                'ticker': ticker,
+                'current_price': current_price,
+                'change': change,
+                'change_percent': change_percent,
+                'volume': int(hist['Volume'].iloc[-1]) if len(hist) > 0 else 0,
+                'market_cap': info.get('marketCap', 0),
+                'pe_ratio': info.get('trailingPE'),
+                'pb_ratio': info.get('priceToBook'),
+                'info': info,
+                'history': hist,
+                'timestamp': datetime.now(),
+                'data_source': 'yfinance_unified'
+            }
+            
+            # Cache the data for every worker
+            intelligent_cache.set_sync(
+                CacheType.PRICE_DATA, ticker, unified_data,
+                tags=[intelligent_cache.tag("ticker", ticker)]
+            )
+            
+            logger.info(f"Successfully cached unified data for {ticker} - Price: ₹{current_price:.2f}")
+            return unified_data
+            
+        except Exception as e:
+            logger.error(f"Error fetching unified stock data for {ticker}: {e}")
+            return None
     
     @classmethod
     def _get_standardized_current_price(cls, info: Dict, hist: pd.DataFrame) -> float:
@@ -146,10 +187,31 @@ class PriceService:
     @classmethod
     def get_price_for_company_header(cls, ticker: str) -> Optional[Dict]:
         """Get price data formatted for company header component"""
+        # Viewing a header keeps the ticker subscribed to the quote stream for a while
+        live = quote_stream.view(ticker)
+        basis = cls._valuation_basis.get(ticker)
+        if live is not None and basis is not None and basis['price'] > 0:
+            scale = live.last_price / basis['price']
+            return {
+                'current_price': live.last_price,
+                'change': live.change,
+                'change_percent': live.change_percent,
+                'volume': live.volume,
+                'market_cap': basis['market_cap'] * scale if basis['market_cap'] else basis['market_cap'],
+                'pe_ratio': basis['pe_ratio'] * scale if basis['pe_ratio'] else basis['pe_ratio'],
+                'pb_ratio': basis['pb_ratio'] * scale if basis['pb_ratio'] else basis['pb_ratio']
+            }
+        
         data = cls.get_unified_stock_data(ticker)
         if not data:
             return None
         
+        cls._valuation_basis[ticker] = {
+            'price': data['current_price'],
+            'market_cap': data['market_cap'],
+            'pe_ratio': data['pe_ratio'],
+            'pb_ratio': data['pb_ratio']
+        }
         return {
             'current_price': data['current_price'],
             'change': data['change'],
@@ -163,9 +225,31 @@ class PriceService:
     @classmethod
     def get_price_for_dcf(cls, ticker: str) -> Optional[float]:
         """Get current price for DCF calculations"""
+        live = quote_stream.get(ticker)
+        if live is not None:
+            return live.last_price
+        
         data = cls.get_unified_stock_data(ticker)
         return data['current_price'] if data else None
     
+    @classmethod
+    def get_price_for_snapshot(cls, snapshot: CompanySnapshot) -> Optional[float]:
+        """
+        Current price from a request's CompanySnapshot, using the same fallback
+        logic as get_unified_stock_data but the snapshot's already fetched data
+        
+        Returns:
+            Current price, or None if it cannot be determined
+        """
+        try:
+            current_price = cls._get_standardized_current_price(
+                snapshot.info_sync(), snapshot.history_sync(period="5d")
+            )
+            return current_price if current_price > 0 else None
+        except Exception as e:
+            logger.error(f"Error getting snapshot price for {snapshot.ticker}: {e}")
+            return None
+    
     @classmethod
     def get_company_info(cls, ticker: str) -> Optional[Dict]:
         """Get company info with consistent pricing"""
@@ -194,30 +278,29 @@ class PriceService:
     @classmethod
     def clear_cache(cls, ticker: str = None):
         """Clear cache for specific ticker or all tickers"""
-        with cls._cache_lock:
-            if ticker:
-                cls._price_cache.pop(ticker, None)
-                cls._cache_timestamps.pop(ticker, None)
-                logger.info(f"Cleared cache for {ticker}")
-            else:
-                cls._price_cache.clear()
-                cls._cache_timestamps.clear()
-                logger.info("Cleared all price cache")
+        if ticker:
+            intelligent_cache.invalidate_by_tag_sync(
+                intelligent_cache.tag("ticker", ticker), CacheType.PRICE_DATA
+            )
+            logger.info(f"Cleared cache for {ticker}")
+        else:
+            intelligent_cache.invalidate_by_tag_sync(
+                intelligent_cache.tag("type", CacheType.PRICE_DATA.value)
+            )
+            logger.info("Cleared all price cache")
     
     @classmethod
     def get_cache_status(cls) -> Dict:
         """Get cache status for debugging"""
-        with cls._cache_lock:
-            status = {}
-            for ticker in cls._price_cache:
-                cache_age = datetime.now() - cls._cache_timestamps.get(ticker, datetime.now())
-                status[ticker] = {
-                    'cached': True,
-                    'age_seconds': cache_age.total_seconds(),
-                    'valid': cls._is_cache_valid(ticker),
-                    'price': cls._price_cache[ticker].get('current_price', 0)
-                }
-            return status
+        status = {}
+        for entry in intelligent_cache.list_entries_sync(CacheType.PRICE_DATA):
+            status[entry['identifier']] = {
+                'cached': True,
+                'age_seconds': entry['age_seconds'],
+                'valid': entry['valid'],
+                'price': entry['data'].get('current_price', 0)
+            }
+        return status
 
 # Global service instance
 price_service = PriceService()
\ No newline at end of file
@@ -0,0 +1,270 @@
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+from .instrument_index import instrument_master
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LiveQuote:
+    """Latest tick of one instrument from the Kite stream."""
+
+    instrument_token: int
+    last_price: float
+    change: float  # against the previous close
+    change_percent: float
+    volume: int
+    ohlc: Dict[str, float]  # open, high, low of the session and the previous close
+    received_at: float  # epoch seconds
+
+
+class QuoteStream:
+    """
+    In-memory quote book fed by Kite's WebSocket ticker (KiteTicker).
+
+    Only instruments somebody is looking at are subscribed. Subscriptions
+    are reference counted per instrument: a live consumer (a price push
+    connection) holds one with acquire/release or watching(), and a REST
+    view holds a lease that lapses view_ttl seconds after the ticker was
+    last viewed. The first reference subscribes the instrument upstream in
+    quote mode, the last one unsubscribes it.
+
+    Readers get the book's entry only while the socket is connected; when
+    the stream is down (not configured, disconnected, reconnecting) get()
+    returns None and callers fall back to their REST path.
+
+    KiteTicker runs on Twisted's reactor in a daemon thread that is started
+    once per process; socket calls are handed to it with callFromThread.
+    """
+
+    EXCHANGE_SUFFIXES = {".NS": "NSE", ".BO": "BSE"}
+
+    def __init__(self, view_ttl: float = 300):
+        """
+        Args:
+            view_ttl: Seconds a viewed ticker stays subscribed after its last view
+        """
+        self.view_ttl = view_ttl
+        self._book: Dict[int, LiveQuote] = {}
+        self._refs: Dict[int, int] = {}
+        self._views: Dict[int, float] = {}  # token -> lease expiry
+        self._tokens: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._ticker = None
+        self._connected = threading.Event()
+
+    # Connection
+
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set()
+
+    def start(self, api_key: str, access_token: str, root: Optional[str] = None) -> bool:
+        """
+        Connect to the Kite ticker (or root, e.g. a local tick server) in the background.
+
+        Returns:
+            False if the stream could not be started
+        """
+        try:
+            from kiteconnect import KiteTicker
+            from twisted.internet import reactor
+
+            self.stop()
+            ticker = KiteTicker(api_key, access_token, root=root, reconnect=True)
+            ticker.on_connect = self._on_connect
+            ticker.on_ticks = self._on_ticks
+            ticker.on_close = self._on_disconnect
+            ticker.on_error = self._on_disconnect
+            self._ticker = ticker
+            if reactor.running:
+                reactor.callFromThread(ticker.connect, threaded=True)
+            else:
+                ticker.connect(threaded=True)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to start Kite quote stream: {e}")
+            self._ticker = None
+            return False
+
+    def stop(self):
+        """Close the socket; the book stops serving until start() is called again."""
+        ticker, self._ticker = self._ticker, None
+        self._connected.clear()
+        self._book.clear()
+        if ticker is not None:
+            try:
+                from twisted.internet import reactor
+                reactor.callFromThread(ticker.close)
+            except Exception as e:
+                logger.warning(f"Error closing Kite quote stream: {e}")
+
+    def wait_connected(self, timeout: float) -> bool:
+        return self._connected.wait(timeout)
+
+    def _on_connect(self, ticker, response):
+        if ticker is not self._ticker:
+            return
+        self._book.clear()
+        self._connected.set()
+        with self._lock:
+            tokens = list(self._refs)
+        logger.info(f"Kite quote stream connected, subscribing {len(tokens)} instruments")
+        if tokens:
+            ticker.subscribe(tokens)
+            ticker.set_mode(ticker.MODE_QUOTE, tokens)
+
+    def _on_disconnect(self, ticker, code, reason):
+        if ticker is self._ticker and self._connected.is_set():
+            logger.warning(f"Kite quote stream down ({code}: {reason}), serving quotes over REST")
+            self._connected.clear()
+
+    def _on_ticks(self, ticker, ticks: List[Dict[str, Any]]):
+        now = time.time()
+        for tick in ticks:
+            ohlc = tick.get("ohlc")
+            if not ohlc:
+                continue  # LTP-mode packet
+            last_price = tick["last_price"]
+            previous_close = ohlc.get("close") or 0
+            self._book[tick["instrument_token"]] = LiveQuote(
+                instrument_token=tick["instrument_token"],
+                last_price=last_price,
+                change=last_price - previous_close if previous_close else 0.0,
+                change_percent=tick.get("change", 0.0),
+                volume=tick.get("volume_traded", 0),
+                ohlc=ohlc,
+                received_at=now
+            )
+        self._expire_views()
+
+    def _send(self, method: str, tokens: List[int]):
+        """Run a KiteTicker subscription call on the reactor thread, if connected."""
+        ticker = self._ticker
+        if ticker is None or not self._connected.is_set():
+            return  # _on_connect subscribes every referenced token
+        from twisted.internet import reactor
+        if method == "subscribe":
+            reactor.callFromThread(ticker.subscribe, tokens)
+            reactor.callFromThread(ticker.set_mode, ticker.MODE_QUOTE, tokens)
+        else:
+            reactor.callFromThread(ticker.unsubscribe, tokens)
+
+    # Subscriptions
+
+    def _token(self, ticker: str) -> Optional[int]:
+        """Instrument token of a yfinance-style ticker from today's instrument index."""
+        token = self._tokens.get(ticker)
+        if token is None:
+            symbol, exchange = ticker.upper(), "NSE"
+            for suffix, suffix_exchange in self.EXCHANGE_SUFFIXES.items():
+                if symbol.endswith(suffix):
+                    symbol, exchange = symbol[:-len(suffix)], suffix_exchange
+            index = instrument_master.get(exchange)
+            token = index.token(exchange, symbol) if index is not None else None
+            if token is not None:
+                self._tokens[ticker] = token
+        return token
+
+    def _add_ref(self, token: int) -> bool:
+        """Take a reference under the lock; True if it is the instrument's first."""
+        self._refs[token] = self._refs.get(token, 0) + 1
+        return self._refs[token] == 1
+
+    def _drop_ref(self, token: int) -> bool:
+        """Drop a reference under the lock; True if it was the instrument's last."""
+        count = self._refs.get(token, 0) - 1
+        if count > 0:
+            self._refs[token] = count
+            return False
+        self._refs.pop(token, None)
+        self._book.pop(token, None)
+        return count == 0
+
+    def _expire_views(self):
+        now = time.time()
+        released = []
+        with self._lock:
+            for token, expiry in list(self._views.items()):
+                if expiry <= now:
+                    del self._views[token]
+                    if self._drop_ref(token):
+                        released.append(token)
+        if released:
+            self._send("unsubscribe", released)
+
+    def acquire(self, ticker: str) -> Optional[int]:
+        """
+        Hold a subscription to a ticker until release().
+
+        Returns:
+            The instrument token, None if the ticker is not in the instrument index
+        """
+        token = self._token(ticker)
+        if token is None:
+            return None
+        with self._lock:
+            first = self._add_ref(token)
+        if first:
+            self._send("subscribe", [token])
+        return token
+
+    def release(self, ticker: str):
+        """Drop a subscription taken with acquire()."""
+        token = self._tokens.get(ticker)
+        if token is None:
+            return
+        with self._lock:
+            last = self._drop_ref(token)
+        if last:
+            self._send("unsubscribe", [token])
+
+    @contextmanager
+    def watching(self, ticker: str) -> Iterator[Optional[int]]:
+        """Subscription to a ticker for the duration of a with block."""
+        token = self.acquire(ticker)
+        try:
+            yield token
+        finally:
+            if token is not None:
+                self.release(ticker)
+
+    def view(self, ticker: str) -> Optional[LiveQuote]:
+        """
+        Keep a ticker subscribed for view_ttl seconds from now and return its live quote.
+
+        Returns:
+            The latest tick, None if the stream cannot serve it (yet)
+        """
+        self._expire_views()
+        token = self._token(ticker)
+        if token is None:
+            return None
+        with self._lock:
+            first = token not in self._views and self._add_ref(token)
+            self._views[token] = time.time() + self.view_ttl
+        if first:
+            self._send("subscribe", [token])
+        return self.get(ticker)
+
+    def get(self, ticker: str) -> Optional[LiveQuote]:
+        """Latest tick of a subscribed ticker, None if it is not subscribed or the stream is down."""
+        if not self._connected.is_set():
+            return None
+        token = self._tokens.get(ticker)
+        return self._book.get(token) if token is not None else None
+
+    def subscriptions(self) -> Dict[int, int]:
+        """Reference count per subscribed instrument token."""
+        with self._lock:
+            return dict(self._refs)
+
+
+# Global quote stream, connected at startup when Kite credentials are configured
+quote_stream = QuoteStream(view_ttl=float(os.getenv("QUOTE_STREAM_VIEW_TTL_SECONDS", "300")))
@@ -114,12 +114,55 @@ class SectorDCFService:
             SectorDCFResult with valuation and sector insights
         """
         
-        # Check cache first (unless force refresh)
-        if self.use_cache and not force_refresh:
-            cached_result = await self._get_cached_dcf(ticker, sector, mode)
-            if cached_result:
-                logger.info(f"Cache hit for {ticker} {sector} DCF calculation")
-                return cached_result
+        current_price = company_data.get("current_price", 0) if company_data else 0
+        
+        if not self.use_cache:
+            result = await self._compute_sector_dcf(ticker, sector, mode, company_data)
+            return result or self._fallback_result(ticker, sector, current_price)
+        
+        if force_refresh:
+            result = await self._compute_sector_dcf(ticker, sector, mode, company_data)
+            if not result:
+                return self._fallback_result(ticker, sector, current_price)
+            await self._cache_dcf_result(ticker, sector, mode, result)
+            return result
+        
+        async def produce() -> Optional[Dict]:
+            result = await self._compute_sector_dcf(ticker, sector, mode, company_data)
+            # Returning None keeps fallback results out of the cache
+            return self._result_to_cache_data(result) if result else None
+        
+        try:
+            # Concurrent requests for the same ticker/sector/mode share one calculation
+            cached_data = await self.cache_manager.get_or_compute(
+                CacheType.FINANCIAL_DATA,
+                ticker,
+                produce,
+                tags=[self.cache_manager.tag("ticker", ticker)],
+                sector=sector,
+                mode=mode,
+                calculation_type="sector_dcf"
+            )
+            if cached_data:
+                return self._result_from_cache_data(cached_data)
+        except Exception as e:
+            logger.error(f"Sector DCF lookup failed for {ticker}: {e}")
+        
+        return self._fallback_result(ticker, sector, current_price)
+    
+    async def _compute_sector_dcf(
+        self,
+        ticker: str,
+        sector: str,
+        mode: str,
+        company_data: Dict = None
+    ) -> Optional[SectorDCFResult]:
+        """
+        Run the sector-specific DCF calculation without touching the cache
+        
+        Returns:
+            SectorDCFResult, or None if the calculation failed
+        """
         try:
             logger.info(f"Calculating {sector} sector DCF for {ticker} in {mode} mode")
             
@@ -146,7 +189,7 @@ class SectorDCFService:
             # Get sector-specific rules
             sector_rules = self._get_sector_rules(sector)
             
-            sector_result = SectorDCFResult(
+            return SectorDCFResult(
                 ticker=ticker,
                 sector=sector,
                 fair_value=result.get("fair_value", 0),
@@ -158,26 +201,23 @@ class SectorDCFService:
                 calculation_timestamp=datetime.now()
             )
             
-            # Cache the result
-            if self.use_cache:
-                await self._cache_dcf_result(ticker, sector, mode, sector_result)
-            
-            return sector_result
-            
         except Exception as e:
             logger.error(f"Sector DCF calculation failed for {ticker}: {e}")
-            # Return fallback result (don't cache failures)
-            return SectorDCFResult(
-                ticker=ticker,
-                sector=sector,
-                fair_value=0,
-                current_price=current_price,
-                upside_downside_pct=0,
-                dcf_method="Fallback",
-                confidence=0.3,
-                sector_rules={},
-                calculation_timestamp=datetime.now()
-            )
+            return None
+    
+    def _fallback_result(self, ticker: str, sector: str, current_price: float) -> SectorDCFResult:
+        """Fallback result returned when the calculation fails (never cached)"""
+        return SectorDCFResult(
+            ticker=ticker,
+            sector=sector,
+            fair_value=0,
+            current_price=current_price,
+            upside_downside_pct=0,
+            dcf_method="Fallback",
+            confidence=0.3,
+            sector_rules={},
+            calculation_timestamp=datetime.now()
+        )
     
     async def _calculate_banking_dcf(self, ticker: str, company_data: Dict, calculator) -> Dict:
         """Calculate banking DCF using Excess Return Model"""
@@ -451,18 +491,7 @@ class SectorDCFService:
             )
             
             if cached_data:
-                # Convert cached dict back to SectorDCFResult
-                return SectorDCFResult(
-                    ticker=cached_data['ticker'],
-                    sector=cached_data['sector'],
-                    fair_value=cached_data['fair_value'],
-                    current_price=cached_data['current_price'],
-                    upside_downside_pct=cached_data['upside_downside_pct'],
-                    dcf_method=cached_data['dcf_method'],
-                    confidence=cached_data['confidence'],
-                    sector_rules=cached_data['sector_rules'],
-                    calculation_timestamp=datetime.fromisoformat(cached_data['calculation_timestamp'])
-                )
+                return self._result_from_cache_data(cached_data)
             return None
             
         except Exception as e:
@@ -483,23 +512,13 @@ class SectorDCFService:
             True if successfully cached, False otherwise
         """
         try:
-            # Convert SectorDCFResult to dict for caching
-            cache_data = {
-                'ticker': result.ticker,
-                'sector': result.sector,
-                'fair_value': result.fair_value,
-                'current_price': result.current_price,
-                'upside_downside_pct': result.upside_downside_pct,
-                'dcf_method': result.dcf_method,
-                'confidence': result.confidence,
-                'sector_rules': result.sector_rules,
-                'calculation_timestamp': result.calculation_timestamp.isoformat()
-            }
+            cache_data = self._result_to_cache_data(result)
             
             success = await self.cache_manager.set(
                 cache_type=CacheType.FINANCIAL_DATA,
                 identifier=ticker,
                 data=cache_data,
+                tags=[self.cache_manager.tag("ticker", ticker)],
                 sector=sector,
                 mode=mode,
                 calculation_type="sector_dcf"
@@ -516,6 +535,34 @@ class SectorDCFService:
             logger.error(f"Error caching DCF result for {ticker}: {e}")
             return False
     
+    def _result_to_cache_data(self, result: SectorDCFResult) -> Dict:
+        """Convert SectorDCFResult to dict for caching"""
+        return {
+            'ticker': result.ticker,
+            'sector': result.sector,
+            'fair_value': result.fair_value,
+            'current_price': result.current_price,
+            'upside_downside_pct': result.upside_downside_pct,
+            'dcf_method': result.dcf_method,
+            'confidence': result.confidence,
+            'sector_rules': result.sector_rules,
+            'calculation_timestamp': result.calculation_timestamp.isoformat()
+        }
+    
+    def _result_from_cache_data(self, cached_data: Dict) -> SectorDCFResult:
+        """Convert cached dict back to SectorDCFResult"""
+        return SectorDCFResult(
+            ticker=cached_data['ticker'],
+            sector=cached_data['sector'],
+            fair_value=cached_data['fair_value'],
+            current_price=cached_data['current_price'],
+            upside_downside_pct=cached_data['upside_downside_pct'],
+            dcf_method=cached_data['dcf_method'],
+            confidence=cached_data['confidence'],
+            sector_rules=cached_data['sector_rules'],
+            calculation_timestamp=datetime.fromisoformat(cached_data['calculation_timestamp'])
+        )
+    
     async def invalidate_cache(self, ticker: str, sector: str = None, mode: str = None) -> int:
         """
         Invalidate cached DCF results for a ticker
@@ -544,22 +591,19 @@ class SectorDCFService:
                     invalidated_count = 1
                     logger.info(f"Invalidated {sector} DCF cache for {ticker} (mode: {mode})")
             else:
-                # Invalidate all sector DCF entries for ticker
-                # This requires iterating through possible combinations
-                sectors = ["BFSI", "PHARMA", "REALESTATE", "IT", "FMCG", "ENERGY"]
-                modes = ["simple", "agentic"]
+                # Invalidate all sector DCF entries for ticker (optionally one sector or mode)
+                tags = [
+                    self.cache_manager.tag("ticker", ticker),
+                    self.cache_manager.tag("calculation_type", "sector_dcf")
+                ]
+                if sector:
+                    tags.append(self.cache_manager.tag("sector", sector))
+                if mode:
+                    tags.append(self.cache_manager.tag("mode", mode))
                 
-                for s in sectors:
-                    for m in modes:
-                        success = await self.cache_manager.invalidate(
-                            cache_type=CacheType.FINANCIAL_DATA,
-                            identifier=ticker,
-                            sector=s,
-                            mode=m,
-                            calculation_type="sector_dcf"
-                        )
-                        if success:
-                            invalidated_count += 1
+                invalidated_count = await self.cache_manager.invalidate_by_tag(
+                    tags, cache_type=CacheType.FINANCIAL_DATA
+                )
                 
                 logger.info(f"Invalidated {invalidated_count} sector DCF cache entries for {ticker}")
             
@@ -0,0 +1,289 @@
+import asyncio
+import contextvars
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+from .market_data_gateway import MarketDataGateway, market_data_gateway
+
+logger = logging.getLogger(__name__)
+
+# Canonical line item -> names yfinance reports it under for some companies,
+# in order of preference (previously resolved on every read by DataService._safe_extract)
+LINE_ITEM_ALIASES = {
+    'Total Revenue': ['Revenue', 'Total Revenues'],
+    'Net Income': ['Net Income Common Stockholders', 'Net Income Applicable To Common Shares'],
+    'Free Cash Flow': ['Operating Cash Flow'],
+    'Total Debt': ['Long Term Debt', 'Total Liabilities'],
+    'Cash And Cash Equivalents': ['Cash', 'Cash Equivalents'],
+    'Ordinary Shares Number': ['Share Issued', 'Common Stock Shares Outstanding'],
+    # Capital intensity metrics alternative names
+    'Capital Expenditure': ['Capital Expenditures', 'Capex', 'Purchase Of Property Plant Equipment'],
+    'Change In Working Capital': ['Working Capital', 'Changes In Working Capital'],
+    'Depreciation And Amortization': ['Depreciation Amortization', 'Depreciation', 'Amortization']
+}
+
+
+class FinancialStatementsStore:
+    """
+    Local store of financial statement values keyed by
+    (ticker, frequency, statement, period_end, line_item), in SQLite (WAL).
+
+    Statements only change when a company reports a new period, so a ticker
+    is fetched once and then only checked again once its next period can
+    have been filed (period end + one period + the SEBI filing deadline),
+    and at most once per recheck_interval after that. A refresh only inserts
+    periods that are not stored yet; stored periods are never rewritten, so
+    history older than yfinance's 4-5 period window is kept too.
+
+    LINE_ITEM_ALIASES are resolved at ingest: when a statement lacks a
+    canonical line item but reports an alias, the value is also stored under
+    the canonical name (with reported_as recording the alias). Readers ask
+    for either the statements as reported or with the canonical items added.
+    """
+
+    STATEMENTS = ("financials", "balance_sheet", "cashflow")
+
+    # Months per period and days companies have to file its results (SEBI LODR)
+    PERIOD_MONTHS = {"annual": 12, "quarterly": 3}
+    FILING_DEADLINE_DAYS = {"annual": 60, "quarterly": 45}
+
+    def __init__(
+        self,
+        db_path: str = "cache/financial_statements.db",
+        gateway: Optional[MarketDataGateway] = None,
+        recheck_interval: timedelta = timedelta(days=1),
+        max_workers: int = 4
+    ):
+        """
+        Args:
+            db_path: SQLite database file
+            gateway: Gateway used for upstream fetches
+            recheck_interval: Minimum time between checks for a period that is due
+            max_workers: Threads serving the async API and submit_statements
+        """
+        self.db_path = Path(db_path)
+        self.gateway = gateway or market_data_gateway
+        self.recheck_interval = recheck_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="statements-store")
+        self._local = threading.local()
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """This thread's connection to db_path, creating the schema on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.path != self.db_path:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS statement_items (
+                    ticker TEXT NOT NULL,
+                    frequency TEXT NOT NULL,
+                    statement TEXT NOT NULL,
+                    period_end TEXT NOT NULL,
+                    line_item TEXT NOT NULL,
+                    reported_as TEXT NOT NULL,
+                    value REAL NOT NULL,
+                    PRIMARY KEY (ticker, frequency, statement, period_end, line_item)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS statement_checks (
+                    ticker TEXT NOT NULL,
+                    frequency TEXT NOT NULL,
+                    checked_at REAL NOT NULL,
+                    PRIMARY KEY (ticker, frequency)
+                )
+            """)
+            self._local.conn, self._local.path = conn, self.db_path
+        return conn
+
+    def _lock(self, ticker: str, frequency: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault((ticker, frequency), threading.Lock())
+
+    # Refresh policy
+
+    def _latest_period_end(self, ticker: str, frequency: str) -> Optional[datetime]:
+        row = self._connect().execute(
+            "SELECT MAX(period_end) FROM statement_items WHERE ticker = ? AND frequency = ?",
+            (ticker, frequency)
+        ).fetchone()
+        return datetime.fromisoformat(row[0]) if row and row[0] else None
+
+    def next_period_due(self, ticker: str, frequency: str) -> Optional[datetime]:
+        """When the period after the latest stored one has to be filed, None if nothing is stored."""
+        latest = self._latest_period_end(ticker, frequency)
+        if latest is None:
+            return None
+        return (latest + relativedelta(months=self.PERIOD_MONTHS[frequency])
+                + timedelta(days=self.FILING_DEADLINE_DAYS[frequency]))
+
+    def _needs_refresh(self, ticker: str, frequency: str) -> bool:
+        row = self._connect().execute(
+            "SELECT checked_at FROM statement_checks WHERE ticker = ? AND frequency = ?",
+            (ticker, frequency)
+        ).fetchone()
+        if row is None:
+            return True
+        due = self.next_period_due(ticker, frequency)
+        if due is not None and datetime.now() < due:
+            return False
+        return time.time() - row[0] > self.recheck_interval.total_seconds()
+
+    # Ingest
+
+    @staticmethod
+    def _rows(ticker: str, frequency: str, statement: str, frame: pd.DataFrame, known: set) -> List[tuple]:
+        """Rows for the periods of one statement frame that are not stored yet, aliases resolved."""
+        resolved = {item: item for item in frame.index}
+        for canonical, aliases in LINE_ITEM_ALIASES.items():
+            if canonical not in resolved:
+                reported = next((alias for alias in aliases if alias in frame.index), None)
+                if reported is not None:
+                    resolved[canonical] = reported
+
+        rows = []
+        for column in frame.columns:
+            period_end = pd.Timestamp(column).date().isoformat()
+            if period_end in known:
+                continue
+            values = frame[column]
+            for line_item, reported_as in resolved.items():
+                value = values.get(reported_as)
+                if isinstance(value, pd.Series):  # duplicate line item names
+                    value = value.iloc[0]
+                if value is not None and pd.notna(value):
+                    rows.append((ticker, frequency, statement, period_end, str(line_item), str(reported_as), float(value)))
+        return rows
+
+    def _ingest(self, ticker: str, frequency: str, statements: Dict[str, Optional[pd.DataFrame]]) -> Optional[int]:
+        """
+        Insert the periods of freshly fetched statements that are not stored yet.
+
+        Returns:
+            Number of new periods, None if the fetch returned no statement at all
+            (the gateway maps upstream errors to None) - the check is then not
+            recorded, so the next request retries
+        """
+        conn = self._connect()
+        rows = []
+        fetched = False
+        for statement in self.STATEMENTS:
+            frame = statements.get(statement)
+            if not isinstance(frame, pd.DataFrame) or frame.empty:
+                continue
+            fetched = True
+            known = {row[0] for row in conn.execute(
+                "SELECT DISTINCT period_end FROM statement_items WHERE ticker = ? AND frequency = ? AND statement = ?",
+                (ticker, frequency, statement)
+            )}
+            rows.extend(self._rows(ticker, frequency, statement, frame, known))
+        if not fetched:
+            return None
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("INSERT OR IGNORE INTO statement_items VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.execute(
+                "INSERT OR REPLACE INTO statement_checks (ticker, frequency, checked_at) VALUES (?, ?, ?)",
+                (ticker, frequency, time.time())
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len({row[3] for row in rows})
+
+    # Read
+
+    def _read(self, ticker: str, frequency: str, resolved: bool,
+              max_periods: Optional[int]) -> Dict[str, Optional[pd.DataFrame]]:
+        query = "SELECT statement, period_end, line_item, value FROM statement_items WHERE ticker = ? AND frequency = ?"
+        if not resolved:
+            query += " AND line_item = reported_as"
+        records = self._connect().execute(query, (ticker, frequency)).fetchall()
+
+        statements = {}
+        for statement in self.STATEMENTS:
+            values = {}
+            for row_statement, period_end, line_item, value in records:
+                if row_statement == statement:
+                    values.setdefault(pd.Timestamp(period_end), {})[line_item] = value
+            if not values:
+                statements[statement] = None
+                continue
+            periods = sorted(values, reverse=True)[:max_periods]
+            # Line items as rows, period ends as columns (newest first) - the yfinance layout
+            statements[statement] = pd.DataFrame({period: values[period] for period in periods})
+        return statements
+
+    # Sync API
+
+    def get_statements_sync(
+        self,
+        ticker: str,
+        frequency: str = "annual",
+        resolved: bool = False,
+        max_periods: Optional[int] = None
+    ) -> Dict[str, Optional[pd.DataFrame]]:
+        """
+        Financial statements, from the store and refreshed from yfinance when a new period is due.
+
+        Args:
+            ticker: Stock ticker symbol
+            frequency: "annual" or "quarterly"
+            resolved: Add canonical line items (LINE_ITEM_ALIASES) where only an alias was reported
+            max_periods: Newest periods to return, all stored periods if None
+
+        Returns:
+            Dictionary with financials, balance_sheet and cashflow (None where unavailable)
+        """
+        with self._lock(ticker, frequency):
+            if self._needs_refresh(ticker, frequency):
+                try:
+                    added = self._ingest(ticker, frequency, self.gateway.get_statements_sync(ticker, frequency))
+                    if added is None:
+                        logger.warning(f"No statements returned for {ticker} ({frequency}), will retry on the next request")
+                    else:
+                        logger.info(f"Statements refresh for {ticker} ({frequency}): {added} new periods")
+                except Exception as e:
+                    if self._latest_period_end(ticker, frequency) is None:
+                        raise
+                    logger.warning(f"Could not refresh statements for {ticker}, serving stored periods: {e}")
+        return self._read(ticker, frequency, resolved, max_periods)
+
+    def invalidate(self, ticker: str):
+        """Drop a ticker's stored statements, e.g. after a restatement."""
+        conn = self._connect()
+        conn.execute("DELETE FROM statement_items WHERE ticker = ?", (ticker,))
+        conn.execute("DELETE FROM statement_checks WHERE ticker = ?", (ticker,))
+
+    # Async API
+
+    def submit_statements(self, ticker: str, frequency: str = "annual", **kwargs) -> Future:
+        """Start get_statements_sync on the store's pool without waiting for it."""
+        return self._executor.submit(contextvars.copy_context().run, self.get_statements_sync, ticker, frequency, **kwargs)
+
+    async def get_statements(self, ticker: str, frequency: str = "annual", **kwargs) -> Dict[str, Optional[pd.DataFrame]]:
+        """Async get_statements_sync."""
+        return await asyncio.wrap_future(self.submit_statements(ticker, frequency, **kwargs))
+
+
+# Global store instance
+financial_statements_store = FinancialStatementsStore(
+    db_path=os.getenv("FINANCIAL_STATEMENTS_DB", "cache/financial_statements.db"),
+    recheck_interval=timedelta(hours=float(os.getenv("STATEMENTS_RECHECK_HOURS", "24")))
+)
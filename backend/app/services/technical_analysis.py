@@ -1,9 +1,15 @@
+import asyncio
+import time
 import pandas as pd
 import numpy as np
-import yfinance as yf
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from .price_service import price_service
+from .intelligent_cache import intelligent_cache, CacheType
+from .ohlcv_store import OHLCVColumns, ohlcv_store
+from .company_snapshot import CompanySnapshot
+from . import indicators
+from .indicator_state import indicator_state_store
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,113 +19,59 @@ class TechnicalAnalysisService:
     Service for calculating technical indicators and preparing data for the Technical Analysis Summary card.
     """
     
+    # Timeframes resampled from a stored base series: pandas rule, base series, bars shown in chart_data
+    TIMEFRAMES = {
+        "5m": ("5min", "intraday", 375),   # 5 sessions
+        "15m": ("15min", "intraday", 250),  # 10 sessions
+        "1h": ("60min", "intraday", 210),   # 30 sessions
+        "1w": ("W-MON", "daily", 156)       # 3 years
+    }
+    WEEKLY_HISTORY_PERIOD = "5y"  # daily bars resampled to weekly: 260 weeks covers the 200-bar SMA
+    INTRADAY_REFRESH_SECONDS = 60  # stored minute candles are topped up at most once a minute
+    
     @staticmethod
     def calculate_sma(data: pd.Series, window: int) -> pd.Series:
         """Calculate Simple Moving Average"""
-        return data.rolling(window=window, min_periods=1).mean()
+        return pd.Series(indicators.sma(data.to_numpy(), window), index=data.index)
     
     @staticmethod
     def calculate_rsi(data: pd.Series, window: int = 14) -> pd.Series:
         """Calculate Relative Strength Index"""
-        delta = data.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=window, min_periods=1).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=window, min_periods=1).mean()
-        
-        # Avoid division by zero
-        rs = gain / loss.replace(0, np.inf)
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return pd.Series(indicators.rsi(data.to_numpy(), window), index=data.index)
     
     @staticmethod
     def calculate_bollinger_bands(data: pd.Series, window: int = 20, num_std: float = 2) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """Calculate Bollinger Bands"""
-        sma = data.rolling(window=window, min_periods=1).mean()
-        std = data.rolling(window=window, min_periods=1).std()
-        
-        upper_band = sma + (std * num_std)
-        lower_band = sma - (std * num_std)
-        
-        return upper_band, sma, lower_band
+        return tuple(
+            pd.Series(band, index=data.index)
+            for band in indicators.bollinger_bands(data.to_numpy(), window, num_std)
+        )
     
     @staticmethod
     def find_support_resistance(data: pd.Series, window: int = 20) -> Tuple[float, float]:
         """Find basic support and resistance levels"""
-        # Get recent highs and lows
-        recent_data = data.tail(window * 2)  # Look at last 40 periods for more data
-        
-        # Calculate local maxima and minima
-        highs = []
-        lows = []
-        
-        for i in range(window, len(recent_data) - window):
-            if all(recent_data.iloc[i] >= recent_data.iloc[i-j] for j in range(1, window+1)) and \
-               all(recent_data.iloc[i] >= recent_data.iloc[i+j] for j in range(1, window+1)):
-                highs.append(recent_data.iloc[i])
-            
-            if all(recent_data.iloc[i] <= recent_data.iloc[i-j] for j in range(1, window+1)) and \
-               all(recent_data.iloc[i] <= recent_data.iloc[i+j] for j in range(1, window+1)):
-                lows.append(recent_data.iloc[i])
-        
-        # If no clear levels found, use percentiles
-        if not highs:
-            highs = [recent_data.quantile(0.9)]
-        if not lows:
-            lows = [recent_data.quantile(0.1)]
-        
-        resistance = np.mean(highs)
-        support = np.mean(lows)
-        
-        return support, resistance
+        return indicators.support_resistance(data.to_numpy(), window)
     
     @staticmethod
     def calculate_macd(data: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """Calculate MACD (Moving Average Convergence Divergence)"""
-        # Calculate the MACD line (12-day EMA - 26-day EMA)
-        ema_fast = data.ewm(span=fast).mean()
-        ema_slow = data.ewm(span=slow).mean()
-        macd_line = ema_fast - ema_slow
-        
-        # Signal line (9-day EMA of MACD line)
-        macd_signal = macd_line.ewm(span=signal).mean()
-        
-        # MACD histogram (MACD - Signal)
-        macd_histogram = macd_line - macd_signal
-        
-        return macd_line, macd_signal, macd_histogram
+        return tuple(
+            pd.Series(line, index=data.index)
+            for line in indicators.macd(data.to_numpy(), fast, slow, signal)
+        )
     
     @staticmethod
     def calculate_stochastic(high: pd.Series, low: pd.Series, close: pd.Series, k: int = 14, d: int = 3) -> Tuple[pd.Series, pd.Series]:
         """Calculate Stochastic Oscillator"""
-        # Calculate %K (Fast Stochastic)
-        lowest_low = low.rolling(window=k, min_periods=1).min()
-        highest_high = high.rolling(window=k, min_periods=1).max()
-        
-        stoch_k = 100 * (close - lowest_low) / (highest_high - lowest_low)
-        
-        # Calculate %D (Slow Stochastic) - SMA of %K
-        stoch_d = stoch_k.rolling(window=d, min_periods=1).mean()
-        
-        return stoch_k, stoch_d
+        stoch_k, stoch_d = indicators.stochastic(high.to_numpy(), low.to_numpy(), close.to_numpy(), k, d)
+        return pd.Series(stoch_k, index=close.index), pd.Series(stoch_d, index=close.index)
     
     @staticmethod
     def calculate_volume_indicators(close: pd.Series, volume: pd.Series, window: int = 20) -> Tuple[pd.Series, pd.Series]:
         """Calculate volume indicators"""
-        # On-Balance Volume (OBV)
-        obv = pd.Series(index=close.index, dtype=float)
-        obv.iloc[0] = volume.iloc[0]
-        
-        for i in range(1, len(close)):
-            if close.iloc[i] > close.iloc[i-1]:
-                obv.iloc[i] = obv.iloc[i-1] + volume.iloc[i]
-            elif close.iloc[i] < close.iloc[i-1]:
-                obv.iloc[i] = obv.iloc[i-1] - volume.iloc[i]
-            else:
-                obv.iloc[i] = obv.iloc[i-1]
-        
-        # Volume Simple Moving Average
-        volume_sma = volume.rolling(window=window, min_periods=1).mean()
-        
-        return obv, volume_sma
+        obv = indicators.obv(close.to_numpy(), volume.to_numpy())
+        volume_sma = indicators.sma(volume.to_numpy(), window)
+        return pd.Series(obv, index=close.index), pd.Series(volume_sma, index=close.index)
     
     @staticmethod
     def analyze_volume_trend(volume: pd.Series, window: int = 10) -> str:
@@ -217,23 +169,224 @@ class TechnicalAnalysisService:
         
         return signals
     
-    def get_technical_analysis(self, ticker: str, period: str = "1y") -> Optional[Dict[str, Any]]:
+    @classmethod
+    def _indicator_values(cls, current_price: float, latest: Dict[str, Any]) -> Dict[str, Any]:
+        """Indicator values for the AI agent and detected signals, from the latest bar's indicators"""
+        indicator_values = {
+            'current_price': float(current_price),
+            'rsi': float(latest['rsi']),
+            'price_vs_50d_sma': float(current_price / latest['sma_50_current']),
+            'price_vs_200d_sma': float(current_price / latest['sma_200_current']),
+            **{
+                name: value if name == 'volume_trend' else float(value)
+                for name, value in latest.items() if name != 'rsi'
+            }
+        }
+        
+        signals = cls.detect_signals(indicator_values)
+        if signals:
+            indicator_values['signals'] = signals
+        return indicator_values
+    
+    def get_indicator_values(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """
+        Current indicator values of a ticker from its persisted indicator state,
+        rolled forward over new bars instead of recomputed over the history
+        
+        Args:
+            ticker: Stock ticker symbol
+            
+        Returns:
+            Indicator values as in compute_technical_analysis, None on failure
+        """
+        latest = indicator_state_store.current_sync(ticker)
+        if latest is None:
+            return None
+        close = latest.pop('close')
+        current_price = price_service.get_price_for_dcf(ticker) or close
+        return self._indicator_values(current_price, latest)
+    
+    @staticmethod
+    def _json_column(values: np.ndarray) -> List[Optional[float]]:
+        """A float column as a JSON-ready list, NaN mapped to None in one pass."""
+        missing = np.isnan(values)
+        if not missing.any():
+            return values.tolist()
+        column = values.astype(object)
+        column[missing] = None
+        return column.tolist()
+    
+    @staticmethod
+    def with_chart_layout(result: Dict[str, Any], layout: str) -> Dict[str, Any]:
         """
-        Get comprehensive technical analysis for a ticker
+        A technical analysis result with its chart_data in the given layout
+        
+        Args:
+            result: Result of compute_technical_analysis (or a cached one in either layout)
+            layout: "rows" - one dict per bar, "columns" - one list per field
+            
+        Returns:
+            The result itself if already in that layout, otherwise a converted copy
+        """
+        current = result.get('chart_layout', 'rows')
+        if current == layout:
+            return result
+        chart_data = result['chart_data']
+        if layout == 'rows':
+            fields = list(chart_data)
+            chart_data = [dict(zip(fields, values)) for values in zip(*chart_data.values())]
+        else:
+            fields = list(chart_data[0]) if chart_data else []
+            chart_data = {field: [row[field] for row in chart_data] for field in fields}
+        return {**result, 'chart_layout': layout, 'chart_data': chart_data}
+    
+    def get_technical_analysis(
+        self,
+        ticker: str,
+        period: str = "1y",
+        snapshot: Optional[CompanySnapshot] = None,
+        layout: str = "rows"
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get comprehensive technical analysis for a ticker, served from the
+        shared cache (CacheType.TECHNICAL_ANALYSIS, 1 hour TTL) when possible
         
         Args:
             ticker: Stock ticker symbol
             period: Time period ("3mo", "6mo", "1y", "3y")
+            snapshot: The request's CompanySnapshot, to reuse its fetched data
+            layout: chart_data as "rows" (one dict per bar) or "columns" (one list per field)
             
         Returns:
             Dictionary containing all technical analysis data
         """
+        result = intelligent_cache.get_sync(CacheType.TECHNICAL_ANALYSIS, ticker, period=period)
+        if result is None:
+            result = self.compute_technical_analysis(ticker, period, snapshot)
+            if result:
+                intelligent_cache.set_sync(
+                    CacheType.TECHNICAL_ANALYSIS, ticker, result,
+                    tags=[intelligent_cache.tag("ticker", ticker)], period=period
+                )
+        return self.with_chart_layout(result, layout) if result else result
+    
+    def _analyze(
+        self,
+        bars: OHLCVColumns,
+        display_bars: int,
+        current_price: float,
+        date_format: str = '%Y-%m-%d'
+    ) -> Tuple[Dict[str, List[Any]], Dict[str, Any]]:
+        """
+        Indicators over all bars, chart columns for the last display_bars of them
+        
+        Args:
+            bars: OHLCV bars of any timeframe, oldest first - indicator windows count these bars
+            display_bars: Bars to include in chart_data
+            current_price: Price the indicator values and signals are judged against
+            date_format: strftime format of the chart's date column
+            
+        Returns:
+            (chart_data columns, indicator_values)
+        """
+        display_data = bars.tail(display_bars)
+        
+        # Calculate indicators using full dataset, straight on the columns
+        close_prices = bars.close
+        
+        # Simple Moving Averages
+        sma_50 = indicators.sma(close_prices, 50)
+        sma_200 = indicators.sma(close_prices, 200)
+        
+        # RSI
+        rsi = indicators.rsi(close_prices, 14)
+        
+        # Bollinger Bands
+        bb_upper, bb_middle, bb_lower = indicators.bollinger_bands(close_prices, 20)
+        
+        # MACD
+        macd_line, macd_signal, macd_histogram = indicators.macd(close_prices)
+        
+        # Stochastic
+        stoch_k, stoch_d = indicators.stochastic(bars.high, bars.low, close_prices)
+        
+        # Volume indicators
+        obv = indicators.obv(close_prices, bars.volume)
+        volume_sma = indicators.sma(bars.volume, 20)
+        volume_trend = self.analyze_volume_trend(pd.Series(bars.volume, copy=False))
+        
+        # Support and Resistance
+        support, resistance = indicators.support_resistance(close_prices)
+        
+        # Latest values, with fallbacks for indicators without a value yet
+        latest = {
+            'rsi': rsi[-1],
+            'support_level': support,
+            'resistance_level': resistance,
+            'sma_50_current': sma_50[-1],
+            'sma_200_current': sma_200[-1],
+            # Previous values for signal detection
+            'sma_50_prev': sma_50[-2] if len(sma_50) > 1 else sma_50[-1],
+            'sma_200_prev': sma_200[-2] if len(sma_200) > 1 else sma_200[-1],
+            'bb_upper_current': bb_upper[-1],
+            'bb_lower_current': bb_lower[-1],
+            'bb_middle_current': bb_middle[-1],
+            # New indicators
+            'macd_current': macd_line[-1] if not pd.isna(macd_line[-1]) else 0,
+            'macd_signal_current': macd_signal[-1] if not pd.isna(macd_signal[-1]) else 0,
+            'macd_histogram_current': macd_histogram[-1] if not pd.isna(macd_histogram[-1]) else 0,
+            'stoch_k_current': stoch_k[-1] if not pd.isna(stoch_k[-1]) else 50,
+            'stoch_d_current': stoch_d[-1] if not pd.isna(stoch_d[-1]) else 50,
+            'volume_trend': volume_trend,
+            'obv_current': obv[-1] if not pd.isna(obv[-1]) else 0
+        }
+        indicator_values = self._indicator_values(current_price, latest)
+        
+        # Prepare chart data (only for the requested display period), one list per field
+        display_count = len(display_data)
+        chart_columns = {
+            'date': display_data.dates().strftime(date_format).tolist(),
+            'timestamp': display_data.timestamps.astype(np.int64).tolist(),
+            'open': display_data.open.tolist(),
+            'high': display_data.high.tolist(),
+            'low': display_data.low.tolist(),
+            'close': display_data.close.tolist(),
+            'volume': display_data.volume.astype(np.int64).tolist()
+        }
+        for name, values in (
+            ('sma_50', sma_50), ('sma_200', sma_200),
+            ('bb_upper', bb_upper), ('bb_lower', bb_lower), ('bb_middle', bb_middle),
+            ('rsi', rsi),
+            # New indicators
+            ('macd_line', macd_line), ('macd_signal', macd_signal), ('macd_histogram', macd_histogram),
+            ('stoch_k', stoch_k), ('stoch_d', stoch_d),
+            ('volume_sma', volume_sma), ('obv', obv)
+        ):
+            chart_columns[name] = self._json_column(values[-display_count:])
+        
+        return chart_columns, indicator_values
+    
+    def compute_technical_analysis(
+        self,
+        ticker: str,
+        period: str = "1y",
+        snapshot: Optional[CompanySnapshot] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Compute technical analysis from fresh yfinance data (uncached)
+        
+        Args:
+            ticker: Stock ticker symbol
+            period: Time period ("3mo", "6mo", "1y", "3y")
+            snapshot: The request's CompanySnapshot, to reuse its fetched data
+            
+        Returns:
+            Dictionary containing all technical analysis data (chart_data in
+            column layout, as cached), None on failure
+        """
         try:
             logger.info(f"Fetching technical analysis for {ticker} with period {period}")
             
-            # Fetch historical data
-            stock = yf.Ticker(ticker)
-            
             # Map period to yfinance format and determine data points needed
             period_map = {
                 "3mo": ("3mo", 90),
@@ -246,154 +399,175 @@ class TechnicalAnalysisService:
             
             # Fetch extra data to ensure we have enough for 200-day SMA calculation
             extended_period = "2y" if period in ["3mo", "6mo", "1y"] else "5y"
-            hist = stock.history(period=extended_period)
+            # Columns are views of the memory-mapped store (or of the snapshot's frame) - never copied
+            if snapshot is not None:
+                hist = snapshot.history_sync(period=extended_period)
+                bars = OHLCVColumns.from_frame(hist) if not hist.empty else None
+            else:
+                bars = ohlcv_store.get_columns_sync(ticker, period=extended_period)
             
-            if hist.empty:
+            if bars is None or len(bars) == 0:
                 logger.error(f"No historical data found for {ticker}")
                 return None
             
-            # Take only the requested period for display, but use extended data for calculations
-            display_data = hist.tail(days_needed).copy()
-            
-            # Calculate indicators using full dataset
-            close_prices = hist['Close']
-            high_prices = hist['High']
-            low_prices = hist['Low']
-            volume_data = hist['Volume']
-            
-            # Simple Moving Averages
-            sma_50 = self.calculate_sma(close_prices, 50)
-            sma_200 = self.calculate_sma(close_prices, 200)
-            
-            # RSI
-            rsi = self.calculate_rsi(close_prices, 14)
-            
-            # Bollinger Bands
-            bb_upper, bb_middle, bb_lower = self.calculate_bollinger_bands(close_prices, 20)
-            
-            # MACD
-            macd_line, macd_signal, macd_histogram = self.calculate_macd(close_prices)
-            
-            # Stochastic
-            stoch_k, stoch_d = self.calculate_stochastic(high_prices, low_prices, close_prices)
-            
-            # Volume indicators
-            obv, volume_sma = self.calculate_volume_indicators(close_prices, volume_data)
-            volume_trend = self.analyze_volume_trend(volume_data)
-            
-            # Support and Resistance
-            support, resistance = self.find_support_resistance(close_prices)
-            
             # Get current price from unified service for consistency
-            unified_current_price = price_service.get_price_for_dcf(ticker)
-            current_price = unified_current_price if unified_current_price else close_prices.iloc[-1]
+            if snapshot is not None:
+                unified_current_price = price_service.get_price_for_snapshot(snapshot)
+            else:
+                unified_current_price = price_service.get_price_for_dcf(ticker)
+            current_price = unified_current_price if unified_current_price else bars.close[-1]
             logger.info(f"Using unified current price for {ticker}: ₹{current_price:.2f}")
-            current_rsi = rsi.iloc[-1]
-            current_sma_50 = sma_50.iloc[-1]
-            current_sma_200 = sma_200.iloc[-1]
-            current_bb_upper = bb_upper.iloc[-1]
-            current_bb_lower = bb_lower.iloc[-1]
-            current_bb_middle = bb_middle.iloc[-1]
-            
-            # New indicators current values
-            current_macd = macd_line.iloc[-1] if len(macd_line) > 0 and not pd.isna(macd_line.iloc[-1]) else 0
-            current_macd_signal = macd_signal.iloc[-1] if len(macd_signal) > 0 and not pd.isna(macd_signal.iloc[-1]) else 0
-            current_macd_histogram = macd_histogram.iloc[-1] if len(macd_histogram) > 0 and not pd.isna(macd_histogram.iloc[-1]) else 0
-            current_stoch_k = stoch_k.iloc[-1] if len(stoch_k) > 0 and not pd.isna(stoch_k.iloc[-1]) else 50
-            current_stoch_d = stoch_d.iloc[-1] if len(stoch_d) > 0 and not pd.isna(stoch_d.iloc[-1]) else 50
-            current_obv = obv.iloc[-1] if len(obv) > 0 and not pd.isna(obv.iloc[-1]) else 0
             
-            # Get previous values for signal detection
-            prev_sma_50 = sma_50.iloc[-2] if len(sma_50) > 1 else current_sma_50
-            prev_sma_200 = sma_200.iloc[-2] if len(sma_200) > 1 else current_sma_200
+            # Take only the requested period for display, but use extended data for calculations
+            chart_columns, indicator_values = self._analyze(bars, days_needed, current_price)
+            display_count = len(chart_columns['date'])
             
-            # Prepare indicator values for AI agent
-            indicator_values = {
-                'current_price': float(current_price),
-                'rsi': float(current_rsi),
-                'price_vs_50d_sma': float(current_price / current_sma_50),
-                'price_vs_200d_sma': float(current_price / current_sma_200),
-                'support_level': float(support),
-                'resistance_level': float(resistance),
-                'sma_50_current': float(current_sma_50),
-                'sma_200_current': float(current_sma_200),
-                'sma_50_prev': float(prev_sma_50),
-                'sma_200_prev': float(prev_sma_200),
-                'bb_upper_current': float(current_bb_upper),
-                'bb_lower_current': float(current_bb_lower),
-                'bb_middle_current': float(current_bb_middle),
-                # New indicators
-                'macd_current': float(current_macd),
-                'macd_signal_current': float(current_macd_signal),
-                'macd_histogram_current': float(current_macd_histogram),
-                'stoch_k_current': float(current_stoch_k),
-                'stoch_d_current': float(current_stoch_d),
-                'volume_trend': volume_trend,
-                'obv_current': float(current_obv)
+            result = {
+                'ticker': ticker,
+                'period': period,
+                'chart_layout': 'columns',
+                'chart_data': chart_columns,
+                'indicator_values': indicator_values,
+                'analysis_timestamp': datetime.now().isoformat(),
+                'data_points': display_count
             }
             
-            # Detect signals
-            signals = self.detect_signals(indicator_values)
-            if signals:
-                indicator_values['signals'] = signals
+            logger.info(f"Technical analysis completed for {ticker}: {display_count} data points")
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error in technical analysis for {ticker}: {e}")
+            return None
+
+    @staticmethod
+    def resample_bars(frame: pd.DataFrame, rule: str) -> pd.DataFrame:
+        """
+        OHLCV bars aggregated to a coarser timeframe
+        
+        Each bin takes the first open, highest high, lowest low, last close and
+        total volume of its bars. Intraday bins are aligned to the 9:15 market
+        open, weekly bins start on Monday; bins without any bar are dropped.
+        
+        Args:
+            frame: Ticker.history style DataFrame of the base series
+            rule: pandas offset alias ("5min", "60min", "W-MON", ...)
+        """
+        if rule.startswith("W"):
+            resampler = frame.resample(rule, label="left", closed="left")
+        else:
+            resampler = frame.resample(rule, origin="start_day", offset="15min")
+        bars = resampler.agg({"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"})
+        return bars[bars["Close"].notna()]
+    
+    async def _base_bars(self, ticker: str, base: str) -> pd.DataFrame:
+        """
+        The stored series a timeframe is resampled from: daily bars or the stored intraday candles
+        
+        The intraday candles are kept for days (CacheType.INTRADAY_BARS) and
+        topped up with only the candles from the last stored one on, which
+        the new ones replace as it may have been a partial minute. Candles
+        older than the lookback are dropped.
+        """
+        if base == "daily":
+            return await ohlcv_store.get_history(ticker, period=self.WEEKLY_HISTORY_PERIOD)
+        
+        from .enhanced_data_service import INTRADAY_LOOKBACK_DAYS, get_enhanced_data_service
+        cached = await intelligent_cache.get(CacheType.INTRADAY_BARS, ticker)
+        stored = cached['bars'] if cached is not None else None
+        if stored is not None and time.time() - cached['refreshed_at'] < self.INTRADAY_REFRESH_SECONDS:
+            return stored
+        
+        since = stored.index[-1] if stored is not None and not stored.empty else None
+        fresh = await get_enhanced_data_service().get_intraday_frame(ticker, since=since)
+        if since is None:
+            frame = fresh
+        elif fresh.empty:
+            frame = stored
+        else:
+            frame = pd.concat([stored[stored.index < fresh.index[0]], fresh])
+        if frame.empty:
+            return frame
+        
+        frame = frame[frame.index >= frame.index[-1].normalize() - pd.Timedelta(days=INTRADAY_LOOKBACK_DAYS)]
+        await intelligent_cache.set(
+            CacheType.INTRADAY_BARS, ticker, {'bars': frame, 'refreshed_at': time.time()},
+            tags=[intelligent_cache.tag("ticker", ticker)]
+        )
+        return frame
+    
+    async def get_timeframe_analysis(self, ticker: str, timeframe: str, layout: str = "rows") -> Optional[Dict[str, Any]]:
+        """
+        Technical analysis on 5m/15m/1h/weekly bars, cached per (ticker, timeframe)
+        
+        Every intraday timeframe is resampled from the same stored minute
+        candles and weekly from the stored daily bars, so no timeframe is
+        fetched on its own. Intraday results live for a minute
+        (CacheType.INTRADAY_ANALYSIS), weekly ones as long as daily results.
+        
+        Args:
+            ticker: Stock ticker symbol
+            timeframe: "5m", "15m", "1h" or "1w"
+            layout: chart_data as "rows" (one dict per bar) or "columns" (one list per field)
             
-            # Prepare chart data (only for the requested display period)
-            chart_data = []
-            display_sma_50 = sma_50.tail(len(display_data))
-            display_sma_200 = sma_200.tail(len(display_data))
-            display_bb_upper = bb_upper.tail(len(display_data))
-            display_bb_lower = bb_lower.tail(len(display_data))
-            display_bb_middle = bb_middle.tail(len(display_data))
-            display_rsi = rsi.tail(len(display_data))
+        Returns:
+            Dictionary as get_technical_analysis, with 'timeframe' in place of 'period'
+        """
+        _, base, _ = self.TIMEFRAMES[timeframe]
+        cache_type = CacheType.INTRADAY_ANALYSIS if base == "intraday" else CacheType.TECHNICAL_ANALYSIS
+        result = await intelligent_cache.get(cache_type, ticker, timeframe=timeframe)
+        if result is None:
+            try:
+                frame = await self._base_bars(ticker, base)
+            except Exception as e:
+                logger.error(f"Error fetching {base} bars for {ticker}: {e}")
+                return None
+            result = await asyncio.to_thread(self.compute_timeframe_analysis, ticker, timeframe, frame)
+            if result:
+                await intelligent_cache.set(
+                    cache_type, ticker, result, tags=[intelligent_cache.tag("ticker", ticker)], timeframe=timeframe
+                )
+        return self.with_chart_layout(result, layout) if result else result
+    
+    def compute_timeframe_analysis(self, ticker: str, timeframe: str, frame: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """
+        Compute technical analysis on a timeframe resampled from a base series (uncached)
+        
+        Indicator windows count bars of the timeframe (the 50 SMA of 1h bars
+        spans 50 hours).
+        
+        Args:
+            ticker: Stock ticker symbol
+            timeframe: "5m", "15m", "1h" or "1w"
+            frame: The base series (see _base_bars)
             
-            # New indicators for display
-            display_macd_line = macd_line.tail(len(display_data))
-            display_macd_signal = macd_signal.tail(len(display_data))
-            display_macd_histogram = macd_histogram.tail(len(display_data))
-            display_stoch_k = stoch_k.tail(len(display_data))
-            display_stoch_d = stoch_d.tail(len(display_data))
-            display_obv = obv.tail(len(display_data))
-            display_volume_sma = volume_sma.tail(len(display_data))
+        Returns:
+            Dictionary containing all technical analysis data, None on failure
+        """
+        try:
+            rule, base, display_bars = self.TIMEFRAMES[timeframe]
+            if frame is None or frame.empty:
+                logger.error(f"No {base} data found for {ticker}")
+                return None
             
-            for i, (date, row) in enumerate(display_data.iterrows()):
-                chart_data.append({
-                    'date': date.strftime('%Y-%m-%d'),
-                    'timestamp': int(date.timestamp()),
-                    'open': float(row['Open']),
-                    'high': float(row['High']),
-                    'low': float(row['Low']),
-                    'close': float(row['Close']),
-                    'volume': int(row['Volume']),
-                    'sma_50': float(display_sma_50.iloc[i]) if not pd.isna(display_sma_50.iloc[i]) else None,
-                    'sma_200': float(display_sma_200.iloc[i]) if not pd.isna(display_sma_200.iloc[i]) else None,
-                    'bb_upper': float(display_bb_upper.iloc[i]) if not pd.isna(display_bb_upper.iloc[i]) else None,
-                    'bb_lower': float(display_bb_lower.iloc[i]) if not pd.isna(display_bb_lower.iloc[i]) else None,
-                    'bb_middle': float(display_bb_middle.iloc[i]) if not pd.isna(display_bb_middle.iloc[i]) else None,
-                    'rsi': float(display_rsi.iloc[i]) if not pd.isna(display_rsi.iloc[i]) else None,
-                    # New indicators
-                    'macd_line': float(display_macd_line.iloc[i]) if i < len(display_macd_line) and not pd.isna(display_macd_line.iloc[i]) else None,
-                    'macd_signal': float(display_macd_signal.iloc[i]) if i < len(display_macd_signal) and not pd.isna(display_macd_signal.iloc[i]) else None,
-                    'macd_histogram': float(display_macd_histogram.iloc[i]) if i < len(display_macd_histogram) and not pd.isna(display_macd_histogram.iloc[i]) else None,
-                    'stoch_k': float(display_stoch_k.iloc[i]) if i < len(display_stoch_k) and not pd.isna(display_stoch_k.iloc[i]) else None,
-                    'stoch_d': float(display_stoch_d.iloc[i]) if i < len(display_stoch_d) and not pd.isna(display_stoch_d.iloc[i]) else None,
-                    'volume_sma': float(display_volume_sma.iloc[i]) if i < len(display_volume_sma) and not pd.isna(display_volume_sma.iloc[i]) else None,
-                    'obv': float(display_obv.iloc[i]) if i < len(display_obv) and not pd.isna(display_obv.iloc[i]) else None
-                })
+            bars = OHLCVColumns.from_frame(self.resample_bars(frame, rule))
+            current_price = price_service.get_price_for_dcf(ticker) or bars.close[-1]
+            chart_columns, indicator_values = self._analyze(
+                bars, display_bars, current_price, '%Y-%m-%d %H:%M' if base == "intraday" else '%Y-%m-%d'
+            )
             
-            result = {
+            logger.info(f"Technical analysis ({timeframe}) completed for {ticker}: {len(chart_columns['date'])} data points")
+            return {
                 'ticker': ticker,
-                'period': period,
-                'chart_data': chart_data,
+                'timeframe': timeframe,
+                'chart_layout': 'columns',
+                'chart_data': chart_columns,
                 'indicator_values': indicator_values,
                 'analysis_timestamp': datetime.now().isoformat(),
-                'data_points': len(chart_data)
+                'data_points': len(chart_columns['date'])
             }
             
-            logger.info(f"Technical analysis completed for {ticker}: {len(chart_data)} data points")
-            return result
-            
         except Exception as e:
-            logger.error(f"Error in technical analysis for {ticker}: {e}")
+            logger.error(f"Error in {timeframe} technical analysis for {ticker}: {e}")
             return None
 
 # Global service instance
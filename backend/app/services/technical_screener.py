@@ -0,0 +1,221 @@
+import logging
+import math
+import operator
+import re
+import warnings
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import indicators
+from .ohlcv_store import OHLCVColumns, ohlcv_store
+from .quote_stream import quote_stream
+from .technical_analysis import technical_analysis_service
+
+logger = logging.getLogger(__name__)
+
+_OPERATORS = {
+    "<=": operator.le, ">=": operator.ge, "<": operator.lt, ">": operator.gt,
+    "=": operator.eq, "==": operator.eq, "!=": operator.ne
+}
+_CONDITION = re.compile(r"^\s*([A-Za-z_][A-Za-z0-9_]*)\s*(<=|>=|==|!=|<|>|=)\s*(\S+)\s*$")
+
+
+class TechnicalScreener:
+    """
+    Current indicator values and signals of many tickers at once.
+
+    The histories are fetched in one batch (OHLCVStore.get_columns_many_sync),
+    stacked into (tickers, bars) panels right-aligned on each ticker's latest
+    bar, and every indicator is computed over the whole panel in one call.
+    Each row equals the indicator_values of compute_technical_analysis for
+    the ticker, with the live tick as current price when the quote stream
+    has one and the latest close otherwise.
+    """
+
+    HISTORY_PERIOD = "2y"  # the history compute_technical_analysis uses for 3mo-1y
+    FIELDS = (
+        'current_price', 'rsi', 'price_vs_50d_sma', 'price_vs_200d_sma', 'support_level', 'resistance_level',
+        'sma_50_current', 'sma_200_current', 'sma_50_prev', 'sma_200_prev',
+        'bb_upper_current', 'bb_lower_current', 'bb_middle_current',
+        'macd_current', 'macd_signal_current', 'macd_histogram_current',
+        'stoch_k_current', 'stoch_d_current', 'obv_current'
+    )  # numeric fields of a row, for conditions and ranking
+
+    @staticmethod
+    def _panel(columns: List[OHLCVColumns]) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """(tickers, bars) high/low/close/volume panels, NaN-padded in front, and the bar count per row."""
+        lengths = np.array([len(bars) for bars in columns])
+        width = int(lengths.max())
+        panel = {name: np.full((len(columns), width), np.nan) for name in ("high", "low", "close", "volume")}
+        for row, bars in enumerate(columns):
+            for name, values in panel.items():
+                values[row, width - len(bars):] = getattr(bars, name)
+        return panel, lengths
+
+    @staticmethod
+    def latest_indicators(panel: Dict[str, np.ndarray], lengths: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Latest indicator values of every row, with the fallbacks of
+        compute_technical_analysis for indicators without a value yet
+
+        Returns:
+            Dictionary of indicator name -> array with one value per row, keys in
+            the order of compute_technical_analysis
+        """
+        close, volume = panel["close"], panel["volume"]
+        sma_50 = indicators.sma(close, 50)
+        sma_200 = indicators.sma(close, 200)
+        rsi = indicators.rsi(close, 14)
+        bb_upper, bb_middle, bb_lower = indicators.bollinger_bands(close, 20)
+        macd_line, macd_signal, macd_histogram = indicators.macd(close)
+        stoch_k, stoch_d = indicators.stochastic(panel["high"], panel["low"], close)
+        obv = indicators.obv(close, volume)
+        support, resistance = indicators.support_resistance(close)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # rows with fewer than 20 bars are neutral anyway
+            recent_avg = np.nanmean(volume[:, -10:], axis=1)
+            previous_avg = np.nanmean(volume[:, -20:-10], axis=1)
+        volume_trend = np.where(
+            lengths < 20, 'neutral',
+            np.where(recent_avg > previous_avg * 1.1, 'increasing',
+                     np.where(recent_avg < previous_avg * 0.9, 'decreasing', 'neutral'))
+        )
+
+        def prev(values: np.ndarray) -> np.ndarray:
+            return np.where(lengths > 1, values[:, -2], values[:, -1]) if values.shape[1] > 1 else values[:, -1]
+
+        def or_default(values: np.ndarray, default: float) -> np.ndarray:
+            return np.where(np.isnan(values[:, -1]), default, values[:, -1])
+
+        return {
+            'rsi': rsi[:, -1],
+            'support_level': support,
+            'resistance_level': resistance,
+            'sma_50_current': sma_50[:, -1],
+            'sma_200_current': sma_200[:, -1],
+            'sma_50_prev': prev(sma_50),
+            'sma_200_prev': prev(sma_200),
+            'bb_upper_current': bb_upper[:, -1],
+            'bb_lower_current': bb_lower[:, -1],
+            'bb_middle_current': bb_middle[:, -1],
+            'macd_current': or_default(macd_line, 0),
+            'macd_signal_current': or_default(macd_signal, 0),
+            'macd_histogram_current': or_default(macd_histogram, 0),
+            'stoch_k_current': or_default(stoch_k, 50),
+            'stoch_d_current': or_default(stoch_d, 50),
+            'volume_trend': volume_trend,
+            'obv_current': or_default(obv, 0)
+        }
+
+    @classmethod
+    def parse_condition(cls, condition: str) -> Callable[[Dict[str, Any]], bool]:
+        """
+        A row predicate from a condition such as "rsi<30" or "sma_50_current>sma_200_current"
+
+        Raises:
+            ValueError: If the condition cannot be parsed or names an unknown field
+        """
+        match = _CONDITION.match(condition)
+        if not match:
+            raise ValueError(f"Invalid condition '{condition}', expected e.g. rsi<30")
+        field, op, operand = match.group(1), _OPERATORS[match.group(2)], match.group(3)
+        try:
+            threshold, other = float(operand), None
+        except ValueError:
+            if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", operand):
+                raise ValueError(f"Invalid condition '{condition}', expected e.g. rsi<30")
+            threshold, other = None, operand
+        for name in (field, other):
+            if name is not None and name not in cls.FIELDS:
+                raise ValueError(f"Unknown field '{name}' in condition '{condition}'")
+
+        def predicate(row: Dict[str, Any]) -> bool:
+            value = row.get(field)
+            right = row.get(other) if other is not None else threshold
+            if not isinstance(value, float) or not isinstance(right, float):
+                return False
+            return op(value, right)
+
+        return predicate
+
+    def screen_sync(
+        self,
+        tickers: List[str],
+        where: Optional[List[str]] = None,
+        signals: Optional[List[str]] = None,
+        sort_by: str = "rsi",
+        order: str = "asc",
+        limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Screen tickers on their current indicator values and signals
+
+        Args:
+            tickers: yfinance ticker symbols
+            where: Conditions every row must meet, e.g. ["rsi<30", "price_vs_200d_sma>1"]
+            signals: Text every row must have among its signals (case-insensitive), e.g. ["golden cross"]
+            sort_by: Numeric field to rank by; rows without a value go last
+            order: "asc" or "desc"
+            limit: Rows to return at most
+
+        Returns:
+            Dictionary with the ranked rows and the tickers without history
+
+        Raises:
+            ValueError: If a condition or the sort field is invalid
+        """
+        if sort_by not in self.FIELDS:
+            raise ValueError(f"Cannot sort by '{sort_by}'")
+        predicates = [self.parse_condition(condition) for condition in where or []]
+        wanted = [text.lower() for text in signals or []]
+
+        columns = ohlcv_store.get_columns_many_sync(tickers, period=self.HISTORY_PERIOD)
+        screened = [(ticker, bars) for ticker, bars in columns.items() if bars is not None and len(bars)]
+        missing = [ticker for ticker, bars in columns.items() if bars is None or not len(bars)]
+
+        rows = []
+        if screened:
+            panel, lengths = self._panel([bars for _, bars in screened])
+            latest = self.latest_indicators(panel, lengths)
+            last_bars = pd.to_datetime([bars.timestamps[-1] for _, bars in screened], unit="s", utc=True)
+            for row, (ticker, bars) in enumerate(screened):
+                live = quote_stream.get(ticker)
+                current_price = live.last_price if live is not None else float(bars.close[-1])
+                values = technical_analysis_service._indicator_values(
+                    current_price, {name: column[row] for name, column in latest.items()}
+                )
+                values['volume_trend'] = str(values['volume_trend'])
+                values.setdefault('signals', [])
+                rows.append({'ticker': ticker, 'as_of': last_bars[row].tz_convert(bars.tz or 'UTC').strftime('%Y-%m-%d'), **values})
+
+        matches = [
+            row for row in rows
+            if all(predicate(row) for predicate in predicates)
+            and all(any(text in signal.lower() for signal in row['signals']) for text in wanted)
+        ]
+        ranked = sorted((row for row in matches if not math.isnan(row[sort_by])), key=lambda row: row[sort_by],
+                        reverse=order == "desc")
+        ranked += [row for row in matches if math.isnan(row[sort_by])]
+        if limit is not None:
+            ranked = ranked[:limit]
+
+        return {
+            'screened': len(screened),
+            'matches': len(matches),
+            'missing': missing,
+            'sort_by': sort_by,
+            'order': order,
+            'rows': [
+                {name: None if isinstance(value, float) and math.isnan(value) else value for name, value in row.items()}
+                for row in ranked
+            ],
+            'analysis_timestamp': datetime.now().isoformat()
+        }
+
+
+# Global screener instance
+technical_screener = TechnicalScreener()
@@ -5,7 +5,6 @@ import asyncio
 import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
-import yfinance as yf
 from functools import lru_cache
 
 from ..models.summary import (
@@ -20,6 +19,9 @@ from .dcf_service import DCFService
 from .claude_service import ClaudeService, agentic_analysis_service
 from .weighted_scoring_service import WeightedScoringService
 from .sector_dcf_service import SectorDCFService
+from .intelligent_cache import intelligent_cache, CacheType
+from .market_data_gateway import market_data_gateway
+from .company_snapshot import CompanySnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -34,8 +36,17 @@ class V3SummaryService:
         self.claude_service = ClaudeService()
         self.weighted_scoring_service = WeightedScoringService()
         self.sector_dcf_service = SectorDCFService()  # NEW: Sector-specific DCF
-        self.cache = {}  # Simple in-memory cache
-        self.cache_duration = timedelta(hours=4)  # 4-hour cache
+        # Summaries are cached as CacheType.V3_SUMMARIES (4 hours), shared by all workers
+    
+    async def _cached_summary(self, ticker: str, mode: str, force_refresh: bool, producer):
+        """Serve a summary from the shared cache, generating it at most once per key on a miss."""
+        if force_refresh:
+            summary = await producer()
+            await intelligent_cache.set(CacheType.V3_SUMMARIES, ticker, summary, mode=mode)
+            return summary
+        return await intelligent_cache.get_or_compute(
+            CacheType.V3_SUMMARIES, ticker, producer, mode=mode
+        )
     
     async def generate_simple_summary(
         self, 
@@ -48,27 +59,28 @@ class V3SummaryService:
         Uses quantitative rules, heuristics, and pre-written logic
         NO LLM inference - pure deterministic analysis
         """
-        cache_key = f"simple_{ticker}"
-        
-        # Check cache first
-        if not force_refresh and cache_key in self.cache:
-            cached_data, timestamp = self.cache[cache_key]
-            if datetime.now() - timestamp < self.cache_duration:
-                logger.info(f"Returning cached simple summary for {ticker}")
-                return cached_data
-        
+        return await self._cached_summary(
+            ticker, "simple", force_refresh,
+            lambda: self._build_simple_summary(ticker, force_refresh)
+        )
+    
+    async def _build_simple_summary(self, ticker: str, force_refresh: bool) -> SimpleSummaryResponse:
+        """Run the weighted scoring pipeline for a simple summary (cache producer)."""
         try:
             logger.info(f"Generating rule-based simple summary for {ticker}")
             
+            # One snapshot for the whole analysis - each upstream dataset is fetched once
+            snapshot = CompanySnapshot(ticker)
+            
             # Step 1: Get basic company data
-            company_data = await self._fetch_company_data(ticker)
+            company_data = await self._fetch_company_data(ticker, snapshot)
             
             # Step 2: Get sector classification using SectorDCFService
             sector = self.sector_dcf_service.classify_sector(ticker)
             
             # Step 3: Use new weighted scoring framework for comprehensive analysis
             peer_data = await self._fetch_peer_data(ticker)
-            technical_data = await self._fetch_technical_data(ticker)
+            technical_data = await self._fetch_technical_data(ticker, snapshot)
             
             scoring_result = await self.weighted_scoring_service.calculate_weighted_score(
                 ticker=ticker,
@@ -119,10 +131,7 @@ class V3SummaryService:
                 }
             )
             
-            # Cache the result
-            self.cache[cache_key] = (summary, datetime.now())
-            
-            logger.info(f"Successfully generated simple summary for {ticker}")
+            logger.info(f"Successfully generated simple summary for {ticker} ({snapshot.loads} market data loads)")
             return summary
             
         except Exception as e:
@@ -140,22 +149,23 @@ class V3SummaryService:
         Uses single Financial Analyst Agent with sector-specific reasoning
         LLM-enabled comprehensive investment thesis
         """
-        cache_key = f"agentic_{ticker}"
-        
-        # Check cache first
-        if not force_refresh and cache_key in self.cache:
-            cached_data, timestamp = self.cache[cache_key]
-            if datetime.now() - timestamp < self.cache_duration:
-                logger.info(f"Returning cached agentic summary for {ticker}")
-                return cached_data
-        
+        return await self._cached_summary(
+            ticker, "agentic", force_refresh,
+            lambda: self._build_agentic_summary(ticker)
+        )
+    
+    async def _build_agentic_summary(self, ticker: str) -> AgenticSummaryResponse:
+        """Generate the AI investment thesis for an agentic summary (cache producer)."""
         try:
             logger.info(f"Generating AI-powered agentic summary for {ticker}")
             
+            # One snapshot for the whole analysis - each upstream dataset is fetched once
+            snapshot = CompanySnapshot(ticker)
+            
             # Step 1: Get comprehensive data for AI analysis
-            company_data = await self._fetch_company_data(ticker)
+            company_data = await self._fetch_company_data(ticker, snapshot)
             peer_data = await self._fetch_peer_data(ticker)
-            technical_data = await self._fetch_technical_data(ticker)
+            technical_data = await self._fetch_technical_data(ticker, snapshot)
             
             # Step 2: Get rule-based baseline for AI context
             baseline_fair_value = await self._calculate_rule_based_fair_value(ticker, company_data)
@@ -199,10 +209,7 @@ class V3SummaryService:
                 model_version=ai_analysis.get("model_version")
             )
             
-            # Cache the result
-            self.cache[cache_key] = (summary, datetime.now())
-            
-            logger.info(f"Successfully generated agentic summary for {ticker}")
+            logger.info(f"Successfully generated agentic summary for {ticker} ({snapshot.loads} market data loads)")
             return summary
             
         except Exception as e:
@@ -282,12 +289,11 @@ class V3SummaryService:
     
     # Private helper methods
     
-    async def _fetch_company_data(self, ticker: str) -> dict:
+    async def _fetch_company_data(self, ticker: str, snapshot: Optional[CompanySnapshot] = None) -> dict:
         """Fetch basic company data using yfinance"""
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
-            hist = stock.history(period="1y")
+            snapshot = snapshot or CompanySnapshot(ticker)
+            info, hist = await asyncio.gather(snapshot.info(), snapshot.history(period="1y"))
             
             return {
                 "name": info.get("longName", ticker),
@@ -620,12 +626,17 @@ class V3SummaryService:
             sector = self._classify_sector(ticker)
             peer_tickers = self._select_peers(ticker, sector, 5)
             
+            # Fetch basic data for all peers concurrently
+            peer_infos = await asyncio.gather(
+                *(market_data_gateway.get_info(peer_ticker) for peer_ticker in peer_tickers),
+                return_exceptions=True
+            )
+            
             peers = []
-            for peer_ticker in peer_tickers:
+            for peer_ticker, peer_info in zip(peer_tickers, peer_infos):
                 try:
-                    # Fetch basic data for each peer
-                    peer_stock = yf.Ticker(peer_ticker)
-                    peer_info = peer_stock.info
+                    if isinstance(peer_info, Exception):
+                        raise peer_info
                     
                     peer_data = {
                         "ticker": peer_ticker,
@@ -651,11 +662,11 @@ class V3SummaryService:
             logger.error(f"Error fetching peer data for {ticker}: {e}")
             return {"peers": [], "sector_averages": {}}
     
-    async def _fetch_technical_data(self, ticker: str) -> dict:
+    async def _fetch_technical_data(self, ticker: str, snapshot: Optional[CompanySnapshot] = None) -> dict:
         """Fetch technical analysis data"""
         try:
-            stock = yf.Ticker(ticker)
-            hist = stock.history(period="6mo")  # 6 months of data
+            snapshot = snapshot or CompanySnapshot(ticker)
+            hist = await snapshot.history(period="6mo")  # 6 months of data
             
             if hist.empty:
                 return {"indicators": {}, "signals": []}
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latency of unrelated endpoints while large cache writes are in flight.
+
+Runs a small FastAPI app in-process and calls a trivial /ping endpoint at a
+fixed rate while ~2 MB AI_ANALYSIS payloads are written to and read from
+IntelligentCacheManager.
+The same workload is run twice:
+
+- blocking: cache I/O forced inline on the event loop (previous behaviour)
+- executor: cache I/O on the dedicated thread pool (current behaviour)
+
+Usage:
+    python benchmarks/cache_io_concurrency.py [--writers 4] [--payload-mb 2] [--seconds 5]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI
+
+from app.services.intelligent_cache import IntelligentCacheManager, CacheType
+
+
+def build_payload(size_mb: float) -> dict:
+    """Build an AI_ANALYSIS-shaped payload of roughly size_mb megabytes."""
+    paragraph = "Margin expansion driven by operating leverage and pricing power. " * 8
+    sections = max(1, int(size_mb * 1024 * 1024 / (len(paragraph) + 40)))
+    return {
+        "ticker": "RELIANCE.NS",
+        "investment_thesis": paragraph,
+        "dcf_commentary": [
+            {"section": i, "text": paragraph, "confidence": 0.7}
+            for i in range(sections)
+        ]
+    }
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_scenario(mode: str, writers: int, payload: dict, seconds: float) -> dict:
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = IntelligentCacheManager(cache_dir=cache_dir, memory_max_entries=0)
+
+        if mode == "blocking":
+            async def run_inline(func, *args):
+                # Yield once so other requests are scheduled between blocking calls
+                await asyncio.sleep(0)
+                return func(*args)
+            cache._run_io = run_inline
+
+        app = FastAPI()
+
+        @app.get("/ping")
+        async def ping():
+            return {"status": "ok"}
+
+        transport = httpx.ASGITransport(app=app)
+        latencies = []
+        writes = 0
+        deadline = time.perf_counter() + seconds
+
+        async def writer(index: int):
+            nonlocal writes
+            while time.perf_counter() < deadline:
+                await cache.set(CacheType.AI_ANALYSIS, f"BENCH{index}.NS", payload)
+                await cache.get(CacheType.AI_ANALYSIS, f"BENCH{index}.NS")
+                writes += 1
+
+        async def pinger(client: httpx.AsyncClient, interval: float = 0.02):
+            # Fixed-rate arrivals: latency is measured from when the request was
+            # due, so time spent waiting for a blocked loop is counted too
+            due = time.perf_counter()
+            while due < deadline:
+                await asyncio.sleep(max(0.0, due - time.perf_counter()))
+                response = await client.get("/ping")
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - due) * 1000)
+                due += interval
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await asyncio.gather(
+                *(writer(i) for i in range(writers)),
+                *(pinger(client) for _ in range(2))
+            )
+
+        cache._io_executor.shutdown(wait=True)
+
+    return {
+        "mode": mode,
+        "requests": len(latencies),
+        "cache_round_trips": writes,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": max(latencies)
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--payload-mb", type=float, default=2.0)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    payload = build_payload(args.payload_mb)
+    print(f"📦 Payload: {args.payload_mb} MB x {args.writers} concurrent writers, {args.seconds}s per scenario")
+
+    for mode in ("blocking", "executor"):
+        result = await run_scenario(mode, args.writers, payload, args.seconds)
+        print(
+            f"  {result['mode']:>9}: /ping p50={result['p50_ms']:.2f}ms "
+            f"p99={result['p99_ms']:.2f}ms max={result['max_ms']:.2f}ms "
+            f"({result['requests']} pings, {result['cache_round_trips']} cache set+get)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark: size and latency of cache entry codecs.
+
+Encodes and decodes a FINANCIAL_DATA entry shaped like
+OptimizedWorkflowService._fetch_company_data output (info dict, 30 days of
+history, four quarters of income statement / balance sheet / cash flow) and a
+text-heavy AI_ANALYSIS entry with every available codec, and compares them to
+the legacy pretty-printed JSON files.
+
+The legacy format cannot encode the Timestamp-keyed frames produced by
+DataFrame.to_dict(), so for the legacy rows those keys are stringified first.
+
+Usage:
+    python benchmarks/cache_serialization.py [--repeat 50]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from app.services.cache_serialization import CacheCodec, zstandard
+
+
+def build_financial_entry() -> dict:
+    rng = np.random.default_rng(42)
+    quarters = pd.date_range("2023-06-30", periods=4, freq="QE")[::-1]
+
+    def statement(rows: int) -> dict:
+        index = [f"Line Item {i}" for i in range(rows)]
+        frame = pd.DataFrame(rng.normal(1e10, 1e9, size=(rows, 4)), index=index, columns=quarters)
+        return frame.to_dict()
+
+    days = pd.date_range("2024-01-01", periods=30, freq="B")
+    history = pd.DataFrame({
+        "Open": rng.normal(2900, 30, 30),
+        "High": rng.normal(2950, 30, 30),
+        "Low": rng.normal(2850, 30, 30),
+        "Close": rng.normal(2900, 30, 30),
+        "Volume": rng.integers(1e6, 1e7, 30)
+    }, index=days)
+
+    data = {
+        "ticker": "RELIANCE.NS",
+        "info": {f"field_{i}": float(rng.normal()) for i in range(150)},
+        "history": history.to_dict(),
+        "financials": statement(60),
+        "balance_sheet": statement(80),
+        "cash_flow": statement(50),
+        "fetched_at": datetime.now().isoformat()
+    }
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "cache_type": "financial_data",
+        "identifier": "RELIANCE.NS",
+        "data": data,
+        "metadata": {"ttl_hours": 24.0, "cache_key": "financial_data_RELIANCE.NS_bench"}
+    }
+
+
+def build_ai_entry() -> dict:
+    paragraph = "Margin expansion driven by operating leverage and pricing power. " * 6
+    data = {
+        "investment_thesis": paragraph * 4,
+        "dcf_commentary": [{"point": i, "text": f"{paragraph} [{i}]"} for i in range(400)],
+        "financial_health": [{"metric": f"m{i}", "comment": f"{paragraph} [{i}]"} for i in range(200)]
+    }
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "cache_type": "ai_analysis",
+        "identifier": "RELIANCE.NS_agentic_comprehensive",
+        "data": data,
+        "metadata": {"ttl_hours": 6.0, "cache_key": "ai_analysis_bench"}
+    }
+
+
+def stringify_keys(obj):
+    if isinstance(obj, dict):
+        return {str(k): stringify_keys(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [stringify_keys(v) for v in obj]
+    return obj
+
+
+def time_call(func, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench(label: str, entry: dict, repeat: int):
+    legacy_entry = stringify_keys(entry)
+    legacy_raw = json.dumps(legacy_entry, indent=2, default=str).encode("utf-8")
+
+    rows = [(
+        "legacy json (indent=2)",
+        len(legacy_raw),
+        time_call(lambda: json.dumps(legacy_entry, indent=2, default=str), repeat),
+        time_call(lambda: json.loads(legacy_raw), repeat)
+    )]
+
+    codecs = [("json", None), ("json", "gzip"), ("pickle", None), ("pickle", "gzip")]
+    if zstandard is not None:
+        codecs += [("json", "zstd"), ("pickle", "zstd")]
+
+    for serializer, compression in codecs:
+        codec = CacheCodec(serializer, compression)
+        # JSON cannot encode Timestamp keys either, so give it the stringified frames
+        source = legacy_entry if serializer == "json" else entry
+        raw = codec.encode(source)
+        rows.append((
+            codec.description,
+            len(raw),
+            time_call(lambda: codec.encode(source), repeat),
+            time_call(lambda: CacheCodec.decode(raw), repeat)
+        ))
+
+    baseline = rows[0][1]
+    print(f"\n📊 {label}")
+    print(f"  {'codec':<24}{'size KB':>10}{'vs legacy':>11}{'encode ms':>11}{'decode ms':>11}")
+    for name, size, encode_ms, decode_ms in rows:
+        print(f"  {name:<24}{size / 1024:>10.1f}{size / baseline:>10.0%}{encode_ms:>11.2f}{decode_ms:>11.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    if zstandard is None:
+        print("ℹ️  zstandard not installed - zstd rows skipped")
+
+    bench("FINANCIAL_DATA entry", build_financial_entry(), args.repeat)
+    bench("AI_ANALYSIS entry", build_ai_entry(), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark: building and encoding the 3y technical analysis response.
+
+A 3y result (1,095 bars of chart_data with 20 fields each) is computed from
+synthetic daily bars (no network). Then each way of shipping it is timed:
+
+- rows, FastAPI default: one dict per bar built in a Python loop with a
+  NaN check per value, returned as a dict so FastAPI runs jsonable_encoder
+  and json.dumps over it (previous behaviour)
+- rows, FastJSONResponse: the same row shape, encoded directly (orjson when
+  installed) - the default layout=rows today
+- columns, FastJSONResponse: one array per field, NaN mapped to null per
+  column (layout=columns)
+
+Build is the time to lay out chart_data from the indicator arrays, encode
+the time to turn the response into bytes. Sizes are of the body as sent
+and gzip-compressed (what a proxy with compression would transfer).
+
+Usage:
+    python benchmarks/chart_data_encoding.py [--rounds 20]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import statistics
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+
+class FrameSnapshot:
+    """CompanySnapshot stand-in serving 5y of synthetic bars."""
+
+    def __init__(self, days: int = 1260, seed: int = 42):
+        rng = np.random.default_rng(seed)
+        close = 1000 * np.exp(np.cumsum(rng.normal(0.0004, 0.015, days)))
+        self.frame = pd.DataFrame(
+            {
+                "Open": close * (1 + rng.normal(0, 0.005, days)),
+                "High": close * (1 + rng.uniform(0, 0.02, days)),
+                "Low": close * (1 - rng.uniform(0, 0.02, days)),
+                "Close": close,
+                "Volume": rng.integers(100_000, 5_000_000, days).astype(float)
+            },
+            index=pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=days, tz="Asia/Kolkata", name="Date")
+        )
+
+    def history_sync(self, period=None):
+        return self.frame
+
+
+def rows_loop(columns: dict) -> list:
+    """The previous chart_data loop: one dict per bar, a NaN check per indicator value."""
+    fields = list(columns)
+    price_fields, indicator_fields = fields[:7], fields[7:]
+    chart_data = []
+    for i in range(len(columns["date"])):
+        row = {name: columns[name][i] for name in price_fields}
+        for name in indicator_fields:
+            value = columns[name][i]
+            row[name] = None if value != value else value
+        chart_data.append(row)
+    return chart_data
+
+
+def timed(function, rounds: int):
+    """Median milliseconds per call and the last result."""
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.CRITICAL)
+
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from app.api import responses
+    from app.api.responses import FastJSONResponse
+    from app.services import technical_analysis as ta_module
+    from app.services.technical_analysis import TechnicalAnalysisService
+
+    service = TechnicalAnalysisService()
+    with patch.object(ta_module.price_service, "get_price_for_snapshot", return_value=None):
+        result = service.compute_technical_analysis("BENCH.NS", "3y", FrameSnapshot())
+    columns = result["chart_data"]
+    # Indicator columns as the service holds them before layout (floats with NaN)
+    raw = {name: [float("nan") if value is None else value for value in values] for name, values in columns.items()}
+
+    modes = {
+        "rows, FastAPI default": (
+            lambda: {**result, "chart_layout": "rows", "chart_data": rows_loop(raw)},
+            lambda payload: JSONResponse(jsonable_encoder(payload)).body
+        ),
+        "rows, FastJSONResponse": (
+            lambda: service.with_chart_layout(result, "rows"),
+            lambda payload: FastJSONResponse(payload).body
+        ),
+        "columns, FastJSONResponse": (
+            lambda: {**result, "chart_data": {name: service._json_column(np.asarray(values, dtype=float))
+                                              if name not in ("date", "timestamp", "volume") else values
+                                              for name, values in raw.items()}},
+            lambda payload: FastJSONResponse(payload).body
+        )
+    }
+
+    encoder = "orjson" if responses.orjson is not None else "json (orjson not installed)"
+    print(f"📦 3y technical analysis response: {result['data_points']} bars x {len(columns)} fields, "
+          f"FastJSONResponse encoder: {encoder}, median of {args.rounds} rounds")
+    for name, (build, encode) in modes.items():
+        build_ms, payload = timed(build, args.rounds)
+        encode_ms, body = timed(lambda: encode(payload), args.rounds)
+        assert json.loads(body)["data_points"] == result["data_points"]
+        print(
+            f"  {name:>26}: build={build_ms:6.2f}ms | encode={encode_ms:6.2f}ms | "
+            f"body={len(body) / 1024:6.1f} KiB | gzip={len(gzip.compress(body)) / 1024:5.1f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
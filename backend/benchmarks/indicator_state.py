@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark: serving a ticker's current indicator values.
+
+A throwaway OHLCVStore holds synthetic daily bars (no network) and the
+unified price lookup is stubbed out. Three ways of getting the values the
+/technical-indicators endpoint returns are compared:
+
+- full (1y / 3y): TechnicalAnalysisService.compute_technical_analysis, every
+  indicator recomputed over 2y / 5y of bars (previous endpoint, uncached)
+- state, no new bar: get_indicator_values with the persisted state already
+  current - load it, apply the latest bar to a copy
+- state, new bar: the same after a new daily bar was stored, so the state
+  is also rolled forward and saved (once a day per ticker)
+
+Building a state from 2y of history (first request for a ticker) is shown
+for reference.
+
+Usage:
+    python benchmarks/indicator_state.py [--rounds 50]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+TICKER = "BENCH.NS"
+
+
+def synthetic_bars(days: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 1000 * np.exp(np.cumsum(rng.normal(0.0004, 0.015, days)))
+    return pd.DataFrame(
+        {
+            "Open": close, "High": close * (1 + rng.uniform(0, 0.02, days)),
+            "Low": close * (1 - rng.uniform(0, 0.02, days)), "Close": close,
+            "Volume": rng.integers(100_000, 5_000_000, days).astype(float)
+        },
+        index=pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=days, tz="Asia/Kolkata", name="Date")
+    )
+
+
+def timed(function, rounds: int, before=None) -> float:
+    """Median milliseconds per call, running before() untimed ahead of each call."""
+    samples = []
+    for _ in range(rounds):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.CRITICAL)
+
+    from app.services import indicator_state, technical_analysis
+    from app.services.indicator_state import IndicatorStateStore
+    from app.services.ohlcv_store import OHLCVStore
+
+    history = synthetic_bars(1400)
+    with tempfile.TemporaryDirectory() as root:
+        ohlcv = OHLCVStore(root=os.path.join(root, "ohlcv"), max_age=float("inf"))
+        states = IndicatorStateStore(root=os.path.join(root, "state"))
+        covered_from = datetime.now() - timedelta(days=4000)
+        service = technical_analysis.TechnicalAnalysisService()
+
+        with patch.object(technical_analysis, "ohlcv_store", ohlcv), \
+             patch.object(indicator_state, "ohlcv_store", ohlcv), \
+             patch.object(technical_analysis, "indicator_state_store", states), \
+             patch.object(technical_analysis.price_service, "get_price_for_dcf", return_value=None):
+            ohlcv._store_full(TICKER, history, covered_from)
+            bars = len(ohlcv.get_columns_sync(TICKER, period="2y"))
+
+            def drop_state():
+                states._path(TICKER).unlink(missing_ok=True)
+
+            def new_bar():
+                # Rewind the state by one bar, as if the latest completed bar had just been stored
+                drop_state()
+                ohlcv._store_full(TICKER, history.iloc[:-1], covered_from)
+                states.current_sync(TICKER)
+                ohlcv._store_full(TICKER, history, covered_from)
+
+            print(f"📊 Current indicator values of one ticker, median of {args.rounds} rounds")
+            results = {
+                "full, 1y (2y of bars)": timed(lambda: service.compute_technical_analysis(TICKER, "1y"), args.rounds),
+                "full, 3y (5y of bars)": timed(lambda: service.compute_technical_analysis(TICKER, "3y"), args.rounds),
+                f"state build ({bars} bars)": timed(lambda: service.get_indicator_values(TICKER), args.rounds, drop_state),
+                "state, new bar": timed(lambda: service.get_indicator_values(TICKER), args.rounds, new_bar),
+                "state, no new bar": timed(lambda: service.get_indicator_values(TICKER), args.rounds)
+            }
+            for name, ms in results.items():
+                print(f"  {name:>26}: {ms:7.2f}ms")
+            print(f"  state file: {states._path(TICKER).stat().st_size / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
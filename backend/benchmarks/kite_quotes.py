@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Benchmark: quoting every NIFTY 200 constituent through EnhancedDataService.
+
+KiteConnect is replaced by a stub whose quote() call costs one upstream round
+trip (--latency-ms) and rejects more than 500 instruments, like the Kite API.
+The instrument dump is synthetic and indexed in a throwaway InstrumentMaster
+(no network). Two ways of quoting the 200 symbols are compared:
+
+- per-symbol: one kite.quote([token]) per symbol, called on the event loop,
+  ten symbols at a time with a 100 ms pause between groups (previous
+  get_multiple_quotes)
+- batched:    KiteService.get_quotes - tokens resolved in one pass, one
+  kite.quote() per 500 instruments on a worker thread (current behaviour)
+
+Event loop lag is the longest a 10 ms heartbeat task running alongside was
+held up, i.e. how long other requests on the same worker would have stalled.
+
+Usage:
+    python benchmarks/kite_quotes.py [--latency-ms 150] [--rounds 3]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+NIFTY_200 = [
+    # NIFTY 50
+    "ADANIENT", "ADANIPORTS", "APOLLOHOSP", "ASIANPAINT", "AXISBANK", "BAJAJ-AUTO", "BAJFINANCE",
+    "BAJAJFINSV", "BEL", "BHARTIARTL", "CIPLA", "COALINDIA", "DRREDDY", "EICHERMOT", "ETERNAL",
+    "GRASIM", "HCLTECH", "HDFCBANK", "HDFCLIFE", "HEROMOTOCO", "HINDALCO", "HINDUNILVR", "ICICIBANK",
+    "INDUSINDBK", "INFY", "ITC", "JIOFIN", "JSWSTEEL", "KOTAKBANK", "LT", "M&M", "MARUTI", "NESTLEIND",
+    "NTPC", "ONGC", "POWERGRID", "RELIANCE", "SBILIFE", "SHRIRAMFIN", "SBIN", "SUNPHARMA", "TCS",
+    "TATACONSUM", "TATAMOTORS", "TATASTEEL", "TECHM", "TITAN", "TRENT", "ULTRACEMCO", "WIPRO",
+    # NIFTY Next 50
+    "ABB", "ADANIENSOL", "ADANIGREEN", "ADANIPOWER", "AMBUJACEM", "BAJAJHLDNG", "BANKBARODA", "BHEL",
+    "BOSCHLTD", "BPCL", "BRITANNIA", "CANBK", "CGPOWER", "CHOLAFIN", "COLPAL", "DABUR", "DIVISLAB",
+    "DLF", "DMART", "GAIL", "GODREJCP", "HAL", "HAVELLS", "ICICIGI", "ICICIPRULI", "INDIGO", "IOC",
+    "IRCTC", "IRFC", "JINDALSTEL", "JSWENERGY", "LICI", "LODHA", "LTIM", "MOTHERSON", "NAUKRI", "NHPC",
+    "PFC", "PIDILITIND", "PNB", "RECLTD", "SHREECEM", "SIEMENS", "TATAPOWER", "TORNTPHARM",
+    "TVSMOTOR", "UNITDSPR", "VBL", "VEDL", "ZYDUSLIFE",
+    # NIFTY Midcap 100
+    "ABCAPITAL", "ACC", "ALKEM", "APLAPOLLO", "APOLLOTYRE", "ASHOKLEY", "ASTRAL", "AUBANK",
+    "AUROPHARMA", "BALKRISIND", "BANDHANBNK", "BANKINDIA", "BDL", "BERGEPAINT", "BHARATFORG",
+    "BHARTIHEXA", "BIOCON", "COCHINSHIP", "COFORGE", "CONCOR", "CUMMINSIND", "DELHIVERY",
+    "DIXON", "ESCORTS", "EXIDEIND", "FEDERALBNK", "GLAND", "GLENMARK", "GMRAIRPORT", "GODREJPROP",
+    "HDFCAMC", "HINDPETRO", "HINDZINC", "HUDCO", "IDEA", "IDFCFIRSTB", "IGL", "INDHOTEL", "INDIANB",
+    "INDUSTOWER", "IREDA", "IRB", "JUBLFOOD", "KALYANKJIL", "KEI", "KPITTECH", "LICHSGFIN", "LTF",
+    "LUPIN", "M&MFIN", "MANKIND", "MARICO", "MAXHEALTH", "MAZDOCK", "MFSL", "MPHASIS", "MRF",
+    "MUTHOOTFIN", "NMDC", "NYKAA", "OBEROIRLTY", "OFSS", "OIL", "PAGEIND", "PATANJALI", "PAYTM",
+    "PERSISTENT", "PETRONET", "PHOENIXLTD", "PIIND", "POLICYBZR", "POLYCAB", "PREMIERENE", "PRESTIGE",
+    "RVNL", "SAIL", "SBICARD", "SJVN", "SOLARINDS", "SONACOMS", "SRF", "SUPREMEIND", "SUZLON",
+    "TATACOMM", "TATAELXSI", "TATATECH", "TIINDIA", "TORNTPOWER", "UNIONBANK", "UPL", "VOLTAS",
+    "WAAREEENER", "YESBANK", "ASTERDM", "LAURUSLABS", "POONAWALLA", "KAYNES", "NATIONALUM",
+    "DEEPAKNTR", "IPCALAB"
+]
+
+
+def instrument_dump() -> list:
+    """Synthetic KiteConnect.instruments("NSE") records for the NIFTY 200 plus filler instruments."""
+    symbols = NIFTY_200 + [f"FILLER{i}" for i in range(2500)]
+    return [
+        {
+            "instrument_token": 256 * (i + 1) + 1, "exchange_token": str(i + 1), "tradingsymbol": symbol,
+            "name": symbol, "last_price": 0.0, "expiry": "", "strike": 0.0, "tick_size": 0.05, "lot_size": 1,
+            "instrument_type": "EQ", "segment": "NSE", "exchange": "NSE"
+        }
+        for i, symbol in enumerate(symbols)
+    ]
+
+
+class StubKite:
+    """KiteConnect stand-in: every quote() call costs one round trip."""
+
+    MAX_INSTRUMENTS = 500
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def instruments(self, exchange=None):
+        return instrument_dump()
+
+    def quote(self, instruments):
+        if len(instruments) > self.MAX_INSTRUMENTS:
+            raise ValueError(f"Too many instruments: {len(instruments)}")
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        return {
+            str(token): {"last_price": 1000.0, "net_change": 5.0, "change_percent": 0.5, "volume": 100_000,
+                         "last_trade_time": "2024-10-01 15:29:59", "ohlc": {}, "depth": {}}
+            for token in instruments
+        }
+
+
+async def per_symbol(enhanced, tickers: list) -> dict:
+    """The previous get_multiple_quotes: get_quote fan-out, each kite.quote() blocking the loop."""
+    kite_service = enhanced.kite_service
+
+    async def quote(ticker: str):
+        kite_symbol, _ = enhanced._normalize_ticker(ticker)
+        token = await kite_service.find_instrument_token(kite_symbol)
+        data = kite_service.kite.quote([token])[str(token)]
+        return enhanced._stock_price_from_quote(kite_service._parse_quote(token, data))
+
+    results = {}
+    for i in range(0, len(tickers), 10):
+        batch = tickers[i:i + 10]
+        for ticker, result in zip(batch, await asyncio.gather(*(quote(ticker) for ticker in batch))):
+            results[ticker] = result
+        if i + 10 < len(tickers):
+            await asyncio.sleep(0.1)
+    return results
+
+
+async def batched(enhanced, tickers: list) -> dict:
+    return await enhanced.get_multiple_quotes(tickers)
+
+
+async def measure(mode, enhanced, tickers: list) -> dict:
+    lag = []
+    done = asyncio.Event()
+
+    async def heartbeat():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lag.append(time.perf_counter() - start - 0.01)
+
+    beat = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    results = await mode(enhanced, tickers)
+    elapsed = time.perf_counter() - start
+    done.set()
+    await beat
+    assert all(results[ticker] is not None for ticker in tickers)
+    return {"seconds": elapsed, "max_lag_ms": max(lag) * 1000}
+
+
+async def run(latency: float, rounds: int):
+    from app.services.instrument_index import InstrumentMaster
+    from app.services.enhanced_data_service import EnhancedDataService
+    from app.services.kite_service import KiteService
+
+    tickers = [f"{symbol}.NS" for symbol in NIFTY_200]
+    with tempfile.TemporaryDirectory() as root, \
+         patch("app.services.kite_service.instrument_master", InstrumentMaster(root=root)):
+        kite = StubKite(latency)
+        enhanced = EnhancedDataService()
+        enhanced.kite_service = KiteService()
+        enhanced.kite_service.kite = kite
+        enhanced.kite_service._session_initialized = True
+        enhanced._initialized = True
+        await enhanced.kite_service.find_instrument_token("INFY")  # index the dump up front
+
+        print(f"📈 {len(tickers)} NIFTY 200 symbols, {latency * 1000:.0f}ms per kite.quote() round trip, {rounds} rounds")
+        for name, mode in (("per-symbol", per_symbol), ("batched", batched)):
+            kite.calls = 0
+            stats = [await measure(mode, enhanced, tickers) for _ in range(rounds)]
+            print(
+                f"  {name:>10}: {statistics.median(s['seconds'] for s in stats):.2f}s | "
+                f"{kite.calls // rounds} quote calls | "
+                f"max event loop lag={statistics.median(s['max_lag_ms'] for s in stats):.0f}ms"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=150)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.CRITICAL)
+    asyncio.run(run(args.latency_ms / 1000, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark: PriceService throughput with many tickers requested at once.
+
+yfinance is replaced by a stub that sleeps for a fixed upstream latency, and
+PriceService uses a throwaway IntelligentCacheManager. Three workloads run
+from a thread pool, the way FastAPI runs sync endpoints:
+
+- distinct:  N concurrent requests for N different tickers (cold cache)
+- same:      N concurrent requests for one ticker (cold cache)
+- cached:    reads of an already cached ticker while a slow fetch is in flight
+
+Each is run twice:
+
+- global-lock: every lookup serialized behind one lock held across the
+  network calls (previous behaviour)
+- per-ticker:  PriceService's per-ticker in-flight fetches (current behaviour)
+
+Per-ticker fetches still share the MarketDataGateway thread pool, so distinct
+tickers are fetched MARKET_DATA_MAX_WORKERS (default 8) at a time.
+
+Usage:
+    python benchmarks/price_service_concurrency.py [--tickers 50] [--latency-ms 200]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from app.services import market_data_gateway as gateway_module
+from app.services import price_service as price_module
+from app.services.intelligent_cache import IntelligentCacheManager
+
+HISTORY = pd.DataFrame(
+    {"Close": [2450.0, 2475.5], "Volume": [1_200_000, 1_350_000]},
+    index=pd.date_range("2024-01-01", periods=2)
+)
+
+
+class StubTicker:
+    """yf.Ticker stand-in: info and history each cost one upstream round trip."""
+
+    latency = 0.2
+    calls = 0
+    calls_lock = threading.Lock()
+
+    def __init__(self, ticker: str):
+        self.ticker = ticker
+
+    @property
+    def info(self):
+        with StubTicker.calls_lock:
+            StubTicker.calls += 1
+        time.sleep(self.latency / 2)
+        return {"currentPrice": 2475.5, "marketCap": 16_000_000_000_000}
+
+    def history(self, period: str):
+        time.sleep(self.latency / 2)
+        return HISTORY
+
+
+def run_mode(mode: str, tickers: int) -> dict:
+    service = price_module.PriceService
+    global_lock = threading.Lock()
+
+    def lookup(ticker: str):
+        if mode == "global-lock":
+            with global_lock:
+                return service.get_unified_stock_data(ticker)
+        return service.get_unified_stock_data(ticker)
+
+    def timed(ticker: str) -> float:
+        start = time.perf_counter()
+        assert lookup(ticker) is not None
+        return (time.perf_counter() - start) * 1000
+
+    results = {"mode": mode}
+    with tempfile.TemporaryDirectory() as cache_dir, \
+         patch.object(price_module, "intelligent_cache", IntelligentCacheManager(cache_dir=cache_dir)), \
+         patch.object(gateway_module.yf, "Ticker", StubTicker), \
+         ThreadPoolExecutor(max_workers=tickers + 8) as pool:
+
+        # distinct tickers
+        StubTicker.calls = 0
+        start = time.perf_counter()
+        latencies = list(pool.map(timed, [f"BENCH{i}.NS" for i in range(tickers)]))
+        results["distinct_wall_s"] = time.perf_counter() - start
+        results["distinct_p50_ms"] = statistics.median(latencies)
+        results["distinct_fetches"] = StubTicker.calls
+
+        # one ticker, many callers
+        StubTicker.calls = 0
+        start = time.perf_counter()
+        list(pool.map(timed, ["SAME.NS"] * tickers))
+        results["same_wall_s"] = time.perf_counter() - start
+        results["same_fetches"] = StubTicker.calls
+
+        # cached reads during a slow fetch of another ticker
+        slow = pool.submit(lookup, "SLOW.NS")
+        time.sleep(StubTicker.latency / 10)
+        cached = list(pool.map(timed, ["BENCH0.NS"] * 20))
+        results["cached_p50_ms"] = statistics.median(cached)
+        slow.result()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    args = parser.parse_args()
+
+    StubTicker.latency = args.latency_ms / 1000
+    print(f"📈 {args.tickers} concurrent requests, {args.latency_ms:.0f} ms upstream latency per ticker")
+
+    for mode in ("global-lock", "per-ticker"):
+        result = run_mode(mode, args.tickers)
+        print(
+            f"  {result['mode']:>11}: distinct wall={result['distinct_wall_s']:.2f}s "
+            f"p50={result['distinct_p50_ms']:.0f}ms ({result['distinct_fetches']} fetches) | "
+            f"same wall={result['same_wall_s']:.2f}s ({result['same_fetches']} fetches) | "
+            f"cached read during fetch p50={result['cached_p50_ms']:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
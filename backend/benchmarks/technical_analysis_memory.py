@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory of 8 worker processes serving technical analysis for the NIFTY 50.
+
+A throwaway OHLCVStore is filled with synthetic daily bars for the 50 index
+constituents (no network). Each worker process then computes
+TechnicalAnalysisService.compute_technical_analysis for every ticker, a few
+rounds, keeping the price history it loaded per ticker resident the way a
+long-running worker keeps its hot tickers. Two data paths are compared:
+
+- dataframe: history built as a pandas DataFrame per request and copied
+  into the indicator columns (previous behaviour)
+- memmap:    indicator columns are views of the memory-mapped store files
+  (current behaviour)
+
+Per worker, Private memory is what only that process holds and PSS splits
+shared pages (the page cache of the store files) across the processes
+using them. The summed PSS is what the 8 workers really cost the host.
+Per-request allocation is measured with tracemalloc in the parent process.
+
+Usage:
+    python benchmarks/technical_analysis_memory.py [--workers 8] [--years 5] [--rounds 3]
+"""
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+NIFTY_50 = [
+    "ADANIENT.NS", "ADANIPORTS.NS", "APOLLOHOSP.NS", "ASIANPAINT.NS", "AXISBANK.NS",
+    "BAJAJ-AUTO.NS", "BAJFINANCE.NS", "BAJAJFINSV.NS", "BEL.NS", "BHARTIARTL.NS",
+    "CIPLA.NS", "COALINDIA.NS", "DRREDDY.NS", "EICHERMOT.NS", "ETERNAL.NS",
+    "GRASIM.NS", "HCLTECH.NS", "HDFCBANK.NS", "HDFCLIFE.NS", "HEROMOTOCO.NS",
+    "HINDALCO.NS", "HINDUNILVR.NS", "ICICIBANK.NS", "INDUSINDBK.NS", "INFY.NS",
+    "ITC.NS", "JIOFIN.NS", "JSWSTEEL.NS", "KOTAKBANK.NS", "LT.NS",
+    "M&M.NS", "MARUTI.NS", "NESTLEIND.NS", "NTPC.NS", "ONGC.NS",
+    "POWERGRID.NS", "RELIANCE.NS", "SBILIFE.NS", "SHRIRAMFIN.NS", "SBIN.NS",
+    "SUNPHARMA.NS", "TCS.NS", "TATACONSUM.NS", "TATAMOTORS.NS", "TATASTEEL.NS",
+    "TECHM.NS", "TITAN.NS", "TRENT.NS", "ULTRACEMCO.NS", "WIPRO.NS"
+]
+
+PERIOD = "3y"  # served from 5y of bars, the longest technical analysis window
+
+
+def synthetic_bars(seed: int, years: int) -> pd.DataFrame:
+    days = years * 252
+    rng = np.random.default_rng(seed)
+    close = 1000 * np.exp(np.cumsum(rng.normal(0.0004, 0.015, days)))
+    spread = close * rng.uniform(0.002, 0.02, days)
+    return pd.DataFrame(
+        {
+            "Open": close + rng.normal(0, 1, days) * spread / 2,
+            "High": close + spread,
+            "Low": close - spread,
+            "Close": close,
+            "Volume": rng.integers(100_000, 5_000_000, days).astype(float)
+        },
+        index=pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=days, tz="Asia/Kolkata", name="Date")
+    )
+
+
+def fill_store(root: str, years: int):
+    from app.services.ohlcv_store import OHLCVStore
+
+    store = OHLCVStore(root=root)
+    covered_from = datetime(datetime.now().year - years - 1, 1, 1)
+    for seed, ticker in enumerate(NIFTY_50):
+        store._store_full(ticker, synthetic_bars(seed, years), covered_from)
+
+
+class FrameSnapshot:
+    """CompanySnapshot stand-in handing compute_technical_analysis a fresh DataFrame per request."""
+
+    def __init__(self, store, ticker: str, resident: dict):
+        self.store = store
+        self.ticker = ticker
+        self.resident = resident
+
+    def history_sync(self, period: str) -> pd.DataFrame:
+        frame = self.store.get_history_sync(self.ticker, period=period)
+        self.resident[self.ticker] = frame
+        return frame
+
+
+def serve(mode: str, service, store, ticker: str, resident: dict):
+    if mode == "dataframe":
+        with patch("app.services.technical_analysis.price_service.get_price_for_snapshot", return_value=None):
+            return service.compute_technical_analysis(ticker, PERIOD, FrameSnapshot(store, ticker, resident))
+    resident[ticker] = store.get_columns_sync(ticker, period="5y")
+    return service.compute_technical_analysis(ticker, PERIOD)
+
+
+def memory_kb() -> dict:
+    """Rss, Pss and Private (clean + dirty) of this process in kB, from /proc/self/smaps_rollup."""
+    fields = {}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[1].isdigit():
+                    fields[parts[0].rstrip(":")] = int(parts[1])
+    except FileNotFoundError:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return {"rss": rss, "pss": rss, "private": rss}
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "private": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+    }
+
+
+def worker(mode: str, root: str, rounds: int, ready, go, results):
+    import logging
+    logging.disable(logging.CRITICAL)
+
+    from app.services import technical_analysis as ta_module
+    from app.services.ohlcv_store import OHLCVStore
+
+    store = OHLCVStore(root=root, max_age=float("inf"))
+    service = ta_module.TechnicalAnalysisService()
+    resident = {}
+
+    with patch.object(ta_module, "ohlcv_store", store), \
+         patch.object(ta_module.price_service, "get_price_for_dcf", return_value=None):
+        baseline = memory_kb()
+        ready.put(os.getpid())
+        go.wait()
+
+        latencies = []
+        for _ in range(rounds):
+            for ticker in NIFTY_50:
+                start = time.perf_counter()
+                assert serve(mode, service, store, ticker, resident) is not None
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    after = memory_kb()
+    results.put({
+        "pss": after["pss"],
+        "private": after["private"],
+        "rss": after["rss"],
+        "growth_private": after["private"] - baseline["private"],
+        "p50_ms": statistics.median(latencies)
+    })
+
+
+def run_workers(mode: str, root: str, workers: int, rounds: int) -> list:
+    ctx = multiprocessing.get_context("spawn")
+    ready, results, go = ctx.Queue(), ctx.Queue(), ctx.Event()
+    processes = [ctx.Process(target=worker, args=(mode, root, rounds, ready, go, results)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    for _ in processes:
+        ready.get()
+    go.set()
+    stats = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return stats
+
+
+def allocation_per_request(mode: str, root: str) -> float:
+    """Peak Python-heap allocation of one request in KiB (tracemalloc, warm store)."""
+    import logging
+    logging.disable(logging.CRITICAL)
+
+    from app.services import technical_analysis as ta_module
+    from app.services.ohlcv_store import OHLCVStore
+
+    store = OHLCVStore(root=root, max_age=float("inf"))
+    service = ta_module.TechnicalAnalysisService()
+    peaks = []
+    with patch.object(ta_module, "ohlcv_store", store), \
+         patch.object(ta_module.price_service, "get_price_for_dcf", return_value=None):
+        serve(mode, service, store, NIFTY_50[0], {})
+        for ticker in NIFTY_50[:10]:
+            tracemalloc.start()
+            serve(mode, service, store, ticker, {})
+            peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+            tracemalloc.stop()
+    return statistics.median(peaks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        fill_store(root, args.years)
+        store_kb = sum(os.path.getsize(os.path.join(root, name)) for name in os.listdir(root)) / 1024
+        print(f"📈 NIFTY 50, {args.years}y of daily bars ({store_kb:.0f} KiB on disk), "
+              f"{args.workers} workers x {args.rounds} rounds of {PERIOD} technical analysis")
+
+        for mode in ("dataframe", "memmap"):
+            stats = run_workers(mode, root, args.workers, args.rounds)
+            allocation = allocation_per_request(mode, root)
+            print(
+                f"  {mode:>9}: total PSS={sum(s['pss'] for s in stats) / 1024:.1f} MiB | "
+                f"per worker private={statistics.mean(s['private'] for s in stats) / 1024:.1f} MiB "
+                f"(+{statistics.mean(s['growth_private'] for s in stats) / 1024:.1f} MiB while serving) | "
+                f"p50={statistics.median(s['p50_ms'] for s in stats):.1f}ms | "
+                f"allocated per request={allocation:.0f} KiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark: computing the technical analysis indicator set over 1y/3y/5y of daily bars.
+
+Synthetic bars (no network) go through every indicator the Technical
+Analysis Summary card shows - SMA 50/200, RSI, Bollinger Bands, MACD,
+Stochastic, OBV, volume SMA and support/resistance. Two implementations are
+compared:
+
+- pandas: Series rolling windows, OBV built with a per-bar iloc loop and
+  pivots scanned bar by bar (previous TechnicalAnalysisService)
+- numpy:  app.services.indicators on the raw columns - cumulative-sum
+  windows, strided window reductions, OBV as a cumulative sum of signed
+  volume (current behaviour)
+
+OBV and support/resistance are also timed on their own, the latter with a
+lookback of the whole history so the pivot scan does real work.
+
+Usage:
+    python benchmarks/technical_indicators.py [--rounds 20]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+HISTORIES = {"1y": 252, "3y": 756, "5y": 1260}
+
+
+def synthetic_bars(days: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    close = 1000 * np.exp(np.cumsum(rng.normal(0.0004, 0.015, days)))
+    high = close * (1 + rng.uniform(0, 0.02, days))
+    low = close * (1 - rng.uniform(0, 0.02, days))
+    volume = rng.integers(100_000, 5_000_000, days).astype(float)
+    return high, low, close, volume
+
+
+# Previous pandas implementation
+
+def pandas_obv(close: pd.Series, volume: pd.Series) -> pd.Series:
+    obv = pd.Series(index=close.index, dtype=float)
+    obv.iloc[0] = volume.iloc[0]
+    for i in range(1, len(close)):
+        if close.iloc[i] > close.iloc[i - 1]:
+            obv.iloc[i] = obv.iloc[i - 1] + volume.iloc[i]
+        elif close.iloc[i] < close.iloc[i - 1]:
+            obv.iloc[i] = obv.iloc[i - 1] - volume.iloc[i]
+        else:
+            obv.iloc[i] = obv.iloc[i - 1]
+    return obv
+
+
+def pandas_support_resistance(data: pd.Series, window: int = 20, lookback: int = None):
+    recent_data = data.tail(lookback or window * 2)
+    highs, lows = [], []
+    for i in range(window, len(recent_data) - window):
+        if all(recent_data.iloc[i] >= recent_data.iloc[i - j] for j in range(1, window + 1)) and \
+           all(recent_data.iloc[i] >= recent_data.iloc[i + j] for j in range(1, window + 1)):
+            highs.append(recent_data.iloc[i])
+        if all(recent_data.iloc[i] <= recent_data.iloc[i - j] for j in range(1, window + 1)) and \
+           all(recent_data.iloc[i] <= recent_data.iloc[i + j] for j in range(1, window + 1)):
+            lows.append(recent_data.iloc[i])
+    if not highs:
+        highs = [recent_data.quantile(0.9)]
+    if not lows:
+        lows = [recent_data.quantile(0.1)]
+    return np.mean(lows), np.mean(highs)
+
+
+def pandas_indicators(high, low, close, volume):
+    close, high, low, volume = (pd.Series(column, copy=False) for column in (close, high, low, volume))
+    sma_50 = close.rolling(window=50, min_periods=1).mean()
+    sma_200 = close.rolling(window=200, min_periods=1).mean()
+    delta = close.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14, min_periods=1).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14, min_periods=1).mean()
+    rsi = 100 - (100 / (1 + gain / loss.replace(0, np.inf)))
+    bb_middle = close.rolling(window=20, min_periods=1).mean()
+    bb_std = close.rolling(window=20, min_periods=1).std()
+    bb_upper, bb_lower = bb_middle + bb_std * 2, bb_middle - bb_std * 2
+    macd_line = close.ewm(span=12).mean() - close.ewm(span=26).mean()
+    macd_signal = macd_line.ewm(span=9).mean()
+    lowest_low = low.rolling(window=14, min_periods=1).min()
+    highest_high = high.rolling(window=14, min_periods=1).max()
+    stoch_k = 100 * (close - lowest_low) / (highest_high - lowest_low)
+    stoch_d = stoch_k.rolling(window=3, min_periods=1).mean()
+    obv = pandas_obv(close, volume)
+    volume_sma = volume.rolling(window=20, min_periods=1).mean()
+    levels = pandas_support_resistance(close)
+    return sma_50, sma_200, rsi, bb_upper, bb_lower, macd_line, macd_signal, stoch_k, stoch_d, obv, volume_sma, levels
+
+
+def numpy_indicators(high, low, close, volume):
+    from app.services import indicators
+
+    return (
+        indicators.sma(close, 50), indicators.sma(close, 200), indicators.rsi(close),
+        indicators.bollinger_bands(close), indicators.macd(close), indicators.stochastic(high, low, close),
+        indicators.obv(close, volume), indicators.sma(volume, 20), indicators.support_resistance(close)
+    )
+
+
+def timed(function, *args, rounds: int) -> float:
+    """Median milliseconds per call."""
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        function(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    from app.services import indicators
+
+    print(f"📈 Indicator set per request, median of {args.rounds} rounds")
+    for name, days in HISTORIES.items():
+        high, low, close, volume = synthetic_bars(days)
+        series_close, series_volume = pd.Series(close), pd.Series(volume)
+        full = {
+            "pandas": timed(pandas_indicators, high, low, close, volume, rounds=args.rounds),
+            "numpy": timed(numpy_indicators, high, low, close, volume, rounds=args.rounds)
+        }
+        obv = {
+            "pandas": timed(pandas_obv, series_close, series_volume, rounds=args.rounds),
+            "numpy": timed(indicators.obv, close, volume, rounds=args.rounds)
+        }
+        pivots = {
+            "pandas": timed(pandas_support_resistance, series_close, 20, days, rounds=args.rounds),
+            "numpy": timed(indicators.support_resistance, close, 20, days, rounds=args.rounds)
+        }
+        print(f"  {name} ({days} bars):")
+        for label, stats in (("all indicators", full), ("OBV", obv), ("pivots (full lookback)", pivots)):
+            print(
+                f"    {label:>22}: pandas={stats['pandas']:8.2f}ms | numpy={stats['numpy']:6.2f}ms | "
+                f"{stats['pandas'] / stats['numpy']:6.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark: current indicator values and signals for the NIFTY 200.
+
+A throwaway OHLCVStore holds 2y of synthetic daily bars for the 200
+symbols (no network; a tenth of them listed recently, so histories differ
+in length) and the unified price lookup is stubbed out. Two ways of
+getting every ticker's indicator_values are compared:
+
+- per ticker: TechnicalAnalysisService.compute_technical_analysis in a loop,
+  one store read and one indicator pass per ticker (uncached)
+- screener:   TechnicalScreener.screen_sync - one batched store read, the
+  histories stacked into (ticker x bar) panels and each indicator computed
+  once over the whole panel, then filtered and ranked
+
+The screener is timed with and without conditions ("rsi<30" plus a golden
+cross), and its rows are checked against the per-ticker values.
+
+Usage:
+    python benchmarks/technical_screener.py [--rounds 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.kite_quotes import NIFTY_200
+
+
+def synthetic_bars(days: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 1000 * np.exp(np.cumsum(rng.normal(0.0004, 0.015, days)))
+    return pd.DataFrame(
+        {
+            "Open": close, "High": close * (1 + rng.uniform(0, 0.02, days)),
+            "Low": close * (1 - rng.uniform(0, 0.02, days)), "Close": close,
+            "Volume": rng.integers(100_000, 5_000_000, days).astype(float)
+        },
+        index=pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=days, tz="Asia/Kolkata", name="Date")
+    )
+
+
+def timed(function, rounds: int):
+    """Median milliseconds per call and the last result."""
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.CRITICAL)
+
+    from app.services import technical_analysis, technical_screener
+    from app.services.ohlcv_store import OHLCVStore
+    from app.services.technical_screener import TechnicalScreener
+
+    tickers = [f"{symbol}.NS" for symbol in NIFTY_200]
+    with tempfile.TemporaryDirectory() as root:
+        store = OHLCVStore(root=root, max_age=float("inf"))
+        covered_from = datetime.now() - timedelta(days=4000)
+        for seed, ticker in enumerate(tickers):
+            store._store_full(ticker, synthetic_bars(120 if seed % 10 == 0 else 520, seed), covered_from)
+
+        service = technical_analysis.TechnicalAnalysisService()
+        screener = TechnicalScreener()
+        with patch.object(technical_analysis, "ohlcv_store", store), \
+             patch.object(technical_screener, "ohlcv_store", store), \
+             patch.object(technical_analysis.price_service, "get_price_for_dcf", return_value=None):
+            per_ticker_ms, expected = timed(
+                lambda: {ticker: service.compute_technical_analysis(ticker, "1y")["indicator_values"] for ticker in tickers},
+                args.rounds
+            )
+            screen_ms, result = timed(lambda: screener.screen_sync(tickers), args.rounds)
+            filtered_ms, filtered = timed(
+                lambda: screener.screen_sync(tickers, where=["rsi<30"], signals=["golden cross"]), args.rounds
+            )
+
+    for row in result["rows"]:
+        for name in ("rsi", "sma_200_current", "macd_current", "support_level"):
+            value = expected[row["ticker"]][name]
+            assert (row[name] is None and value != value) or np.isclose(row[name], value, rtol=1e-9), (row["ticker"], name)
+        assert row["signals"] == expected[row["ticker"]].get("signals", [])
+
+    print(f"🔎 Indicator values and signals for {len(tickers)} tickers (2y of bars), median of {args.rounds} rounds")
+    print(f"  {'per ticker':>24}: {per_ticker_ms:8.1f}ms")
+    print(f"  {'screener':>24}: {screen_ms:8.1f}ms ({per_ticker_ms / screen_ms:.1f}x)")
+    print(f"  {'screener, filtered':>24}: {filtered_ms:8.1f}ms ({filtered['matches']} of {filtered['screened']} match)")
+
+
+if __name__ == "__main__":
+    main()
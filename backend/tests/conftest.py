@@ -1,5 +1,9 @@
 import pytest
+import json
 import os
+import struct
+import sys
+import threading
 from fastapi.testclient import TestClient
 from unittest.mock import patch
 
@@ -8,6 +12,93 @@ os.environ["TESTING"] = "1"
 
 from app.main import app
 
+@pytest.fixture(autouse=True)
+def isolated_market_data_stores(tmp_path, monkeypatch):
+    """Give every test empty on-disk stores: intelligent cache, OHLCV, financial statements, instruments, indicator state."""
+    for package in ("app", "backend.app"):
+        cache_module = sys.modules.get(f"{package}.services.intelligent_cache")
+        if cache_module is not None:
+            cache = cache_module.intelligent_cache
+            cache_dir = tmp_path / "intelligent_cache"
+            cache_dir.mkdir(exist_ok=True)
+            monkeypatch.setattr(cache, "cache_dir", cache_dir)
+            monkeypatch.setattr(cache, "backend", cache_module.FileCacheBackend(cache_dir))
+            monkeypatch.setattr(cache, "_index", cache_module.CacheIndex(cache_dir / cache.INDEX_FILENAME))
+            monkeypatch.setattr(cache, "_memory_cache", type(cache._memory_cache)())
+            monkeypatch.setattr(cache, "_memory_bytes", 0)
+            monkeypatch.setattr(cache, "_pending_touches", {})
+        ohlcv_module = sys.modules.get(f"{package}.services.ohlcv_store")
+        if ohlcv_module is not None:
+            monkeypatch.setattr(ohlcv_module.ohlcv_store, "root", tmp_path / "ohlcv")
+        statements_module = sys.modules.get(f"{package}.services.statements_store")
+        if statements_module is not None:
+            monkeypatch.setattr(statements_module.financial_statements_store, "db_path", tmp_path / "financial_statements.db")
+        instruments_module = sys.modules.get(f"{package}.services.instrument_index")
+        if instruments_module is not None:
+            monkeypatch.setattr(instruments_module.instrument_master, "root", tmp_path / "kite_instruments")
+            monkeypatch.setattr(instruments_module.instrument_master, "_indexes", {})
+            monkeypatch.setattr(instruments_module.instrument_master, "_failed_at", {})
+        indicator_state_module = sys.modules.get(f"{package}.services.indicator_state")
+        if indicator_state_module is not None:
+            monkeypatch.setattr(indicator_state_module.indicator_state_store, "root", tmp_path / "indicator_state")
+
+class FakeTickServer:
+    """
+    Local stand-in for Kite's ticker WebSocket.
+
+    Records the subscription messages KiteTicker sends and pushes quote-mode
+    ticks in Kite's binary packet layout to every connected client.
+    """
+
+    def __init__(self):
+        from websockets.sync.server import serve
+
+        self.messages = []
+        self.subscribed = set()
+        self.connections = []
+        self._server = serve(self._handle, "127.0.0.1", 0)
+        self.url = f"ws://127.0.0.1:{self._server.socket.getsockname()[1]}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def _handle(self, connection):
+        self.connections.append(connection)
+        try:
+            for message in connection:
+                data = json.loads(message)
+                self.messages.append(data)
+                if data["a"] == "subscribe":
+                    self.subscribed.update(data["v"])
+                elif data["a"] == "unsubscribe":
+                    self.subscribed.difference_update(data["v"])
+        except Exception:
+            pass
+        finally:
+            self.connections.remove(connection)
+
+    def push(self, token: int, last_price: float, close: float, volume: int = 0):
+        """Send one quote-mode tick (prices in paise) to every client."""
+        packet = struct.pack(
+            ">11i", token, round(last_price * 100), 1, round(last_price * 100), volume, 0, 0,
+            round(close * 100), round(max(last_price, close) * 100), round(min(last_price, close) * 100), round(close * 100)
+        )
+        for connection in list(self.connections):
+            connection.send(struct.pack(">HH", 1, len(packet)) + packet)
+
+    def drop_connections(self):
+        for connection in list(self.connections):
+            connection.close()
+
+    def close(self):
+        self.drop_connections()
+        self._server.shutdown()
+
+@pytest.fixture
+def fake_tick_server():
+    """A FakeTickServer for the test, shut down afterwards."""
+    server = FakeTickServer()
+    yield server
+    server.close()
+
 @pytest.fixture
 def client():
     """Create a test client for the FastAPI app."""
@@ -0,0 +1,106 @@
+import asyncio
+
+import pandas as pd
+import pytest
+from fastapi.concurrency import run_in_threadpool
+from unittest.mock import patch
+
+from backend.app.services.company_snapshot import CompanySnapshot
+from backend.app.services.market_data_gateway import count_upstream_calls
+
+
+class CountingTicker:
+    """yf.Ticker stand-in recording every upstream access."""
+
+    calls = []
+
+    def __init__(self, ticker):
+        self.ticker = ticker
+
+    @property
+    def info(self):
+        CountingTicker.calls.append(('info', self.ticker))
+        return {'longName': 'Tata Consultancy Services Limited', 'currentPrice': 3900.0}
+
+    def history(self, period=None, **kwargs):
+        CountingTicker.calls.append(('history', period))
+        return pd.DataFrame(
+            {'Open': 1.0, 'High': 1.0, 'Low': 1.0, 'Close': [float(i) for i in range(400)], 'Volume': 1000},
+            index=pd.date_range(end='2024-06-28', periods=400)
+        )
+
+
+class TestCompanySnapshot:
+    """Test cases for the request-scoped company snapshot."""
+
+    @pytest.fixture(autouse=True)
+    def counting_ticker(self):
+        CountingTicker.calls = []
+        with patch('yfinance.Ticker', CountingTicker):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_each_dataset_fetched_once(self):
+        """Test concurrent async and thread users share one fetch per dataset."""
+        snapshot = CompanySnapshot('TCS.NS')
+
+        infos = await asyncio.gather(
+            snapshot.info(),
+            snapshot.info(),
+            run_in_threadpool(snapshot.info_sync)
+        )
+        year = await snapshot.history(period='1y')
+        half_year = await snapshot.history(period='6mo')
+        week = await run_in_threadpool(snapshot.history_sync, '5d')
+
+        assert all(info['longName'] == 'Tata Consultancy Services Limited' for info in infos)
+        assert CountingTicker.calls == [('info', 'TCS.NS'), ('history', '1y')]
+        assert snapshot.loads == 2
+
+        # Periods are cut from the stored bars, ending at the latest one
+        assert len(year) == 366
+        assert len(half_year) == 183
+        assert len(week) == 5
+        assert half_year['Close'].iloc[-1] == year['Close'].iloc[-1]
+
+    @pytest.mark.asyncio
+    async def test_longer_period_fetched_separately(self):
+        """Test a period longer than any loaded one triggers a new fetch."""
+        snapshot = CompanySnapshot('TCS.NS')
+
+        await snapshot.history(period='6mo')
+        await snapshot.history(period='2y')
+        await snapshot.history(period='1y')
+
+        # The store only fetches the older bars the 2y request is missing
+        assert CountingTicker.calls == [('history', '6mo'), ('history', None)]
+
+    @pytest.mark.asyncio
+    async def test_upstream_calls_counted_per_scope(self):
+        """Test gateway calls from tasks and worker threads land in the active scope."""
+        with count_upstream_calls() as stats:
+            snapshot = CompanySnapshot('TCS.NS')
+            await asyncio.gather(snapshot.info(), snapshot.history(period='1y'))
+            await run_in_threadpool(CompanySnapshot('INFY.NS').info_sync)
+
+        with count_upstream_calls() as other:
+            await CompanySnapshot('TCS.NS').info()
+
+        assert stats.to_dict() == {'total': 3, 'by_kind': {'info': 2, 'history': 1}}
+        assert other.total == 1
+
+    @pytest.mark.asyncio
+    async def test_v3_summary_data_shares_snapshot(self):
+        """Test company and technical data for one summary cost one info and one history fetch."""
+        from backend.app.services.v3_summary_service import V3SummaryService
+
+        service = V3SummaryService()
+        snapshot = CompanySnapshot('TCS.NS')
+
+        with count_upstream_calls() as stats:
+            company_data = await service._fetch_company_data('TCS.NS', snapshot)
+            technical_data = await service._fetch_technical_data('TCS.NS', snapshot)
+
+        assert company_data['name'] == 'Tata Consultancy Services Limited'
+        assert 'rsi' in technical_data
+        assert stats.by_kind == {'info': 1, 'history': 1}
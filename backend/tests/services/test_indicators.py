@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.app.services import indicators
+from backend.tests.synthetic_bars import make_history
+
+
+def make_bars(days: int = 1260, seed: int = 7):
+    history = make_history(days, seed)
+    return tuple(history[name].to_numpy(copy=True) for name in ('High', 'Low', 'Close', 'Volume'))
+
+
+# Pandas formulations the indicators replace
+
+
+def reference_rsi(close: pd.Series, window: int = 14) -> pd.Series:
+    delta = close.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=window, min_periods=1).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=window, min_periods=1).mean()
+    return 100 - (100 / (1 + gain / loss.replace(0, np.inf)))
+
+
+def reference_obv(close: pd.Series, volume: pd.Series) -> pd.Series:
+    obv = pd.Series(index=close.index, dtype=float)
+    obv.iloc[0] = volume.iloc[0]
+    for i in range(1, len(close)):
+        if close.iloc[i] > close.iloc[i - 1]:
+            obv.iloc[i] = obv.iloc[i - 1] + volume.iloc[i]
+        elif close.iloc[i] < close.iloc[i - 1]:
+            obv.iloc[i] = obv.iloc[i - 1] - volume.iloc[i]
+        else:
+            obv.iloc[i] = obv.iloc[i - 1]
+    return obv
+
+
+def reference_pivots(recent: pd.Series, window: int):
+    highs, lows = [], []
+    for i in range(window, len(recent) - window):
+        if all(recent.iloc[i] >= recent.iloc[i - j] for j in range(1, window + 1)) and \
+           all(recent.iloc[i] >= recent.iloc[i + j] for j in range(1, window + 1)):
+            highs.append(recent.iloc[i])
+        if all(recent.iloc[i] <= recent.iloc[i - j] for j in range(1, window + 1)) and \
+           all(recent.iloc[i] <= recent.iloc[i + j] for j in range(1, window + 1)):
+            lows.append(recent.iloc[i])
+    support = np.mean(lows) if lows else recent.quantile(0.1)
+    resistance = np.mean(highs) if highs else recent.quantile(0.9)
+    return support, resistance
+
+
+def assert_same(actual, expected):
+    np.testing.assert_allclose(actual, np.asarray(expected, dtype=float), rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+class TestIndicators:
+    """Test cases for the array indicators against the pandas formulations."""
+
+    @pytest.mark.parametrize('gaps', [False, True])
+    def test_match_pandas(self, gaps):
+        """Test every indicator equals its pandas formulation bar for bar, NaN bars included."""
+        high, low, close, volume = make_bars()
+        if gaps:
+            close[[3, 400, 401, 1000]] = np.nan
+        series = pd.Series(close)
+        rolling = series.rolling(window=20, min_periods=1)
+
+        assert_same(indicators.sma(close, 200), series.rolling(window=200, min_periods=1).mean())
+        assert_same(indicators.rsi(close), reference_rsi(series))
+        upper, middle, lower = indicators.bollinger_bands(close)
+        assert_same(middle, rolling.mean())
+        assert_same(upper, rolling.mean() + 2 * rolling.std())
+        assert_same(lower, rolling.mean() - 2 * rolling.std())
+
+        stoch_k, stoch_d = indicators.stochastic(high, low, close)
+        lowest = pd.Series(low).rolling(window=14, min_periods=1).min()
+        highest = pd.Series(high).rolling(window=14, min_periods=1).max()
+        expected_k = 100 * (series - lowest) / (highest - lowest)
+        assert_same(stoch_k, expected_k)
+        assert_same(stoch_d, expected_k.rolling(window=3, min_periods=1).mean())
+
+        assert_same(indicators.obv(close, volume), reference_obv(series, pd.Series(volume)))
+        macd_line, macd_signal, _ = indicators.macd(close)
+        expected_line = series.ewm(span=12).mean() - series.ewm(span=26).mean()
+        assert_same(macd_line, expected_line)
+        assert_same(macd_signal, expected_line.ewm(span=9).mean())
+
+    def test_support_resistance_pivots(self):
+        """Test pivot levels match the window-by-window scan, with and without pivots in the lookback."""
+        _, _, close, _ = make_bars(days=300)
+        series = pd.Series(close)
+
+        for window, lookback in ((20, None), (5, 120), (3, 300)):
+            recent = series.tail(lookback or window * 2)
+            assert indicators.support_resistance(close, window, lookback) == pytest.approx(
+                reference_pivots(recent, window)
+            )
+
+        flat = np.full(60, 100.0)
+        assert indicators.support_resistance(flat, 5, 60) == (100.0, 100.0)
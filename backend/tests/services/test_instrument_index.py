@@ -0,0 +1,146 @@
+from datetime import date, timedelta
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from backend.app.models.kite import KiteInstrumentType
+from backend.app.services.instrument_index import InstrumentIndex, InstrumentMaster
+
+
+def instrument(token, tradingsymbol, name, instrument_type='EQ', exchange='NSE', segment=None, expiry='', strike=0.0):
+    """A record as KiteConnect.instruments() parses it from the CSV dump."""
+    return {
+        'instrument_token': token,
+        'exchange_token': str(token // 256),
+        'tradingsymbol': tradingsymbol,
+        'name': name,
+        'last_price': 0.0,
+        'expiry': expiry,
+        'strike': strike,
+        'tick_size': 0.05,
+        'lot_size': 1 if instrument_type == 'EQ' else 25,
+        'instrument_type': instrument_type,
+        'segment': segment or exchange,
+        'exchange': exchange
+    }
+
+
+RECORDS = [
+    instrument(408065, 'INFY', 'INFOSYS'),
+    instrument(3520257, 'INFIBEAM', 'INFIBEAM AVENUES'),
+    instrument(2953217, 'TCS', 'TATA CONSULTANCY SERV LT'),
+    instrument(895745, 'TATASTEEL', 'TATA STEEL'),
+    instrument(256265, 'NIFTY 50', 'NIFTY 50', segment='INDICES'),
+    instrument(128053508, 'INFY', 'INFOSYS', exchange='BSE'),
+    instrument(12345602, 'NIFTY24OCT24500CE', 'NIFTY', 'CE', 'NFO', 'NFO-OPT', date(2024, 10, 31), 24500.0),
+    instrument(12345858, 'NIFTY24OCTFUT', 'NIFTY', 'FUT', 'NFO', 'NFO-FUT', date(2024, 10, 31)),
+    instrument(12346114, 'INFY24OCTFUT', 'INFOSYS', 'FUT', 'NFO', 'NFO-FUT', date(2024, 10, 31)),
+]
+
+
+class TestInstrumentIndex:
+    """Test cases for the indexed Kite instrument master."""
+
+    @pytest.fixture
+    def index(self):
+        return InstrumentIndex.from_records(RECORDS, built_on=date(2024, 10, 1))
+
+    def symbols(self, index, rows):
+        return [index.tradingsymbols[row] for row in rows]
+
+    def test_lookup_by_exchange_symbol_and_type(self, index):
+        """Test tokens are found by (exchange, tradingsymbol, type) and rows read back as dump records."""
+        assert index.token('NSE', 'INFY') == 408065
+        assert index.token('BSE', 'INFY') == 128053508
+        assert index.token('NFO', 'NIFTY24OCTFUT', 'FUT') == 12345858
+        assert index.token('NSE', 'NIFTY24OCTFUT') is None
+        assert index.token('NSE', 'WIPRO') is None
+
+        record = index.record(index.row('NFO', 'NIFTY24OCT24500CE', 'CE'))
+        assert record == {**RECORDS[6], 'exchange_token': 12345602 // 256}
+        assert index.record(index.row('NSE', 'TCS'))['expiry'] is None
+
+    def test_search_ranking(self, index):
+        """Test matches rank exact symbol, symbol prefix, name prefix, then substrings."""
+        assert self.symbols(index, index.search('infy', exchange='NSE')) == ['INFY']
+        assert self.symbols(index, index.search('INF')) == [
+            'INFY', 'INFIBEAM', 'INFY', 'INFY24OCTFUT'
+        ]
+        assert self.symbols(index, index.search('tata')) == ['TATASTEEL', 'TCS']
+        assert self.symbols(index, index.search('steel')) == ['TATASTEEL']
+        assert self.symbols(index, index.search('ni', exchange='NFO')) == ['NIFTY24OCT24500CE', 'NIFTY24OCTFUT']
+        assert index.search('zzz') == []
+        assert len(index.search('nifty', limit=2)) == 2
+
+    def test_saved_index_matches_built_index(self, index, tmp_path):
+        """Test an index read back from disk answers the same as the one built from records."""
+        index.save(tmp_path / 'instruments.npz')
+        loaded = InstrumentIndex.load(tmp_path / 'instruments.npz')
+
+        assert InstrumentIndex.stored_on(tmp_path / 'instruments.npz') == date(2024, 10, 1)
+        assert loaded.built_on == index.built_on
+        assert loaded.token('NFO', 'INFY24OCTFUT', 'FUT') == 12346114
+        assert loaded.search('inf') == index.search('inf')
+        assert loaded.search('consultancy') == index.search('consultancy')
+        assert [loaded.record(row) for row in range(len(loaded))] == [index.record(row) for row in range(len(index))]
+
+
+class TestInstrumentMaster:
+    """Test cases for the daily, persisted instrument master."""
+
+    def test_dump_downloaded_once_per_day(self, tmp_path):
+        """Test a cold start reuses the day's saved dump and the next day downloads again."""
+        fetch = MagicMock(return_value=RECORDS)
+        today = date(2024, 10, 1)
+
+        with patch.object(InstrumentMaster, 'today', side_effect=lambda: today):
+            master = InstrumentMaster(root=tmp_path)
+            assert master.get('NSE', fetch).token('NSE', 'TCS') == 2953217
+            master.get('NSE', fetch)
+
+            restarted = InstrumentMaster(root=tmp_path)
+            assert restarted.get('NSE', fetch).token('NSE', 'TCS') == 2953217
+            assert fetch.call_count == 1
+
+            # Without a session (no fetch) the saved index is still served
+            assert InstrumentMaster(root=tmp_path).get('NSE').built_on == today
+
+            today += timedelta(days=1)
+            fetch.side_effect = ConnectionError("instruments dump unavailable")
+            assert restarted.get('NSE', fetch).built_on == date(2024, 10, 1)
+            assert fetch.call_count == 2
+
+            # A failed download is not retried on every lookup
+            fetch.side_effect = None
+            assert restarted.get('NSE', fetch).built_on == date(2024, 10, 1)
+            assert fetch.call_count == 2
+
+            restarted.retry_interval = 0
+            assert restarted.get('NSE', fetch).built_on == today
+            assert fetch.call_count == 3
+
+        assert InstrumentMaster(root=tmp_path).get('NFO') is None
+
+    @pytest.mark.asyncio
+    async def test_kite_service_uses_index(self):
+        """Test KiteService finds tokens and searches through the master, downloading each dump once."""
+        from backend.app.services.kite_service import KiteService
+
+        service = KiteService()
+        service.kite = MagicMock()
+        service.kite.instruments.side_effect = lambda exchange=None: [
+            record for record in RECORDS if exchange in (None, record['exchange'])
+        ]
+        service._session_initialized = True
+
+        assert await service.find_instrument_token('INFY.NS') == 408065
+        assert await service.find_instrument_token('TCS') == 2953217
+        matches = await service.search_instruments('tata')
+        futures = await service.search_instruments('nifty', exchange='NFO')
+
+        assert [call.args for call in service.kite.instruments.call_args_list] == [('NSE',), ('NFO',)]
+        assert [match.tradingsymbol for match in matches] == ['TATASTEEL', 'TCS']
+        assert matches[0].instrument_type == KiteInstrumentType.EQ
+        assert [future.tradingsymbol for future in futures] == ['NIFTY24OCT24500CE', 'NIFTY24OCTFUT']
+        assert futures[1].expiry.date() == date(2024, 10, 31)
+        assert len(await service.get_instruments('NSE')) == 5
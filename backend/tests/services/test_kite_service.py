@@ -0,0 +1,84 @@
+import pytest
+from unittest.mock import MagicMock, patch
+
+from backend.app.models.company import StockPrice
+from backend.app.services.kite_service import KiteService
+
+SYMBOLS = ['INFY', 'TCS', 'WIPRO', 'HCLTECH', 'TECHM']
+
+
+def equity(token, tradingsymbol):
+    return {
+        'instrument_token': token, 'exchange_token': str(token // 256), 'tradingsymbol': tradingsymbol,
+        'name': tradingsymbol, 'last_price': 0.0, 'expiry': '', 'strike': 0.0, 'tick_size': 0.05,
+        'lot_size': 1, 'instrument_type': 'EQ', 'segment': 'NSE', 'exchange': 'NSE'
+    }
+
+
+def quote_response(instruments):
+    """kite.quote() response: entries keyed by the requested instrument tokens."""
+    return {
+        str(token): {
+            'last_price': float(token % 1000), 'net_change': 1.5, 'change_percent': 0.5, 'volume': 1000,
+            'last_trade_time': '2024-10-01 15:29:59', 'ohlc': {'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': 1.5}
+        }
+        for token in instruments
+    }
+
+
+class TestKiteQuotes:
+    """Test cases for batched Kite quotes."""
+
+    @pytest.fixture
+    def service(self):
+        service = KiteService()
+        service.kite = MagicMock()
+        service.kite.instruments.return_value = [equity(256 * (i + 1) + i, symbol) for i, symbol in enumerate(SYMBOLS)]
+        service.kite.quote.side_effect = quote_response
+        service._session_initialized = True
+        return service
+
+    @pytest.mark.asyncio
+    async def test_quotes_batched_to_api_limit(self, service):
+        """Test symbols are resolved in bulk and quoted QUOTE_BATCH_SIZE instruments per call."""
+        requested = ['INFY.NS', 'INFY', 'TCS', 'WIPRO', 'HCLTECH', 'TECHM', 'GONE']
+        with patch.object(KiteService, 'QUOTE_BATCH_SIZE', 2):
+            quotes = await service.get_quotes(requested)
+
+        assert [len(call.args[0]) for call in service.kite.quote.call_args_list] == [2, 2, 1]
+        assert service.kite.instruments.call_count == 1
+        assert list(quotes) == requested
+        assert quotes['GONE'] is None
+        assert quotes['INFY.NS'] is quotes['INFY']
+        assert quotes['TCS'].instrument_token == 2 * 256 + 1
+        assert quotes['TCS'].change == 1.5
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_leaves_others_quoted(self, service):
+        """Test a failing quote call only loses the symbols of its batch."""
+        service.kite.quote.side_effect = [ConnectionError("timeout"), quote_response([3 * 256 + 2])]
+        with patch.object(KiteService, 'QUOTE_BATCH_SIZE', 2):
+            quotes = await service.get_quotes(['INFY', 'TCS', 'WIPRO'])
+
+        assert quotes['INFY'] is None and quotes['TCS'] is None
+        assert quotes['WIPRO'].instrument_token == 3 * 256 + 2
+
+    @pytest.mark.asyncio
+    async def test_multiple_quotes_use_one_batch(self, service):
+        """Test get_multiple_quotes makes one quote call and falls back to yfinance per missing ticker."""
+        from backend.app.services.enhanced_data_service import EnhancedDataService
+
+        enhanced = EnhancedDataService()
+        enhanced.kite_service = service
+        enhanced._initialized = True
+        fallback_price = StockPrice(current_price=10.0, change=0.0, change_percent=0.0, volume=1, market_cap=0)
+        enhanced.fallback_service = MagicMock()
+        enhanced.fallback_service.get_stock_price.return_value = fallback_price
+
+        prices = await enhanced.get_multiple_quotes(['INFY.NS', 'TCS.NS', 'GONE.NS'])
+
+        assert service.kite.quote.call_count == 1
+        assert list(prices) == ['INFY.NS', 'TCS.NS', 'GONE.NS']
+        assert prices['TCS.NS'].current_price == float((2 * 256 + 1) % 1000)
+        assert prices['GONE.NS'] is fallback_price
+        enhanced.fallback_service.get_stock_price.assert_called_once_with('GONE.NS')
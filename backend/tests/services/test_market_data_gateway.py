@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import time
+
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from backend.app.services.market_data_gateway import MarketDataGateway
+
+
+def make_history(close: float, days: int = 3) -> pd.DataFrame:
+    return pd.DataFrame(
+        {'Open': close, 'High': close, 'Low': close, 'Close': close, 'Volume': 1000},
+        index=pd.date_range('2024-01-01', periods=days)
+    )
+
+
+class TestMarketDataGateway:
+    """Test cases for the yfinance gateway."""
+
+    @pytest.fixture
+    def gateway(self):
+        gateway = MarketDataGateway(max_workers=2, download_chunk_size=2)
+        yield gateway
+        gateway._executor.shutdown(wait=True)
+
+    @pytest.mark.asyncio
+    async def test_fetches_do_not_block_event_loop(self, gateway):
+        """Test slow yfinance calls run on the pool, bounded by max_workers."""
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        class SlowTicker:
+            def __init__(self, ticker):
+                self.ticker = ticker
+
+            @property
+            def info(self):
+                nonlocal running, peak
+                with lock:
+                    running += 1
+                    peak = max(peak, running)
+                time.sleep(0.05)
+                with lock:
+                    running -= 1
+                return {'longName': self.ticker}
+
+        ticks = 0
+
+        async def heartbeat_loop():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        with patch('yfinance.Ticker', SlowTicker):
+            heartbeat = asyncio.create_task(heartbeat_loop())
+            infos = await asyncio.gather(*(gateway.get_info(f'T{i}.NS') for i in range(6)))
+            heartbeat.cancel()
+
+        assert [info['longName'] for info in infos] == [f'T{i}.NS' for i in range(6)]
+        assert peak == 2
+        assert ticks > 10  # the loop kept running during ~150ms of fetches
+
+    @pytest.mark.asyncio
+    async def test_get_histories_batches_through_download(self, gateway):
+        """Test multi-ticker history uses one yf.download call per chunk."""
+        tickers = ['A.NS', 'B.NS', 'C.NS']
+
+        def fake_download(chunk, **kwargs):
+            frames = {ticker: make_history(float(tickers.index(ticker) + 1)) for ticker in chunk if ticker != 'C.NS'}
+            if not frames:
+                return pd.DataFrame()
+            return pd.concat(frames, axis=1)
+
+        with patch('yfinance.download', side_effect=fake_download) as mock_download, \
+             patch('yfinance.Ticker') as mock_ticker:
+            histories = await gateway.get_histories(tickers + ['A.NS'], period='1y')
+
+        assert mock_download.call_count == 2  # chunks of 2
+        assert mock_download.call_args_list[0].args[0] == ['A.NS', 'B.NS']
+        assert mock_download.call_args_list[0].kwargs['period'] == '1y'
+        mock_ticker.assert_not_called()
+
+        assert histories['A.NS']['Close'].iloc[-1] == 1.0
+        assert histories['B.NS']['Close'].iloc[-1] == 2.0
+        assert list(histories['A.NS'].columns) == ['Open', 'High', 'Low', 'Close', 'Volume']
+        assert histories['C.NS'].empty
+
+    def test_statements_and_sync_api(self, gateway):
+        """Test statements are fetched per frequency and failures map to None."""
+        class StatementsTicker:
+            def __init__(self, ticker):
+                self.quarterly_financials = pd.DataFrame({'Q1': [1.0]})
+                self.quarterly_cashflow = pd.DataFrame({'Q1': [2.0]})
+
+            @property
+            def quarterly_balance_sheet(self):
+                raise ValueError("not available")
+
+        with patch('yfinance.Ticker', StatementsTicker):
+            statements = gateway.get_statements_sync('TCS.NS', frequency='quarterly')
+
+        assert statements['financials'].iloc[0, 0] == 1.0
+        assert statements['balance_sheet'] is None
+        assert statements['cashflow'].iloc[0, 0] == 2.0
@@ -0,0 +1,165 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from backend.app.services.market_data_gateway import MarketDataGateway
+from backend.app.services.ohlcv_store import OHLCVStore
+
+
+def make_market(days: int = 800) -> pd.DataFrame:
+    index = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=days, tz='Asia/Kolkata', name='Date')
+    close = np.linspace(100.0, 200.0, days)
+    return pd.DataFrame(
+        {'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close, 'Volume': 1000.0,
+         'Dividends': 0.0, 'Stock Splits': 0.0},
+        index=index
+    )
+
+
+class FakeMarket:
+    """yf.Ticker / yf.download stand-in serving slices of one frame per ticker."""
+
+    def __init__(self):
+        self.frames = {}
+        self.calls = []
+
+    def slice(self, ticker, period=None, start=None, end=None):
+        frame = self.frames.get(ticker, pd.DataFrame())
+        if frame.empty:
+            return frame
+        if period is not None:
+            return frame[frame.index > frame.index[-1] - pd.Timedelta(days=OHLCVStore.PERIOD_DAYS[period])]
+        tz = frame.index.tz
+        if start is not None:
+            frame = frame[frame.index >= pd.Timestamp(start).tz_localize(tz)]
+        if end is not None:
+            frame = frame[frame.index < pd.Timestamp(end).tz_localize(tz)]
+        return frame
+
+    def ticker(self, ticker):
+        market = self
+
+        class Ticker:
+            def history(self, period=None, start=None, end=None, **kwargs):
+                market.calls.append(('history', ticker, period, start))
+                return market.slice(ticker, period, start, end)
+
+        return Ticker()
+
+    def download(self, tickers, period=None, start=None, end=None, **kwargs):
+        self.calls.append(('download', tuple(tickers), period, start))
+        return pd.concat({ticker: self.slice(ticker, period, start, end) for ticker in tickers}, axis=1)
+
+
+class TestOHLCVStore:
+    """Test cases for the on-disk OHLCV store."""
+
+    @pytest.fixture
+    def market(self):
+        market = FakeMarket()
+        market.frames['TCS.NS'] = make_market()
+        with patch('yfinance.Ticker', side_effect=market.ticker), \
+             patch('yfinance.download', side_effect=market.download):
+            yield market
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        gateway = MarketDataGateway(max_workers=2)
+        yield OHLCVStore(root=tmp_path / 'ohlcv', gateway=gateway, max_age=900)
+        gateway._executor.shutdown(wait=True)
+
+    def test_periods_served_from_disk(self, market, store):
+        """Test a stored history serves shorter periods and only fetches a missing head."""
+        year = store.get_history_sync('TCS.NS', period='1y')
+        half_year = store.get_history_sync('TCS.NS', period='6mo')
+
+        assert market.calls == [('history', 'TCS.NS', '1y', None)]
+        expected = market.slice('TCS.NS', '1y')
+        assert year.index.equals(expected.index)
+        assert list(year.columns) == list(OHLCVStore.COLUMNS)
+        np.testing.assert_array_equal(year['Close'], expected['Close'])
+        assert len(half_year) == len(market.slice('TCS.NS', '6mo'))
+        assert str(year.index.tz) == 'Asia/Kolkata'
+
+        two_years = store.get_history_sync('TCS.NS', period='2y')
+        since = datetime.now() - timedelta(days=731)
+        history_since = store.get_history_sync('TCS.NS', period=None, start=since)
+
+        # One extra fetch for the bars older than the stored year only
+        assert len(market.calls) == 2
+        assert market.calls[1][2] is None
+        assert market.calls[1][3] <= since + timedelta(seconds=5)
+        assert len(two_years) == len(market.slice('TCS.NS', '2y'))
+        assert history_since['Close'].is_monotonic_increasing
+        assert history_since.index.is_unique
+
+    def test_stale_tail_fetched_incrementally(self, market, store):
+        """Test a stale store fetches from its last completed bar and refetches after re-adjustment."""
+        full = market.frames['TCS.NS']
+        market.frames['TCS.NS'] = full.iloc[:-1]
+        store.get_history_sync('TCS.NS', period='1y')
+        market.frames['TCS.NS'] = full
+
+        with patch('time.time', return_value=datetime.now().timestamp() + 3600):
+            history = store.get_history_sync('TCS.NS', period='1y')
+
+        kind, _, period, start = market.calls[-1]
+        assert (kind, period) == ('history', None)
+        assert pd.Timestamp(start).date() == full.index[-3].date()
+        assert history.index[-1] == full.index[-1]
+        assert len(market.calls) == 2
+
+        # A dividend re-adjusts every past close - the whole range is fetched again
+        adjusted = full.copy()
+        adjusted[['Open', 'High', 'Low', 'Close']] *= 0.98
+        market.frames['TCS.NS'] = adjusted
+        with patch('time.time', return_value=datetime.now().timestamp() + 7200):
+            history = store.get_history_sync('TCS.NS', period='1y')
+
+        assert len(market.calls) == 4
+        np.testing.assert_allclose(history['Close'], adjusted.loc[history.index, 'Close'])
+
+    def test_get_histories_batches_missing_bars(self, market, store):
+        """Test many tickers cost one download for cold tickers and one for stale tails."""
+        market.frames['INFY.NS'] = make_market()
+        market.frames['WIPRO.NS'] = make_market()
+        store.get_history_sync('TCS.NS', period='1y')
+
+        with patch('time.time', return_value=datetime.now().timestamp() + 3600):
+            histories = store.get_histories_sync(['TCS.NS', 'INFY.NS', 'WIPRO.NS', 'GONE.NS'], period='1y')
+
+        downloads = [call for call in market.calls if call[0] == 'download']
+        assert downloads[0][1:3] == (('INFY.NS', 'WIPRO.NS', 'GONE.NS'), '1y')
+        assert downloads[1][1:3] == (('TCS.NS',), None)
+        assert len(market.calls) == 3
+        assert len(histories['INFY.NS']) == len(market.slice('INFY.NS', '1y'))
+        assert histories['GONE.NS'].empty
+
+    def test_stored_bars_served_when_upstream_fails(self, market, store):
+        """Test a failed refresh falls back to the stored bars."""
+        store.get_history_sync('TCS.NS', period='1y')
+
+        with patch('yfinance.Ticker', side_effect=ConnectionError("rate limited")), \
+             patch('time.time', return_value=datetime.now().timestamp() + 3600):
+            history = store.get_history_sync('TCS.NS', period='1y')
+            with pytest.raises(ConnectionError):
+                store.get_history_sync('INFY.NS', period='1y')
+
+        assert len(history) == len(market.slice('TCS.NS', '1y'))
+
+    def test_columns_are_views_of_the_store_file(self, market, store):
+        """Test get_columns_sync serves read-only memory-mapped views matching get_history_sync."""
+        history = store.get_history_sync('TCS.NS', period='1y')
+        columns = store.get_columns_sync('TCS.NS', period='6mo')
+
+        assert len(market.calls) == 1
+        assert isinstance(columns.close, np.memmap)
+        assert not columns.close.flags.writeable
+        assert len(columns) == len(market.slice('TCS.NS', '6mo'))
+        np.testing.assert_array_equal(columns.close, history['Close'].iloc[-len(columns):])
+        assert columns.dates().equals(history.index[-len(columns):])
+        assert len(columns.tail(5)) == 5
+        assert columns.tail(5).volume.base is columns.volume.base
@@ -0,0 +1,131 @@
+import asyncio
+import itertools
+import threading
+
+import pytest
+from unittest.mock import patch
+
+from backend.app.services import price_broadcaster as broadcaster_module
+from backend.app.services.price_broadcaster import PriceBroadcaster
+
+
+class MovingPrice:
+    """PriceService.get_price_for_company_header stand-in whose price moves on every read."""
+
+    def __init__(self):
+        self.reads = 0
+        self._prices = itertools.count(100)
+
+    def __call__(self, ticker):
+        self.reads += 1
+        price = float(next(self._prices))
+        return {'current_price': price, 'change': price - 100, 'change_percent': price - 100, 'volume': 1,
+                'market_cap': 0, 'pe_ratio': None, 'pb_ratio': None}
+
+
+@pytest.fixture
+def upstream():
+    upstream = MovingPrice()
+    with patch.object(broadcaster_module.PriceService, 'get_price_for_company_header', side_effect=upstream):
+        yield upstream
+
+
+class TestPriceBroadcaster:
+    """Test cases for the shared live price push."""
+
+    @pytest.mark.asyncio
+    async def test_clients_share_one_upstream_loop(self, upstream):
+        """Test every client of a ticker gets the same updates from a single read loop."""
+        broadcaster = PriceBroadcaster(live_interval=0.01, rest_interval=0.01)
+        first = broadcaster.subscribe('TCS.NS')
+        first_updates = [await first.__anext__()]
+        second = broadcaster.subscribe('TCS.NS')
+        second_updates = [await second.__anext__()]
+
+        for _ in range(5):
+            first_updates.append(await first.__anext__())
+            second_updates.append(await second.__anext__())
+
+        # Each client sees every price in order, the late one from the latest at the time it joined
+        for updates in (first_updates, second_updates):
+            prices = [update['current_price'] for update in updates]
+            assert prices == [prices[0] + i for i in range(len(prices))]
+        assert second_updates[0]['current_price'] >= first_updates[0]['current_price']
+        assert broadcaster.subscriber_counts() == {'TCS.NS': 2}
+        highest = max(update['current_price'] for update in first_updates + second_updates)
+        assert upstream.reads <= highest - 100 + 2  # one read per price, not one per client
+        assert first_updates[-1]['source'] == 'yfinance_unified'
+
+        await first.aclose()
+        assert broadcaster.subscriber_counts() == {'TCS.NS': 1}
+        await second.aclose()
+        await asyncio.sleep(0.05)
+        reads = upstream.reads
+        await asyncio.sleep(0.05)
+
+        assert broadcaster.subscriber_counts() == {}
+        assert upstream.reads == reads  # loop stopped with its last client
+
+    @pytest.mark.asyncio
+    async def test_slow_client_dropped(self, upstream):
+        """Test a client that stops reading is dropped after queue_size updates without holding others up."""
+        broadcaster = PriceBroadcaster(live_interval=0.01, rest_interval=0.01, queue_size=3, heartbeat=1)
+        stalled = broadcaster.subscribe('INFY.NS')
+        await stalled.__anext__()
+        reader = broadcaster.subscribe('INFY.NS')
+
+        prices = [(await reader.__anext__())['current_price'] for _ in range(8)]
+
+        assert prices == sorted(prices) and len(set(prices)) == 8
+        assert broadcaster.subscriber_counts() == {'INFY.NS': 1}
+        assert (await stalled.__anext__())['status'] == 'dropped'
+        with pytest.raises(StopAsyncIteration):
+            await stalled.__anext__()
+        await reader.aclose()
+
+    @pytest.mark.asyncio
+    async def test_keep_alive_without_updates(self):
+        """Test subscribers get a keep-alive when the price does not move."""
+        price = {'current_price': 100.0, 'change': 0.0, 'change_percent': 0.0, 'volume': 1,
+                 'market_cap': 0, 'pe_ratio': None, 'pb_ratio': None}
+        broadcaster = PriceBroadcaster(live_interval=0.01, rest_interval=0.01, heartbeat=0.05)
+        with patch.object(broadcaster_module.PriceService, 'get_price_for_company_header', return_value=price):
+            updates = broadcaster.subscribe('TCS.NS')
+            assert (await updates.__anext__())['current_price'] == 100.0
+            assert await updates.__anext__() is None
+            await updates.aclose()
+
+    @pytest.mark.asyncio
+    async def test_releases_only_the_subscription_it_took(self, upstream):
+        """Test a loop cancelled mid-acquire still releases it, and an unresolved ticker releases nothing."""
+        acquired = threading.Event()
+        proceed = threading.Event()
+
+        def slow_acquire(ticker):
+            acquired.set()
+            proceed.wait(5)
+            return 2953217
+
+        broadcaster = PriceBroadcaster(live_interval=0.01, rest_interval=0.01)
+        stream = broadcaster_module.quote_stream
+        with patch.object(stream, 'acquire', side_effect=slow_acquire), patch.object(stream, 'release') as release:
+            task = asyncio.create_task(broadcaster._run('TCS.NS', broadcaster_module._Feed()))
+            await asyncio.to_thread(acquired.wait, 5)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert release.call_count == 0
+            proceed.set()
+            for _ in range(100):
+                if release.called:
+                    break
+                await asyncio.sleep(0.01)
+            release.assert_called_once_with('TCS.NS')
+
+        with patch.object(stream, 'acquire', return_value=None), patch.object(stream, 'release') as release:
+            task = asyncio.create_task(broadcaster._run('TCS.NS', broadcaster_module._Feed()))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            release.assert_not_called()
@@ -0,0 +1,59 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from backend.app.services import market_data_gateway as gateway_module
+from backend.app.services import price_service as price_module
+from backend.app.services.intelligent_cache import IntelligentCacheManager
+
+
+class TestPriceService:
+    """Test cases for the unified price service."""
+
+    @pytest.fixture
+    def cache_manager(self, tmp_path):
+        return IntelligentCacheManager(cache_dir=str(tmp_path))
+
+    def test_fetches_tickers_independently(self, cache_manager):
+        """Test a slow fetch blocks neither other tickers nor cached reads, and is shared by its waiters."""
+        history = pd.DataFrame(
+            {'Close': [99.0, 100.0], 'Volume': [1000, 1200]},
+            index=pd.date_range('2024-01-01', periods=2)
+        )
+        release_slow = threading.Event()
+        fetched = []
+
+        class FakeTicker:
+            def __init__(self, ticker):
+                self.ticker = ticker
+
+            @property
+            def info(self):
+                fetched.append(self.ticker)
+                if self.ticker == 'SLOW.NS':
+                    release_slow.wait(5)
+                return {'currentPrice': 100.0}
+
+            def history(self, period):
+                return history
+
+        with patch.object(price_module, 'intelligent_cache', cache_manager), \
+             patch.object(gateway_module.yf, 'Ticker', FakeTicker), \
+             ThreadPoolExecutor(max_workers=8) as pool:
+            service = price_module.PriceService
+            service.get_unified_stock_data('CACHED.NS')
+
+            slow_calls = [pool.submit(service.get_unified_stock_data, 'SLOW.NS') for _ in range(5)]
+
+            # While SLOW.NS is stuck upstream, other tickers and cached reads complete
+            assert pool.submit(service.get_unified_stock_data, 'FAST.NS').result(timeout=2)['current_price'] == 100.0
+            assert pool.submit(service.get_price_for_dcf, 'CACHED.NS').result(timeout=2) == 100.0
+            assert not any(call.done() for call in slow_calls)
+
+            release_slow.set()
+            assert all(call.result(timeout=5)['ticker'] == 'SLOW.NS' for call in slow_calls)
+            assert fetched.count('SLOW.NS') == 1
+            assert service._inflight == {}
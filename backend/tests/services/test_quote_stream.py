@@ -0,0 +1,109 @@
+import time
+from datetime import date
+
+import pytest
+from unittest.mock import patch
+
+from backend.app.services import instrument_index, price_service as price_module
+from backend.app.services.quote_stream import QuoteStream
+
+TCS, INFY = 2953217, 408065
+
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            raise AssertionError("timed out waiting for the tick server")
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def nse_index():
+    """Today's NSE instrument index, as KiteService would have stored it."""
+    records = [
+        {'instrument_token': token, 'exchange_token': str(token // 256), 'tradingsymbol': symbol, 'name': symbol,
+         'last_price': 0.0, 'expiry': '', 'strike': 0.0, 'tick_size': 0.05, 'lot_size': 1,
+         'instrument_type': 'EQ', 'segment': 'NSE', 'exchange': 'NSE'}
+        for token, symbol in ((TCS, 'TCS'), (INFY, 'INFY'))
+    ]
+    instrument_index.instrument_master.get('NSE', lambda: records)
+
+
+@pytest.fixture
+def stream(fake_tick_server, nse_index):
+    stream = QuoteStream(view_ttl=60)
+    assert stream.start('api_key', 'access_token', root=fake_tick_server.url)
+    assert stream.wait_connected(10)
+    yield stream
+    stream.stop()
+
+
+class TestQuoteStream:
+    """Test cases for the streaming Kite quote book."""
+
+    def test_subscriptions_reference_counted(self, stream, fake_tick_server):
+        """Test an instrument is subscribed on its first reference and unsubscribed after its last."""
+        with stream.watching('TCS.NS'):
+            stream.acquire('TCS.NS')
+            wait_for(lambda: TCS in fake_tick_server.subscribed)
+            assert stream.subscriptions() == {TCS: 2}
+            assert stream.get('TCS.NS') is None  # subscribed, no tick yet
+
+            fake_tick_server.push(TCS, 3512.5, close=3500.0, volume=120000)
+            wait_for(lambda: stream.get('TCS.NS') is not None)
+            quote = stream.get('TCS.NS')
+            assert (quote.last_price, quote.change, quote.volume) == (3512.5, 12.5, 120000)
+            assert quote.change_percent == pytest.approx(12.5 / 3500.0 * 100)
+
+        assert stream.subscriptions() == {TCS: 1}
+        stream.release('TCS.NS')
+        wait_for(lambda: TCS not in fake_tick_server.subscribed)
+        assert stream.subscriptions() == {}
+        assert [message['a'] for message in fake_tick_server.messages] == ['subscribe', 'mode', 'unsubscribe']
+
+    def test_views_lapse_after_ttl(self, stream, fake_tick_server):
+        """Test a viewed ticker stays subscribed for view_ttl after its last view."""
+        assert stream.view('INFY.NS') is None
+        stream.view('INFY.NS')
+        wait_for(lambda: INFY in fake_tick_server.subscribed)
+        assert stream.subscriptions() == {INFY: 1}
+
+        with patch('time.time', return_value=time.time() + 61):
+            stream.view('TCS.NS')
+
+        wait_for(lambda: INFY not in fake_tick_server.subscribed)
+        assert stream.subscriptions() == {TCS: 1}
+        assert stream.acquire('GONE.NS') is None
+
+    def test_price_service_reads_book_without_network(self, stream, fake_tick_server):
+        """Test header and DCF prices come from the book while streaming and over REST once it is down."""
+        unified = {
+            'current_price': 3500.0, 'change': 0.0, 'change_percent': 0.0, 'volume': 1000,
+            'market_cap': 1_000_000.0, 'pe_ratio': 30.0, 'pb_ratio': None
+        }
+        with patch.object(price_module, 'quote_stream', stream), \
+             patch.object(price_module.PriceService, '_valuation_basis', {}), \
+             patch.object(price_module.PriceService, 'get_unified_stock_data', return_value=unified) as rest:
+            service = price_module.PriceService
+            assert service.get_price_for_company_header('TCS.NS')['current_price'] == 3500.0
+
+            wait_for(lambda: TCS in fake_tick_server.subscribed)
+            fake_tick_server.push(TCS, 3850.0, close=3500.0, volume=250000)
+            wait_for(lambda: stream.get('TCS.NS') is not None)
+
+            header = service.get_price_for_company_header('TCS.NS')
+            assert service.get_price_for_dcf('TCS.NS') == 3850.0
+            assert rest.call_count == 1
+            assert header['current_price'] == 3850.0
+            assert header['change'] == 350.0
+            assert header['volume'] == 250000
+            assert header['market_cap'] == pytest.approx(1_100_000.0)
+            assert header['pe_ratio'] == pytest.approx(33.0)
+            assert header['pb_ratio'] is None
+
+            # Stream down: REST again
+            fake_tick_server.close()
+            wait_for(lambda: not stream.connected)
+            assert service.get_price_for_dcf('TCS.NS') == 3500.0
+            assert rest.call_count == 2
@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from backend.app.services.market_data_gateway import MarketDataGateway
+from backend.app.services.statements_store import FinancialStatementsStore
+
+
+def statement(rows: dict, period_ends: list) -> pd.DataFrame:
+    """yfinance layout: line items as rows, period ends as columns (newest first)."""
+    return pd.DataFrame(rows, index=[pd.Timestamp(period_end) for period_end in period_ends]).T
+
+
+class StatementsTicker:
+    """yf.Ticker stand-in whose annual statements are set per test."""
+
+    fetches = 0
+    period_ends = ['2024-03-31', '2023-03-31']
+    revenue = [1000.0, 900.0]
+
+    def __init__(self, ticker):
+        StatementsTicker.fetches += 1
+        self.financials = statement(
+            {'Revenue': self.revenue, 'Net Income': [100.0 - 10 * i for i in range(len(self.period_ends))]},
+            self.period_ends
+        )
+        self.balance_sheet = statement({'Total Debt': [50.0] * len(self.period_ends)}, self.period_ends)
+        self.cashflow = statement(
+            {'Operating Cash Flow': [120.0] * len(self.period_ends), 'Capital Expenditure': [-20.0] * len(self.period_ends)},
+            self.period_ends
+        )
+
+
+class TestFinancialStatementsStore:
+    """Test cases for the local financial statements store."""
+
+    @pytest.fixture(autouse=True)
+    def statements_ticker(self):
+        StatementsTicker.fetches = 0
+        StatementsTicker.period_ends = ['2024-03-31', '2023-03-31']
+        StatementsTicker.revenue = [1000.0, 900.0]
+        with patch('yfinance.Ticker', StatementsTicker):
+            yield
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        gateway = MarketDataGateway(max_workers=2)
+        yield FinancialStatementsStore(db_path=tmp_path / 'statements.db', gateway=gateway)
+        gateway._executor.shutdown(wait=True)
+
+    def test_aliases_resolved_at_ingest(self, store):
+        """Test canonical line items are stored alongside the names yfinance reported."""
+        reported = store.get_statements_sync('TCS.NS')
+        resolved = store.get_statements_sync('TCS.NS', resolved=True)
+
+        assert StatementsTicker.fetches == 1
+        assert 'Total Revenue' not in reported['financials'].index
+        assert resolved['financials'].loc['Total Revenue', pd.Timestamp('2024-03-31')] == 1000.0
+        assert resolved['cashflow'].loc['Free Cash Flow'].tolist() == [120.0, 120.0]
+        assert list(resolved['financials'].columns) == [pd.Timestamp('2024-03-31'), pd.Timestamp('2023-03-31')]
+
+    def test_refreshed_only_when_new_period_due(self, store):
+        """Test no upstream check before the next filing deadline, and only new periods ingested after it."""
+        store.recheck_interval = timedelta(0)
+
+        with patch('backend.app.services.statements_store.datetime') as mock_datetime:
+            mock_datetime.fromisoformat = datetime.fromisoformat
+            mock_datetime.now.return_value = datetime(2024, 9, 1)
+            store.get_statements_sync('TCS.NS')
+            store.get_statements_sync('TCS.NS')
+
+            assert StatementsTicker.fetches == 1
+            assert store.next_period_due('TCS.NS', 'annual') == datetime(2025, 3, 31) + timedelta(days=60)
+
+            # FY25 filed; yfinance also restates FY24, which the store keeps as first ingested
+            mock_datetime.now.return_value = datetime(2025, 6, 15)
+            StatementsTicker.period_ends = ['2025-03-31', '2024-03-31']
+            StatementsTicker.revenue = [1100.0, 999.0]
+            store.get_statements_sync('TCS.NS')
+            statements = store.get_statements_sync('TCS.NS', resolved=True, max_periods=2)
+
+            assert StatementsTicker.fetches == 2  # the next check waits for FY26
+            assert statements['financials'].loc['Total Revenue'].tolist() == [1100.0, 1000.0]
+            assert store.get_statements_sync('TCS.NS')['financials'].shape[1] == 3
+
+    def test_empty_fetch_is_retried(self, store):
+        """Test a fetch without statements (an upstream error) is not recorded as a check."""
+        StatementsTicker.period_ends, StatementsTicker.revenue = [], []
+        assert store.get_statements_sync('TCS.NS')['financials'] is None
+
+        StatementsTicker.period_ends, StatementsTicker.revenue = ['2024-03-31', '2023-03-31'], [1000.0, 900.0]
+        statements = store.get_statements_sync('TCS.NS')
+
+        assert StatementsTicker.fetches == 2
+        assert statements['financials'].loc['Revenue'].tolist() == [1000.0, 900.0]
+
+    def test_data_service_reads_resolved_statements(self):
+        """Test DataService extracts canonical items that were only reported under an alias."""
+        from backend.app.services.data_service import DataService
+
+        financial_data = DataService.get_financial_data('TCS.NS')
+
+        assert financial_data.revenue == [1000.0, 900.0]
+        assert financial_data.free_cash_flow == [120.0, 120.0]
+        assert financial_data.total_debt == [50.0, 50.0]
+        assert financial_data.years == [2024, 2023]
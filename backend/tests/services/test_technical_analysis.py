@@ -0,0 +1,152 @@
+import asyncio
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from backend.app.api.responses import FastJSONResponse
+from backend.app.services import enhanced_data_service
+from backend.app.services import technical_analysis as ta_module
+from backend.app.services.intelligent_cache import IntelligentCacheManager
+from backend.app.services.technical_analysis import TechnicalAnalysisService
+
+
+class FrameSnapshot:
+    """CompanySnapshot stand-in serving one history frame."""
+
+    def __init__(self, days: int):
+        close = np.linspace(100.0, 160.0, days) + np.sin(np.arange(days))
+        self.frame = pd.DataFrame(
+            {'Open': close, 'High': close + 2, 'Low': close - 2, 'Close': close, 'Volume': 1000.0},
+            index=pd.bdate_range(end='2024-10-01', periods=days, tz='Asia/Kolkata', name='Date')
+        )
+
+    def history_sync(self, period=None):
+        return self.frame
+
+
+def compute(days: int = 60):
+    with patch.object(ta_module.price_service, 'get_price_for_snapshot', return_value=None):
+        return TechnicalAnalysisService().compute_technical_analysis('TCS.NS', '3mo', FrameSnapshot(days))
+
+
+class TestChartLayout:
+    """Test cases for the row and column layouts of chart_data."""
+
+    def test_columns_and_rows_carry_the_same_bars(self):
+        """Test the column layout converts to the row-per-bar shape and back without changes."""
+        result = compute()
+        columns = result['chart_data']
+
+        assert result['chart_layout'] == 'columns' and result['data_points'] == 60
+        assert all(len(values) == 60 for values in columns.values())
+        assert columns['bb_upper'][0] is None  # no deviation from one bar: NaN mapped to null
+        assert columns['date'][-1] == '2024-10-01'
+        assert isinstance(columns['volume'][0], int) and isinstance(columns['close'][0], float)
+
+        rows = TechnicalAnalysisService.with_chart_layout(result, 'rows')
+        assert rows['chart_layout'] == 'rows' and result['chart_layout'] == 'columns'
+        assert list(rows['chart_data'][0]) == [
+            'date', 'timestamp', 'open', 'high', 'low', 'close', 'volume',
+            'sma_50', 'sma_200', 'bb_upper', 'bb_lower', 'bb_middle', 'rsi',
+            'macd_line', 'macd_signal', 'macd_histogram', 'stoch_k', 'stoch_d', 'volume_sma', 'obv'
+        ]
+        assert rows['chart_data'][10] == {field: values[10] for field, values in columns.items()}
+
+        assert TechnicalAnalysisService.with_chart_layout(rows, 'columns')['chart_data'] == columns
+        assert TechnicalAnalysisService.with_chart_layout(result, 'columns') is result
+
+    def test_fast_json_response(self):
+        """Test the response body is compact JSON with non-finite floats as null."""
+        result = compute()
+        result['indicator_values']['rsi'] = float('nan')
+
+        body = json.loads(FastJSONResponse(result).body)
+
+        assert body['indicator_values']['rsi'] is None
+        assert body['chart_data'] == json.loads(json.dumps(result['chart_data']))
+
+
+def minute_bars(sessions: int = 2) -> pd.DataFrame:
+    """One-minute candles of full NSE sessions (9:15-15:29), close rising by 0.01 a minute."""
+    days = pd.bdate_range(end='2024-10-01', periods=sessions, tz='Asia/Kolkata')
+    index = pd.DatetimeIndex([
+        minute for day in days
+        for minute in pd.date_range(day + pd.Timedelta('9h15min'), periods=375, freq='min')
+    ], name='Date')
+    close = 100 + np.arange(len(index)) * 0.01
+    return pd.DataFrame(
+        {'Open': close - 0.005, 'High': close + 0.02, 'Low': close - 0.02, 'Close': close, 'Volume': 10.0},
+        index=index
+    )
+
+
+class TestTimeframes:
+    """Test cases for timeframes resampled from a stored base series."""
+
+    def test_resample_aligns_to_market_open_and_weeks(self):
+        """Test intraday bins start at 9:15 without overnight bins and weekly bins start on Monday."""
+        minutes = minute_bars()
+        hourly = TechnicalAnalysisService.resample_bars(minutes, '60min')
+
+        assert len(hourly) == 14  # 6 full hours and the 15:15 bar per session
+        assert [stamp.strftime('%H:%M') for stamp in hourly.index[:7]] == [
+            '09:15', '10:15', '11:15', '12:15', '13:15', '14:15', '15:15'
+        ]
+        first = minutes.iloc[:60]
+        assert hourly.iloc[0].tolist() == [
+            first['Open'].iloc[0], first['High'].max(), first['Low'].min(), first['Close'].iloc[-1], 600.0
+        ]
+        assert hourly['Volume'].iloc[6] == 150.0  # 15:15-15:29
+
+        daily = FrameSnapshot(30).frame
+        weekly = TechnicalAnalysisService.resample_bars(daily, 'W-MON')
+        assert (weekly.index.dayofweek == 0).all()
+        assert weekly['Volume'].sum() == daily['Volume'].sum()
+
+    def test_intraday_timeframes_share_one_base_fetch(self, tmp_path):
+        """Test 5m, 15m and 1h resample one fetch of minute candles and are cached per timeframe."""
+        service = TechnicalAnalysisService()
+        data_service = enhanced_data_service.get_enhanced_data_service()
+        cache = IntelligentCacheManager(cache_dir=str(tmp_path))
+        with patch.object(ta_module, 'intelligent_cache', cache), \
+             patch.object(ta_module.price_service, 'get_price_for_dcf', return_value=None), \
+             patch.object(data_service, 'get_intraday_frame', AsyncMock(return_value=minute_bars())) as fetch, \
+             patch.object(service, 'compute_timeframe_analysis', wraps=service.compute_timeframe_analysis) as compute:
+            results = {
+                timeframe: asyncio.run(service.get_timeframe_analysis('TCS.NS', timeframe, 'columns'))
+                for timeframe in ('5m', '15m', '1h', '5m')
+            }
+
+        assert fetch.await_count == 1
+        assert compute.call_count == 3  # the second 5m request is a cache hit
+        assert {timeframe: result['data_points'] for timeframe, result in results.items()} == {
+            '5m': 150, '15m': 50, '1h': 14
+        }
+        five = results['5m']
+        assert five['timeframe'] == '5m' and five['chart_data']['date'][0] == '2024-09-30 09:15'
+        assert five['indicator_values']['current_price'] == pytest.approx(minute_bars()['Close'].iloc[-1])
+
+    def test_intraday_candles_are_topped_up(self, tmp_path):
+        """Test stored minute candles are extended with only the candles from the last stored one on."""
+        service = TechnicalAnalysisService()
+        data_service = enhanced_data_service.get_enhanced_data_service()
+        candles = minute_bars(3)
+        newer = candles.iloc[-375 - 1:].copy()
+        newer.iloc[0, newer.columns.get_loc('Close')] += 1  # the last stored minute was still forming
+        fetch = AsyncMock(side_effect=[candles.iloc[:-375], newer, candles.iloc[:0]])
+        with patch.object(ta_module, 'intelligent_cache', IntelligentCacheManager(cache_dir=str(tmp_path))), \
+             patch.object(data_service, 'get_intraday_frame', fetch), \
+             patch.object(service, 'INTRADAY_REFRESH_SECONDS', 0):
+            first = asyncio.run(service._base_bars('TCS.NS', 'intraday'))
+            second = asyncio.run(service._base_bars('TCS.NS', 'intraday'))
+            third = asyncio.run(service._base_bars('TCS.NS', 'intraday'))
+
+        assert [call.kwargs['since'] for call in fetch.await_args_list] == [
+            None, first.index[-1], candles.index[-1]
+        ]
+        assert len(first) == 750
+        pd.testing.assert_frame_equal(second, pd.concat([candles.iloc[:-376], newer]))
+        pd.testing.assert_frame_equal(third, second)  # nothing new: the stored candles stay
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from backend.app.services import technical_analysis as ta_module
+from backend.app.services import technical_screener as screener_module
+from backend.app.services.technical_analysis import TechnicalAnalysisService
+from backend.app.services.technical_screener import TechnicalScreener
+from backend.tests.synthetic_bars import make_history
+
+# Bars per ticker: full 2y history, under the 200-day window, under every window but Stochastic's
+HISTORIES = {'TCS.NS': (600, 3), 'INFY.NS': (150, 5), 'NEWLIST.NS': (12, 7)}
+
+
+@pytest.fixture
+def stored():
+    store = screener_module.ohlcv_store
+    for ticker, (days, seed) in HISTORIES.items():
+        store._store_full(ticker, make_history(days, seed), datetime.now() - timedelta(days=4000))
+    with patch.object(store, 'max_age', float('inf')), \
+         patch.object(store.gateway, 'get_histories_sync', side_effect=lambda tickers, **kwargs: {t: pd.DataFrame() for t in tickers}), \
+         patch.object(ta_module.price_service, 'get_price_for_dcf', return_value=None):
+        yield
+
+
+class TestTechnicalScreener:
+    """Test cases for the batch technical screener."""
+
+    def test_rows_match_per_ticker_analysis(self, stored):
+        """Test every row equals the ticker's own indicator_values, whatever its history length."""
+        result = TechnicalScreener().screen_sync(list(HISTORIES) + ['UNKNOWN.NS'])
+
+        assert result['screened'] == 3 and result['missing'] == ['UNKNOWN.NS']
+        rows = {row['ticker']: row for row in result['rows']}
+        service = TechnicalAnalysisService()
+        for ticker in HISTORIES:
+            expected = service.compute_technical_analysis(ticker, '1y')['indicator_values']
+            row = rows[ticker]
+            assert row['signals'] == expected.get('signals', [])
+            for name, value in expected.items():
+                if name == 'signals':
+                    continue
+                if isinstance(value, float) and np.isnan(value):
+                    assert row[name] is None, (ticker, name)
+                else:
+                    assert row[name] == (value if isinstance(value, str) else pytest.approx(value, rel=1e-9)), (ticker, name)
+
+    def test_filters_and_ranking(self, stored):
+        """Test conditions, signal text and ranking select and order the rows."""
+        screener = TechnicalScreener()
+        everything = screener.screen_sync(list(HISTORIES))['rows']
+
+        ranked = screener.screen_sync(list(HISTORIES), sort_by='current_price', order='desc', limit=2)
+        prices = sorted((row['current_price'] for row in everything), reverse=True)
+        assert [row['current_price'] for row in ranked['rows']] == prices[:2]
+        assert ranked['matches'] == 3
+
+        below = screener.screen_sync(list(HISTORIES), where=['sma_200_current<=sma_50_current'])
+        assert {row['ticker'] for row in below['rows']} == {
+            row['ticker'] for row in everything
+            if row['sma_200_current'] is not None and row['sma_200_current'] <= row['sma_50_current']
+        }
+
+        signal = everything[0]['signals'][0]
+        matched = screener.screen_sync(list(HISTORIES), signals=[signal.upper()[:12]])['rows']
+        assert everything[0]['ticker'] in {row['ticker'] for row in matched}
+
+        for bad in (dict(where=['rsi<<30']), dict(where=['bogus>1']), dict(sort_by='volume_trend')):
+            with pytest.raises(ValueError):
+                screener.screen_sync(list(HISTORIES), **bad)
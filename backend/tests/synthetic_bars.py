@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+
+
+def make_history(days: int = 1260, seed: int = 3) -> pd.DataFrame:
+    """
+    Daily OHLCV bars of a random walk ending today, in yfinance's layout.
+
+    Every 90th bar from the 50th closes flat, so indicators see unchanged
+    closes too; highs and lows are within 2% of the close.
+    """
+    rng = np.random.default_rng(seed)
+    close = 1000 * np.exp(np.cumsum(rng.normal(0.0004, 0.015, days)))
+    close[50::90] = close[49::90][:len(close[50::90])]  # flat bars
+    index = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=days, tz='Asia/Kolkata', name='Date')
+    return pd.DataFrame(
+        {'Open': close, 'High': close * (1 + rng.uniform(0, 0.02, days)),
+         'Low': close * (1 - rng.uniform(0, 0.02, days)), 'Close': close,
+         'Volume': rng.integers(100_000, 5_000_000, days).astype(float)},
+        index=index
+    )
@@ -2,13 +2,18 @@ import pytest
 import asyncio
 import tempfile
 import shutil
-from datetime import datetime, timedelta
+import os
+import sqlite3
+from datetime import datetime, time, timedelta
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 from backend.app.services.intelligent_cache import (
     IntelligentCacheManager, CacheType
 )
+from backend.app.services.cache_serialization import CacheCodec
+from backend.app.services.cache_backends import FileCacheBackend, SQLiteCacheBackend
+from backend.app.services.cache_warming import CacheWarmingService, RateBudget, WarmingJob
 
 class TestIntelligentCacheManager:
     """
@@ -133,7 +138,7 @@ class TestIntelligentCacheManager:
         assert cache_manager.stats['hits'] == 1
         
         # Verify cache file exists
-        cache_files = list(cache_manager.cache_dir.glob('*.json'))
+        cache_files = list(cache_manager.backend.iter_files())
         assert len(cache_files) == 1
     
     @pytest.mark.asyncio
@@ -231,7 +236,7 @@ class TestIntelligentCacheManager:
                 await cache_manager.set(CacheType.FINANCIAL_DATA, ticker, sample_financial_data)
             
             # Verify all are cached
-            cache_files = list(cache_manager.cache_dir.glob('*.json'))
+            cache_files = list(cache_manager.backend.iter_files())
             assert len(cache_files) == 3
             
             # Wait for expiration
@@ -242,7 +247,7 @@ class TestIntelligentCacheManager:
             assert cleaned_count == 3
             
             # Verify files are gone
-            cache_files = list(cache_manager.cache_dir.glob('*.json'))
+            cache_files = list(cache_manager.backend.iter_files())
             assert len(cache_files) == 0
             
         finally:
@@ -304,19 +309,105 @@ class TestIntelligentCacheManager:
         """Test cache warming for popular stocks."""
         
         popular_tickers = ['TCS.NS', 'RELIANCE.NS', 'HDFCBANK.NS']
+        fetched = []
         
-        # Test cache warming (mocked since we don't want real API calls)
-        with patch.object(cache_manager, 'get') as mock_get:
-            mock_get.return_value = None  # Simulate cache miss
-            
-            results = await cache_manager.warm_cache_for_popular_stocks(
-                popular_tickers, cache_financial=True, cache_news=False
-            )
-            
-            assert 'financial_cached' in results
-            assert 'news_cached' in results
-            assert 'errors' in results
-            assert results['errors'] == 0
+        async def fetch_financials(ticker):
+            fetched.append(ticker)
+            return {'ticker': ticker, 'price': 100.0}
+        
+        async def fetch_news(ticker):
+            return [] if ticker == 'HDFCBANK.NS' else [{'title': f'{ticker} news'}]
+        
+        warming = CacheWarmingService(
+            cache=cache_manager,
+            jobs=[
+                WarmingJob('financial_data', CacheType.FINANCIAL_DATA, fetch_financials),
+                WarmingJob('news_articles', CacheType.NEWS_ARTICLES, fetch_news, params={'max_articles': 5})
+            ],
+            calls_per_minute=6000
+        )
+        
+        results = await warming.warm(popular_tickers)
+        
+        assert results['status'] == 'completed'
+        assert results['completed_tickers'] == 3
+        assert results['percent_complete'] == 100.0
+        assert results['outcomes']['financial_data'] == {'warmed': 3, 'fresh': 0, 'failed': 0}
+        assert results['outcomes']['news_articles'] == {'warmed': 2, 'fresh': 0, 'failed': 1}
+        assert any('HDFCBANK.NS/news_articles' in error for error in results['errors'])
+        
+        # Warmed entries are keyed like the request path keys them
+        assert await cache_manager.get(CacheType.FINANCIAL_DATA, 'TCS.NS') == {'ticker': 'TCS.NS', 'price': 100.0}
+        assert await cache_manager.get(CacheType.NEWS_ARTICLES, 'TCS.NS', max_articles=5) == [{'title': 'TCS.NS news'}]
+        
+        # A second run finds everything fresh and makes no upstream calls
+        fetched.clear()
+        results = await warming.warm(popular_tickers, job_names=['financial_data'])
+        assert fetched == []
+        assert results['outcomes']['financial_data'] == {'warmed': 0, 'fresh': 3, 'failed': 0}
+        assert results['upstream_calls'] == 0
+        
+        # Progress is visible from another service instance (another worker)
+        other_worker = CacheWarmingService(cache=cache_manager, jobs=[])
+        assert other_worker.get_status()['run_id'] == results['run_id']
+    
+    @pytest.mark.asyncio
+    async def test_cache_warming_bounded_concurrency(self, cache_manager):
+        """Test cache warming never runs more tickers at once than allowed."""
+        
+        running = 0
+        peak = 0
+        
+        async def slow_fetch(ticker):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {'ticker': ticker}
+        
+        warming = CacheWarmingService(
+            cache=cache_manager,
+            jobs=[WarmingJob('financial_data', CacheType.FINANCIAL_DATA, slow_fetch)],
+            max_concurrency=2,
+            calls_per_minute=6000
+        )
+        
+        results = await warming.warm([f'STOCK{i}.NS' for i in range(8)])
+        
+        assert results['outcomes']['financial_data']['warmed'] == 8
+        assert peak == 2
+    
+    @pytest.mark.asyncio
+    async def test_cache_warming_rate_budget(self):
+        """Test the rate budget paces calls once the burst is spent."""
+        
+        budget = RateBudget(calls_per_minute=600, burst=2)  # 10 calls/s
+        
+        start = asyncio.get_event_loop().time()
+        for _ in range(4):
+            await budget.acquire()
+        elapsed = asyncio.get_event_loop().time() - start
+        
+        # Two from the burst, two more at 0.1s each
+        assert 0.15 <= elapsed < 1.0
+    
+    def test_cache_warming_schedule(self):
+        """Test scheduled runs land on the next weekday before market open."""
+        
+        ist = CacheWarmingService.MARKET_TIMEZONE
+        run_at = time(8, 45)
+        
+        # Friday evening -> Monday morning
+        friday = datetime(2024, 6, 7, 18, 0, tzinfo=ist)
+        assert CacheWarmingService.next_run_time(friday, run_at) == datetime(2024, 6, 10, 8, 45, tzinfo=ist)
+        
+        # Tuesday early morning -> same day
+        tuesday = datetime(2024, 6, 11, 7, 0, tzinfo=ist)
+        assert CacheWarmingService.next_run_time(tuesday, run_at) == datetime(2024, 6, 11, 8, 45, tzinfo=ist)
+        
+        # Saturday is allowed when not restricted to weekdays
+        assert CacheWarmingService.next_run_time(friday, run_at, weekdays_only=False) == datetime(2024, 6, 8, 8, 45, tzinfo=ist)
     
     @pytest.mark.asyncio
     async def test_concurrent_cache_access(self, cache_manager, sample_financial_data):
@@ -350,7 +441,7 @@ class TestIntelligentCacheManager:
         
         # Create corrupted cache file
         cache_key = cache_manager._generate_cache_key(CacheType.FINANCIAL_DATA, ticker)
-        cache_path = cache_manager._get_cache_path(cache_key)
+        cache_path = cache_manager.backend.entry_path(cache_key)
         
         # Write invalid JSON
         with open(cache_path, 'w') as f:
@@ -380,8 +471,656 @@ class TestIntelligentCacheManager:
         assert cache_manager.stats['hits'] == 2
         
         # Should have 2 cache files
-        cache_files = list(cache_manager.cache_dir.glob('*.json'))
+        cache_files = list(cache_manager.backend.iter_files())
         assert len(cache_files) == 2
 
+    @pytest.mark.asyncio
+    async def test_memory_tier_serves_repeat_hits(self, cache_manager, sample_financial_data):
+        """Test repeat hits are served from the L1 tier without reading disk."""
+        
+        ticker = 'TCS.NS'
+        await cache_manager.set(CacheType.FINANCIAL_DATA, ticker, sample_financial_data)
+        
+        with patch('builtins.open', side_effect=AssertionError("disk read")):
+            cached_data = await cache_manager.get(CacheType.FINANCIAL_DATA, ticker)
+        
+        assert cached_data == sample_financial_data
+        assert cache_manager.stats['memory_hits'] == 1
+        assert cache_manager.stats['disk_hits'] == 0
+        
+        # Callers get independent copies
+        cached_data['info']['currentPrice'] = 0
+        cached_again = await cache_manager.get(CacheType.FINANCIAL_DATA, ticker)
+        assert cached_again['info']['currentPrice'] == 3850.0
+    
+    @pytest.mark.asyncio
+    async def test_memory_tier_promotes_disk_hits(self, temp_cache_dir, sample_financial_data):
+        """Test a disk hit is promoted so the next lookup stays in memory."""
+        
+        writer = IntelligentCacheManager(cache_dir=temp_cache_dir)
+        await writer.set(CacheType.FINANCIAL_DATA, 'TCS.NS', sample_financial_data)
+        
+        reader = IntelligentCacheManager(cache_dir=temp_cache_dir)
+        assert await reader.get(CacheType.FINANCIAL_DATA, 'TCS.NS') == sample_financial_data
+        assert await reader.get(CacheType.FINANCIAL_DATA, 'TCS.NS') == sample_financial_data
+        
+        assert reader.stats['disk_hits'] == 1
+        assert reader.stats['memory_hits'] == 1
+        assert reader.stats['memory_misses'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_memory_tier_lru_eviction(self, temp_cache_dir, sample_financial_data):
+        """Test the L1 tier stays bounded and evicts least recently used keys."""
+        
+        cache_manager = IntelligentCacheManager(cache_dir=temp_cache_dir, memory_max_entries=2)
+        
+        await cache_manager.set(CacheType.FINANCIAL_DATA, 'TCS.NS', sample_financial_data)
+        await cache_manager.set(CacheType.FINANCIAL_DATA, 'INFY.NS', sample_financial_data)
+        await cache_manager.get(CacheType.FINANCIAL_DATA, 'TCS.NS')  # TCS now most recent
+        await cache_manager.set(CacheType.FINANCIAL_DATA, 'WIPRO.NS', sample_financial_data)
+        
+        infy_key = cache_manager._generate_cache_key(CacheType.FINANCIAL_DATA, 'INFY.NS')
+        tcs_key = cache_manager._generate_cache_key(CacheType.FINANCIAL_DATA, 'TCS.NS')
+        assert infy_key not in cache_manager._memory_cache
+        assert tcs_key in cache_manager._memory_cache
+        assert cache_manager.stats['memory_evictions'] == 1
+        
+        # Evicted entries are still served from disk
+        assert await cache_manager.get(CacheType.FINANCIAL_DATA, 'INFY.NS') == sample_financial_data
+        assert cache_manager.stats['disk_hits'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_memory_tier_invalidation_and_ttl(self, cache_manager, sample_financial_data):
+        """Test invalidation and the per-type L1 TTL both drop memory entries."""
+        
+        ticker = 'TCS.NS'
+        await cache_manager.set(CacheType.FINANCIAL_DATA, ticker, sample_financial_data)
+        await cache_manager.invalidate(CacheType.FINANCIAL_DATA, ticker)
+        assert await cache_manager.get(CacheType.FINANCIAL_DATA, ticker) is None
+        
+        cache_manager.memory_ttl_config[CacheType.FINANCIAL_DATA] = timedelta(milliseconds=50)
+        await cache_manager.set(CacheType.FINANCIAL_DATA, ticker, sample_financial_data)
+        await asyncio.sleep(0.1)
+        
+        # L1 copy expired, file copy still valid
+        assert await cache_manager.get(CacheType.FINANCIAL_DATA, ticker) == sample_financial_data
+        assert cache_manager.stats['disk_hits'] == 1
+        
+        stats = await cache_manager.get_cache_stats()
+        tiers = stats['tier_statistics']
+        assert tiers['memory']['hits'] == 0
+        assert tiers['memory']['misses'] == 2
+        assert tiers['disk']['hits'] == 1
+        assert tiers['disk']['misses'] == 1
+        assert tiers['memory']['entries'] == 1
+
+    @pytest.mark.asyncio
+    async def test_disk_io_runs_off_event_loop(self, temp_cache_dir, sample_financial_data):
+        """Test file reads and writes happen on the I/O pool, not the loop thread."""
+        
+        import threading
+        cache_manager = IntelligentCacheManager(cache_dir=temp_cache_dir, memory_max_entries=0)
+        loop_thread = threading.get_ident()
+        io_threads = []
+        
+        original_read = cache_manager._read_entry
+        original_write = cache_manager._write_entry
+        
+        def tracking_read(*args):
+            io_threads.append(threading.get_ident())
+            return original_read(*args)
+        
+        def tracking_write(*args):
+            io_threads.append(threading.get_ident())
+            return original_write(*args)
+        
+        with patch.object(cache_manager, '_read_entry', side_effect=tracking_read), \
+             patch.object(cache_manager, '_write_entry', side_effect=tracking_write):
+            await cache_manager.set(CacheType.FINANCIAL_DATA, 'TCS.NS', sample_financial_data)
+            cached_data = await cache_manager.get(CacheType.FINANCIAL_DATA, 'TCS.NS')
+        
+        assert cached_data == sample_financial_data
+        assert len(io_threads) == 2
+        assert loop_thread not in io_threads
+        assert not list(cache_manager.cache_dir.glob('*.tmp'))
+
+    @pytest.mark.asyncio
+    async def test_legacy_json_entries_still_readable(self, cache_manager, sample_financial_data):
+        """Test pretty-printed .json entries written before codecs are still served."""
+        
+        import json
+        ticker = 'TCS.NS'
+        cache_key = cache_manager._generate_cache_key(CacheType.FINANCIAL_DATA, ticker)
+        legacy_entry = {
+            'timestamp': datetime.now().isoformat(),
+            'cache_type': CacheType.FINANCIAL_DATA.value,
+            'identifier': ticker,
+            'data': sample_financial_data,
+            'metadata': {'cache_key': cache_key}
+        }
+        with open(cache_manager.backend.legacy_path(cache_key), 'w') as f:
+            json.dump(legacy_entry, f, indent=2)
+        
+        assert await cache_manager.get(CacheType.FINANCIAL_DATA, ticker) == sample_financial_data
+        
+        # Rewriting replaces the legacy file with a framed entry
+        await cache_manager.set(CacheType.FINANCIAL_DATA, ticker, sample_financial_data)
+        cache_files = list(cache_manager.backend.iter_files())
+        assert [f.suffix for f in cache_files] == [FileCacheBackend.ENTRY_SUFFIX]
+        
+        assert await cache_manager.invalidate(CacheType.FINANCIAL_DATA, ticker) is True
+        assert list(cache_manager.backend.iter_files()) == []
+    
+    @pytest.mark.asyncio
+    async def test_binary_codec_preserves_native_types(self, temp_cache_dir):
+        """Test pickle-coded entries keep Timestamp keys that JSON cannot encode."""
+        
+        import pandas as pd
+        quarterly = pd.DataFrame(
+            {pd.Timestamp('2024-03-31'): [1000.0, 250.0]},
+            index=['Total Revenue', 'EBITDA']
+        ).to_dict()
+        data = {'ticker': 'TCS.NS', 'financials': quarterly}
+        
+        writer = IntelligentCacheManager(cache_dir=temp_cache_dir)
+        assert writer.codec_config[CacheType.FINANCIAL_DATA].serializer.name == 'pickle'
+        assert await writer.set(CacheType.FINANCIAL_DATA, 'TCS.NS', data) is True
+        
+        reader = IntelligentCacheManager(cache_dir=temp_cache_dir)
+        cached = await reader.get(CacheType.FINANCIAL_DATA, 'TCS.NS')
+        assert cached == data
+        assert pd.Timestamp('2024-03-31') in cached['financials']
+    
+    @pytest.mark.asyncio
+    async def test_entries_decode_after_codec_change(self, temp_cache_dir, sample_news_data):
+        """Test the entry header lets a different codec configuration read old entries."""
+        
+        writer = IntelligentCacheManager(
+            cache_dir=temp_cache_dir,
+            codec_config={CacheType.NEWS_ARTICLES: CacheCodec("pickle", "gzip")}
+        )
+        await writer.set(CacheType.NEWS_ARTICLES, 'TCS.NS', sample_news_data)
+        
+        reader = IntelligentCacheManager(
+            cache_dir=temp_cache_dir,
+            codec_config={CacheType.NEWS_ARTICLES: CacheCodec("json")}
+        )
+        assert await reader.get(CacheType.NEWS_ARTICLES, 'TCS.NS') == sample_news_data
+        
+        stats = await reader.get_cache_stats()
+        assert stats['ttl_configuration']['news_articles']['codec'] == 'json'
+    
+    def test_codec_rejects_unframed_bytes(self):
+        """Test decoding garbage raises instead of returning bogus data."""
+        
+        with pytest.raises(ValueError):
+            CacheCodec.decode(b'invalid json content')
+        
+        entry = {'timestamp': '2024-01-01T00:00:00', 'data': {'a': 1}}
+        assert CacheCodec.decode(CacheCodec("json", "gzip").encode(entry)) == entry
+
+    @pytest.mark.asyncio
+    async def test_cleanup_and_stats_use_index(self, cache_manager, sample_financial_data):
+        """Test expiry sweeps and storage stats never open or glob entry files."""
+        
+        cache_manager.ttl_config[CacheType.NEWS_ARTICLES] = timedelta(milliseconds=50)
+        await cache_manager.set(CacheType.FINANCIAL_DATA, 'TCS.NS', sample_financial_data)
+        await cache_manager.set(CacheType.NEWS_ARTICLES, 'TCS.NS', ['headline'])
+        await cache_manager.set(CacheType.NEWS_ARTICLES, 'INFY.NS', ['headline'])
+        await asyncio.sleep(0.1)
+        
+        with patch.object(cache_manager.backend, 'load_file', side_effect=AssertionError("file opened")), \
+             patch.object(cache_manager.backend, 'iter_files', side_effect=AssertionError("dir scanned")):
+            cleaned_count = await cache_manager.cleanup_expired()
+            stats = await cache_manager.get_cache_stats()
+        
+        assert cleaned_count == 2
+        assert stats['cache_storage']['cache_files'] == 1
+        
+        expected_bytes = sum(f.stat().st_size for f in cache_manager.backend.iter_files())
+        assert cache_manager._index.totals() == (1, expected_bytes)
+        
+        await cache_manager.invalidate(CacheType.FINANCIAL_DATA, 'TCS.NS')
+        assert cache_manager._index.totals() == (0, 0)
+    
+    @pytest.mark.asyncio
+    async def test_index_seeded_from_existing_files(self, temp_cache_dir, sample_financial_data):
+        """Test a missing index is rebuilt from entry files already on disk."""
+        
+        writer = IntelligentCacheManager(cache_dir=temp_cache_dir)
+        await writer.set(CacheType.FINANCIAL_DATA, 'TCS.NS', sample_financial_data)
+        await writer.set(CacheType.FINANCIAL_DATA, 'INFY.NS', sample_financial_data)
+        
+        # Corrupted file is dropped during the rebuild
+        (Path(temp_cache_dir) / 'financial_data_BAD.NS_00000000.cache').write_bytes(b'garbage')
+        for index_file in Path(temp_cache_dir).glob(f"{IntelligentCacheManager.INDEX_FILENAME}*"):
+            index_file.unlink()
+        
+        reader = IntelligentCacheManager(cache_dir=temp_cache_dir)
+        stats = await reader.get_cache_stats()
+        assert stats['cache_storage']['cache_files'] == 2
+        assert len(list(reader.backend.iter_files())) == 2
+
+    @pytest.mark.asyncio
+    async def test_get_or_compute_runs_producer_once(self, cache_manager, sample_financial_data):
+        """Test concurrent misses for one key share a single producer run."""
+
+        calls = 0
+
+        async def producer():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return sample_financial_data
+
+        results = await asyncio.gather(*[
+            cache_manager.get_or_compute(CacheType.FINANCIAL_DATA, 'TCS.NS', producer)
+            for _ in range(20)
+        ])
+
+        assert calls == 1
+        assert all(result == sample_financial_data for result in results)
+        assert cache_manager.stats['producer_runs'] == 1
+        assert cache_manager.stats['coalesced_requests'] == 19
+        assert not cache_manager._inflight
+
+        # Later calls are served from the cache
+        await cache_manager.get_or_compute(CacheType.FINANCIAL_DATA, 'TCS.NS', producer)
+        assert calls == 1
+
+        stats = await cache_manager.get_cache_stats()
+        assert stats['single_flight']['producer_runs'] == 1
+        assert stats['single_flight']['coalesced_requests'] == 19
+
+    @pytest.mark.asyncio
+    async def test_get_or_compute_on_another_event_loop(self, cache_manager, sample_financial_data):
+        """Test a caller on a second event loop does not join a computation bound to the first."""
+        started = asyncio.Event()
+
+        async def slow_producer():
+            started.set()
+            await asyncio.sleep(0.2)
+            return sample_financial_data
+
+        async def other_loop_producer():
+            return {'source': 'other loop'}
+
+        first = asyncio.ensure_future(
+            cache_manager.get_or_compute(CacheType.FINANCIAL_DATA, 'TCS.NS', slow_producer)
+        )
+        await started.wait()
+        other = await asyncio.to_thread(
+            asyncio.run, cache_manager.get_or_compute(CacheType.FINANCIAL_DATA, 'TCS.NS', other_loop_producer)
+        )
+
+        assert other == {'source': 'other loop'}
+        assert await first == sample_financial_data
+        assert not cache_manager._inflight
+
+    @pytest.mark.asyncio
+    async def test_get_or_compute_errors_and_empty_results(self, cache_manager):
+        """Test producer errors reach every waiter and falsy results are not cached."""
+
+        async def failing_producer():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream down")
+
+        results = await asyncio.gather(*[
+            cache_manager.get_or_compute(CacheType.AI_INSIGHTS, 'TCS.NS', failing_producer)
+            for _ in range(3)
+        ], return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        assert not cache_manager._inflight
+
+        calls = 0
+
+        async def empty_producer():
+            nonlocal calls
+            calls += 1
+            return None
+
+        assert await cache_manager.get_or_compute(CacheType.AI_INSIGHTS, 'TCS.NS', empty_producer) is None
+        assert await cache_manager.get_or_compute(CacheType.AI_INSIGHTS, 'TCS.NS', empty_producer) is None
+        assert calls == 2
+
+    @pytest.mark.asyncio
+    async def test_get_or_compute_survives_caller_cancellation(self, cache_manager, sample_financial_data):
+        """Test cancelling one caller does not abort the shared computation."""
+
+        release = asyncio.Event()
+
+        async def producer():
+            await release.wait()
+            return sample_financial_data
+
+        first = asyncio.ensure_future(
+            cache_manager.get_or_compute(CacheType.FINANCIAL_DATA, 'TCS.NS', producer)
+        )
+        second = asyncio.ensure_future(
+            cache_manager.get_or_compute(CacheType.FINANCIAL_DATA, 'TCS.NS', producer)
+        )
+        await asyncio.sleep(0.01)
+
+        first.cancel()
+        release.set()
+
+        assert await second == sample_financial_data
+        assert first.cancelled()
+        assert await cache_manager.get(CacheType.FINANCIAL_DATA, 'TCS.NS') == sample_financial_data
+
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate_serves_stale_and_refreshes(self, cache_manager):
+        """Test an expired AI entry inside the grace window is served while one refresh runs."""
+
+        cache_manager.ttl_config[CacheType.AI_ANALYSIS] = timedelta(milliseconds=50)
+        await cache_manager.set(CacheType.AI_ANALYSIS, 'TCS.NS', {'thesis': 'old'})
+        await asyncio.sleep(0.1)
+
+        release = asyncio.Event()
+        calls = 0
+
+        async def producer():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return {'thesis': 'new'}
+
+        # Plain get treats the entry as a miss but leaves it on disk
+        assert await cache_manager.get(CacheType.AI_ANALYSIS, 'TCS.NS') is None
+
+        results = [
+            await cache_manager.get_or_compute(CacheType.AI_ANALYSIS, 'TCS.NS', producer)
+            for _ in range(3)
+        ]
+        assert results == [{'thesis': 'old'}] * 3
+        await asyncio.sleep(0)
+        assert calls == 1
+        assert len(cache_manager._refreshing) == 1
+
+        cache_manager.ttl_config[CacheType.AI_ANALYSIS] = timedelta(hours=6)
+        release.set()
+        await asyncio.gather(*cache_manager._refreshing.values())
+
+        assert await cache_manager.get(CacheType.AI_ANALYSIS, 'TCS.NS') == {'thesis': 'new'}
+
+        stats = await cache_manager.get_cache_stats()
+        swr = stats['stale_while_revalidate']
+        assert swr['stale_served'] == 3
+        assert swr['background_refreshes'] == 1
+        assert swr['refresh_failures'] == 0
+        assert swr['refreshing'] == 0
+        assert swr['refresh_latency_ms']['max'] > 0
+        assert stats['ttl_configuration']['ai_analysis']['stale_grace_hours'] == 12
+
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate_limits(self, cache_manager, sample_financial_data):
+        """Test entries past the grace window, and types without one, are recomputed."""
+
+        cache_manager.ttl_config[CacheType.AI_ANALYSIS] = timedelta(milliseconds=50)
+        cache_manager.stale_grace_config[CacheType.AI_ANALYSIS] = timedelta(milliseconds=50)
+        cache_manager.ttl_config[CacheType.FINANCIAL_DATA] = timedelta(milliseconds=50)
+
+        await cache_manager.set(CacheType.AI_ANALYSIS, 'TCS.NS', {'thesis': 'old'})
+        await cache_manager.set(CacheType.FINANCIAL_DATA, 'TCS.NS', sample_financial_data)
+        await asyncio.sleep(0.15)
+
+        async def producer():
+            return {'thesis': 'new'}
+
+        assert await cache_manager.get_or_compute(
+            CacheType.AI_ANALYSIS, 'TCS.NS', producer
+        ) == {'thesis': 'new'}
+        assert await cache_manager.get_or_compute(
+            CacheType.FINANCIAL_DATA, 'TCS.NS', producer
+        ) == {'thesis': 'new'}
+        assert cache_manager.stats['stale_served'] == 0
+        assert cache_manager.stats['producer_runs'] == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_ticker_and_tags(self, cache_manager, sample_financial_data, sample_news_data):
+        """Test tag invalidation drops every entry for a ticker whatever its key parameters."""
+
+        await cache_manager.set(CacheType.FINANCIAL_DATA, 'TCS.NS', sample_financial_data)
+        await cache_manager.set(CacheType.NEWS_ARTICLES, 'TCS.NS', sample_news_data, max_articles=10)
+        await cache_manager.set(CacheType.AI_ANALYSIS, 'TCS.NS_agentic_comprehensive', {'thesis': 'x'})
+        for sector, mode in [('IT', 'simple'), ('IT', 'agentic'), ('FMCG', 'simple')]:
+            await cache_manager.set(
+                CacheType.FINANCIAL_DATA, 'TCS.NS', {'fair_value': 1},
+                sector=sector, mode=mode, calculation_type='sector_dcf'
+            )
+        await cache_manager.set(CacheType.FINANCIAL_DATA, 'INFY.NS', sample_financial_data)
+
+        # Combined tags must all match
+        removed = await cache_manager.invalidate_by_tag(
+            [cache_manager.tag('ticker', 'TCS.NS'), 'calculation_type:sector_dcf', 'sector:IT'],
+            cache_type=CacheType.FINANCIAL_DATA
+        )
+        assert removed == 2
+        assert await cache_manager.get(
+            CacheType.FINANCIAL_DATA, 'TCS.NS', sector='FMCG', mode='simple', calculation_type='sector_dcf'
+        ) == {'fair_value': 1}
+
+        assert await cache_manager.invalidate_ticker('tcs.ns') == 4
+        assert await cache_manager.get(CacheType.FINANCIAL_DATA, 'TCS.NS') is None
+        assert await cache_manager.get(CacheType.NEWS_ARTICLES, 'TCS.NS', max_articles=10) is None
+        assert await cache_manager.get(CacheType.FINANCIAL_DATA, 'INFY.NS') == sample_financial_data
+        assert cache_manager._index.totals()[0] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_by_prefix_and_type(self, cache_manager, sample_financial_data):
+        """Test identifier-prefix and whole-type invalidation."""
+
+        await cache_manager.set(CacheType.FINANCIAL_DATA, 'TCS.NS_governance', sample_financial_data)
+        await cache_manager.set(CacheType.FINANCIAL_DATA, 'TCS.NS_blended_valuation', sample_financial_data)
+        await cache_manager.set(CacheType.FINANCIAL_DATA, 'TCSX.NS', sample_financial_data)
+        await cache_manager.set(CacheType.MARKET_DATA, 'india_10y_gsec', {'rate': 7.1})
+
+        assert await cache_manager.invalidate_by_prefix('TCS.NS_') == 2
+        assert await cache_manager.get(CacheType.FINANCIAL_DATA, 'TCSX.NS') == sample_financial_data
+
+        assert await cache_manager.invalidate_by_tag(cache_manager.tag('type', 'market_data')) == 1
+        assert await cache_manager.get(CacheType.MARKET_DATA, 'india_10y_gsec') is None
+
+    @pytest.mark.asyncio
+    async def test_tags_backfilled_when_index_upgraded(self, temp_cache_dir, sample_financial_data):
+        """Test an index created before tagging is re-seeded with tags on upgrade."""
+
+        writer = IntelligentCacheManager(cache_dir=temp_cache_dir)
+        await writer.set(
+            CacheType.FINANCIAL_DATA, 'TCS.NS', sample_financial_data,
+            sector='IT', mode='simple', calculation_type='sector_dcf'
+        )
+
+        conn = sqlite3.connect(str(Path(temp_cache_dir) / IntelligentCacheManager.INDEX_FILENAME))
+        conn.execute("DROP TABLE entry_tags")
+        conn.execute("PRAGMA user_version = 1")
+        conn.commit()
+        conn.close()
+
+        reader = IntelligentCacheManager(cache_dir=temp_cache_dir)
+        assert reader._index.upgraded
+        assert await reader.invalidate_by_tag(['ticker:TCS.NS', 'sector:IT']) == 1
+
+    @pytest.mark.asyncio
+    async def test_disk_budget_evicts_cheapest_entries_first(self, temp_cache_dir):
+        """Test the disk budget evicts cheap COMPANY_PROFILES before costly AI_ANALYSIS."""
+
+        cache_manager = IntelligentCacheManager(
+            cache_dir=temp_cache_dir,
+            max_disk_mb=0.1,
+            codec_config={cache_type: CacheCodec("pickle") for cache_type in CacheType}
+        )
+        payload = {'blob': os.urandom(20 * 1024).hex()}  # ~40 KB per entry
+
+        await cache_manager.set(CacheType.COMPANY_PROFILES, 'TCS.NS', payload)
+        await cache_manager.set(CacheType.AI_ANALYSIS, 'TCS.NS', payload)
+        assert cache_manager.stats['evictions'] == 0
+
+        await cache_manager.set(CacheType.MARKET_DATA, 'TCS.NS', payload)
+
+        assert await cache_manager.get(CacheType.COMPANY_PROFILES, 'TCS.NS') is None
+        assert await cache_manager.get(CacheType.AI_ANALYSIS, 'TCS.NS') == payload
+        assert await cache_manager.get(CacheType.MARKET_DATA, 'TCS.NS') == payload
+
+        stats = await cache_manager.get_cache_stats()
+        assert stats['cache_statistics']['evictions_by_reason'] == {
+            'expired': 0, 'capacity': 1, 'invalidated': 0
+        }
+        assert stats['cache_storage']['storage_size_mb'] <= 0.1
+        assert stats['cache_storage']['eviction_policy'] == 'greedy_dual_size'
+        assert len(list(cache_manager.backend.iter_files())) == 2
+
+    @pytest.mark.asyncio
+    async def test_disk_budget_keeps_recently_read_entries(self, temp_cache_dir):
+        """Test a read refreshes an entry's priority so an unread peer is evicted instead."""
+
+        cache_manager = IntelligentCacheManager(
+            cache_dir=temp_cache_dir,
+            max_disk_mb=0.1,
+            memory_max_entries=0,
+            codec_config={CacheType.FINANCIAL_DATA: CacheCodec("pickle")}
+        )
+        payload = {'blob': os.urandom(20 * 1024).hex()}
+
+        for ticker in ('AAA.NS', 'BBB.NS', 'CCC.NS'):
+            await cache_manager.set(CacheType.FINANCIAL_DATA, ticker, payload)
+        # Budget holds two entries - the oldest was evicted and inflation raised
+        assert await cache_manager.get(CacheType.FINANCIAL_DATA, 'AAA.NS') is None
+
+        assert await cache_manager.get(CacheType.FINANCIAL_DATA, 'BBB.NS') == payload
+        await cache_manager.set(CacheType.FINANCIAL_DATA, 'DDD.NS', payload)
+
+        assert await cache_manager.get(CacheType.FINANCIAL_DATA, 'BBB.NS') == payload
+        assert await cache_manager.get(CacheType.FINANCIAL_DATA, 'CCC.NS') is None
+        assert cache_manager.stats['evictions_by_reason']['capacity'] == 2
+
+    @pytest.mark.asyncio
+    async def test_sqlite_backend_round_trip(self, temp_cache_dir, sample_financial_data):
+        """Test entries live in the SQLite backend and survive a new manager instance."""
+        
+        def make_manager():
+            backend = SQLiteCacheBackend(Path(temp_cache_dir) / SQLiteCacheBackend.DB_FILENAME)
+            return IntelligentCacheManager(cache_dir=temp_cache_dir, backend=backend)
+        
+        writer = make_manager()
+        await writer.set(CacheType.FINANCIAL_DATA, 'TCS.NS', sample_financial_data)
+        await writer.set(CacheType.NEWS_ARTICLES, 'TCS.NS', ['headline'])
+        assert list(Path(temp_cache_dir).glob("*.cache")) == []
+        
+        # A second manager (another worker) reads the same entries
+        reader = make_manager()
+        assert await reader.get(CacheType.FINANCIAL_DATA, 'TCS.NS') == sample_financial_data
+        assert reader.stats['disk_hits'] == 1
+        
+        stats = await reader.get_cache_stats()
+        assert stats['cache_storage']['backend'] == 'sqlite'
+        assert stats['cache_storage']['cache_files'] == 2
+        
+        assert await reader.invalidate_ticker('TCS.NS') == 2
+        assert reader.backend.keys() == []
+        # The writer keeps serving its own L1 copy until the memory TTL lapses
+        assert await writer.get(CacheType.NEWS_ARTICLES, 'TCS.NS') == ['headline']
+        writer._memory_cache.clear()
+        assert await writer.get(CacheType.NEWS_ARTICLES, 'TCS.NS') is None
+    
+    @pytest.mark.asyncio
+    async def test_index_rebuilt_from_sqlite_backend(self, temp_cache_dir, sample_financial_data):
+        """Test a lost index is re-seeded from the SQLite backend contents."""
+        
+        backend = SQLiteCacheBackend(Path(temp_cache_dir) / SQLiteCacheBackend.DB_FILENAME)
+        writer = IntelligentCacheManager(cache_dir=temp_cache_dir, backend=backend)
+        await writer.set(CacheType.FINANCIAL_DATA, 'TCS.NS', sample_financial_data)
+        await writer.set(CacheType.FINANCIAL_DATA, 'INFY.NS', sample_financial_data)
+        
+        for index_file in Path(temp_cache_dir).glob(f"{IntelligentCacheManager.INDEX_FILENAME}*"):
+            index_file.unlink()
+        
+        reader = IntelligentCacheManager(cache_dir=temp_cache_dir, backend=backend)
+        assert reader._index.created
+        assert reader._index.totals()[0] == 2
+        assert await reader.invalidate_ticker('INFY.NS') == 1
+    
+    @pytest.mark.parametrize("backend_name", ["file", "sqlite"])
+    def test_shared_tier_visible_across_processes(self, temp_cache_dir, backend_name):
+        """Test entries written by one process are read and invalidated by another."""
+        import subprocess
+        import sys
+        
+        repo_root = Path(__file__).resolve().parents[2]
+        script = f"""
+import pandas as pd
+from backend.app.services.cache_backends import create_cache_backend
+from backend.app.services.intelligent_cache import IntelligentCacheManager, CacheType
+cache_dir = {temp_cache_dir!r}
+cache = IntelligentCacheManager(cache_dir=cache_dir, backend=create_cache_backend({backend_name!r}, cache_dir))
+history = pd.DataFrame({{'Close': [3800.0, 3850.0]}}, index=pd.date_range('2024-01-01', periods=2))
+assert cache.set_sync(CacheType.PRICE_DATA, 'TCS.NS', {{'current_price': 3850.0, 'history': history}})
+"""
+        env = {**os.environ, "PYTHONPATH": str(repo_root)}
+        subprocess.run([sys.executable, "-c", script], check=True, env=env, cwd=temp_cache_dir, timeout=60)
+        
+        from backend.app.services.cache_backends import create_cache_backend
+        cache = IntelligentCacheManager(
+            cache_dir=temp_cache_dir, backend=create_cache_backend(backend_name, temp_cache_dir)
+        )
+        data = cache.get_sync(CacheType.PRICE_DATA, 'TCS.NS')
+        assert data['current_price'] == 3850.0
+        assert list(data['history']['Close']) == [3800.0, 3850.0]
+        
+        assert cache.invalidate_by_tag_sync(cache.tag("ticker", "TCS.NS")) == 1
+        check = script.split("history =")[0] + "assert cache.get_sync(CacheType.PRICE_DATA, 'TCS.NS') is None\n"
+        subprocess.run([sys.executable, "-c", check], check=True, env=env, cwd=temp_cache_dir, timeout=60)
+    
+    @pytest.mark.asyncio
+    async def test_sync_accessors(self, cache_manager):
+        """Test blocking accessors bypass L1, expire entries and list a type's entries."""
+        
+        await cache_manager.set(CacheType.PRICE_DATA, 'TCS.NS', {'current_price': 3800.0})
+        assert cache_manager.set_sync(CacheType.PRICE_DATA, 'TCS.NS', {'current_price': 3850.0})
+        
+        # set_sync dropped the stale L1 copy written by set
+        assert await cache_manager.get(CacheType.PRICE_DATA, 'TCS.NS') == {'current_price': 3850.0}
+        assert cache_manager.get_sync(CacheType.PRICE_DATA, 'TCS.NS') == {'current_price': 3850.0}
+        assert cache_manager.get_sync(CacheType.PRICE_DATA, 'INFY.NS') is None
+        
+        entries = cache_manager.list_entries_sync(CacheType.PRICE_DATA)
+        assert [(e['identifier'], e['valid']) for e in entries] == [('TCS.NS', True)]
+        assert entries[0]['data'] == {'current_price': 3850.0}
+        
+        cache_manager.ttl_config[CacheType.PRICE_DATA] = timedelta(milliseconds=50)
+        await asyncio.sleep(0.1)
+        assert cache_manager.list_entries_sync(CacheType.PRICE_DATA)[0]['valid'] is False
+        assert cache_manager.get_sync(CacheType.PRICE_DATA, 'TCS.NS') is None
+        assert cache_manager.stats['evictions_by_reason']['expired'] == 1
+        assert cache_manager.list_entries_sync(CacheType.PRICE_DATA) == []
+    
+    def test_price_service_uses_shared_cache(self, cache_manager):
+        """Test PriceService fetches a ticker once and serves other callers from the shared tier."""
+        import pandas as pd
+        from backend.app.services import price_service as price_module
+        from backend.app.services import market_data_gateway as gateway_module
+        
+        history = pd.DataFrame(
+            {'Close': [3800.0, 3850.0], 'Volume': [1000, 1200]},
+            index=pd.date_range('2024-01-01', periods=2)
+        )
+        with patch.object(price_module, 'intelligent_cache', cache_manager), \
+             patch.object(gateway_module.yf, 'Ticker') as mock_ticker:
+            mock_ticker.return_value.info = {'currentPrice': 3850.0, 'marketCap': 1}
+            mock_ticker.return_value.history.return_value = history
+            
+            service = price_module.PriceService
+            assert service.get_price_for_dcf('TCS.NS') == 3850.0
+            assert service.get_unified_stock_data('TCS.NS')['change'] == 50.0
+            assert mock_ticker.return_value.history.call_count == 1
+            
+            status = service.get_cache_status()
+            assert status['TCS.NS']['valid'] and status['TCS.NS']['price'] == 3850.0
+            
+            service.clear_cache('TCS.NS')
+            assert service.get_cache_status() == {}
+            service.get_unified_stock_data('TCS.NS')
+            assert mock_ticker.return_value.history.call_count == 2
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
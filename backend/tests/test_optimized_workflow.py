@@ -1,7 +1,7 @@
 import pytest
 import asyncio
 import json
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 from datetime import datetime
 from backend.app.services.optimized_workflow import OptimizedWorkflowService
 from backend.app.models.dcf import DCFAssumptions
@@ -272,8 +272,8 @@ class TestOptimizedWorkflowService:
             assert progress_updates[-1][1] == 100  # Final progress should be 100%
             
             # Validate mock calls
-            mock_company.assert_called_once_with('TCS.NS')
-            mock_news.assert_called_once_with('TCS.NS', 5)
+            mock_company.assert_called_once_with('TCS.NS', snapshot=ANY)
+            mock_news.assert_called_once_with('TCS.NS', 5, snapshot=ANY)
             mock_analysis.assert_called_once()
             mock_validation.assert_called_once()
     
@@ -335,11 +335,11 @@ class TestOptimizedWorkflowService:
         """Test that data fetching is parallelized for performance."""
         
         # Mock slow individual functions
-        async def slow_company_fetch(ticker):
+        async def slow_company_fetch(ticker, snapshot=None):
             await asyncio.sleep(0.1)
             return {'ticker': ticker}
         
-        async def slow_news_fetch(ticker, max_articles):
+        async def slow_news_fetch(ticker, max_articles, snapshot=None):
             await asyncio.sleep(0.1)
             return []
         
@@ -372,7 +372,7 @@ class TestOptimizedWorkflowService:
             
             # Should return None when company data fetch fails
             assert result is None
-            mock_company.assert_called_once_with('INVALID.NS')
+            mock_company.assert_called_once_with('INVALID.NS', snapshot=ANY)
     
     @pytest.mark.asyncio
     async def test_error_handling_news_failure_graceful_degradation(self, workflow_service):